@@ -1,7 +1,9 @@
 """ETL pipeline for syncing posthog_organization and posthog_team tables from Postgres to ClickHouse."""
 
 import json
-import uuid
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union
@@ -277,66 +279,88 @@ def create_clickhouse_tables(
         raise
 
 
-def fetch_organizations_in_batches(conn, last_sync: Optional[datetime] = None, batch_size: int = 10000):
-    """Fetch organizations from Postgres in batches to avoid memory issues.
+def fetch_in_keyset_batches(
+    conn, select_query: str, last_sync: Optional[datetime] = None, batch_size: int = 10000
+) -> Iterator[list[dict]]:
+    """Fetch the rows of a query in batches ordered by (updated_at, id).
 
-    Yields batches of organization records.
-    """
-    # Use unique cursor name to avoid conflicts with concurrent runs
-    cursor_name = f"organizations_cursor_{uuid.uuid4().hex[:8]}"
-    cursor = conn.cursor(name=cursor_name)  # Named cursor for server-side processing
+    Each batch is a separate query starting after the last row of the previous batch, so no cursor is held open on
+    the server between batches, and the position in the table doesn't depend on an offset.
 
+    Yields batches of records.
+    """
+    cursor = conn.cursor()
     try:
-        query = """
-            SELECT
-                id,
-                name,
-                slug,
-                logo_media_id,
-                created_at,
-                updated_at,
-                session_cookie_age,
-                is_member_join_email_enabled,
-                is_ai_data_processing_approved,
-                enforce_2fa,
-                members_can_invite,
-                members_can_use_personal_api_keys,
-                allow_publicly_shared_resources,
-                plugins_access_level,
-                for_internal_metrics,
-                default_experiment_stats_method,
-                is_hipaa,
-                customer_id,
-                available_product_features,
-                usage,
-                never_drop_data,
-                customer_trust_scores,
-                setup_section_2_completed,
-                personalization,
-                domain_whitelist,
-                is_platform
-            FROM posthog_organization
-        """
-
-        params = []
-        if last_sync:
-            query += " WHERE updated_at > %s"
-            params.append(last_sync)
-
-        query += " ORDER BY updated_at ASC"
-
-        cursor.execute(query, params)
-        cursor.itersize = batch_size  # Configure batch size for server-side cursor
-
+        after: Optional[tuple[datetime, Any]] = None
         while True:
-            batch = cursor.fetchmany(batch_size)
+            conditions = []
+            params: list[Any] = []
+            if last_sync:
+                conditions.append("updated_at > %s")
+                params.append(last_sync)
+            if after:
+                conditions.append("(updated_at, id) > (%s, %s)")
+                params.extend(after)
+
+            query = select_query
+            if conditions:
+                query += f" WHERE {' AND '.join(conditions)}"
+            query += " ORDER BY updated_at ASC, id ASC LIMIT %s"
+            params.append(batch_size)
+
+            cursor.execute(query, params)
+            batch = cursor.fetchall()
             if not batch:
                 break
+
+            # Read before yielding, as the rows are transformed in place
+            after = (batch[-1]["updated_at"], batch[-1]["id"])
             yield batch
+
+            if len(batch) < batch_size:
+                break
     finally:
         cursor.close()
 
 
+def fetch_organizations_in_batches(conn, last_sync: Optional[datetime] = None, batch_size: int = 10000):
+    """Fetch organizations from Postgres in keyset-paginated batches to avoid memory issues.
+
+    Yields batches of organization records.
+    """
+    query = """
+        SELECT
+            id,
+            name,
+            slug,
+            logo_media_id,
+            created_at,
+            updated_at,
+            session_cookie_age,
+            is_member_join_email_enabled,
+            is_ai_data_processing_approved,
+            enforce_2fa,
+            members_can_invite,
+            members_can_use_personal_api_keys,
+            allow_publicly_shared_resources,
+            plugins_access_level,
+            for_internal_metrics,
+            default_experiment_stats_method,
+            is_hipaa,
+            customer_id,
+            available_product_features,
+            usage,
+            never_drop_data,
+            customer_trust_scores,
+            setup_section_2_completed,
+            personalization,
+            domain_whitelist,
+            is_platform
+        FROM posthog_organization
+    """
+    yield from fetch_in_keyset_batches(conn, query, last_sync, batch_size)
+
+
 def fetch_organizations(conn, last_sync: Optional[datetime] = None, batch_size: int = 10000) -> list[dict]:
     """Fetch all organizations from Postgres (legacy function for compatibility)."""
     rows = []
@@ -346,116 +370,94 @@ def fetch_organizations(conn, last_sync: Optional[datetime] = None, batch_size:
 
 
 def fetch_teams_in_batches(conn, last_sync: Optional[datetime] = None, batch_size: int = 10000):
-    """Fetch teams from Postgres in batches to avoid memory issues.
+    """Fetch teams from Postgres in keyset-paginated batches to avoid memory issues.
 
     Yields batches of team records.
     """
-    # Use unique cursor name to avoid conflicts with concurrent runs
-    cursor_name = f"teams_cursor_{uuid.uuid4().hex[:8]}"
-    cursor = conn.cursor(name=cursor_name)  # Named cursor for server-side processing
-
-    try:
-        query = """
-            SELECT
-                id,
-                uuid,
-                organization_id,
-                parent_team_id,
-                project_id,
-                api_token,
-                app_urls,
-                name,
-                slack_incoming_webhook,
-                created_at,
-                updated_at,
-                anonymize_ips,
-                completed_snippet_onboarding,
-                has_completed_onboarding_for,
-                onboarding_tasks,
-                ingested_event,
-                autocapture_opt_out,
-                autocapture_web_vitals_opt_in,
-                autocapture_web_vitals_allowed_metrics,
-                autocapture_exceptions_opt_in,
-                autocapture_exceptions_errors_to_ignore,
-                person_processing_opt_out,
-                secret_api_token,
-                secret_api_token_backup,
-                session_recording_opt_in,
-                session_recording_sample_rate,
-                session_recording_minimum_duration_milliseconds,
-                session_recording_linked_flag,
-                session_recording_network_payload_capture_config,
-                session_recording_masking_config,
-                session_recording_url_trigger_config,
-                session_recording_url_blocklist_config,
-                session_recording_event_trigger_config,
-                session_recording_trigger_match_type_config,
-                session_replay_config,
-                survey_config,
-                capture_console_log_opt_in,
-                capture_performance_opt_in,
-                capture_dead_clicks,
-                surveys_opt_in,
-                heatmaps_opt_in,
-                flags_persistence_default,
-                feature_flag_confirmation_enabled,
-                feature_flag_confirmation_message,
-                session_recording_version,
-                signup_token,
-                is_demo,
-                access_control,
-                week_start_day,
-                inject_web_apps,
-                test_account_filters,
-                test_account_filters_default_checked,
-                path_cleaning_filters,
-                timezone,
-                data_attributes,
-                person_display_name_properties,
-                live_events_columns,
-                recording_domains,
-                human_friendly_comparison_periods,
-                cookieless_server_hash_mode,
-                primary_dashboard_id,
-                default_data_theme,
-                extra_settings,
-                modifiers,
-                correlation_config,
-                session_recording_retention_period_days,
-                plugins_opt_in,
-                opt_out_capture,
-                event_names,
-                event_names_with_usage,
-                event_properties,
-                event_properties_with_usage,
-                event_properties_numerical,
-                external_data_workspace_id,
-                external_data_workspace_last_synced_at,
-                api_query_rate_limit,
-                revenue_tracking_config,
-                drop_events_older_than,
-                base_currency
-            FROM posthog_team
-        """
-
-        params = []
-        if last_sync:
-            query += " WHERE updated_at > %s"
-            params.append(last_sync)
-
-        query += " ORDER BY updated_at ASC"
-
-        cursor.execute(query, params)
-        cursor.itersize = batch_size  # Configure batch size for server-side cursor
-
-        while True:
-            batch = cursor.fetchmany(batch_size)
-            if not batch:
-                break
-            yield batch
-    finally:
-        cursor.close()
+    query = """
+        SELECT
+            id,
+            uuid,
+            organization_id,
+            parent_team_id,
+            project_id,
+            api_token,
+            app_urls,
+            name,
+            slack_incoming_webhook,
+            created_at,
+            updated_at,
+            anonymize_ips,
+            completed_snippet_onboarding,
+            has_completed_onboarding_for,
+            onboarding_tasks,
+            ingested_event,
+            autocapture_opt_out,
+            autocapture_web_vitals_opt_in,
+            autocapture_web_vitals_allowed_metrics,
+            autocapture_exceptions_opt_in,
+            autocapture_exceptions_errors_to_ignore,
+            person_processing_opt_out,
+            secret_api_token,
+            secret_api_token_backup,
+            session_recording_opt_in,
+            session_recording_sample_rate,
+            session_recording_minimum_duration_milliseconds,
+            session_recording_linked_flag,
+            session_recording_network_payload_capture_config,
+            session_recording_masking_config,
+            session_recording_url_trigger_config,
+            session_recording_url_blocklist_config,
+            session_recording_event_trigger_config,
+            session_recording_trigger_match_type_config,
+            session_replay_config,
+            survey_config,
+            capture_console_log_opt_in,
+            capture_performance_opt_in,
+            capture_dead_clicks,
+            surveys_opt_in,
+            heatmaps_opt_in,
+            flags_persistence_default,
+            feature_flag_confirmation_enabled,
+            feature_flag_confirmation_message,
+            session_recording_version,
+            signup_token,
+            is_demo,
+            access_control,
+            week_start_day,
+            inject_web_apps,
+            test_account_filters,
+            test_account_filters_default_checked,
+            path_cleaning_filters,
+            timezone,
+            data_attributes,
+            person_display_name_properties,
+            live_events_columns,
+            recording_domains,
+            human_friendly_comparison_periods,
+            cookieless_server_hash_mode,
+            primary_dashboard_id,
+            default_data_theme,
+            extra_settings,
+            modifiers,
+            correlation_config,
+            session_recording_retention_period_days,
+            plugins_opt_in,
+            opt_out_capture,
+            event_names,
+            event_names_with_usage,
+            event_properties,
+            event_properties_with_usage,
+            event_properties_numerical,
+            external_data_workspace_id,
+            external_data_workspace_last_synced_at,
+            api_query_rate_limit,
+            revenue_tracking_config,
+            drop_events_older_than,
+            base_currency
+        FROM posthog_team
+    """
+    yield from fetch_in_keyset_batches(conn, query, last_sync, batch_size)
 
 
 def fetch_teams(conn, last_sync: Optional[datetime] = None, batch_size: int = 10000) -> list[dict]:
@@ -601,58 +603,112 @@ def transform_team_row(row: dict) -> dict:
     return row
 
 
-def insert_organizations_to_clickhouse(organizations: list[dict], batch_size: int = 10000) -> int:
-    """Insert organizations into ClickHouse."""
-    if not organizations:
-        return 0
-
-    # Transform the data
-    transformed = [transform_organization_row(org) for org in organizations]
-
-    # Prepare data for insertion
-    columns = list(transformed[0].keys())
+def insert_rows_to_clickhouse(table: str, rows: list[dict], batch_size: int = 10000) -> int:
+    """Insert transformed rows into a ClickHouse table, passing them in columnar form."""
+    columns = list(rows[0].keys())
 
     # Insert in batches
     total_inserted = 0
-    for i in range(0, len(transformed), batch_size):
-        batch = transformed[i : i + batch_size]
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i : i + batch_size]
 
-        # ClickHouse requires passing data as list of tuples
-        data = [tuple(row.get(col) for col in columns) for row in batch]
+        # One list of values per column, which is cheaper for the client to serialize than a tuple per row
+        data = [[row.get(col) for row in batch] for col in columns]
 
-        query = f"INSERT INTO models.posthog_organization ({', '.join(columns)}) VALUES"
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES"
 
-        sync_execute(query, data, with_column_types=False)
+        sync_execute(query, data, with_column_types=False, columnar=True)
         total_inserted += len(batch)
 
     return total_inserted
 
 
-def insert_teams_to_clickhouse(teams: list[dict], batch_size: int = 10000) -> int:
-    """Insert teams into ClickHouse."""
-    if not teams:
+@dataclass
+class StreamStats:
+    """Track the batches streamed from Postgres to ClickHouse."""
+
+    rows: int = 0
+    batches: int = 0
+    last_updated: Optional[datetime] = None
+    # Time spent waiting for Postgres after the previous batch was inserted, and inserting into ClickHouse
+    fetch_wait_seconds: float = 0.0
+    insert_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        total_seconds = self.fetch_wait_seconds + self.insert_seconds
+        return self.rows / total_seconds if total_seconds else 0.0
+
+
+def stream_batches_to_clickhouse(
+    context: Union[OpExecutionContext, AssetExecutionContext],
+    batches: Iterator[list[dict]],
+    insert: Callable[[list[dict]], int],
+    entity_name: str,
+) -> StreamStats:
+    """Insert batches into ClickHouse while the next batch is fetched from Postgres.
+
+    At most two batches are held in memory, the one being inserted and the one being fetched, so memory doesn't grow
+    with the size of the table.
+    """
+    stats = StreamStats()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_batch = executor.submit(next, batches, None)
+        while True:
+            wait_start = time.monotonic()
+            batch = next_batch.result()
+            fetch_wait_seconds = time.monotonic() - wait_start
+            if batch is None:
+                break
+
+            next_batch = executor.submit(next, batches, None)
+            if not batch:
+                continue
+
+            stats.batches += 1
+            # Read before inserting, as the rows are transformed in place
+            batch_last_updated = max(row["updated_at"] for row in batch)
+
+            insert_start = time.monotonic()
+            rows_inserted = insert(batch)
+            insert_seconds = time.monotonic() - insert_start
+
+            stats.rows += rows_inserted
+            stats.fetch_wait_seconds += fetch_wait_seconds
+            stats.insert_seconds += insert_seconds
+            if stats.last_updated is None or batch_last_updated > stats.last_updated:
+                stats.last_updated = batch_last_updated
+
+            batch_seconds = fetch_wait_seconds + insert_seconds
+            context.log.info(
+                f"Inserted batch {stats.batches} ({rows_inserted} {entity_name}) in {batch_seconds:.2f}s "
+                f"(waited {fetch_wait_seconds:.2f}s for Postgres, {insert_seconds:.2f}s inserting, "
+                f"{rows_inserted / batch_seconds if batch_seconds else 0:.0f} rows/s). Total so far: {stats.rows}"
+            )
+
+    return stats
+
+
+def insert_organizations_to_clickhouse(organizations: list[dict], batch_size: int = 10000) -> int:
+    """Insert organizations into ClickHouse."""
+    if not organizations:
         return 0
 
     # Transform the data
-    transformed = [transform_team_row(team) for team in teams]
-
-    # Prepare data for insertion
-    columns = list(transformed[0].keys())
+    transformed = [transform_organization_row(org) for org in organizations]
 
-    # Insert in batches
-    total_inserted = 0
-    for i in range(0, len(transformed), batch_size):
-        batch = transformed[i : i + batch_size]
+    return insert_rows_to_clickhouse("models.posthog_organization", transformed, batch_size=batch_size)
 
-        # ClickHouse requires passing data as list of tuples
-        data = [tuple(row.get(col) for col in columns) for row in batch]
 
-        query = f"INSERT INTO models.posthog_team ({', '.join(columns)}) VALUES"
+def insert_teams_to_clickhouse(teams: list[dict], batch_size: int = 10000) -> int:
+    """Insert teams into ClickHouse."""
+    if not teams:
+        return 0
 
-        sync_execute(query, data, with_column_types=False)
-        total_inserted += len(batch)
+    # Transform the data
+    transformed = [transform_team_row(team) for team in teams]
 
-    return total_inserted
+    return insert_rows_to_clickhouse("models.posthog_team", transformed, batch_size=batch_size)
 
 
 @op(retry_policy=etl_retry_policy)
@@ -689,30 +745,20 @@ def sync_organizations(
     # Connect to Postgres and fetch/insert data in streaming batches
     pg_conn = get_postgres_connection()
     try:
-        total_rows = 0
-        last_updated = None
-        batch_num = 0
-
-        # Process data in streaming fashion to avoid memory issues
-        for batch in fetch_organizations_in_batches(pg_conn, last_sync=last_sync, batch_size=config.batch_size):
-            batch_num += 1
-            if batch:
-                context.log.info(f"Processing batch {batch_num} with {len(batch)} organizations")
-
-                # Insert this batch into ClickHouse
-                rows_inserted = insert_organizations_to_clickhouse(batch, batch_size=config.batch_size)
-                total_rows += rows_inserted
-
-                # Track the latest timestamp for state
-                batch_last_updated = max(org["updated_at"] for org in batch)
-                if last_updated is None or batch_last_updated > last_updated:
-                    last_updated = batch_last_updated
-
-                context.log.info(f"Inserted batch {batch_num} ({rows_inserted} rows). Total so far: {total_rows}")
+        # Process data in streaming fashion to avoid memory issues, inserting a batch while the next one is fetched
+        stats = stream_batches_to_clickhouse(
+            context,
+            fetch_organizations_in_batches(pg_conn, last_sync=last_sync, batch_size=config.batch_size),
+            lambda batch: insert_organizations_to_clickhouse(batch, batch_size=config.batch_size),
+            "organizations",
+        )
 
-        state.rows_synced = total_rows
-        state.last_sync_timestamp = last_updated
-        context.log.info(f"Completed sync: inserted {total_rows} organizations into ClickHouse")
+        state.rows_synced = stats.rows
+        state.last_sync_timestamp = stats.last_updated
+        context.log.info(
+            f"Completed sync: inserted {stats.rows} organizations into ClickHouse "
+            f"in {stats.batches} batches ({stats.rows_per_second:.0f} rows/s)"
+        )
 
     except Exception as e:
         state.errors.append(f"Error syncing organizations: {str(e)}")
@@ -729,6 +775,8 @@ def sync_organizations(
                 str(state.last_sync_timestamp) if state.last_sync_timestamp else "N/A"
             ),
             "full_refresh": MetadataValue.bool(config.full_refresh),
+            "batches": MetadataValue.int(stats.batches),
+            "rows_per_second": MetadataValue.float(stats.rows_per_second),
         }
     )
 
@@ -769,30 +817,20 @@ def sync_teams(
     # Connect to Postgres and fetch/insert data in streaming batches
     pg_conn = get_postgres_connection()
     try:
-        total_rows = 0
-        last_updated = None
-        batch_num = 0
-
-        # Process data in streaming fashion to avoid memory issues
-        for batch in fetch_teams_in_batches(pg_conn, last_sync=last_sync, batch_size=config.batch_size):
-            batch_num += 1
-            if batch:
-                context.log.info(f"Processing batch {batch_num} with {len(batch)} teams")
-
-                # Insert this batch into ClickHouse
-                rows_inserted = insert_teams_to_clickhouse(batch, batch_size=config.batch_size)
-                total_rows += rows_inserted
-
-                # Track the latest timestamp for state
-                batch_last_updated = max(team["updated_at"] for team in batch)
-                if last_updated is None or batch_last_updated > last_updated:
-                    last_updated = batch_last_updated
-
-                context.log.info(f"Inserted batch {batch_num} ({rows_inserted} rows). Total so far: {total_rows}")
+        # Process data in streaming fashion to avoid memory issues, inserting a batch while the next one is fetched
+        stats = stream_batches_to_clickhouse(
+            context,
+            fetch_teams_in_batches(pg_conn, last_sync=last_sync, batch_size=config.batch_size),
+            lambda batch: insert_teams_to_clickhouse(batch, batch_size=config.batch_size),
+            "teams",
+        )
 
-        state.rows_synced = total_rows
-        state.last_sync_timestamp = last_updated
-        context.log.info(f"Completed sync: inserted {total_rows} teams into ClickHouse")
+        state.rows_synced = stats.rows
+        state.last_sync_timestamp = stats.last_updated
+        context.log.info(
+            f"Completed sync: inserted {stats.rows} teams into ClickHouse "
+            f"in {stats.batches} batches ({stats.rows_per_second:.0f} rows/s)"
+        )
 
     except Exception as e:
         state.errors.append(f"Error syncing teams: {str(e)}")
@@ -809,6 +847,8 @@ def sync_teams(
                 str(state.last_sync_timestamp) if state.last_sync_timestamp else "N/A"
             ),
             "full_refresh": MetadataValue.bool(config.full_refresh),
+            "batches": MetadataValue.int(stats.batches),
+            "rows_per_second": MetadataValue.float(stats.rows_per_second),
         }
     )
 
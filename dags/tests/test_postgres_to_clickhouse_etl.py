@@ -1,6 +1,7 @@
 """Tests for the Postgres to ClickHouse ETL pipeline."""
 
 import json
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 
@@ -13,6 +14,7 @@ from dagster import build_op_context
 from dags.postgres_to_clickhouse_etl import (
     ETLState,
     create_clickhouse_tables,
+    fetch_in_keyset_batches,
     fetch_organizations,
     fetch_teams,
     insert_organizations_to_clickhouse,
@@ -20,6 +22,7 @@ from dags.postgres_to_clickhouse_etl import (
     organizations_in_clickhouse,
     postgres_to_clickhouse_etl_job,
     postgres_to_clickhouse_hourly_schedule,
+    stream_batches_to_clickhouse,
     sync_organizations,
     sync_teams,
     teams_in_clickhouse,
@@ -117,22 +120,11 @@ class TestDatabaseOperations:
     @patch("dags.postgres_to_clickhouse_etl.psycopg2.connect")
     def test_fetch_organizations(self, mock_connect):
         """Test fetching organizations from Postgres."""
-        # Mock both named cursor and regular cursor
-        mock_named_cursor = MagicMock()
-        mock_named_cursor.fetchmany.side_effect = [[{"id": 1, "name": "Org 1", "updated_at": datetime.now()}], []]
-
-        mock_regular_cursor = MagicMock()
-        mock_regular_cursor.fetchmany.side_effect = [[{"id": 1, "name": "Org 1", "updated_at": datetime.now()}], []]
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [[{"id": 1, "name": "Org 1", "updated_at": datetime.now()}], []]
 
         mock_conn = MagicMock()
-
-        # Return named cursor when name is provided, regular cursor otherwise
-        def cursor_side_effect(name=None):
-            if name:
-                return mock_named_cursor
-            return mock_regular_cursor
-
-        mock_conn.cursor.side_effect = cursor_side_effect
+        mock_conn.cursor.return_value = mock_cursor
         mock_connect.return_value = mock_conn
 
         # Test without last_sync
@@ -140,42 +132,65 @@ class TestDatabaseOperations:
         assert len(orgs) == 1
         assert orgs[0]["name"] == "Org 1"
 
-        # Verify query was called correctly on named cursor
-        mock_named_cursor.execute.assert_called_once()
-        call_args = mock_named_cursor.execute.call_args[0]
+        # A batch smaller than the batch size is the last one
+        mock_cursor.execute.assert_called_once()
+        call_args = mock_cursor.execute.call_args[0]
         assert "SELECT" in call_args[0]
         assert "FROM posthog_organization" in call_args[0]
         assert "WHERE updated_at >" not in call_args[0]
+        assert "ORDER BY updated_at ASC, id ASC LIMIT %s" in call_args[0]
 
     @patch("dags.postgres_to_clickhouse_etl.psycopg2.connect")
     def test_fetch_organizations_incremental(self, mock_connect):
         """Test fetching organizations incrementally."""
-        mock_named_cursor = MagicMock()
-        mock_named_cursor.fetchmany.side_effect = [[{"id": 2, "name": "Org 2", "updated_at": datetime.now()}], []]
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [[{"id": 2, "name": "Org 2", "updated_at": datetime.now()}], []]
 
         mock_conn = MagicMock()
-        mock_conn.cursor.return_value = mock_named_cursor
+        mock_conn.cursor.return_value = mock_cursor
         mock_connect.return_value = mock_conn
 
         last_sync = datetime.now() - timedelta(days=1)
         _ = fetch_organizations(mock_conn, last_sync=last_sync)
 
-        # Verify incremental query on named cursor
-        mock_named_cursor.execute.assert_called_once()
-        call_args = mock_named_cursor.execute.call_args[0]
+        # Verify incremental query
+        mock_cursor.execute.assert_called_once()
+        call_args = mock_cursor.execute.call_args[0]
         assert "WHERE updated_at > %s" in call_args[0]
-        assert call_args[1] == [last_sync]
+        assert call_args[1] == [last_sync, 10000]
+
+    def test_fetch_in_keyset_batches_continues_after_last_row(self):
+        """Test that each batch starts after the last row of the previous one."""
+        first_updated_at = datetime(2024, 1, 1)
+        second_updated_at = datetime(2024, 1, 2)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [{"id": 1, "updated_at": first_updated_at}, {"id": 2, "updated_at": second_updated_at}],
+            [{"id": 3, "updated_at": second_updated_at}],
+        ]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        last_sync = datetime(2023, 12, 31)
+        batches = list(fetch_in_keyset_batches(mock_conn, "SELECT id, updated_at FROM t", last_sync, batch_size=2))
+
+        assert [[row["id"] for row in batch] for batch in batches] == [[1, 2], [3]]
+        assert mock_cursor.execute.call_count == 2
+        query, params = mock_cursor.execute.call_args[0]
+        assert "WHERE updated_at > %s AND (updated_at, id) > (%s, %s)" in query
+        assert params == [last_sync, second_updated_at, 2, 2]
+        mock_cursor.close.assert_called_once()
 
     @patch("dags.postgres_to_clickhouse_etl.psycopg2.connect")
     def test_fetch_teams(self, mock_connect):
         """Test fetching teams from Postgres."""
-        mock_named_cursor = MagicMock()
-        mock_named_cursor.fetchmany.side_effect = [
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
             [{"id": 1, "name": "Team 1", "organization_id": 1, "updated_at": datetime.now()}],
             [],
         ]
         mock_conn = MagicMock()
-        mock_conn.cursor.return_value = mock_named_cursor
+        mock_conn.cursor.return_value = mock_cursor
         mock_connect.return_value = mock_conn
 
         teams = fetch_teams(mock_conn)
@@ -257,6 +272,13 @@ class TestDatabaseOperations:
         call_args = mock_sync_execute.call_args[0]
         assert "INSERT INTO models.posthog_organization" in call_args[0]
 
+        # Rows are passed as one list of values per column
+        columns = call_args[0].split("(")[1].split(")")[0].split(", ")
+        data = dict(zip(columns, call_args[1]))
+        assert data["name"] == ["Org 1", "Org 2"]
+        assert data["is_member_join_email_enabled"] == [1, 0]
+        assert mock_sync_execute.call_args[1]["columnar"] is True
+
     @patch("dags.postgres_to_clickhouse_etl.sync_execute")
     def test_insert_teams_to_clickhouse(self, mock_sync_execute):
         """Test inserting teams into ClickHouse."""
@@ -422,6 +444,65 @@ class TestOps:
             assert len(result.errors) == 0
 
 
+class TestStreaming:
+    """Test streaming batches from Postgres to ClickHouse."""
+
+    def test_stream_batches_to_clickhouse(self):
+        """Test that every batch is inserted and the stats are tracked."""
+        batches = iter(
+            [
+                [{"id": 1, "updated_at": datetime(2024, 1, 2)}, {"id": 2, "updated_at": datetime(2024, 1, 3)}],
+                [],
+                [{"id": 3, "updated_at": datetime(2024, 1, 1)}],
+            ]
+        )
+        inserted = []
+
+        def insert(batch):
+            inserted.append([row["id"] for row in batch])
+            return len(batch)
+
+        stats = stream_batches_to_clickhouse(build_op_context(), batches, insert, "organizations")
+
+        assert inserted == [[1, 2], [3]]
+        assert stats.rows == 3
+        assert stats.batches == 2
+        assert stats.last_updated == datetime(2024, 1, 3)
+
+    def test_stream_batches_to_clickhouse_fetches_next_batch_while_inserting(self):
+        """Test that the next batch is fetched while the current one is inserted."""
+        fetched = []
+
+        def batches():
+            for batch_id in range(3):
+                fetched.append(batch_id)
+                yield [{"id": batch_id, "updated_at": datetime(2024, 1, 1)}]
+
+        def insert(batch):
+            # Give the prefetch a chance to run before checking
+            for _ in range(100):
+                if len(fetched) > batch[0]["id"] + 1 or len(fetched) == 3:
+                    break
+                time.sleep(0.01)
+            assert len(fetched) == min(batch[0]["id"] + 2, 3)
+            return len(batch)
+
+        stats = stream_batches_to_clickhouse(build_op_context(), batches(), insert, "organizations")
+
+        assert stats.rows == 3
+
+    def test_stream_batches_to_clickhouse_propagates_insert_errors(self):
+        """Test that an insert failure fails the stream."""
+
+        def insert(batch):
+            raise Exception("Insert failed")
+
+        with pytest.raises(Exception, match="Insert failed"):
+            stream_batches_to_clickhouse(
+                build_op_context(), iter([[{"id": 1, "updated_at": datetime(2024, 1, 1)}]]), insert, "organizations"
+            )
+
+
 class TestErrorHandling:
     """Test error handling in the ETL pipeline."""
 
@@ -1,11 +1,12 @@
 import copy
-from collections.abc import Mapping, Sequence
-from datetime import datetime, timedelta
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Any, Optional, TypedDict, cast
 
 from django.conf import settings
-from django.db import close_old_connections
+from django.db import close_old_connections, connection
 from django.db.models import Q
 from django.utils import timezone
 
@@ -117,6 +118,32 @@ class UsageCounters(TypedDict):
     rows_exported: int
 
 
+USAGE_COUNTERS_FIELDS: list[str] = list(UsageCounters.__annotations__)
+
+QUOTA_LIMITING_TEAM_FIELDS = (
+    "id",
+    "api_token",
+    "organization__id",
+    "organization__usage",
+    "organization__created_at",
+    "organization__never_drop_data",
+)
+
+# The usage queries are independent, so they run at the same time
+QUOTA_USAGE_QUERY_CONCURRENCY = 4
+
+# The usage counters of the current day, kept by the incremental evaluation in between the full passes
+QUOTA_USAGE_COUNTERS_KEY = "@posthog/quota-usage-counters/"
+QUOTA_USAGE_COUNTED_UNTIL_KEY = "@posthog/quota-usage-counted-until/"
+QUOTA_USAGE_COUNTERS_TTL = timedelta(days=2)
+# The most recent usage is left to the next run, as part of it isn't ingested yet
+QUOTA_USAGE_COUNTERS_LAG = timedelta(minutes=2)
+# Held by the full pass and by the incremental evaluation, so that they never update the counters at the same time
+QUOTA_USAGE_COUNTERS_LOCK_KEY = "@posthog/quota-usage-counters-lock"
+QUOTA_LIMITING_FULL_PASS_TIMEOUT = timedelta(minutes=60)
+QUOTA_LIMITING_INCREMENTAL_TIMEOUT = timedelta(minutes=10)
+
+
 # -------------------------------------------------------------------------------------------------
 # REDIS FUNCTIONS
 # -------------------------------------------------------------------------------------------------
@@ -168,6 +195,68 @@ def list_limited_team_attributes(resource: QuotaResource, cache_key: QuotaLimiti
     return [x.decode("utf-8") for x in results]
 
 
+# The usage counters are stored in a hash per day, with a field per team and counter.
+# E.g. key: @posthog/quota-usage-counters/2025-01-26, value: {"2:events": 1000, "2:recordings": 10}
+# E.g. key: @posthog/quota-usage-counted-until/2025-01-26, value: "2025-01-26T10:58:00+00:00"
+
+
+def _usage_counters_keys(period_start: datetime) -> tuple[str, str]:
+    day = period_start.strftime("%Y-%m-%d")
+    return f"{QUOTA_USAGE_COUNTERS_KEY}{day}", f"{QUOTA_USAGE_COUNTED_UNTIL_KEY}{day}"
+
+
+def replace_usage_counters(
+    period_start: datetime, teams_usage: Mapping[int, UsageCounters], counted_until: datetime
+) -> None:
+    """
+    Replaces the usage counters of the day with the usage counted until the given time.
+    """
+    counters_key, counted_until_key = _usage_counters_keys(period_start)
+    counters = {
+        f"{team_id}:{field}": value for team_id, usage in teams_usage.items() for field, value in usage.items() if value
+    }
+    pipe = get_client().pipeline()
+    pipe.delete(counters_key)
+    if counters:
+        pipe.hset(counters_key, mapping=counters)  # type: ignore
+        pipe.expire(counters_key, QUOTA_USAGE_COUNTERS_TTL)
+    pipe.set(counted_until_key, counted_until.isoformat(), ex=QUOTA_USAGE_COUNTERS_TTL)
+    pipe.execute()
+
+
+def add_usage_counters(
+    period_start: datetime, teams_usage: Mapping[int, UsageCounters], counted_until: datetime
+) -> None:
+    """
+    Adds the usage counted since the last update to the usage counters of the day.
+    """
+    counters_key, counted_until_key = _usage_counters_keys(period_start)
+    pipe = get_client().pipeline()
+    for team_id, usage in teams_usage.items():
+        for field, value in usage.items():
+            if value:
+                pipe.hincrby(counters_key, f"{team_id}:{field}", value)  # type: ignore
+    pipe.expire(counters_key, QUOTA_USAGE_COUNTERS_TTL)
+    pipe.set(counted_until_key, counted_until.isoformat(), ex=QUOTA_USAGE_COUNTERS_TTL)
+    pipe.execute()
+
+
+def get_usage_counters_counted_until(period_start: datetime) -> Optional[datetime]:
+    _, counted_until_key = _usage_counters_keys(period_start)
+    counted_until = get_client().get(counted_until_key)
+    return datetime.fromisoformat(counted_until.decode("utf-8")) if counted_until else None
+
+
+def get_usage_counters(period_start: datetime, team_ids: Sequence[int]) -> dict[int, UsageCounters]:
+    counters_key, _ = _usage_counters_keys(period_start)
+    fields = [f"{team_id}:{field}" for team_id in team_ids for field in USAGE_COUNTERS_FIELDS]
+    values = iter(get_client().hmget(counters_key, fields) if fields else [])
+    return {
+        team_id: cast(UsageCounters, {field: int(next(values) or 0) for field in USAGE_COUNTERS_FIELDS})
+        for team_id in team_ids
+    }
+
+
 # -------------------------------------------------------------------------------------------------
 # MAIN FUNCTIONS
 # -------------------------------------------------------------------------------------------------
@@ -576,91 +665,74 @@ def set_org_usage_summary(
     return has_changed
 
 
-def update_all_orgs_billing_quotas(
-    dry_run: bool = False,
-) -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]]:
-    """
-    This is called on a cron job every 30 minutes to update all orgs with their quotas.
-    Specifically it's update quota_limited_until and quota_limiting_suspended_until in their usage
-    field on the Organization model.
-
-    # Start and end of the current day
-    """
-    period = get_current_day()
-    period_start, period_end = period
+def _run_usage_query(query: Callable[[], list]) -> list:
+    try:
+        return query()
+    finally:
+        # Each thread has its own connection, which isn't closed by the request or task it runs in
+        connection.close()
 
-    api_queries_usage = get_teams_with_api_queries_metrics(period_start, period_end)
 
-    # Clickhouse is good at counting things so we count across all teams rather than doing it one by one
-    all_data = {
-        "teams_with_event_count_in_period": convert_team_usage_rows_to_dict(
-            get_teams_with_billable_event_count_in_period(period_start, period_end)
-        ),
-        "teams_with_exceptions_captured_in_period": convert_team_usage_rows_to_dict(
-            get_teams_with_exceptions_captured_in_period(period_start, period_end)
-        ),
-        "teams_with_recording_count_in_period": convert_team_usage_rows_to_dict(
-            get_teams_with_recording_count_in_period(period_start, period_end)
-        ),
-        "teams_with_rows_synced_in_period": convert_team_usage_rows_to_dict(
-            get_teams_with_rows_synced_in_period(period_start, period_end)
-        ),
-        "teams_with_decide_requests_count": convert_team_usage_rows_to_dict(
-            get_teams_with_feature_flag_requests_count_in_period(period_start, period_end, FlagRequestType.DECIDE)
-        ),
-        "teams_with_local_evaluation_requests_count": convert_team_usage_rows_to_dict(
-            get_teams_with_feature_flag_requests_count_in_period(
-                period_start, period_end, FlagRequestType.LOCAL_EVALUATION
-            )
-        ),
-        "teams_with_api_queries_read_bytes": convert_team_usage_rows_to_dict(api_queries_usage["read_bytes"]),
-        "teams_with_cdp_trigger_events_metrics": convert_team_usage_rows_to_dict(
-            get_teams_with_cdp_billable_invocations_in_period(period_start, period_end)
-        ),
-        "teams_with_rows_exported_in_period": convert_team_usage_rows_to_dict(
-            get_teams_with_rows_exported_in_period(period_start, period_end)
+def get_teams_usage_in_period(begin: datetime, end: datetime) -> dict[int, UsageCounters]:
+    """
+    Returns the usage of the teams with any usage in the period.
+    """
+    queries: dict[str, Callable[[], list]] = {
+        "teams_with_event_count_in_period": lambda: get_teams_with_billable_event_count_in_period(begin, end),
+        "teams_with_exceptions_captured_in_period": lambda: get_teams_with_exceptions_captured_in_period(begin, end),
+        "teams_with_recording_count_in_period": lambda: get_teams_with_recording_count_in_period(begin, end),
+        "teams_with_rows_synced_in_period": lambda: get_teams_with_rows_synced_in_period(begin, end),
+        "teams_with_decide_requests_count": lambda: get_teams_with_feature_flag_requests_count_in_period(
+            begin, end, FlagRequestType.DECIDE
         ),
-        "teams_with_survey_responses_count_in_period": convert_team_usage_rows_to_dict(
-            get_teams_with_survey_responses_count_in_period(period_start, period_end)
+        "teams_with_local_evaluation_requests_count": lambda: get_teams_with_feature_flag_requests_count_in_period(
+            begin, end, FlagRequestType.LOCAL_EVALUATION
         ),
-        "teams_with_ai_event_count_in_period": convert_team_usage_rows_to_dict(
-            get_teams_with_ai_event_count_in_period(period_start, period_end)
+        "teams_with_api_queries_read_bytes": lambda: get_teams_with_api_queries_metrics(begin, end)["read_bytes"],
+        "teams_with_cdp_trigger_events_metrics": lambda: get_teams_with_cdp_billable_invocations_in_period(begin, end),
+        "teams_with_rows_exported_in_period": lambda: get_teams_with_rows_exported_in_period(begin, end),
+        "teams_with_survey_responses_count_in_period": lambda: get_teams_with_survey_responses_count_in_period(
+            begin, end
         ),
+        "teams_with_ai_event_count_in_period": lambda: get_teams_with_ai_event_count_in_period(begin, end),
     }
 
-    teams: Sequence[Team] = list(
-        Team.objects.select_related("organization")
-        .exclude(Q(organization__for_internal_metrics=True) | Q(is_demo=True))
-        .only(
-            "id",
-            "api_token",
-            "organization__id",
-            "organization__usage",
-            "organization__created_at",
-            "organization__never_drop_data",
+    with ThreadPoolExecutor(max_workers=QUOTA_USAGE_QUERY_CONCURRENCY) as executor:
+        futures = {key: executor.submit(_run_usage_query, query) for key, query in queries.items()}
+        rows = {key: future.result() for key, future in futures.items()}
+
+    all_data = {key: convert_team_usage_rows_to_dict(key_rows) for key, key_rows in rows.items()}
+
+    teams_usage: dict[int, UsageCounters] = {}
+    for team_id in set().union(*all_data.values()):
+        decide_requests = all_data["teams_with_decide_requests_count"].get(team_id, 0)
+        local_evaluation_requests = all_data["teams_with_local_evaluation_requests_count"].get(team_id, 0)
+
+        teams_usage[team_id] = UsageCounters(
+            events=all_data["teams_with_event_count_in_period"].get(team_id, 0),
+            exceptions=all_data["teams_with_exceptions_captured_in_period"].get(team_id, 0),
+            recordings=all_data["teams_with_recording_count_in_period"].get(team_id, 0),
+            rows_synced=all_data["teams_with_rows_synced_in_period"].get(team_id, 0),
+            feature_flags=decide_requests + (local_evaluation_requests * 10),  # Same weighting as in _get_team_report
+            api_queries_read_bytes=all_data["teams_with_api_queries_read_bytes"].get(team_id, 0),
+            survey_responses=all_data["teams_with_survey_responses_count_in_period"].get(team_id, 0),
+            llm_events=all_data["teams_with_ai_event_count_in_period"].get(team_id, 0),
+            cdp_trigger_events=all_data["teams_with_cdp_trigger_events_metrics"].get(team_id, 0),
+            rows_exported=all_data["teams_with_rows_exported_in_period"].get(team_id, 0),
         )
-    )
 
+    return teams_usage
+
+
+def _sum_usage_by_org(
+    teams: Sequence[Team], teams_usage: Mapping[int, UsageCounters]
+) -> tuple[dict[str, UsageCounters], dict[str, Organization]]:
     todays_usage_report: dict[str, UsageCounters] = {}
     orgs_by_id: dict[str, Organization] = {}
 
     # we iterate through all teams, and add their usage to the organization they belong to
     for team in teams:
-        decide_requests = all_data["teams_with_decide_requests_count"].get(team.id, 0)
-        local_evaluation_requests = all_data["teams_with_local_evaluation_requests_count"].get(team.id, 0)
-
-        team_report = UsageCounters(
-            events=all_data["teams_with_event_count_in_period"].get(team.id, 0),
-            exceptions=all_data["teams_with_exceptions_captured_in_period"].get(team.id, 0),
-            recordings=all_data["teams_with_recording_count_in_period"].get(team.id, 0),
-            rows_synced=all_data["teams_with_rows_synced_in_period"].get(team.id, 0),
-            feature_flags=decide_requests + (local_evaluation_requests * 10),  # Same weighting as in _get_team_report
-            api_queries_read_bytes=all_data["teams_with_api_queries_read_bytes"].get(team.id, 0),
-            survey_responses=all_data["teams_with_survey_responses_count_in_period"].get(team.id, 0),
-            llm_events=all_data["teams_with_ai_event_count_in_period"].get(team.id, 0),
-            cdp_trigger_events=all_data["teams_with_cdp_trigger_events_metrics"].get(team.id, 0),
-            rows_exported=all_data["teams_with_rows_exported_in_period"].get(team.id, 0),
-        )
+        team_report = teams_usage.get(team.id) or cast(UsageCounters, dict.fromkeys(USAGE_COUNTERS_FIELDS, 0))
 
         org_id = str(team.organization.id)
 
@@ -672,23 +744,24 @@ def update_all_orgs_billing_quotas(
             for field in team_report:
                 org_report[field] += team_report[field]  # type: ignore
 
-    # Now we have the usage for all orgs for the current day
-    # orgs_by_id is a dict of orgs by id (e.g. {"018e9acf-b488-0000-259c-534bcef40359": <Organization: 018e9acf-b488-0000-259c-534bcef40359>})
-    # todays_usage_report is a dict of orgs by id with their usage for the current day (e.g. {"018e9acf-b488-0000-259c-534bcef40359": {"events": 100, "exceptions": 100, "recordings": 100, "rows_synced": 100, "feature_flag_requests": 100, "api_queries_read_bytes": 100, "survey_responses": 100}})
-    quota_limited_orgs: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
-    quota_limiting_suspended_orgs: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
+    return todays_usage_report, orgs_by_id
 
-    # Get the current quota limits so we can track to PostHog if it changes
-    orgs_with_changes = set()
-    previously_quota_limited_team_tokens: dict[str, list[str]] = {x.value: [] for x in QuotaResource}
 
+def _previously_quota_limited_team_tokens() -> dict[str, list[str]]:
     # All teams that are currently under quota limits
-    for resource in QuotaResource:
-        previously_quota_limited_team_tokens[resource.value] = list_limited_team_attributes(
-            resource, QuotaLimitingCaches.QUOTA_LIMITER_CACHE_KEY
-        )
-    # We have the teams that are currently under quota limits
-    # previously_quota_limited_team_tokens is a dict of resources to team tokens from redis (e.g. {"events": ["phc_123", "phc_456"], "exceptions": ["phc_123", "phc_456"], "recordings": ["phc_123", "phc_456"], "rows_synced": ["phc_123", "phc_456"], "feature_flag_requests": ["phc_123", "phc_456"], "api_queries_read_bytes": ["phc_123", "phc_456"], "survey_responses": ["phc_123", "phc_456"]})
+    return {
+        resource.value: list_limited_team_attributes(resource, QuotaLimitingCaches.QUOTA_LIMITER_CACHE_KEY)
+        for resource in QuotaResource
+    }
+
+
+def _evaluate_orgs_quota_limits(
+    todays_usage_report: Mapping[str, UsageCounters],
+    orgs_by_id: Mapping[str, Organization],
+    previously_quota_limited_team_tokens: Mapping[str, list[str]],
+) -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]]:
+    quota_limited_orgs: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
+    quota_limiting_suspended_orgs: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
 
     # Find all orgs that should be rate limited
     report_index = 1
@@ -724,14 +797,19 @@ def update_all_orgs_billing_quotas(
         except Exception as e:
             capture_exception(e, {"organization_id": org_id})
 
-    # Now we have the teams that are currently under quota limits
-    # quota_limited_orgs is a dict of resources to org ids (e.g. {"events": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "exceptions": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "recordings": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "rows_synced": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "feature_flag_requests": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "api_queries_read_bytes": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "survey_responses": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}})
-    # quota_limiting_suspended_orgs is a dict of resources to org ids (e.g. {"events": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "exceptions": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "recordings": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "rows_synced": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "feature_flag_requests": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "api_queries_read_bytes": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "survey_responses": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}})
+    return quota_limited_orgs, quota_limiting_suspended_orgs
+
 
+def _quota_limited_teams(
+    teams: Sequence[Team],
+    quota_limited_orgs: Mapping[str, Mapping[str, int]],
+    quota_limiting_suspended_orgs: Mapping[str, Mapping[str, int]],
+    previously_quota_limited_team_tokens: Mapping[str, list[str]],
+) -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]], set[str]]:
     quota_limited_teams: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
     quota_limiting_suspended_teams: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
+    orgs_with_changes = set()
 
-    # Convert the org ids to team tokens
     for team in teams:
         for field in quota_limited_orgs:
             org_id = str(team.organization.id)
@@ -748,10 +826,14 @@ def update_all_orgs_billing_quotas(
                 if team.api_token in previously_quota_limited_team_tokens[field]:
                     orgs_with_changes.add(org_id)
 
-    # Now we have the teams that are currently under quota limits
-    # quota_limited_teams is a dict of resources to team tokens (e.g. {"events": {"phc_123": 1737867600}, "exceptions": {"phc_123": 1737867600}, "recordings": {"phc_123": 1737867600}, "rows_synced": {"phc_123": 1737867600}, "feature_flag_requests": {"phc_123": 1737867600}, "api_queries_read_bytes": {"phc_123": 1737867600}, "survey_responses": {"phc_123": 1737867600}})
-    # quota_limiting_suspended_teams is a dict of resources to team tokens (e.g. {"events": {"phc_123": 1737867600}, "exceptions": {"phc_123": 1737867600}, "recordings": {"phc_123": 1737867600}, "rows_synced": {"phc_123": 1737867600}, "feature_flag_requests": {"phc_123": 1737867600}, "api_queries_read_bytes": {"phc_123": 1737867600}, "survey_responses": {"phc_123": 1737867600}})
+    return quota_limited_teams, quota_limiting_suspended_teams, orgs_with_changes
 
+
+def _report_quota_limits_changes(
+    orgs_with_changes: set[str],
+    orgs_by_id: Mapping[str, Organization],
+    quota_limited_orgs: Mapping[str, Mapping[str, int]],
+) -> None:
     for org_id in orgs_with_changes:
         properties = {
             "quota_limited_events": quota_limited_orgs["events"].get(org_id, None),
@@ -773,6 +855,93 @@ def update_all_orgs_billing_quotas(
             group_properties=properties,
         )
 
+
+def _usage_counted_until(period_start: datetime, period_end: datetime) -> datetime:
+    # The watermark the incremental evaluation counts the usage up to, the most recent usage being left to its next run
+    return max(period_start, min(datetime.now(UTC) - QUOTA_USAGE_COUNTERS_LAG, period_end))
+
+
+def _subtract_usage(
+    teams_usage: Mapping[int, UsageCounters], usage_to_subtract: Mapping[int, UsageCounters]
+) -> dict[int, UsageCounters]:
+    no_usage = cast(UsageCounters, dict.fromkeys(USAGE_COUNTERS_FIELDS, 0))
+    return {
+        team_id: cast(
+            UsageCounters,
+            {
+                field: teams_usage.get(team_id, no_usage)[field] - usage_to_subtract.get(team_id, no_usage)[field]  # type: ignore
+                for field in USAGE_COUNTERS_FIELDS
+            },
+        )
+        for team_id in {*teams_usage, *usage_to_subtract}
+    }
+
+
+def update_all_orgs_billing_quotas(
+    dry_run: bool = False,
+) -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]]:
+    """
+    This is called on a cron job every 30 minutes to update all orgs with their quotas.
+    Specifically it's update quota_limited_until and quota_limiting_suspended_until in their usage
+    field on the Organization model.
+
+    # Start and end of the current day
+    """
+    if dry_run:
+        return _update_all_orgs_billing_quotas(dry_run=True)
+
+    # Waits for a running incremental evaluation, which would add its usage to the counters replaced by this pass
+    with get_client().lock(
+        QUOTA_USAGE_COUNTERS_LOCK_KEY,
+        timeout=QUOTA_LIMITING_FULL_PASS_TIMEOUT.total_seconds(),
+        blocking_timeout=QUOTA_LIMITING_INCREMENTAL_TIMEOUT.total_seconds(),
+    ):
+        return _update_all_orgs_billing_quotas(dry_run=False)
+
+
+def _update_all_orgs_billing_quotas(dry_run: bool) -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]]:
+    period_start, period_end = get_current_day()
+
+    # Clickhouse is good at counting things so we count across all teams rather than doing it one by one
+    teams_usage = get_teams_usage_in_period(period_start, period_end)
+
+    teams: Sequence[Team] = list(
+        Team.objects.select_related("organization")
+        .exclude(Q(organization__for_internal_metrics=True) | Q(is_demo=True))
+        .only(*QUOTA_LIMITING_TEAM_FIELDS)
+    )
+
+    todays_usage_report, orgs_by_id = _sum_usage_by_org(teams, teams_usage)
+
+    # Now we have the usage for all orgs for the current day
+    # orgs_by_id is a dict of orgs by id (e.g. {"018e9acf-b488-0000-259c-534bcef40359": <Organization: 018e9acf-b488-0000-259c-534bcef40359>})
+    # todays_usage_report is a dict of orgs by id with their usage for the current day (e.g. {"018e9acf-b488-0000-259c-534bcef40359": {"events": 100, "exceptions": 100, "recordings": 100, "rows_synced": 100, "feature_flag_requests": 100, "api_queries_read_bytes": 100, "survey_responses": 100}})
+
+    # Get the current quota limits so we can track to PostHog if it changes
+    previously_quota_limited_team_tokens = _previously_quota_limited_team_tokens()
+    # We have the teams that are currently under quota limits
+    # previously_quota_limited_team_tokens is a dict of resources to team tokens from redis (e.g. {"events": ["phc_123", "phc_456"], "exceptions": ["phc_123", "phc_456"], "recordings": ["phc_123", "phc_456"], "rows_synced": ["phc_123", "phc_456"], "feature_flag_requests": ["phc_123", "phc_456"], "api_queries_read_bytes": ["phc_123", "phc_456"], "survey_responses": ["phc_123", "phc_456"]})
+
+    # Find all orgs that should be rate limited
+    quota_limited_orgs, quota_limiting_suspended_orgs = _evaluate_orgs_quota_limits(
+        todays_usage_report, orgs_by_id, previously_quota_limited_team_tokens
+    )
+
+    # Now we have the teams that are currently under quota limits
+    # quota_limited_orgs is a dict of resources to org ids (e.g. {"events": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "exceptions": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "recordings": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "rows_synced": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "feature_flag_requests": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "api_queries_read_bytes": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "survey_responses": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}})
+    # quota_limiting_suspended_orgs is a dict of resources to org ids (e.g. {"events": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "exceptions": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "recordings": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "rows_synced": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "feature_flag_requests": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "api_queries_read_bytes": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}, "survey_responses": {"018e9acf-b488-0000-259c-534bcef40359": 1737867600}})
+
+    # Convert the org ids to team tokens
+    quota_limited_teams, quota_limiting_suspended_teams, orgs_with_changes = _quota_limited_teams(
+        teams, quota_limited_orgs, quota_limiting_suspended_orgs, previously_quota_limited_team_tokens
+    )
+
+    # Now we have the teams that are currently under quota limits
+    # quota_limited_teams is a dict of resources to team tokens (e.g. {"events": {"phc_123": 1737867600}, "exceptions": {"phc_123": 1737867600}, "recordings": {"phc_123": 1737867600}, "rows_synced": {"phc_123": 1737867600}, "feature_flag_requests": {"phc_123": 1737867600}, "api_queries_read_bytes": {"phc_123": 1737867600}, "survey_responses": {"phc_123": 1737867600}})
+    # quota_limiting_suspended_teams is a dict of resources to team tokens (e.g. {"events": {"phc_123": 1737867600}, "exceptions": {"phc_123": 1737867600}, "recordings": {"phc_123": 1737867600}, "rows_synced": {"phc_123": 1737867600}, "feature_flag_requests": {"phc_123": 1737867600}, "api_queries_read_bytes": {"phc_123": 1737867600}, "survey_responses": {"phc_123": 1737867600}})
+
+    _report_quota_limits_changes(orgs_with_changes, orgs_by_id, quota_limited_orgs)
+
     if not dry_run:
         for field in quota_limited_teams:
             replace_limited_team_tokens(
@@ -784,6 +953,83 @@ def update_all_orgs_billing_quotas(
                 quota_limiting_suspended_teams[field],
                 QuotaLimitingCaches.QUOTA_LIMITING_SUSPENDED_KEY,
             )
+        # The incremental evaluation counts the usage from its watermark on, so the usage since the watermark is taken
+        # out of the counters. It's counted after the usage of the day, so that the usage ingested in between is taken
+        # out too, and counted once by the incremental evaluation. The counters of a team can be negative until then.
+        counted_until = _usage_counted_until(period_start, period_end)
+        usage_since_counted_until = get_teams_usage_in_period(counted_until, period_end)
+        replace_usage_counters(period_start, _subtract_usage(teams_usage, usage_since_counted_until), counted_until)
+
+    return quota_limited_orgs, quota_limiting_suspended_orgs
+
+
+def update_changed_orgs_billing_quotas() -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]]:
+    """
+    This is called every few minutes in between the runs of update_all_orgs_billing_quotas. The usage since the last
+    run is added to the usage counters of the day, and only the orgs of the teams with usage since are evaluated again,
+    the same way as by update_all_orgs_billing_quotas. The quota limits of the other orgs can't have changed with their
+    usage, and are left to the next full pass, as are all the orgs while a full pass is running.
+    """
+    lock = get_client().lock(QUOTA_USAGE_COUNTERS_LOCK_KEY, timeout=QUOTA_LIMITING_INCREMENTAL_TIMEOUT.total_seconds())
+    if not lock.acquire(blocking=False):
+        return {x.value: {} for x in QuotaResource}, {x.value: {} for x in QuotaResource}
+
+    try:
+        return _update_changed_orgs_billing_quotas()
+    finally:
+        lock.release()
+
+
+def _update_changed_orgs_billing_quotas() -> tuple[dict[str, dict[str, int]], dict[str, dict[str, int]]]:
+    quota_limited_orgs: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
+    quota_limiting_suspended_orgs: dict[str, dict[str, int]] = {x.value: {} for x in QuotaResource}
+
+    period_start, period_end = get_current_day()
+    # Without counters for the day yet, the usage of the whole day so far is counted
+    begin = get_usage_counters_counted_until(period_start) or period_start
+    end = _usage_counted_until(period_start, period_end)
+    if begin >= end:
+        return quota_limited_orgs, quota_limiting_suspended_orgs
+
+    usage_since_last_run = get_teams_usage_in_period(begin, end)
+    add_usage_counters(period_start, usage_since_last_run, end)
+
+    changed_team_ids = [team_id for team_id, usage in usage_since_last_run.items() if any(usage.values())]
+    if not changed_team_ids:
+        return quota_limited_orgs, quota_limiting_suspended_orgs
+
+    teams: Sequence[Team] = list(
+        Team.objects.select_related("organization")
+        .filter(organization_id__in=Team.objects.filter(id__in=changed_team_ids).values("organization_id"))
+        .exclude(Q(organization__for_internal_metrics=True) | Q(is_demo=True))
+        .only(*QUOTA_LIMITING_TEAM_FIELDS)
+    )
+
+    teams_usage = get_usage_counters(period_start, [team.id for team in teams])
+    todays_usage_report, orgs_by_id = _sum_usage_by_org(teams, teams_usage)
+
+    previously_quota_limited_team_tokens = _previously_quota_limited_team_tokens()
+    quota_limited_orgs, quota_limiting_suspended_orgs = _evaluate_orgs_quota_limits(
+        todays_usage_report, orgs_by_id, previously_quota_limited_team_tokens
+    )
+    quota_limited_teams, quota_limiting_suspended_teams, orgs_with_changes = _quota_limited_teams(
+        teams, quota_limited_orgs, quota_limiting_suspended_orgs, previously_quota_limited_team_tokens
+    )
+
+    _report_quota_limits_changes(orgs_with_changes, orgs_by_id, quota_limited_orgs)
+
+    # Only the tokens of the evaluated teams are updated, the other tokens are kept as they are
+    team_tokens = [team.api_token for team in teams]
+    for resource in QuotaResource:
+        for cache_key, limited_teams in (
+            (QuotaLimitingCaches.QUOTA_LIMITER_CACHE_KEY, quota_limited_teams[resource.value]),
+            (QuotaLimitingCaches.QUOTA_LIMITING_SUSPENDED_KEY, quota_limiting_suspended_teams[resource.value]),
+        ):
+            remove_limited_team_tokens(
+                resource, [token for token in team_tokens if token not in limited_teams], cache_key
+            )
+            if limited_teams:
+                add_limited_team_tokens(resource, limited_teams, cache_key)
 
     return quota_limited_orgs, quota_limiting_suspended_orgs
 
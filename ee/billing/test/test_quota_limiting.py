@@ -1,32 +1,39 @@
 import time
+from concurrent.futures import Future
+from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
 
 from freezegun import freeze_time
-from posthog.test.base import BaseTest, FuzzyInt, _create_event
+from posthog.test.base import BaseTest, FuzzyInt, NonAtomicBaseTest, _create_event, flush_persons_and_events
 from unittest.mock import patch
 
+from django.db import connection
 from django.utils import timezone
 from django.utils.timezone import now
 
 from dateutil.relativedelta import relativedelta
 
 from posthog.api.test.test_team import create_team
+from posthog.models.organization import Organization
 from posthog.models.team.team import Team
 from posthog.redis import get_client
 
 from ee.billing.quota_limiting import (
     QUOTA_LIMIT_DATA_RETENTION_FLAG,
+    QUOTA_USAGE_COUNTERS_LOCK_KEY,
     TRUST_SCORE_KEYS,
     QuotaLimitingCaches,
     QuotaResource,
     add_limited_team_tokens,
     get_team_attribute_by_quota_resource,
+    get_teams_usage_in_period,
     list_limited_team_attributes,
     org_quota_limited_until,
     replace_limited_team_tokens,
     set_org_usage_summary,
     update_all_orgs_billing_quotas,
+    update_changed_orgs_billing_quotas,
     update_org_billing_quotas,
 )
 from ee.clickhouse.materialized_columns.columns import materialize
@@ -36,11 +43,39 @@ def zero_trust_scores():
     return {k: 0 for k in TRUST_SCORE_KEYS.values()}
 
 
+class SynchronousExecutor:
+    """Runs the submitted calls right away, in the thread of the test and so within its transaction."""
+
+    def __init__(self, max_workers: int | None = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
 class TestQuotaLimiting(BaseTest):
     CLASS_DATA_LEVEL_SETUP = False
 
     def setUp(self) -> None:
         super().setUp()
+        # The usage queries run one after the other in the thread of the test, keeping its connection open
+        for patcher in (
+            patch("ee.billing.quota_limiting.ThreadPoolExecutor", SynchronousExecutor),
+            patch("ee.billing.quota_limiting.connection"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
         self.redis_client = get_client()
         self.redis_client.delete(f"@posthog/quota-limits/events")
         self.redis_client.delete(f"@posthog/quota-limits/exceptions")
@@ -60,6 +95,7 @@ class TestQuotaLimiting(BaseTest):
         self.redis_client.delete(f"@posthog/quota-limiting-suspended/rows_exported")
         self.redis_client.delete(f"@posthog/quota-limiting-suspended/llm_events")
         self.redis_client.delete(f"@posthog/quota-limiting-suspended/cdp_trigger_events")
+        self.redis_client.delete(QUOTA_USAGE_COUNTERS_LOCK_KEY)
         materialize("events", "$exception_values")
 
     @patch("posthoganalytics.capture")
@@ -1626,3 +1662,132 @@ class TestQuotaLimiting(BaseTest):
             # Verify analytics events were captured
             events_captured = [call[1]["event"] for call in mock_capture.call_args_list if len(call) >= 2]
             assert "org_quota_limited_until" in events_captured  # Should have suspension and removal events
+
+    @patch("posthoganalytics.capture")
+    def test_update_changed_orgs_billing_quotas(self, mock_capture) -> None:
+        usage_summary = {
+            "events": {"usage": 90, "limit": 100},
+            "period": ["2021-01-01T00:00:00Z", "2021-01-31T23:59:59Z"],
+        }
+        other_organization = Organization.objects.create(name="Other org", usage=usage_summary)
+        other_team = create_team(organization=other_organization)
+        org_id = str(self.organization.id)
+
+        with self.settings(USE_TZ=False), freeze_time("2021-01-25T12:00:00Z"):
+            self.organization.usage = usage_summary
+            self.organization.save()
+            for _ in range(0, 5):
+                _create_event(distinct_id="user", event="$event1", timestamp=now(), team=self.team)
+
+            # The full pass counts the usage of the day so far, not over the limit yet
+            quota_limited_orgs, _ = update_all_orgs_billing_quotas()
+            assert quota_limited_orgs["events"] == {}
+
+        with self.settings(USE_TZ=False), freeze_time("2021-01-25T12:10:00Z"):
+            # Only counted by the incremental evaluation
+            for _ in range(0, 10):
+                _create_event(distinct_id="user", event="$event1", timestamp="2021-01-25T12:05:00Z", team=self.team)
+            # Not counted yet, it may still be ingested
+            _create_event(distinct_id="user", event="$event1", timestamp="2021-01-25T12:09:00Z", team=self.team)
+
+            # The other org is over its limit too, but has no usage since the full pass
+            other_organization.usage = {**usage_summary, "events": {"usage": 110, "limit": 100}}
+            other_organization.save()
+
+            quota_limited_orgs, quota_limiting_suspended_orgs = update_changed_orgs_billing_quotas()
+            assert quota_limited_orgs["events"] == {org_id: 1612137599}
+            assert quota_limiting_suspended_orgs["events"] == {}
+            assert self.redis_client.zrange("@posthog/quota-limits/events", 0, -1) == [
+                self.team.api_token.encode("UTF-8")
+            ]
+            assert other_team.api_token.encode("UTF-8") not in self.redis_client.zrange(
+                "@posthog/quota-limits/events", 0, -1
+            )
+
+            self.organization.refresh_from_db()
+            assert self.organization.usage["events"]["todays_usage"] == 15
+
+            # Nothing to evaluate again without new usage
+            assert update_changed_orgs_billing_quotas()[0]["events"] == {}
+
+        with self.settings(USE_TZ=False), freeze_time("2021-01-25T12:15:00Z"):
+            # The decisions match the full pass
+            quota_limited_orgs, _ = update_all_orgs_billing_quotas()
+            assert quota_limited_orgs["events"] == {
+                org_id: 1612137599,
+                str(other_organization.id): 1612137599,
+            }
+            self.organization.refresh_from_db()
+            assert self.organization.usage["events"]["todays_usage"] == 16
+
+    @patch("posthoganalytics.capture")
+    def test_usage_ingested_while_the_full_pass_runs_is_counted_once(self, mock_capture) -> None:
+        org_id = str(self.organization.id)
+
+        with self.settings(USE_TZ=False), freeze_time("2021-01-25T12:00:00Z"):
+            self.organization.usage = {
+                "events": {"usage": 89, "limit": 100},
+                "period": ["2021-01-01T00:00:00Z", "2021-01-31T23:59:59Z"],
+            }
+            self.organization.save()
+            for _ in range(0, 5):
+                _create_event(distinct_id="user", event="$event1", timestamp="2021-01-25T11:00:00Z", team=self.team)
+            # Ingested after the pass started, but before its queries ran
+            for _ in range(0, 5):
+                _create_event(distinct_id="user", event="$event1", timestamp="2021-01-25T12:00:30Z", team=self.team)
+
+            update_all_orgs_billing_quotas()
+            self.organization.refresh_from_db()
+            assert self.organization.usage["events"]["todays_usage"] == 10
+
+        with self.settings(USE_TZ=False), freeze_time("2021-01-25T12:05:00Z"):
+            # 89 + 10 isn't over the limit, counting the events since the watermark of the full pass again would be
+            quota_limited_orgs, _ = update_changed_orgs_billing_quotas()
+            assert quota_limited_orgs["events"] == {}
+            self.organization.refresh_from_db()
+            assert self.organization.usage["events"]["todays_usage"] == 10
+
+            quota_limited_orgs, _ = update_all_orgs_billing_quotas()
+            assert quota_limited_orgs["events"] == {}
+            self.organization.refresh_from_db()
+            assert self.organization.usage["events"]["todays_usage"] == 10
+
+        with self.settings(USE_TZ=False), freeze_time("2021-01-25T12:10:00Z"):
+            _create_event(distinct_id="user", event="$event1", timestamp="2021-01-25T12:06:00Z", team=self.team)
+            quota_limited_orgs, _ = update_changed_orgs_billing_quotas()
+            assert quota_limited_orgs["events"] == {org_id: 1612137599}
+
+    @patch("posthoganalytics.capture")
+    def test_update_changed_orgs_billing_quotas_skipped_while_the_full_pass_runs(self, mock_capture) -> None:
+        with self.settings(USE_TZ=False), freeze_time("2021-01-25T12:00:00Z"):
+            self.organization.usage = {
+                "events": {"usage": 110, "limit": 100},
+                "period": ["2021-01-01T00:00:00Z", "2021-01-31T23:59:59Z"],
+            }
+            self.organization.save()
+            _create_event(distinct_id="user", event="$event1", timestamp="2021-01-25T11:00:00Z", team=self.team)
+
+            with self.redis_client.lock(QUOTA_USAGE_COUNTERS_LOCK_KEY, timeout=60):
+                quota_limited_orgs, _ = update_changed_orgs_billing_quotas()
+                assert quota_limited_orgs["events"] == {}
+                assert self.redis_client.zrange("@posthog/quota-limits/events", 0, -1) == []
+
+            quota_limited_orgs, _ = update_changed_orgs_billing_quotas()
+            assert quota_limited_orgs["events"] == {str(self.organization.id): 1612137599}
+
+
+class TestQuotaLimitingUsageQueries(NonAtomicBaseTest):
+    def test_get_teams_usage_in_period_runs_the_queries_in_threads(self) -> None:
+        with freeze_time("2021-01-25T12:00:00Z"):
+            for _ in range(0, 3):
+                _create_event(distinct_id="user", event="$event1", timestamp="2021-01-25T11:00:00Z", team=self.team)
+            flush_persons_and_events()
+
+            with patch("ee.billing.quota_limiting.connection", wraps=connection) as mock_connection:
+                teams_usage = get_teams_usage_in_period(
+                    datetime(2021, 1, 25, tzinfo=UTC), datetime(2021, 1, 26, tzinfo=UTC)
+                )
+
+        assert teams_usage[self.team.pk]["events"] == 3
+        # Each query closes the connection of the thread it ran in
+        assert mock_connection.close.call_count == 11
@@ -1,9 +1,13 @@
 from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, cast
 
 import structlog
 
+from posthog.hogql.property_access import PropertyAccessKey, PropertyAccessStats, get_property_access_stats
+
 from posthog.clickhouse.client import sync_execute
 from posthog.models.property import PropertyName, TableColumn, TableWithProperties
 from posthog.settings import CLICKHOUSE_CLUSTER
@@ -17,12 +21,29 @@ from ee.clickhouse.materialized_columns.columns import (
 from ee.settings import (
     MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS,
     MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS,
+    MATERIALIZE_COLUMNS_FROM_PROPERTY_ACCESSES,
     MATERIALIZE_COLUMNS_MAX_AT_ONCE,
+    MATERIALIZE_COLUMNS_MINIMUM_ACCESS_COUNT,
     MATERIALIZE_COLUMNS_MINIMUM_QUERY_TIME,
 )
 
 Suggestion = tuple[TableWithProperties, TableColumn, PropertyName]
 
+# The JSON columns properties can be materialized from, per table
+MATERIALIZABLE_TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "events": (
+        "properties",
+        "person_properties",
+        "group0_properties",
+        "group1_properties",
+        "group2_properties",
+        "group3_properties",
+        "group4_properties",
+    ),
+    "person": ("properties",),
+    "groups": ("group_properties",),
+}
+
 logger = structlog.get_logger(__name__)
 
 
@@ -86,6 +107,79 @@ LIMIT 100 -- Make sure we don't add 100s of columns in one run
     return [("events", table_column, property_name) for (table_column, property_name) in raw_queries]
 
 
+@dataclass
+class MaterializationCandidate:
+    table: TableWithProperties
+    table_column: TableColumn
+    property_name: PropertyName
+    # Slow queries reading the property from JSON
+    count: int = 0
+    # Time of those queries attributed to reading the property
+    duration_ms: int = 0
+    team_ids: set[int] = field(default_factory=set)
+
+    @property
+    def suggestion(self) -> Suggestion:
+        return (self.table, self.table_column, self.property_name)
+
+
+def rank_property_accesses(
+    stats: Mapping[PropertyAccessKey, PropertyAccessStats],
+    min_query_time: int,
+    min_count: int = MATERIALIZE_COLUMNS_MINIMUM_ACCESS_COUNT,
+    team_id: Optional[int] = None,
+) -> list[MaterializationCandidate]:
+    """
+    Ranks the properties read from JSON by the query time materializing them could save.
+
+    Only queries that (may have) taken longer than `min_query_time` milliseconds count, as fast queries don't need
+    optimizing. A property's cost is the time of those queries attributed to it, i.e. split between the properties
+    each query read, so that a property that is merely read next to a slow one doesn't rank highly.
+    """
+    candidates: dict[Suggestion, MaterializationCandidate] = {}
+    for key, key_stats in stats.items():
+        if key.table_column not in MATERIALIZABLE_TABLE_COLUMNS.get(key.table, ()):
+            continue
+        if team_id is not None and key.team_id != team_id:
+            continue
+        # Keep the buckets that can hold queries slower than the minimum
+        if key.max_duration_ms <= min_query_time:
+            continue
+
+        table = cast(TableWithProperties, key.table)
+        candidate = candidates.setdefault(
+            (table, key.table_column, key.property_name),
+            MaterializationCandidate(table, key.table_column, key.property_name),
+        )
+        candidate.count += key_stats.count
+        candidate.duration_ms += key_stats.duration_ms
+        candidate.team_ids.add(key.team_id)
+
+    ranked = [candidate for candidate in candidates.values() if candidate.count >= min_count]
+    ranked.sort(key=lambda candidate: (candidate.duration_ms, candidate.count), reverse=True)
+    return ranked
+
+
+def _analyze_property_accesses(
+    since_hours_ago: int, min_query_time: int, team_id: Optional[int] = None
+) -> list[Suggestion]:
+    "Finds columns that should be materialized, from the property accesses recorded by the HogQL printer"
+    candidates = rank_property_accesses(
+        get_property_access_stats(since_hours_ago), min_query_time=min_query_time, team_id=team_id
+    )[:100]  # Make sure we don't add 100s of columns in one run
+    for candidate in candidates:
+        logger.info(
+            "Materialization candidate",
+            table=candidate.table,
+            table_column=candidate.table_column,
+            property_name=candidate.property_name,
+            count=candidate.count,
+            duration_ms=candidate.duration_ms,
+            teams=len(candidate.team_ids),
+        )
+    return [candidate.suggestion for candidate in candidates]
+
+
 def materialize_properties_task(
     properties_to_materialize: Optional[list[Suggestion]] = None,
     time_to_analyze_hours: int = MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS,
@@ -101,7 +195,12 @@ def materialize_properties_task(
     """
 
     if properties_to_materialize is None:
-        properties_to_materialize = _analyze(time_to_analyze_hours, min_query_time, team_id_to_analyze)
+        if MATERIALIZE_COLUMNS_FROM_PROPERTY_ACCESSES:
+            properties_to_materialize = _analyze_property_accesses(
+                time_to_analyze_hours, min_query_time, team_id_to_analyze
+            )
+        else:
+            properties_to_materialize = _analyze(time_to_analyze_hours, min_query_time, team_id_to_analyze)
 
     properties_by_table: dict[TableWithProperties, list[tuple[TableColumn, PropertyName]]] = defaultdict(list)
     for table, table_column, property_name in properties_to_materialize:
@@ -1,10 +1,13 @@
 import pytest
 from posthog.test.base import BaseTest, ClickhouseTestMixin
+from unittest import TestCase
 from unittest.mock import call, patch
 
+from posthog.hogql.property_access import PropertyAccessAggregate
+
 from posthog.clickhouse.client import sync_execute
 
-from ee.clickhouse.materialized_columns.analyze import materialize_properties_task
+from ee.clickhouse.materialized_columns.analyze import materialize_properties_task, rank_property_accesses
 
 
 class TestMaterializedColumnsAnalyze(ClickhouseTestMixin, BaseTest):
@@ -58,3 +61,82 @@ class TestMaterializedColumnsAnalyze(ClickhouseTestMixin, BaseTest):
                 call("events", "materialize_me3", table_column="properties", is_nullable=False),
             ]
         )
+
+
+class TestRankPropertyAccesses(TestCase):
+    def _sample_workload(self) -> PropertyAccessAggregate:
+        aggregate = PropertyAccessAggregate()
+        # A slow query reading two properties from JSON, for two teams
+        for team_id in (1, 2):
+            for _ in range(10):
+                aggregate.record(
+                    [("events", "properties", "$browser"), ("events", "properties", "$os")],
+                    team_id=team_id,
+                    query_kind="TrendsQuery",
+                    duration_ms=60_000,
+                )
+        # A slower query reading a single property, but run too rarely
+        for _ in range(5):
+            aggregate.record(
+                [("events", "properties", "rare")], team_id=1, query_kind="HogQLQuery", duration_ms=120_000
+            )
+        # Lots of fast queries
+        for _ in range(100):
+            aggregate.record(
+                [("events", "person_properties", "email")], team_id=1, query_kind="HogQLQuery", duration_ms=200
+            )
+        # A slow query reading mostly from a materialized column, except for one property
+        for _ in range(10):
+            aggregate.record(
+                [("events", "group0_properties", "plan")], team_id=3, query_kind="FunnelsQuery", duration_ms=50_000
+            )
+        # Not a column that can be materialized
+        for _ in range(10):
+            aggregate.record([("logs", "attributes", "level")], team_id=1, query_kind="HogQLQuery", duration_ms=90_000)
+        return aggregate
+
+    def test_ranks_by_attributed_query_time(self):
+        candidates = rank_property_accesses(self._sample_workload().drain(), min_query_time=40_000)
+
+        self.assertEqual(
+            [(candidate.suggestion, candidate.count, candidate.duration_ms) for candidate in candidates],
+            [
+                (("events", "properties", "$browser"), 20, 600_000),
+                (("events", "properties", "$os"), 20, 600_000),
+                (("events", "group0_properties", "plan"), 10, 500_000),
+            ],
+        )
+        self.assertEqual(candidates[0].team_ids, {1, 2})
+
+    def test_filters_by_team_and_count(self):
+        candidates = rank_property_accesses(
+            self._sample_workload().drain(), min_query_time=40_000, min_count=5, team_id=1
+        )
+
+        self.assertEqual(
+            [candidate.suggestion for candidate in candidates],
+            [
+                ("events", "properties", "rare"),
+                ("events", "properties", "$browser"),
+                ("events", "properties", "$os"),
+            ],
+        )
+
+    def test_min_query_time_includes_fast_queries_when_low(self):
+        candidates = rank_property_accesses(self._sample_workload().drain(), min_query_time=100)
+
+        self.assertIn(("events", "person_properties", "email"), [candidate.suggestion for candidate in candidates])
+
+    def test_aggregate_drops_new_keys_when_full(self):
+        aggregate = PropertyAccessAggregate(max_keys=1)
+        aggregate.record([("events", "properties", "a")], team_id=1, query_kind="HogQLQuery", duration_ms=10)
+        aggregate.record(
+            [("events", "properties", "a"), ("events", "properties", "b")],
+            team_id=1,
+            query_kind="HogQLQuery",
+            duration_ms=10,
+        )
+
+        stats = aggregate.drain()
+        self.assertEqual([(key.property_name, value.count) for key, value in stats.items()], [("a", 2)])
+        self.assertEqual(len(aggregate), 0)
@@ -22,12 +22,17 @@ from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
 
 from posthog.sync import database_sync_to_async
 
+from ee.hogai.django_checkpoint.delta import ChannelKey, ListDelta, ListDeltaEncoder, WrittenList
 from ee.models.assistant import ConversationCheckpoint, ConversationCheckpointBlob, ConversationCheckpointWrite
 
 
 class DjangoCheckpointer(BaseCheckpointSaver[str]):
     jsonplus_serde = JsonPlusSerializer()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._list_delta_encoder = ListDeltaEncoder(self.serde)
+
     def _load_writes(self, writes: Sequence[ConversationCheckpointWrite]) -> list[PendingWrite]:
         return (
             [
@@ -104,6 +109,43 @@ class DjangoCheckpointer(BaseCheckpointSaver[str]):
             Q(thread_id=checkpoint.thread_id, checkpoint_ns=checkpoint.checkpoint_ns) & query
         )
 
+    def _get_delta_base_blobs(self, checkpoint: ConversationCheckpoint, deltas: dict[str, ListDelta]):
+        """The blobs the channel values stored as deltas are rebuilt from, of all channels at once"""
+        query = Q()
+        for channel, delta in deltas.items():
+            query |= Q(channel=channel, version__in=delta.base)
+        return ConversationCheckpointBlob.objects.filter(
+            Q(thread_id=checkpoint.thread_id, checkpoint_ns=checkpoint.checkpoint_ns) & query
+        )
+
+    async def _load_channel_values(self, checkpoint: ConversationCheckpoint) -> dict[str, Any]:
+        channel_blobs = self._get_checkpoint_channel_values(checkpoint)
+        if channel_blobs is None:
+            return {}
+
+        channel_values: dict[str, Any] = {}
+        deltas: dict[str, ListDelta] = {}
+        async for checkpoint_blob in channel_blobs:
+            if checkpoint_blob.type is None or checkpoint_blob.type == "empty" or checkpoint_blob.blob is None:
+                continue
+            delta = self._list_delta_encoder.unpack(checkpoint_blob.type, checkpoint_blob.blob)
+            if delta is None:
+                channel_values[checkpoint_blob.channel] = self.serde.loads_typed(
+                    (checkpoint_blob.type, checkpoint_blob.blob)
+                )
+            elif not delta.base:
+                channel_values[checkpoint_blob.channel] = self._list_delta_encoder.rebuild(delta, {})
+            else:
+                deltas[checkpoint_blob.channel] = delta
+
+        if deltas:
+            base_blobs: dict[str, dict[str, tuple[str, Optional[bytes]]]] = {}
+            async for base_blob in self._get_delta_base_blobs(checkpoint, deltas):
+                base_blobs.setdefault(base_blob.channel, {})[base_blob.version] = (base_blob.type, base_blob.blob)
+            for channel, delta in deltas.items():
+                channel_values[channel] = self._list_delta_encoder.rebuild(delta, base_blobs.get(channel, {}))
+        return channel_values
+
     async def alist(
         self,
         config: Optional[RunnableConfig],
@@ -131,7 +173,6 @@ class DjangoCheckpointer(BaseCheckpointSaver[str]):
             qs = qs[:limit]
 
         async for checkpoint in qs:
-            channel_values = self._get_checkpoint_channel_values(checkpoint)
             loaded_checkpoint: Checkpoint = self._load_json(checkpoint.checkpoint)
 
             pending_sends = (
@@ -144,17 +185,7 @@ class DjangoCheckpointer(BaseCheckpointSaver[str]):
                 else []
             )
 
-            channel_values = (
-                {
-                    checkpoint_blob.channel: self.serde.loads_typed((checkpoint_blob.type, checkpoint_blob.blob))
-                    async for checkpoint_blob in channel_values
-                    if checkpoint_blob.type is not None
-                    and checkpoint_blob.type != "empty"
-                    and checkpoint_blob.blob is not None
-                }
-                if channel_values is not None
-                else {}
-            )
+            channel_values = await self._load_channel_values(checkpoint)
 
             checkpoint_dict: Checkpoint = {
                 **loaded_checkpoint,
@@ -263,10 +294,15 @@ class DjangoCheckpointer(BaseCheckpointSaver[str]):
             )
 
             blobs = []
+            written_lists: dict[ChannelKey, WrittenList] = {}
             for channel, version in new_versions.items():
-                type, blob = (
-                    self.serde.dumps_typed(channel_values[channel]) if channel in channel_values else ("empty", None)
-                )
+                if channel in channel_values:
+                    key = (thread_id, checkpoint_ns or "", channel)
+                    (type, blob), written = self._list_delta_encoder.dumps(key, str(version), channel_values[channel])
+                    if written is not None:
+                        written_lists[key] = written
+                else:
+                    type, blob = "empty", None
                 blobs.append(
                     ConversationCheckpointBlob(
                         checkpoint=updated_checkpoint,
@@ -279,6 +315,10 @@ class DjangoCheckpointer(BaseCheckpointSaver[str]):
                 )
 
             ConversationCheckpointBlob.objects.bulk_create(blobs, ignore_conflicts=True)
+
+        # Only once the blobs are committed can the next values of the channels be written as deltas of them
+        for key, written in written_lists.items():
+            self._list_delta_encoder.remember(key, written)
         return next_config
 
     async def aput_writes(
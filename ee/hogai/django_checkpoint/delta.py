@@ -0,0 +1,190 @@
+"""
+Delta encoding of the list channels of checkpoints, e.g. the messages of a conversation.
+
+Every checkpoint writes the value of every channel that changed in its step, so without deltas a conversation of `n`
+messages writes the messages `O(n^2)` times over its steps. A list value that shares a prefix with the value last
+written for the same channel is instead written as a delta: the length of the shared prefix, and the items after it.
+Every `CHECKPOINT_SNAPSHOT_INTERVAL` deltas, the full value is written again as a snapshot, so rebuilding a value reads
+at most that many blobs. Snapshots and deltas are compressed with zstd.
+
+Values smaller than `CHECKPOINT_DELTA_MIN_BYTES` are written as plain typed blobs, as compressing them doesn't pay off.
+The values last written are tracked in memory, so a conversation continued by another process starts with a snapshot.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import zstd
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from prometheus_client import Counter
+
+CHECKPOINT_DELTA_MIN_BYTES = 4 * 1024
+CHECKPOINT_SNAPSHOT_INTERVAL = 16
+# Bounds the memory of the values last written, the least recently written channels are forgotten first
+CHECKPOINT_TRACKED_CHANNELS_MAX = 10_000
+
+SNAPSHOT_BLOB_TYPE = "snapshot"
+DELTA_BLOB_TYPE = "delta"
+
+CHECKPOINT_BLOB_BYTES = Counter(
+    "posthog_max_ai_checkpoint_blob_bytes_total",
+    "Bytes of the checkpoint blobs of list channels written, by blob encoding.",
+    labelnames=["encoding"],
+)
+CHECKPOINT_VALUE_BYTES = Counter(
+    "posthog_max_ai_checkpoint_value_bytes_total",
+    "Serialized bytes of the full values of the checkpoint blobs of list channels written, by blob encoding. "
+    "Divided by the blob bytes, it's the write amplification saved by delta encoding.",
+    labelnames=["encoding"],
+)
+
+TypedBlob = tuple[str, Optional[bytes]]
+# Thread ID, checkpoint namespace and channel
+ChannelKey = tuple[str, str, str]
+
+
+@dataclass
+class ListDelta:
+    # Versions of the blobs the base value is rebuilt from, in order, the first one holding a full value.
+    # Empty for snapshots.
+    base: list[str]
+    # Number of items of the base value kept, the items are appended after them
+    keep: int
+    items: list[tuple[str, bytes]]
+
+
+@dataclass
+class WrittenList:
+    version: str
+    digests: list[bytes]
+    base: list[str]
+
+
+def _digest(blob: bytes) -> bytes:
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
+def _shared_prefix_length(a: Sequence[bytes], b: Sequence[bytes]) -> int:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+class ListDeltaEncoder:
+    def __init__(self, serde: SerializerProtocol, max_tracked_channels: int = CHECKPOINT_TRACKED_CHANNELS_MAX):
+        self._serde = serde
+        self._max_tracked_channels = max_tracked_channels
+        self._lock = threading.Lock()
+        self._written: OrderedDict[ChannelKey, WrittenList] = OrderedDict()
+
+    def dumps(self, key: ChannelKey, version: str, value: Any) -> tuple[TypedBlob, Optional[WrittenList]]:
+        """
+        Serializes the value of a channel. List values are also returned with what was written, which must be passed
+        to `remember` once the blob is stored, so that the next value of the channel can be written as a delta of it.
+        """
+        if type(value) is not list:
+            return self._serde.dumps_typed(value), None
+
+        items = [self._serde.dumps_typed(item) for item in value]
+        digests = [_digest(blob) for _, blob in items]
+        value_bytes = sum(len(blob) for _, blob in items)
+
+        with self._lock:
+            previous = self._written.get(key)
+        keep = _shared_prefix_length(previous.digests, digests) if previous else 0
+
+        if value_bytes < CHECKPOINT_DELTA_MIN_BYTES:
+            typed_blob, encoding, base = self._serde.dumps_typed(value), "plain", []
+        elif previous and keep > 0 and len(previous.base) < CHECKPOINT_SNAPSHOT_INTERVAL:
+            base = [*previous.base, previous.version]
+            typed_blob, encoding = (DELTA_BLOB_TYPE, self._pack(ListDelta(base, keep, items[keep:]))), "delta"
+        else:
+            typed_blob, encoding, base = (SNAPSHOT_BLOB_TYPE, self._pack(ListDelta([], 0, items))), "snapshot", []
+
+        CHECKPOINT_BLOB_BYTES.labels(encoding=encoding).inc(len(typed_blob[1] or b""))
+        CHECKPOINT_VALUE_BYTES.labels(encoding=encoding).inc(value_bytes)
+        return typed_blob, WrittenList(version=version, digests=digests, base=base)
+
+    def remember(self, key: ChannelKey, written: WrittenList) -> None:
+        with self._lock:
+            self._written[key] = written
+            self._written.move_to_end(key)
+            while len(self._written) > self._max_tracked_channels:
+                self._written.popitem(last=False)
+
+    def _pack(self, delta: ListDelta) -> bytes:
+        _, packed = self._serde.dumps_typed(
+            {"base": delta.base, "keep": delta.keep, "items": [list(item) for item in delta.items]}
+        )
+        return zstd.compress(packed)
+
+    def unpack(self, blob_type: Optional[str], blob: Optional[bytes]) -> Optional[ListDelta]:
+        """Returns the delta of a snapshot or delta blob, `None` for other blobs."""
+        if blob_type not in (SNAPSHOT_BLOB_TYPE, DELTA_BLOB_TYPE) or blob is None:
+            return None
+        payload = self._serde.loads_typed(("msgpack", zstd.decompress(blob)))
+        return ListDelta(
+            base=payload["base"],
+            keep=payload["keep"],
+            items=[(item_type, item_blob) for item_type, item_blob in payload["items"]],
+        )
+
+    def rebuild(self, delta: ListDelta, base_blobs: Mapping[str, TypedBlob]) -> list[Any]:
+        """Rebuilds the value of a delta from the blobs of its base versions."""
+        value: list[Any] = []
+        for version in delta.base:
+            if version not in base_blobs:
+                raise ValueError(f"Missing checkpoint blob of version {version} to rebuild a delta")
+            blob_type, blob = base_blobs[version]
+            base_delta = self.unpack(blob_type, blob)
+            if base_delta is None:
+                value = list(self._serde.loads_typed((blob_type, blob)))
+            else:
+                value = self._apply(value, base_delta)
+        return self._apply(value, delta)
+
+    def _apply(self, value: list[Any], delta: ListDelta) -> list[Any]:
+        return [*value[: delta.keep], *(self._serde.loads_typed(item) for item in delta.items)]
+
+
+@dataclass
+class WriteAmplification:
+    steps: int
+    # Serialized bytes of the last value
+    value_bytes: int
+    # Bytes written over all steps when writing the full value at every step
+    full_bytes: int
+    # Bytes written over all steps with delta encoding
+    delta_bytes: int
+
+    @property
+    def full_amplification(self) -> float:
+        return self.full_bytes / max(self.value_bytes, 1)
+
+    @property
+    def delta_amplification(self) -> float:
+        return self.delta_bytes / max(self.value_bytes, 1)
+
+
+def measure_write_amplification(serde: SerializerProtocol, values: Sequence[list[Any]]) -> WriteAmplification:
+    """Replays the successive values of a list channel, e.g. the messages of a recorded conversation."""
+    encoder = ListDeltaEncoder(serde)
+    key: ChannelKey = ("replay", "", "messages")
+    full_bytes = delta_bytes = value_bytes = 0
+    for version, value in enumerate(values):
+        value_bytes = len(serde.dumps_typed(value)[1] or b"")
+        full_bytes += value_bytes
+        (_, blob), written = encoder.dumps(key, str(version), value)
+        delta_bytes += len(blob or b"")
+        if written is not None:
+            encoder.remember(key, written)
+    return WriteAmplification(
+        steps=len(values), value_bytes=value_bytes, full_bytes=full_bytes, delta_bytes=delta_bytes
+    )
@@ -432,6 +432,44 @@ class TestDjangoCheckpointer(NonAtomicBaseTest):
         self.assertEqual(blobs[5].type, "empty")
         self.assertIsNone(blobs[5].blob)
 
+    async def test_large_list_channels_are_saved_as_deltas(self):
+        """Test that long message lists are saved as deltas of the previous values and rebuilt on load."""
+
+        class State(TypedDict, total=False):
+            messages: Annotated[list[str], operator.add]
+
+        graph = StateGraph(State)
+
+        def make_node(i: int):
+            return lambda state: {"messages": [f"message {i} " + "hello " * 1000]}
+
+        for i in range(4):
+            graph.add_node(f"node{i}", make_node(i))
+        graph.add_edge(START, "node0")
+        for i in range(3):
+            graph.add_edge(f"node{i}", f"node{i + 1}")
+        graph.add_edge("node3", END)
+
+        checkpointer = DjangoCheckpointer()
+        compiled = graph.compile(checkpointer=checkpointer)
+
+        thread = await Conversation.objects.acreate(user=self.user, team=self.team)
+        config = {"configurable": {"thread_id": str(thread.id)}}
+        await compiled.ainvoke({"messages": ["hello"]}, config=config)
+
+        blob_types = [
+            blob.type
+            async for blob in ConversationCheckpointBlob.objects.filter(thread=thread, channel="messages").order_by(
+                "version"
+            )
+        ]
+        self.assertEqual(blob_types, ["msgpack", "delta", "delta", "delta", "delta"])
+
+        snapshot = await compiled.aget_state(config)
+        self.assertEqual(snapshot.values["messages"], ["hello", *(f"message {i} " + "hello " * 1000 for i in range(4))])
+        history = [state async for state in compiled.aget_state_history(config)]
+        self.assertEqual([len(state.values.get("messages", [])) for state in history], [5, 4, 3, 2, 1, 0])
+
     def test_alist_query_efficiency(self):
         """Test that alist doesn't cause N+1 queries when fetching pending writes."""
         thread = Conversation.objects.create(user=self.user, team=self.team)
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+from unittest import TestCase
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from posthog.schema import AssistantMessage, HumanMessage
+
+from ee.hogai.django_checkpoint.delta import (
+    CHECKPOINT_SNAPSHOT_INTERVAL,
+    DELTA_BLOB_TYPE,
+    SNAPSHOT_BLOB_TYPE,
+    ListDeltaEncoder,
+    measure_write_amplification,
+)
+
+
+def _load_conversation() -> list[HumanMessage | AssistantMessage]:
+    with open(Path(__file__).parent / "assets" / "conversation.json") as f:
+        return [
+            HumanMessage.model_validate(message)
+            if message["type"] == "human"
+            else AssistantMessage.model_validate(message)
+            for message in json.load(f)
+        ]
+
+
+class TestListDeltaEncoder(TestCase):
+    def setUp(self):
+        self.serde = JsonPlusSerializer()
+        self.encoder = ListDeltaEncoder(self.serde)
+        self.key = ("thread", "", "messages")
+        self.blobs: dict[str, tuple[str, bytes | None]] = {}
+
+    def _write(self, version: str, value: list) -> str:
+        (blob_type, blob), written = self.encoder.dumps(self.key, version, value)
+        self.blobs[version] = (blob_type, blob)
+        assert written is not None
+        self.encoder.remember(self.key, written)
+        return blob_type
+
+    def _read(self, version: str) -> list:
+        delta = self.encoder.unpack(*self.blobs[version])
+        if delta is None:
+            return self.serde.loads_typed(self.blobs[version])
+        return self.encoder.rebuild(delta, {base: self.blobs[base] for base in delta.base})
+
+    def test_rebuilds_appended_and_replaced_messages(self):
+        messages = _load_conversation()
+        value: list = []
+        blob_types = []
+        for version, message in enumerate(messages):
+            value = [*value, message]
+            blob_types.append(self._write(str(version), value))
+            self.assertEqual(self._read(str(version)), value)
+
+        # The last message is streamed, so it's replaced by a message with the same ID
+        value = [*value[:-1], value[-1].model_copy(update={"content": "Here's a shorter summary."})]
+        blob_types.append(self._write("streamed", value))
+        self.assertEqual(self._read("streamed"), value)
+
+        self.assertEqual(blob_types[0], "msgpack")
+        self.assertEqual(blob_types[-1], DELTA_BLOB_TYPE)
+
+    def test_writes_snapshots_periodically(self):
+        messages = [HumanMessage(content=f"{i} " + "hello " * 1000) for i in range(CHECKPOINT_SNAPSHOT_INTERVAL + 2)]
+        blob_types = [self._write(str(i), messages[: i + 1]) for i in range(len(messages))]
+
+        self.assertEqual(blob_types[0], SNAPSHOT_BLOB_TYPE)
+        self.assertEqual(
+            blob_types[1 : CHECKPOINT_SNAPSHOT_INTERVAL + 1], [DELTA_BLOB_TYPE] * CHECKPOINT_SNAPSHOT_INTERVAL
+        )
+        self.assertEqual(blob_types[CHECKPOINT_SNAPSHOT_INTERVAL + 1], SNAPSHOT_BLOB_TYPE)
+        self.assertEqual(self._read(str(len(messages) - 1)), messages)
+
+    def test_other_values_are_written_as_before(self):
+        (blob_type, blob), written = self.encoder.dumps(self.key, "1", {"messages": ["hello"]})
+        self.assertEqual((blob_type, blob), self.serde.dumps_typed({"messages": ["hello"]}))
+        self.assertIsNone(written)
+
+    def test_write_amplification_of_recorded_conversation(self):
+        messages = _load_conversation()
+        report = measure_write_amplification(self.serde, [messages[: i + 1] for i in range(len(messages))])
+
+        self.assertEqual(report.steps, len(messages))
+        # Writing the full messages at every step writes the conversation several times over
+        self.assertGreater(report.full_amplification, 5)
+        self.assertLess(report.delta_amplification, report.full_amplification / 2)
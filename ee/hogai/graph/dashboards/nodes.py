@@ -17,6 +17,7 @@ from posthog.schema import (
 
 from posthog.exceptions_capture import capture_exception
 from posthog.models import Dashboard, DashboardTile, Insight
+from posthog.models.search_document import sync_search_documents
 from posthog.sync import database_sync_to_async
 from posthog.utils import pluralize
 
@@ -216,7 +217,9 @@ class DashboardCreationNode(AssistantNode):
 
     @transaction.atomic
     def _save_insights(self, insights_to_create: list[Insight]) -> list[Insight]:
-        return Insight.objects.bulk_create(insights_to_create)
+        insights = Insight.objects.bulk_create(insights_to_create)
+        sync_search_documents("insight", insights)
+        return insights
 
     @database_sync_to_async
     def _process_insight_creation_results(
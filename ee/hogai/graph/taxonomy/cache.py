@@ -0,0 +1,130 @@
+"""
+Team-scoped cache of the taxonomy the assistant's tools read from ClickHouse.
+
+The assistant looks up the same event properties, property values and actor properties many times, within a
+conversation and across the conversations of a team, and usually asks for a different subset of properties each time,
+so the query runners' own cache, keyed by the whole query, rarely hits. This cache keeps one entry per event, and one
+per event or actor property, so any subset of properties is served from the entries warmed by earlier lookups, and
+only the properties that are missing are queried.
+
+Entries are kept for `TAXONOMY_CACHE_TTL`, the same as the query runners' AI staleness threshold. Empty entries (an
+event without properties, a property without values) are kept for `TAXONOMY_CACHE_EMPTY_TTL` only, as they are
+usually data that's just starting to be ingested.
+"""
+
+import json
+import time
+import hashlib
+from collections.abc import Callable
+from datetime import timedelta
+from enum import StrEnum
+from typing import Any, Optional
+
+from django.core.cache import cache
+
+from prometheus_client import Counter
+
+TAXONOMY_CACHE_TTL = timedelta(hours=1)
+TAXONOMY_CACHE_EMPTY_TTL = timedelta(minutes=5)
+
+TAXONOMY_CACHE_LOOKUPS = Counter(
+    "posthog_max_ai_taxonomy_cache_lookups_total",
+    "Taxonomy lookups of the assistant's tools. Hits are ClickHouse queries saved, partial hits query fewer properties.",
+    labelnames=["kind", "result"],
+)
+
+# The key of the single entry of lookups that aren't per property
+_ALL_PROPERTIES = "*"
+
+
+class TaxonomyCacheKind(StrEnum):
+    EVENT_PROPERTIES = "event_properties"
+    EVENT_PROPERTY_VALUES = "event_property_values"
+    ACTOR_PROPERTY_VALUES = "actor_property_values"
+
+
+class TaxonomyCache:
+    """
+    Entries are JSON values, `None` being an empty entry. Entries read from Redis are also kept in memory for the
+    lifetime of the cache, until they expire, so repeated lookups of a conversation don't go to Redis either.
+    """
+
+    def __init__(self, team_id: int):
+        self._team_id = team_id
+        self._local: dict[str, dict[str, Any]] = {}
+
+    def _key(self, kind: TaxonomyCacheKind, scope: tuple, name: str) -> str:
+        digest = hashlib.sha256(json.dumps([*scope, name], default=str).encode()).hexdigest()[:32]
+        return f"ai_taxonomy:{self._team_id}:{kind}:{digest}"
+
+    def _get_many(self, keys: list[str]) -> dict[str, Any]:
+        now = time.time()
+        entries = {key: self._local[key] for key in keys if key in self._local}
+        missing = [key for key in keys if key not in entries]
+        if missing:
+            entries.update(cache.get_many(missing))
+        fresh = {key: entry for key, entry in entries.items() if entry["expires_at"] > now}
+        self._local.update(fresh)
+        return {key: entry["value"] for key, entry in fresh.items()}
+
+    def _set_many(self, values: dict[str, Any]) -> None:
+        now = time.time()
+        by_ttl: dict[int, dict[str, dict[str, Any]]] = {}
+        for key, value in values.items():
+            ttl = int((TAXONOMY_CACHE_TTL if value else TAXONOMY_CACHE_EMPTY_TTL).total_seconds())
+            entry = {"value": value, "expires_at": now + ttl}
+            self._local[key] = entry
+            by_ttl.setdefault(ttl, {})[key] = entry
+        for ttl, entries in by_ttl.items():
+            cache.set_many(entries, timeout=ttl)
+
+    def get_many_or_compute(
+        self,
+        kind: TaxonomyCacheKind,
+        scope: tuple,
+        names: list[str],
+        compute: Callable[[list[str]], Optional[dict[str, Any]]],
+    ) -> Optional[dict[str, Any]]:
+        """
+        Returns the entries of the `names` in the `scope`, computing the missing ones with `compute`. `compute` returns
+        the entries of the names it was given, names it leaves out are cached as empty, or `None` if it failed, in
+        which case nothing is cached and `None` is returned.
+        """
+        keys = {name: self._key(kind, scope, name) for name in names}
+        cached = self._get_many(list(keys.values()))
+        values = {name: cached[key] for name, key in keys.items() if key in cached}
+        missing = [name for name in names if name not in values]
+
+        if not missing:
+            result = "hit"
+        elif len(missing) < len(names):
+            result = "partial"
+        else:
+            result = "miss"
+        TAXONOMY_CACHE_LOOKUPS.labels(kind=kind, result=result).inc()
+
+        if missing:
+            computed = compute(missing)
+            if computed is None:
+                return None
+            computed_values = {name: computed.get(name) for name in missing}
+            self._set_many({keys[name]: value for name, value in computed_values.items()})
+            values.update(computed_values)
+        return values
+
+    def get_or_compute(
+        self, kind: TaxonomyCacheKind, scope: tuple, compute: Callable[[], Optional[Any]]
+    ) -> tuple[bool, Any]:
+        """
+        Returns the single entry of the `scope`, computing it with `compute` if it's missing. The first element is
+        `False` if `compute` failed by returning `None`.
+        """
+
+        def compute_all(_: list[str]) -> Optional[dict[str, Any]]:
+            value = compute()
+            return None if value is None else {_ALL_PROPERTIES: value}
+
+        values = self.get_many_or_compute(kind, scope, [_ALL_PROPERTIES], compute_all)
+        if values is None:
+            return False, None
+        return True, values[_ALL_PROPERTIES]
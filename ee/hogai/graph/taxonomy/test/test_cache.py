@@ -0,0 +1,80 @@
+from freezegun import freeze_time
+from posthog.test.base import BaseTest
+from unittest.mock import MagicMock
+
+from django.core.cache import cache
+
+from ee.hogai.graph.taxonomy.cache import TaxonomyCache, TaxonomyCacheKind
+
+
+class TestTaxonomyCache(BaseTest):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.taxonomy_cache = TaxonomyCache(self.team.pk)
+
+    def test_computes_only_missing_properties(self):
+        compute = MagicMock(side_effect=lambda names: {name: {"values": [name]} for name in names})
+
+        values = self.taxonomy_cache.get_many_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTY_VALUES, ("event", "$pageview"), ["a", "b"], compute
+        )
+        assert values == {"a": {"values": ["a"]}, "b": {"values": ["b"]}}
+
+        values = self.taxonomy_cache.get_many_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTY_VALUES, ("event", "$pageview"), ["b", "c"], compute
+        )
+        assert values == {"b": {"values": ["b"]}, "c": {"values": ["c"]}}
+        assert [call.args[0] for call in compute.call_args_list] == [["a", "b"], ["c"]]
+
+    def test_cache_is_shared_within_team_only(self):
+        compute = MagicMock(return_value={"a": {"values": ["x"]}})
+        self.taxonomy_cache.get_many_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTY_VALUES, ("event", "$pageview"), ["a"], compute
+        )
+
+        TaxonomyCache(self.team.pk).get_many_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTY_VALUES, ("event", "$pageview"), ["a"], compute
+        )
+        assert compute.call_count == 1
+
+        TaxonomyCache(self.team.pk + 1).get_many_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTY_VALUES, ("event", "$pageview"), ["a"], compute
+        )
+        assert compute.call_count == 2
+
+    def test_empty_entries_expire_sooner(self):
+        compute = MagicMock(return_value={"a": {"values": ["x"]}})
+
+        with freeze_time("2025-01-01T00:00:00Z") as frozen_time:
+            values = self.taxonomy_cache.get_many_or_compute(
+                TaxonomyCacheKind.ACTOR_PROPERTY_VALUES, (None, 25), ["a", "empty"], compute
+            )
+            assert values == {"a": {"values": ["x"]}, "empty": None}
+
+            frozen_time.tick(600)
+            self.taxonomy_cache.get_many_or_compute(
+                TaxonomyCacheKind.ACTOR_PROPERTY_VALUES, (None, 25), ["a", "empty"], compute
+            )
+            assert compute.call_args.args[0] == ["empty"]
+
+            frozen_time.tick(3600)
+            self.taxonomy_cache.get_many_or_compute(
+                TaxonomyCacheKind.ACTOR_PROPERTY_VALUES, (None, 25), ["a", "empty"], compute
+            )
+            assert compute.call_args.args[0] == ["a", "empty"]
+
+    def test_failed_computation_is_not_cached(self):
+        compute = MagicMock(return_value=None)
+
+        assert self.taxonomy_cache.get_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTIES, ("event", "$pageview"), compute
+        ) == (False, None)
+        compute.return_value = []
+        assert self.taxonomy_cache.get_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTIES, ("event", "$pageview"), compute
+        ) == (True, [])
+        assert self.taxonomy_cache.get_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTIES, ("event", "$pageview"), compute
+        ) == (True, [])
+        assert compute.call_count == 2
@@ -1,5 +1,7 @@
 from posthog.test.base import ClickhouseTestMixin, NonAtomicBaseTest, _create_event, flush_persons_and_events
+from unittest.mock import patch
 
+from posthog.hogql_queries.ai.event_taxonomy_query_runner import EventTaxonomyQueryRunner
 from posthog.models import Action
 from posthog.models.property_definition import PropertyDefinition
 from posthog.test.test_utils import create_group_type_mapping_without_created_at
@@ -129,6 +131,26 @@ class TestEvents(ClickhouseTestMixin, NonAtomicBaseTest):
         assert "Chrome" in "\n".join(property_vals.get(232, []))
         assert "Firefox" in "\n".join(property_vals.get(232, []))
 
+    async def test_events_property_values_are_cached_per_property(self):
+        with patch(
+            "ee.hogai.graph.taxonomy.toolkit.EventTaxonomyQueryRunner", wraps=EventTaxonomyQueryRunner
+        ) as runner_mock:
+            await self.toolkit.retrieve_event_or_action_property_values({"event1": ["$browser"]})
+            assert runner_mock.call_count == 1
+
+            # Only the property missing from the cache is queried
+            property_vals = await self.toolkit.retrieve_event_or_action_property_values({"event1": ["$browser", "id"]})
+            assert runner_mock.call_count == 2
+            assert runner_mock.call_args.args[0].properties == ["id"]
+            assert "Chrome" in "\n".join(property_vals["event1"])
+            assert "123" in "\n".join(property_vals["event1"])
+
+            # Other conversations of the team share the cache
+            other_toolkit = DummyToolkit(self.team, self.user)
+            property_vals = await other_toolkit.retrieve_event_or_action_property_values({"event1": ["id", "$browser"]})
+            assert runner_mock.call_count == 2
+            assert "Firefox" in "\n".join(property_vals["event1"])
+
     async def test_retrieve_event_or_action_properties_action_not_found(self):
         result = await self.toolkit.retrieve_event_or_action_properties_parallel([999])
         assert (
@@ -10,14 +10,13 @@ from pydantic import BaseModel
 
 from posthog.schema import (
     ActorsPropertyTaxonomyQuery,
+    ActorsPropertyTaxonomyResponse,
     AssistantMessage,
     AssistantToolCall,
     CachedActorsPropertyTaxonomyQueryResponse,
     CachedEventTaxonomyQueryResponse,
-    CacheMissResponse,
     EventTaxonomyItem,
     EventTaxonomyQuery,
-    QueryStatusResponse,
     TaskExecutionStatus,
 )
 
@@ -33,6 +32,7 @@ from posthog.models.property_definition import PropertyDefinition, PropertyType
 from posthog.sync import database_sync_to_async
 from posthog.taxonomy.taxonomy import CORE_FILTER_DEFINITIONS_BY_GROUP
 
+from ee.hogai.graph.taxonomy.cache import TaxonomyCache, TaxonomyCacheKind
 from ee.hogai.graph.taxonomy.format import (
     enrich_props_with_descriptions,
     format_properties_xml,
@@ -143,6 +143,7 @@ class TaxonomyAgentToolkit:
         self._user = user
         self.MAX_ENTITIES_PER_BATCH = 6
         self.MAX_PROPERTIES = 500
+        self._taxonomy_cache = TaxonomyCache(team.pk)
 
     @property
     def _groups(self):
@@ -213,10 +214,10 @@ class TaxonomyAgentToolkit:
     @database_sync_to_async(thread_sensitive=False)
     def _retrieve_event_or_action_taxonomy(
         self, event_name_or_action_id: str | int, properties: list[str] | None = None
-    ):
+    ) -> tuple[list[EventTaxonomyItem] | None, str]:
         """
-        Retrieve event/action taxonomy with efficient caching.
-        Multiple properties are batched in a single query to maximize cache hits.
+        Retrieve event/action taxonomy from the taxonomy cache, `None` if the query failed.
+        Multiple properties are batched in a single query, only the properties missing from the cache are queried.
         """
         try:
             action_id = int(event_name_or_action_id)
@@ -225,16 +226,45 @@ class TaxonomyAgentToolkit:
             is_event = True
 
         if is_event:
-            query = EventTaxonomyQuery(event=event_name_or_action_id, maxPropertyValues=25, properties=properties)
+            scope: tuple = ("event", event_name_or_action_id)
             verbose_name = f"event {event_name_or_action_id}"
         else:
-            query = EventTaxonomyQuery(actionId=action_id, maxPropertyValues=25, properties=properties)
+            scope = ("action", action_id)
             verbose_name = f"action with ID {action_id}"
-        runner = EventTaxonomyQueryRunner(query, self._team)
-        with tags_context(product=Product.MAX_AI, team_id=self._team.pk, org_id=self._team.organization_id):
-            # Use cache-first execution mode for optimal performance
-            response = runner.run(ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS)
-        return response, verbose_name
+
+        def run_query(query_properties: list[str] | None) -> list[dict] | None:
+            if is_event:
+                query = EventTaxonomyQuery(
+                    event=event_name_or_action_id, maxPropertyValues=25, properties=query_properties
+                )
+            else:
+                query = EventTaxonomyQuery(actionId=action_id, maxPropertyValues=25, properties=query_properties)
+            runner = EventTaxonomyQueryRunner(query, self._team)
+            with tags_context(product=Product.MAX_AI, team_id=self._team.pk, org_id=self._team.organization_id):
+                # Use cache-first execution mode for optimal performance
+                response = runner.run(ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS)
+            if not isinstance(response, CachedEventTaxonomyQueryResponse):
+                return None
+            return [item.model_dump() for item in response.results]
+
+        if not properties:
+            succeeded, items = self._taxonomy_cache.get_or_compute(
+                TaxonomyCacheKind.EVENT_PROPERTIES, scope, lambda: run_query(None)
+            )
+            if not succeeded:
+                return None, verbose_name
+            return [EventTaxonomyItem.model_validate(item) for item in items], verbose_name
+
+        def compute(missing_properties: list[str]) -> dict[str, dict] | None:
+            items = run_query(missing_properties)
+            return None if items is None else {item["property"]: item for item in items}
+
+        values = self._taxonomy_cache.get_many_or_compute(
+            TaxonomyCacheKind.EVENT_PROPERTY_VALUES, scope, properties, compute
+        )
+        if values is None:
+            return None, verbose_name
+        return [EventTaxonomyItem.model_validate(values[prop]) for prop in properties if values[prop]], verbose_name
 
     def _format_properties(self, props: list[tuple[str, str | None, str | None]]) -> str:
         """
@@ -326,21 +356,16 @@ class TaxonomyAgentToolkit:
         if query is None:
             results.append(TaxonomyErrorMessages.entity_not_found(entity))
             return results
-        property_values_response = await self._run_actors_taxonomy_query(query)
-        if not isinstance(property_values_response, CachedActorsPropertyTaxonomyQueryResponse):
+        property_values_results = await self._run_actors_taxonomy_query(query)
+        if property_values_results is None:
             results.append(TaxonomyErrorMessages.entity_not_found(entity))
             return results
 
-        if not property_values_response.results:
+        if not property_values_results:
             for property_name in property_names:
                 results.append(TaxonomyErrorMessages.property_values_not_found(property_name, entity))
             return results
 
-        if isinstance(property_values_response.results, list):
-            property_values_results = property_values_response.results
-        else:
-            property_values_results = [property_values_response.results]
-
         property_definitions: dict[str, PropertyDefinition] = await self._get_definitions_for_entity(
             entity, property_names, query
         )
@@ -404,7 +429,7 @@ class TaxonomyAgentToolkit:
         task = cast(AssistantToolCall, input_dict["task"])
         event_name_or_action_id = task.args["event_name_or_action_id"]
         try:
-            response, verbose_name = await self._retrieve_event_or_action_taxonomy(event_name_or_action_id)
+            items, verbose_name = await self._retrieve_event_or_action_taxonomy(event_name_or_action_id)
         except Action.DoesNotExist:
             project_actions = await self._get_project_actions()
             if not project_actions:
@@ -422,7 +447,7 @@ class TaxonomyAgentToolkit:
                 artifacts=[],
                 status=TaskExecutionStatus.FAILED,
             )
-        if not isinstance(response, CachedEventTaxonomyQueryResponse):
+        if items is None:
             result = TaxonomyErrorMessages.generic_not_found("Properties")
             return TaskResult(
                 id=task.id,
@@ -430,7 +455,7 @@ class TaxonomyAgentToolkit:
                 artifacts=[],
                 status=TaskExecutionStatus.FAILED,
             )
-        if not response.results:
+        if not items:
             result = TaxonomyErrorMessages.event_properties_not_found(verbose_name)
             return TaskResult(
                 id=task.id,
@@ -440,7 +465,7 @@ class TaxonomyAgentToolkit:
             )
 
         qs = PropertyDefinition.objects.filter(
-            team=self._team, type=PropertyDefinition.Type.EVENT, name__in=[item.property for item in response.results]
+            team=self._team, type=PropertyDefinition.Type.EVENT, name__in=[item.property for item in items]
         )
         property_definitions = [prop async for prop in qs]
         property_to_type = {
@@ -448,7 +473,7 @@ class TaxonomyAgentToolkit:
         }
         props = [
             (item.property, property_to_type.get(item.property))
-            for item in response.results
+            for item in items
             # Exclude properties that exist in the taxonomy, but don't have a type.
             if item.property in property_to_type
         ]
@@ -616,12 +641,42 @@ class TaxonomyAgentToolkit:
 
     @database_sync_to_async(thread_sensitive=False)
     def _run_actors_taxonomy_query(
-        self, query
-    ) -> CachedActorsPropertyTaxonomyQueryResponse | CacheMissResponse | QueryStatusResponse:
-        with tags_context(product=Product.MAX_AI, team_id=self._team.pk, org_id=self._team.organization_id):
-            return ActorsPropertyTaxonomyQueryRunner(query, self._team).run(
-                ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS
-            )
+        self, query: ActorsPropertyTaxonomyQuery
+    ) -> list[ActorsPropertyTaxonomyResponse] | None:
+        """
+        Retrieve the values of the query's properties from the taxonomy cache, in the order of the properties,
+        `None` if the query failed. Only the properties missing from the cache are queried.
+        """
+
+        def compute(missing_properties: list[str]) -> dict[str, dict] | None:
+            missing_query = query.model_copy(update={"properties": missing_properties})
+            with tags_context(product=Product.MAX_AI, team_id=self._team.pk, org_id=self._team.organization_id):
+                response = ActorsPropertyTaxonomyQueryRunner(missing_query, self._team).run(
+                    ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS
+                )
+            if not isinstance(response, CachedActorsPropertyTaxonomyQueryResponse):
+                return None
+            response_results = response.results if isinstance(response.results, list) else [response.results]
+            return {
+                prop: result.model_dump()
+                for prop, result in zip(missing_properties, response_results)
+                if result.sample_values
+            }
+
+        values = self._taxonomy_cache.get_many_or_compute(
+            TaxonomyCacheKind.ACTOR_PROPERTY_VALUES,
+            (query.groupTypeIndex, query.maxPropertyValues),
+            query.properties,
+            compute,
+        )
+        if values is None:
+            return None
+        return [
+            ActorsPropertyTaxonomyResponse.model_validate(values[prop])
+            if values[prop]
+            else ActorsPropertyTaxonomyResponse(sample_values=[], sample_count=0)
+            for prop in query.properties
+        ]
 
     @database_sync_to_async(thread_sensitive=False)
     def _get_project_actions(self) -> list[Action]:
@@ -683,18 +738,18 @@ class TaxonomyAgentToolkit:
         except PropertyDefinition.DoesNotExist:
             definitions_map = {}
 
-        response, verbose_name = await self._retrieve_event_or_action_taxonomy(event_name_or_action_id, property_names)
+        items, verbose_name = await self._retrieve_event_or_action_taxonomy(event_name_or_action_id, property_names)
 
-        if not isinstance(response, CachedEventTaxonomyQueryResponse):
+        if items is None:
             results.append(TaxonomyErrorMessages.event_not_found(verbose_name))
             return results
-        if not response.results:
+        if not items:
             for property_name in property_names:
                 results.append(TaxonomyErrorMessages.property_values_not_found(property_name, verbose_name))
             return results
 
         # Create a map of property name to taxonomy result for efficient lookup
-        taxonomy_results_map: dict[str, EventTaxonomyItem] = {item.property: item for item in response.results}
+        taxonomy_results_map: dict[str, EventTaxonomyItem] = {item.property: item for item in items}
 
         results.extend(
             self._process_property_values(
@@ -71,6 +71,13 @@ MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS = get_from_env(
 MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS = get_from_env("MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS", 0, type_cast=int)
 # Maximum number of columns to materialize at once. Avoids running into resource bottlenecks (storage + ingest + backfilling).
 MATERIALIZE_COLUMNS_MAX_AT_ONCE = get_from_env("MATERIALIZE_COLUMNS_MAX_AT_ONCE", 100, type_cast=int)
+# Whether to pick the columns to materialize from the property accesses recorded by the HogQL printer, instead of
+# from the query text in system.query_log
+MATERIALIZE_COLUMNS_FROM_PROPERTY_ACCESSES = get_from_env(
+    "MATERIALIZE_COLUMNS_FROM_PROPERTY_ACCESSES", False, type_cast=str_to_bool
+)
+# Minimum number of slow queries reading a property before it's considered for materialization
+MATERIALIZE_COLUMNS_MINIMUM_ACCESS_COUNT = get_from_env("MATERIALIZE_COLUMNS_MINIMUM_ACCESS_COUNT", 10, type_cast=int)
 
 BILLING_SERVICE_URL = get_from_env("BILLING_SERVICE_URL", "https://billing.posthog.com")
 
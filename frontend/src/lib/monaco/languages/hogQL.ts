@@ -694,6 +694,8 @@ export const language: () => languages.IMonarchLanguage = () => ({
         'groupUniqArrayIf',
         'groupArrayInsertAt',
         'groupArrayInsertAtIf',
+        'groupArraySorted',
+        'groupArraySortedIf',
         'groupArrayMovingAvg',
         'groupArrayMovingAvgIf',
         'groupArrayMovingSum',
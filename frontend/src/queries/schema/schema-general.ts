@@ -101,6 +101,7 @@ export enum NodeKind {
     ErrorTrackingIssueCorrelationQuery = 'ErrorTrackingIssueCorrelationQuery',
     LogsQuery = 'LogsQuery',
     SessionBatchEventsQuery = 'SessionBatchEventsQuery',
+    HeatmapsQuery = 'HeatmapsQuery',
 
     // Interface nodes
     DataTableNode = 'DataTableNode',
@@ -2602,6 +2603,33 @@ export type CachedSessionBatchEventsQueryResponse = CachedEventsQueryResponse &
 }
 export type CachedLogsQueryResponse = CachedQueryResponse<LogsQueryResponse>
 
+export enum HeatmapsQueryAggregation {
+    TotalCount = 'total_count',
+    UniqueVisitors = 'unique_visitors',
+}
+
+export interface HeatmapsQuery extends DataNode<HeatmapsQueryResponse> {
+    kind: NodeKind.HeatmapsQuery
+    /** The heatmap type, e.g. `click` or `scrolldepth` */
+    type: string
+    /** Dates of the first and last days, both included */
+    dateRange: DateRange
+    urlExact?: string
+    /** Anchored pattern matched against the URL */
+    urlPattern?: string
+    viewportWidthMin?: integer
+    viewportWidthMax?: integer
+    aggregation: HeatmapsQueryAggregation
+    filterTestAccounts?: boolean
+}
+
+export interface HeatmapsQueryResponse extends AnalyticsQueryResponseBase {
+    /** `[pointer_target_fixed, pointer_relative_x, pointer_y, count]` rows, or `[scroll_depth_bucket, bucket_count, cumulative_count]` rows for scroll depth */
+    results: any[][]
+}
+
+export type CachedHeatmapsQueryResponse = CachedQueryResponse<HeatmapsQueryResponse>
+
 export interface FileSystemCount {
     count: number
 }
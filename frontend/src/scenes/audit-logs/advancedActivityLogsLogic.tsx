@@ -42,6 +42,7 @@ export interface AdvancedActivityLogFilters {
 export interface DetailField {
     name: string
     types: string[]
+    sample_values?: (string | number | boolean)[]
 }
 
 export interface ScopeFields {
@@ -179,6 +179,12 @@ export const QUERY_TYPES_METADATA: Record<NodeKind, InsightTypeMetadata> = {
         icon: IconCursor,
         inMenu: false,
     },
+    [NodeKind.HeatmapsQuery]: {
+        name: 'Heatmaps',
+        description: 'Clicks, mouse movements and scroll depth of a page.',
+        icon: IconCursor,
+        inMenu: false,
+    },
     [NodeKind.PersonsNode]: {
         name: 'Persons',
         description: 'List and explore your persons.',
@@ -4817,6 +4817,8 @@ export interface DataWarehouseSavedQuery {
     latest_error: string | null
     latest_history_id?: string
     is_materialized?: boolean
+    /** Column whose values only increase, used to only materialize new rows */
+    incremental_cursor_column?: string | null
     upstream_dependency_count?: number
     downstream_dependency_count?: number
     created_at?: string
@@ -6,3 +6,6 @@ CACHE_KEY_PREFIX = "activity_log:details_fields"
 # Fallbacks need to be kept in sync with the smallest AUDIT_LOG feature limits in billing
 ADVANCED_ACTIVITY_LOGS_LOOKBACK_FALLBACK_LIMIT = 2
 ADVANCED_ACTIVITY_LOGS_LOOKBACK_FALLBACK_UNIT = "months"
+FIELD_CATALOG_KEY_PREFIX = "activity_log:field_catalog"
+FIELD_CATALOG_SAMPLE_VALUES = 5
+FIELD_CATALOG_SAMPLE_VALUE_MAX_LENGTH = 100
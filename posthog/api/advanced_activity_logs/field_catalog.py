@@ -0,0 +1,194 @@
+"""
+Activity log field catalog
+
+The detail fields of the activity logs are recorded per organization and scope as the logs are written, with their
+types and a few sample values, so that the available filters are read from the catalog instead of scanning the logs.
+The logs written before the catalog of an organization existed are recorded by backfilling it once, after which it is
+marked as complete and read by the filters endpoint.
+"""
+
+import json
+from typing import Any, Optional
+
+from redis.exceptions import WatchError
+
+from posthog.exceptions_capture import capture_exception
+from posthog.redis import get_client
+
+from .constants import FIELD_CATALOG_KEY_PREFIX, FIELD_CATALOG_SAMPLE_VALUE_MAX_LENGTH, FIELD_CATALOG_SAMPLE_VALUES
+
+# Same as field discovery, only the first items of arrays are looked at
+ARRAY_SAMPLE_SIZE = 10
+
+# Times the fields are read and merged again when the catalog is written to by another process in between
+RECORD_FIELDS_ATTEMPTS = 5
+
+
+def _catalog_key(organization_id: str) -> str:
+    return f"{FIELD_CATALOG_KEY_PREFIX}:{organization_id}"
+
+
+def _complete_key(organization_id: str) -> str:
+    return f"{FIELD_CATALOG_KEY_PREFIX}:complete:{organization_id}"
+
+
+def get_field_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    elif isinstance(value, bool):
+        return "boolean"
+    elif isinstance(value, int | float):
+        return "number"
+    elif isinstance(value, str):
+        return "string"
+    elif isinstance(value, list):
+        return "array"
+    elif isinstance(value, dict):
+        return "object"
+    else:
+        return "unknown"
+
+
+class CatalogField:
+    def __init__(self) -> None:
+        self.types: set[str] = set()
+        self.sample_values: list[Any] = []
+
+    def add(self, value: Any) -> None:
+        self.types.add(get_field_type(value))
+        if isinstance(value, str) and len(value) > FIELD_CATALOG_SAMPLE_VALUE_MAX_LENGTH:
+            return
+        if (
+            isinstance(value, str | int | float | bool)
+            and value not in self.sample_values
+            and len(self.sample_values) < FIELD_CATALOG_SAMPLE_VALUES
+        ):
+            self.sample_values.append(value)
+
+    def merge(self, other: "CatalogField") -> bool:
+        """Adds the types and sample values of the other field, returns whether anything was added."""
+        changed = not other.types.issubset(self.types)
+        self.types.update(other.types)
+        for value in other.sample_values:
+            if value not in self.sample_values and len(self.sample_values) < FIELD_CATALOG_SAMPLE_VALUES:
+                self.sample_values.append(value)
+                changed = True
+        return changed
+
+    def to_json(self) -> str:
+        return json.dumps({"types": sorted(self.types), "sample_values": self.sample_values})
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "CatalogField":
+        parsed = json.loads(data)
+        field = cls()
+        field.types = set(parsed["types"])
+        field.sample_values = parsed["sample_values"]
+        return field
+
+
+def extract_fields(detail: Any, fields: dict[str, CatalogField], prefix: str = "") -> None:
+    """Adds the JSON paths of the detail, with the types and values found at each of them, to the fields."""
+    if isinstance(detail, dict):
+        for key, value in detail.items():
+            path = f"{prefix}.{key}" if prefix else key
+            fields.setdefault(path, CatalogField()).add(value)
+            extract_fields(value, fields, path)
+
+    elif isinstance(detail, list) and detail:
+        path = f"{prefix}[]" if prefix else "[]"
+        for item in detail[:ARRAY_SAMPLE_SIZE]:
+            if item is not None:
+                fields.setdefault(path, CatalogField()).add(item)
+                if isinstance(item, dict | list):
+                    extract_fields(item, fields, path)
+
+
+def record_activity_log_fields(organization_id: str, records: list[dict[str, Any]]) -> None:
+    """
+    Records the detail fields of the activity logs, each with a `scope` and a `detail`. Only the fields with new types
+    or sample values are written, so recording the fields of logs like the ones already recorded is a single read.
+    """
+    try:
+        fields: dict[tuple[str, str], CatalogField] = {}
+        for record in records:
+            if not isinstance(record["detail"], dict):
+                continue
+            record_fields: dict[str, CatalogField] = {}
+            extract_fields(record["detail"], record_fields)
+            for path, field in record_fields.items():
+                key = (record["scope"], path)
+                if key in fields:
+                    fields[key].merge(field)
+                else:
+                    fields[key] = field
+
+        if not fields:
+            return
+
+        catalog_key = _catalog_key(organization_id)
+        hash_keys = [json.dumps(key) for key in fields]
+
+        with get_client().pipeline() as pipe:
+            for attempt in range(RECORD_FIELDS_ATTEMPTS):
+                try:
+                    # The fields are merged with the recorded ones, so the catalog must not change in between, or the
+                    # types and sample values recorded by the other write would be overwritten
+                    pipe.watch(catalog_key)
+                    updates: dict[str, str] = {}
+                    for hash_key, field, existing in zip(
+                        hash_keys, fields.values(), pipe.hmget(catalog_key, hash_keys)
+                    ):
+                        if existing is None:
+                            updates[hash_key] = field.to_json()
+                            continue
+                        existing_field = CatalogField.from_json(existing)
+                        if existing_field.merge(field):
+                            updates[hash_key] = existing_field.to_json()
+
+                    if updates:
+                        pipe.multi()
+                        pipe.hset(catalog_key, mapping=updates)
+                        pipe.execute()
+                    return
+                except WatchError:
+                    if attempt == RECORD_FIELDS_ATTEMPTS - 1:
+                        raise
+    except Exception as e:
+        capture_exception(e)
+
+
+def mark_field_catalog_complete(organization_id: str) -> None:
+    try:
+        get_client().set(_complete_key(organization_id), "1")
+    except Exception as e:
+        capture_exception(e)
+
+
+def get_catalog_fields(organization_id: str) -> Optional[dict[str, dict[str, list[dict[str, Any]]]]]:
+    """The detail fields of each scope, or None if the catalog of the organization isn't complete yet."""
+    try:
+        client = get_client()
+        if not client.exists(_complete_key(organization_id)):
+            return None
+        catalog = client.hgetall(_catalog_key(organization_id))
+    except Exception as e:
+        capture_exception(e)
+        return None
+
+    result: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    for hash_key, data in sorted(catalog.items()):
+        scope, path = json.loads(hash_key)
+        field = CatalogField.from_json(data)
+        result.setdefault(scope, {"fields": []})["fields"].append(
+            {"name": path, "types": sorted(field.types), "sample_values": field.sample_values}
+        )
+    return result
+
+
+def delete_field_catalog(organization_id: str) -> bool:
+    try:
+        return bool(get_client().delete(_catalog_key(organization_id), _complete_key(organization_id)))
+    except Exception as e:
+        capture_exception(e)
+        return False
@@ -2,7 +2,7 @@ import gc
 import json
 import dataclasses
 from datetime import timedelta
-from typing import Any, TypedDict
+from typing import Any, TypedDict, cast
 
 from django.db import connection
 from django.db.models import QuerySet
@@ -12,6 +12,7 @@ from posthog.models.activity_logging.activity_log import ActivityLog, Change
 from posthog.models.utils import UUIDT
 
 from .constants import BATCH_SIZE, SAMPLING_PERCENTAGE, SMALL_ORG_THRESHOLD
+from .field_catalog import get_catalog_fields, get_field_type, mark_field_catalog_complete, record_activity_log_fields
 from .fields_cache import cache_fields, get_cached_fields
 
 
@@ -30,16 +31,25 @@ class AdvancedActivityLogFieldDiscovery:
         record_count = self._get_org_record_count()
 
         if record_count > SMALL_ORG_THRESHOLD:
+            # The catalog of large organizations is backfilled by the refresh_activity_log_fields_cache task
+            detail_fields = self._get_catalog_detail_fields()
             cached = get_cached_fields(str(self.organization_id))
             if cached:
+                if detail_fields is not None:
+                    cached["detail_fields"] = detail_fields
                 return cached
             return {
                 "static_filters": {"users": [], "scopes": [], "activities": []},
-                "detail_fields": {},
+                "detail_fields": detail_fields or {},
             }
 
         static_filters = self._get_static_filters(base_queryset)
-        detail_fields = self._analyze_detail_fields_memory()
+        detail_fields = self._get_catalog_detail_fields()
+        if detail_fields is None:
+            self.backfill_field_catalog()
+            detail_fields = self._get_catalog_detail_fields()
+        if detail_fields is None:
+            detail_fields = self._analyze_detail_fields_memory()
 
         result = {
             "static_filters": static_filters,
@@ -49,6 +59,21 @@ class AdvancedActivityLogFieldDiscovery:
         cache_fields(str(self.organization_id), result, record_count)
         return result
 
+    def _get_catalog_detail_fields(self) -> DetailFieldsResult | None:
+        catalog_fields = get_catalog_fields(str(self.organization_id))
+        if catalog_fields is None:
+            return None
+        result = cast(DetailFieldsResult, catalog_fields)
+        self._merge_fields_into_result(result, self._get_changes_fields())
+        return result
+
+    def backfill_field_catalog(self) -> None:
+        """Records the detail fields of all the activity logs of the organization in its catalog."""
+        queryset = self.get_activity_logs_queryset().order_by("id").values("scope", "detail")
+        for offset in range(0, self._get_record_count_for_memory(), BATCH_SIZE):
+            record_activity_log_fields(str(self.organization_id), list(queryset[offset : offset + BATCH_SIZE]))
+        mark_field_catalog_complete(str(self.organization_id))
+
     def _get_static_filters(self, queryset: QuerySet) -> dict[str, list[dict[str, str]]]:
         return {
             "users": self._get_available_users(queryset),
@@ -140,6 +165,7 @@ class AdvancedActivityLogFieldDiscovery:
             hours_back: If provided, used to get appropriate static filters for the time range
         """
         # Process the provided records
+        record_activity_log_fields(str(self.organization_id), records)
         batch_fields = self._extract_fields_from_records(records)
         batch_converted = self._convert_to_discovery_format(batch_fields)
 
@@ -298,22 +324,7 @@ class AdvancedActivityLogFieldDiscovery:
         return paths
 
     def _get_field_type(self, value: Any) -> str:
-        if value is None:
-            return "null"
-        elif isinstance(value, bool):
-            return "boolean"
-        elif isinstance(value, int):
-            return "number"
-        elif isinstance(value, float):
-            return "number"
-        elif isinstance(value, str):
-            return "string"
-        elif isinstance(value, list):
-            return "array"
-        elif isinstance(value, dict):
-            return "object"
-        else:
-            return "unknown"
+        return get_field_type(value)
 
     def _merge_fields_memory(
         self, all_fields: dict[str, set[tuple[str, str]]], batch_fields: dict[str, set[tuple[str, str]]]
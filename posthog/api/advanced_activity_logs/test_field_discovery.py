@@ -1,7 +1,17 @@
 from typing import Any
 
 from posthog.test.base import BaseTest
+from unittest.mock import patch
 
+from django.db import transaction
+
+from posthog.api.advanced_activity_logs.field_catalog import (
+    CatalogField,
+    delete_field_catalog,
+    get_catalog_fields,
+    mark_field_catalog_complete,
+    record_activity_log_fields,
+)
 from posthog.api.advanced_activity_logs.fields_cache import _get_cache_key, get_client
 from posthog.models.activity_logging.activity_log import ActivityLog
 
@@ -105,8 +115,88 @@ class FieldDiscoveryTest(BaseTest):
                     client.delete(cache_key)
                 except Exception:
                     pass
+                delete_field_catalog(str(self.organization.id))
 
                 detail = self._generate_test_data_from_pattern(field_pattern, test_value)
                 self._create_activity_log("Dashboard", detail)
                 results = self._run_field_discovery()
                 self._assert_field_discovered(results, "Dashboard", field_pattern, expected_types)
+
+    def test_fields_of_new_activity_logs_are_read_from_the_catalog(self):
+        self._create_activity_log("Dashboard", {"name": "First dashboard"})
+        results = self._run_field_discovery()
+        self._assert_field_discovered(results, "Dashboard", "name", ["string"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_activity_log("Dashboard", {"name": "Second dashboard", "tags": ["marketing"]})
+            self._create_activity_log("FeatureFlag", {"key": "flag", "rollout": 50})
+
+        with (
+            patch.object(self.discovery, "backfill_field_catalog") as mock_backfill,
+            patch.object(self.discovery, "_analyze_detail_fields_memory") as mock_analyze,
+        ):
+            results = self._run_field_discovery()
+
+        mock_backfill.assert_not_called()
+        mock_analyze.assert_not_called()
+        self._assert_field_discovered(results, "Dashboard", "tags[]", ["string"])
+        self._assert_field_discovered(results, "FeatureFlag", "rollout", ["number"])
+        name_field = next(f for f in results["detail_fields"]["Dashboard"]["fields"] if f["name"] == "name")
+        self.assertEqual(name_field["sample_values"], ["First dashboard", "Second dashboard"])
+
+    def _catalog_field(self, scope: str, path: str) -> dict[str, Any]:
+        catalog = get_catalog_fields(str(self.organization.id))
+        assert catalog is not None
+        return next(f for f in catalog[scope]["fields"] if f["name"] == path)
+
+    def test_fields_of_rolled_back_activity_logs_are_not_recorded(self):
+        delete_field_catalog(str(self.organization.id))
+        mark_field_catalog_complete(str(self.organization.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._create_activity_log("Dashboard", {"rolled_back": True})
+                    raise ValueError("Rolled back")
+            except ValueError:
+                pass
+            self._create_activity_log("Dashboard", {"name": "Committed"})
+
+        catalog = get_catalog_fields(str(self.organization.id))
+        assert catalog is not None
+        self.assertEqual([f["name"] for f in catalog["Dashboard"]["fields"]], ["name"])
+
+    def test_fields_are_recorded_when_the_internal_event_fails(self):
+        delete_field_catalog(str(self.organization.id))
+        mark_field_catalog_complete(str(self.organization.id))
+
+        with (
+            patch("posthog.cdp.internal_events.produce_internal_event", side_effect=Exception("Kafka is down")),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self._create_activity_log("Dashboard", {"name": "Dashboard"})
+
+        self.assertEqual(self._catalog_field("Dashboard", "name")["types"], ["string"])
+
+    def test_concurrent_records_of_the_same_field_are_merged(self):
+        organization_id = str(self.organization.id)
+        delete_field_catalog(organization_id)
+        mark_field_catalog_complete(organization_id)
+        record_activity_log_fields(organization_id, [{"scope": "Dashboard", "detail": {"name": "First"}}])
+
+        from_json = CatalogField.from_json
+        concurrent_records = []
+
+        def from_json_with_concurrent_record(data):
+            # Another process records the same field in between the read and the write of this one
+            if not concurrent_records:
+                concurrent_records.append(True)
+                record_activity_log_fields(organization_id, [{"scope": "Dashboard", "detail": {"name": 2}}])
+            return from_json(data)
+
+        with patch.object(CatalogField, "from_json", side_effect=from_json_with_concurrent_record):
+            record_activity_log_fields(organization_id, [{"scope": "Dashboard", "detail": {"name": "Third"}}])
+
+        field = self._catalog_field("Dashboard", "name")
+        self.assertEqual(field["types"], ["number", "string"])
+        self.assertEqual(field["sample_values"], ["First", 2, "Third"])
@@ -1,9 +1,16 @@
 import json
-from collections.abc import AsyncGenerator
+import asyncio
+import weakref
+import threading
+import contextvars
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
-from typing import Any, Optional, cast
+from functools import partial
+from typing import Any, Optional, TypeVar, cast
 
 from django.conf import settings
+from django.db import connection
 from django.db.models import CharField, DateTimeField, F, FilteredRelation, Prefetch, Q, QuerySet, Value
 from django.db.models.functions import Cast
 from django.http import StreamingHttpResponse
@@ -34,12 +41,18 @@ from posthog.constants import GENERATED_DASHBOARD_PREFIX
 from posthog.event_usage import report_user_action
 from posthog.helpers import create_dashboard_from_template
 from posthog.helpers.dashboard_templates import create_from_template
+from posthog.hogql_queries.query_runner import (
+    ExecutionMode,
+    execution_mode_from_refresh,
+    shared_insights_execution_mode,
+)
 from posthog.models import Dashboard, DashboardTile, Insight, Text
 from posthog.models.activity_logging.activity_log import Detail, changes_between, log_activity
 from posthog.models.alert import AlertConfiguration
 from posthog.models.dashboard_templates import DashboardTemplate
 from posthog.models.group_type_mapping import GroupTypeMapping
 from posthog.models.insight_variable import InsightVariable
+from posthog.models.search_document import sync_search_documents
 from posthog.models.signals import model_activity_signal, mutable_receiver
 from posthog.models.tagged_item import TaggedItem
 from posthog.models.user import User
@@ -47,7 +60,11 @@ from posthog.rbac.access_control_api_mixin import AccessControlViewSetMixin
 from posthog.rbac.user_access_control import UserAccessControlSerializerMixin
 from posthog.renderers import SafeJSONRenderer, ServerSentEventRenderer
 from posthog.user_permissions import UserPermissionsSerializerMixin
-from posthog.utils import filters_override_requested_by_client, variables_override_requested_by_client
+from posthog.utils import (
+    filters_override_requested_by_client,
+    refresh_requested_by_client,
+    variables_override_requested_by_client,
+)
 
 from products.llm_analytics.backend.dashboard_templates import get_llm_analytics_default_template
 
@@ -86,6 +103,8 @@ DASHBOARD_SHARED_FIELDS = [
 
 tracer = trace.get_tracer(__name__)
 
+T = TypeVar("T")
+
 
 def serialize_tile_with_context(tile, order: int, context: dict) -> tuple[int, dict]:
     """
@@ -118,6 +137,165 @@ def serialize_tile_with_context(tile, order: int, context: dict) -> tuple[int, d
         return order, tile_data
 
 
+# Execution modes that return a fresh cached result as is, so the cache can be checked for all tiles up front
+CACHE_FIRST_EXECUTION_MODES = {
+    ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
+    ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS,
+}
+
+
+_team_tile_semaphores_lock = threading.Lock()
+# Semaphores are dropped once no request is serializing tiles of the team
+_team_tile_semaphores: weakref.WeakValueDictionary[int, threading.BoundedSemaphore] = weakref.WeakValueDictionary()
+_team_async_tile_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, weakref.WeakValueDictionary[int, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+
+def _team_tile_semaphore(team_id: int) -> threading.BoundedSemaphore:
+    """Limits the tiles of a team calculated at the same time by the threads of this process, across requests."""
+    with _team_tile_semaphores_lock:
+        semaphore = _team_tile_semaphores.get(team_id)
+        if semaphore is None:
+            semaphore = _team_tile_semaphores[team_id] = threading.BoundedSemaphore(settings.DASHBOARD_TILE_CONCURRENCY)
+        return semaphore
+
+
+def _team_async_tile_semaphore(team_id: int) -> asyncio.Semaphore:
+    """Same as `_team_tile_semaphore`, for the requests served by the running event loop."""
+    semaphores = _team_async_tile_semaphores.setdefault(asyncio.get_running_loop(), weakref.WeakValueDictionary())
+    semaphore = semaphores.get(team_id)
+    if semaphore is None:
+        semaphore = semaphores[team_id] = asyncio.Semaphore(settings.DASHBOARD_TILE_CONCURRENCY)
+    return semaphore
+
+
+def _run_in_worker_thread(func: Callable[..., T], *args: Any) -> T:
+    try:
+        return func(*args)
+    finally:
+        # Worker threads don't go through the request lifecycle, so nothing else closes their connection
+        connection.close()
+
+
+def _serialize_tile_in_thread(
+    semaphore: threading.BoundedSemaphore, tile, order: int, context: dict
+) -> tuple[int, dict]:
+    with semaphore:
+        return _run_in_worker_thread(serialize_tile_with_context, tile, order, context)
+
+
+def _tile_execution_mode(context: dict) -> ExecutionMode:
+    execution_mode = execution_mode_from_refresh(refresh_requested_by_client(context["request"]))
+    if context.get("is_shared", False):
+        execution_mode = shared_insights_execution_mode(execution_mode)
+    return execution_mode
+
+
+def _is_fresh_cache_hit(tile_data: dict) -> bool:
+    if tile_data.get("error"):
+        return False
+    insight = tile_data.get("insight")
+    if not insight:
+        # Text tiles have nothing to calculate
+        return True
+    if not insight.get("is_cached") or insight.get("result") is None:
+        return False
+    cache_target_age = insight.get("cache_target_age")
+    return cache_target_age is None or cache_target_age > now()
+
+
+def serialize_tiles(tiles: list[DashboardTile], context: dict) -> list[dict]:
+    """
+    Serializes the tiles with up to `DASHBOARD_TILE_CONCURRENCY` of them calculated at the same time, keeping
+    their order.
+    """
+    if settings.DASHBOARD_TILE_CONCURRENCY <= 1 or len(tiles) <= 1:
+        return [serialize_tile_with_context(tile, order, context)[1] for order, tile in enumerate(tiles)]
+    return _serialize_tiles_concurrently(tiles, context)
+
+
+def _serialize_tiles_concurrently(tiles: list[DashboardTile], context: dict) -> list[dict]:
+    semaphore = _team_tile_semaphore(context["dashboard"].team_id)
+    with ThreadPoolExecutor(max_workers=min(settings.DASHBOARD_TILE_CONCURRENCY, len(tiles))) as executor:
+        # Each tile runs in a copy of the request's context, so e.g. its query tags apply
+        futures = [
+            executor.submit(contextvars.copy_context().run, _serialize_tile_in_thread, semaphore, tile, order, context)
+            for order, tile in enumerate(tiles)
+        ]
+        return [future.result()[1] for future in futures]
+
+
+async def _as_completed(awaitables: list[Awaitable]) -> AsyncGenerator[Any, None]:
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The client may disconnect before all tiles are done
+        for task in tasks:
+            task.cancel()
+
+
+async def serialize_tiles_as_completed(
+    tiles: list[tuple[int, DashboardTile]], context: dict
+) -> AsyncGenerator[tuple[int, DashboardTile, dict | Exception], None]:
+    """
+    Serializes the (order, tile) pairs with up to `DASHBOARD_TILE_CONCURRENCY` tiles calculated at the same time,
+    yielding (order, tile, tile data or exception) as soon as each tile is done, so not in order.
+
+    If the tiles would be served from a fresh cache anyway, the cache is checked for all tiles first and cache hits
+    are yielded before any tile is calculated. Tiles are started in order, so the top of the dashboard goes first.
+    """
+    # One tile at a time is calculated on the request's thread, as by `serialize_tiles`
+    thread_sensitive = settings.DASHBOARD_TILE_CONCURRENCY <= 1
+
+    def in_thread(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+        return sync_to_async(
+            func if thread_sensitive else partial(_run_in_worker_thread, func), thread_sensitive=thread_sensitive
+        )
+
+    serialize = in_thread(serialize_tile_with_context)
+    semaphore = _team_async_tile_semaphore(context["dashboard"].team_id)
+
+    async def run(order: int, tile: DashboardTile, tile_context: dict) -> tuple[int, DashboardTile, dict | Exception]:
+        async with semaphore:
+            try:
+                _, tile_data = await serialize(tile, order, tile_context)
+                return order, tile, tile_data
+            except Exception as e:
+                logger.exception(f"Error serializing tile {tile.id}: {e}")
+                return order, tile, e
+
+    async def run_if_cached(
+        order: int, tile: DashboardTile, tile_context: dict
+    ) -> tuple[int, DashboardTile, dict | None]:
+        """Serializes the tile from the cache only, returns None as its data unless it's a fresh cache hit."""
+        async with semaphore:
+            try:
+                _, tile_data = await serialize(tile, order, tile_context)
+            except Exception:
+                # Calculating the tile reports the error
+                return order, tile, None
+        return order, tile, tile_data if _is_fresh_cache_hit(tile_data) else None
+
+    to_calculate = tiles
+    if _tile_execution_mode(context) in CACHE_FIRST_EXECUTION_MODES:
+        cache_only_context = {**context, "execution_mode_override": ExecutionMode.CACHE_ONLY_NEVER_CALCULATE}
+        to_calculate = []
+        async for order, tile, tile_data in _as_completed(
+            [run_if_cached(order, tile, cache_only_context) for order, tile in tiles]
+        ):
+            if tile_data is not None:
+                yield order, tile, tile_data
+            else:
+                to_calculate.append((order, tile))
+        to_calculate.sort(key=lambda order_and_tile: order_and_tile[0])
+
+    async for result in _as_completed([run(order, tile, context) for order, tile in to_calculate]):
+        yield result
+
+
 class CanEditDashboard(BasePermission):
     message = "You don't have edit permissions for this dashboard."
 
@@ -516,6 +694,7 @@ class DashboardSerializer(DashboardMetadataSerializer):
                     insights_to_update.append(insight)
 
             Insight.objects.bulk_update(insights_to_update, ["deleted"])
+            sync_search_documents("insight", insights_to_update)
         DashboardTile.objects_including_soft_deleted.filter(dashboard__id=instance.id).update(deleted=True)
 
     @staticmethod
@@ -527,6 +706,7 @@ class DashboardSerializer(DashboardMetadataSerializer):
                 tile.insight.deleted = False
                 insights_to_undelete.append(tile.insight)
         Insight.objects.bulk_update(insights_to_undelete, ["deleted"])
+        sync_search_documents("insight", insights_to_undelete)
 
     @tracer.start_as_current_span("DashboardSerializer.get_tiles")
     def get_tiles(self, dashboard: Dashboard) -> Optional[list[ReturnDict]]:
@@ -577,9 +757,15 @@ class DashboardSerializer(DashboardMetadataSerializer):
             if not sorted_tiles:
                 return []
 
-            for order, tile in enumerate(sorted_tiles):
-                order, tile_data = serialize_tile_with_context(tile, order, self.context)
-                serialized_tiles.append(cast(ReturnDict, tile_data))
+            if chained_tile_refresh_enabled:
+                # The task chain is collected per thread, so the tiles have to be serialized on this one
+                for order, tile in enumerate(sorted_tiles):
+                    order, tile_data = serialize_tile_with_context(tile, order, self.context)
+                    serialized_tiles.append(cast(ReturnDict, tile_data))
+            else:
+                serialized_tiles = [
+                    cast(ReturnDict, tile_data) for tile_data in serialize_tiles(sorted_tiles, self.context)
+                ]
 
         return serialized_tiles
 
@@ -760,44 +946,36 @@ class DashboardsViewSet(
 
             try:
                 # Serialize the first 2 tiles (or fewer if dashboard has less) for inclusion in metadata
-                initial_tiles = []
                 initial_tile_count = min(2, len(sorted_tiles))
+                initial_tiles_by_order: dict[int, dict] = {}
 
-                for order in range(initial_tile_count):
-                    tile = sorted_tiles[order]
-                    try:
-                        order_result, tile_data = await sync_to_async(
-                            serialize_tile_with_context, thread_sensitive=True
-                        )(tile, order, context)
-                        initial_tiles.append(tile_data)
-                    except Exception as e:
-                        logger.exception(f"Error serializing initial tile {tile.id}: {e}")
+                async for order, tile, tile_data in serialize_tiles_as_completed(
+                    list(enumerate(sorted_tiles[:initial_tile_count])), context
+                ):
+                    if isinstance(tile_data, Exception):
                         # Add error tile to initial tiles
-                        initial_tiles.append(
-                            {
-                                "id": tile.id,
-                                "error": {"type": type(e).__name__, "message": str(e)},
-                            }
-                        )
+                        tile_data = {
+                            "id": tile.id,
+                            "error": {"type": type(tile_data).__name__, "message": str(tile_data)},
+                        }
+                    initial_tiles_by_order[order] = tile_data
 
-                metadata_data["tiles"] = initial_tiles
+                metadata_data["tiles"] = [initial_tiles_by_order[order] for order in range(initial_tile_count)]
 
                 metadata_json = renderer.render({"type": "metadata", "dashboard": metadata_data}).decode()
                 yield f"data: {metadata_json}\n\n".encode()
 
-                # Stream remaining tiles (starting from tile 2 if we have more than 2 tiles)
-                for order in range(initial_tile_count, len(sorted_tiles)):
-                    tile = sorted_tiles[order]
-                    try:
-                        order_result, tile_data = await sync_to_async(
-                            serialize_tile_with_context, thread_sensitive=True
-                        )(tile, order, context)
+                # Stream remaining tiles as they finish, cache hits first, tagged with their order on the dashboard
+                remaining_tiles = list(enumerate(sorted_tiles))[initial_tile_count:]
+                async for order, tile, tile_data in serialize_tiles_as_completed(remaining_tiles, context):
+                    if isinstance(tile_data, Exception):
+                        error_json = renderer.render(
+                            {"type": "error", "tile_id": tile.id, "error": str(tile_data)}
+                        ).decode()
+                        yield f"data: {error_json}\n\n".encode()
+                    else:
                         tile_json = renderer.render({"type": "tile", "order": order, "tile": tile_data}).decode()
                         yield f"data: {tile_json}\n\n".encode()
-                    except Exception as e:
-                        logger.exception(f"Error serializing tile {tile.id}: {e}")
-                        error_json = renderer.render({"type": "error", "tile_id": tile.id, "error": str(e)}).decode()
-                        yield f"data: {error_json}\n\n".encode()
 
                 # Send completion signal
                 complete_json = renderer.render({"type": "complete"}).decode()
@@ -34,6 +34,11 @@ from posthog.models.event.util import ClickhouseEventSerializer
 from posthog.models.person.util import get_persons_by_distinct_ids
 from posthog.models.team import Team
 from posthog.models.utils import UUIDT
+from posthog.queries.property_value_sketches import (
+    PROPERTY_VALUE_SUGGESTIONS_TIME_HISTOGRAM,
+    PropertyValueSketchType,
+    get_property_value_suggestions,
+)
 from posthog.rate_limit import ClickHouseBurstRateThrottle, ClickHouseSustainedRateThrottle
 from posthog.taxonomy.taxonomy import CORE_FILTER_DEFINITIONS_BY_GROUP
 from posthog.utils import convert_property_value, flatten, relative_date_parse
@@ -307,6 +312,33 @@ class EventViewSet(
         self,
         query_params: EventValueQueryParams,
     ) -> response.Response:
+        items = list(query_params.items)
+        # The sketch holds the values of the key in all events, so filtered values still need the events
+        if (
+            not query_params.is_column
+            and not query_params.event_names
+            and not any(param_key.startswith("properties_") for param_key, _ in items)
+        ):
+            suggestions = get_property_value_suggestions(
+                query_params.team,
+                PropertyValueSketchType.EVENT,
+                query_params.key,
+                query_params.value,
+                order_by_length=True,
+            )
+            if suggestions is not None:
+                return self._return_with_short_cache(self._format_values([value for value, _ in suggestions]))
+
+        with PROPERTY_VALUE_SUGGESTIONS_TIME_HISTOGRAM.labels(
+            property_type=PropertyValueSketchType.EVENT.value, source="clickhouse"
+        ).time():
+            result = execute_hogql_query(self._event_property_values_query(query_params, items), team=query_params.team)
+
+        return self._return_with_short_cache(self._format_values([value[0] for value in result.results]))
+
+    def _event_property_values_query(
+        self, query_params: EventValueQueryParams, items: list[tuple[str, str | list[object]]]
+    ) -> ast.SelectQuery:
         date_from = relative_date_parse("-7d", query_params.team.timezone_info).strftime("%Y-%m-%d 00:00:00")
         date_to = timezone.now().strftime("%Y-%m-%d 23:59:59")
 
@@ -329,7 +361,7 @@ class EventViewSet(
             ),
         ]
         # Handle property filters from query parameters
-        for param_key, param_value in query_params.items:
+        for param_key, param_value in items:
             if param_key.startswith("properties_"):
                 property_key = param_key.replace("properties_", "", 1)
                 try:
@@ -370,7 +402,7 @@ class EventViewSet(
                     order="ASC",
                 )
             ]
-        query = ast.SelectQuery(
+        return ast.SelectQuery(
             select=[ast.Field(chain=chain)],
             distinct=True,
             select_from=ast.JoinExpr(table=ast.Field(chain=["events"])),
@@ -379,19 +411,19 @@ class EventViewSet(
             limit=ast.Constant(value=10),
         )
 
-        result = execute_hogql_query(query, team=query_params.team)
-
+    @staticmethod
+    def _format_values(raw_values: list[Any]) -> list[dict[str, Any]]:
         values = []
-        for value in result.results:
-            if isinstance(value[0], float | int | bool | uuid.UUID):
-                values.append(value[0])
+        for value in raw_values:
+            if isinstance(value, float | int | bool | uuid.UUID):
+                values.append(value)
             else:
                 try:
-                    values.append(json.loads(value[0]))
+                    values.append(json.loads(value))
                 except json.JSONDecodeError:
-                    values.append(value[0])
+                    values.append(value)
 
-        return self._return_with_short_cache([{"name": convert_property_value(value)} for value in flatten(values)])
+        return [{"name": convert_property_value(value)} for value in flatten(values)]
 
     @staticmethod
     def _return_with_short_cache(values) -> response.Response:
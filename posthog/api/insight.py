@@ -769,6 +769,10 @@ class InsightSerializer(InsightBasicSerializer):
                 if self.context.get("is_shared", False):
                     execution_mode = shared_insights_execution_mode(execution_mode)
 
+                # Set by the dashboard tile scheduler to look up cached results without calculating
+                if execution_mode_override := self.context.get("execution_mode_override"):
+                    execution_mode = execution_mode_override
+
                 return calculate_for_query_based_insight(
                     insight,
                     team=self.context["get_team"](),
@@ -37,7 +37,14 @@ from posthog.decorators import cached_by_filters
 from posthog.logging.timing import timed
 from posthog.metrics import LABEL_TEAM_ID
 from posthog.models import Cohort, Filter, Person, Team, User
-from posthog.models.activity_logging.activity_log import Change, Detail, load_activity, log_activity
+from posthog.models.activity_logging.activity_log import (
+    Change,
+    Detail,
+    LogActivityEntry,
+    bulk_log_activity,
+    load_activity,
+    log_activity,
+)
 from posthog.models.activity_logging.activity_page import activity_page_response
 from posthog.models.async_deletion import AsyncDeletion, DeletionType
 from posthog.models.cohort.util import get_all_cohort_ids_by_person_uuid
@@ -48,7 +55,7 @@ from posthog.models.filters.retention_filter import RetentionFilter
 from posthog.models.filters.stickiness_filter import StickinessFilter
 from posthog.models.person.deletion import reset_deleted_person_distinct_ids
 from posthog.models.person.missing_person import MissingPerson
-from posthog.models.person.util import delete_person
+from posthog.models.person.util import delete_person, delete_persons
 from posthog.queries.actor_base_query import ActorBaseQuery, get_serialized_people
 from posthog.queries.funnels import ClickhouseFunnelActors, ClickhouseFunnelTrendsActors
 from posthog.queries.funnels.funnel_strict_persons import ClickhouseFunnelStrictActors
@@ -56,6 +63,11 @@ from posthog.queries.funnels.funnel_unordered_persons import ClickhouseFunnelUno
 from posthog.queries.insight import insight_sync_execute
 from posthog.queries.person_query import PersonQuery
 from posthog.queries.properties_timeline import PropertiesTimeline
+from posthog.queries.property_value_sketches import (
+    PROPERTY_VALUE_SUGGESTIONS_TIME_HISTOGRAM,
+    PropertyValueSketchType,
+    get_property_value_suggestions,
+)
 from posthog.queries.property_values import get_person_property_values_for_key
 from posthog.queries.stickiness import Stickiness
 from posthog.queries.trends.lifecycle import Lifecycle
@@ -405,22 +417,28 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
         else:
             raise ValidationError("You need to specify either distinct_ids or ids")
 
-        for person in persons:
-            delete_person(person=person)
-            self.perform_destroy(person)
-            log_activity(
-                organization_id=self.organization.id,
-                team_id=self.team_id,
-                user=cast(User, request.user),
-                was_impersonated=is_impersonated_session(request),
-                item_id=person.pk,
-                scope="Person",
-                activity="deleted",
-                detail=Detail(name=str(person.uuid)),
-            )
-            # Once the person is deleted, queue deletion of associated data, if that was requested
-            if request.data.get("delete_events"):
-                self._queue_event_deletion(person)
+        # Persons matched by several of the distinct IDs are deleted once
+        persons_to_delete = list({person.pk: person for person in persons}.values())
+        delete_persons(self.team_id, persons_to_delete)
+        Person.objects.filter(team_id=self.team_id, pk__in=[person.pk for person in persons_to_delete]).delete()
+        bulk_log_activity(
+            [
+                LogActivityEntry(
+                    organization_id=self.organization.id,
+                    team_id=self.team_id,
+                    user=cast(User, request.user),
+                    was_impersonated=is_impersonated_session(request),
+                    item_id=person.pk,
+                    scope="Person",
+                    activity="deleted",
+                    detail=Detail(name=str(person.uuid)),
+                )
+                for person in persons_to_delete
+            ]
+        )
+        # Once the persons are deleted, queue deletion of associated data, if that was requested
+        if request.data.get("delete_events"):
+            self._queue_events_deletion(persons_to_delete)
         return response.Response(status=202)
 
     @action(methods=["GET"], detail=False, required_scopes=["person:read"])
@@ -446,8 +464,15 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
 
     @timed("get_person_property_values_for_key_timer")
     def _get_person_property_values_for_key(self, key, value):
+        suggestions = get_property_value_suggestions(self.team, PropertyValueSketchType.PERSON, key, value, limit=20)
+        if suggestions is not None:
+            return suggestions
+
         try:
-            result = get_person_property_values_for_key(key, self.team, value)
+            with PROPERTY_VALUE_SUGGESTIONS_TIME_HISTOGRAM.labels(
+                property_type=PropertyValueSketchType.PERSON.value, source="clickhouse"
+            ).time():
+                result = get_person_property_values_for_key(key, self.team, value)
             statsd.incr(
                 "get_person_property_values_for_key_success",
                 tags={"team_id": self.team.id},
@@ -905,6 +930,10 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
 
     def _queue_event_deletion(self, person: Person) -> None:
         """Helper to queue deletion of all events for a person."""
+        self._queue_events_deletion([person])
+
+    def _queue_events_deletion(self, persons: list[Person]) -> None:
+        """Helper to queue deletion of all events for each of the persons."""
         AsyncDeletion.objects.bulk_create(
             [
                 AsyncDeletion(
@@ -913,6 +942,7 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
                     key=str(person.uuid),
                     created_by=cast(User, self.request.user),
                 )
+                for person in persons
             ],
             ignore_conflicts=True,
         )
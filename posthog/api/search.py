@@ -1,8 +1,13 @@
 import re
+import operator
+from collections import defaultdict
+from functools import reduce
 from typing import Any, Literal, TypedDict, cast
 
-from django.db.models import CharField, F, Model, QuerySet, Value
-from django.db.models.functions import Cast, JSONObject
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import CharField, Count, F, Model, Q, QuerySet, Value, Window
+from django.db.models.functions import Cast, JSONObject, RowNumber
 from django.http import HttpResponse
 
 from rest_framework import serializers, viewsets
@@ -11,7 +16,19 @@ from rest_framework.response import Response
 
 from posthog.api.routing import TeamAndOrgViewSetMixin
 from posthog.helpers.full_text_search import build_rank, process_query
-from posthog.models import Action, Cohort, Dashboard, EventDefinition, Experiment, FeatureFlag, Insight, Survey
+from posthog.models import (
+    Action,
+    Cohort,
+    Dashboard,
+    EventDefinition,
+    Experiment,
+    FeatureFlag,
+    Insight,
+    SearchDocument,
+    Survey,
+)
+from posthog.models.search_document import SEARCH_DOCUMENT_ENTITIES
+from posthog.rbac.user_access_control import model_to_resource
 
 from products.notebooks.backend.models import Notebook
 
@@ -100,7 +117,10 @@ class SearchViewSet(TeamAndOrgViewSetMixin, viewsets.ViewSet):
         entities = set(params["entities"]) if params["entities"] else set(ENTITY_MAP.keys())
         query = params["q"]
 
-        results, counts = search_entities(entities, query, self.project_id, self, ENTITY_MAP)
+        if settings.SEARCH_INDEX_ENABLED:
+            results, counts = search_indexed_entities(entities, query, self.project_id, self, ENTITY_MAP)
+        else:
+            results, counts = search_entities(entities, query, self.project_id, self, ENTITY_MAP)
 
         return Response({"results": results, "counts": counts})
 
@@ -145,6 +165,118 @@ def search_entities(
     return results, counts
 
 
+def search_indexed_entities(
+    entities: set[str],
+    query: str | None,
+    project_id: int,
+    view: TeamAndOrgViewSetMixin,
+    entity_map: dict[str, EntityConfig],
+) -> tuple[list[dict[str, Any]], dict[str, int | None]]:
+    """
+    Same as `search_entities`, but the entities indexed in `SearchDocument` are searched and counted with a single
+    query of the index. Extra fields are only fetched for the results returned.
+    """
+    counts: dict[str, int | None] = {key: None for key in entity_map}
+    indexed_entities = {entity for entity in entities if entity in SEARCH_DOCUMENT_ENTITIES}
+    search = process_query(query) if query else None
+
+    results: list[dict[str, Any]] = []
+    if indexed_entities:
+        qs = SearchDocument.objects.filter(team__project_id=project_id).filter(
+            reduce(operator.or_, (_search_document_access_filter(view, entity) for entity in indexed_entities))
+        )
+        values = ["entity_type", "object_id", "result_id", "sort_name", "entity_count"]
+        if search:
+            search_query = SearchQuery(search, config="simple", search_type="raw")
+            qs = qs.filter(search_vector=search_query).annotate(rank=SearchRank(F("search_vector"), search_query))
+            qs = qs.filter(rank__gt=0.05)
+            order_by = [F("rank").desc()]
+            values.append("rank")
+        else:
+            order_by = [F("sort_name").asc(nulls_first=True)]
+
+        # Counts every entity, but only fetches the documents which can be in the results
+        qs = qs.annotate(
+            entity_count=Window(Count("id"), partition_by=[F("entity_type")]),
+            entity_position=Window(RowNumber(), partition_by=[F("entity_type")], order_by=order_by),
+        ).filter(entity_position__lte=LIMIT)
+        qs = qs.order_by("entity_type", *order_by)
+
+        counts.update({entity: 0 for entity in indexed_entities})
+        for document in qs.values(*values):
+            counts[document["entity_type"]] = document["entity_count"]
+            results.append(
+                {
+                    "type": document["entity_type"],
+                    "result_id": document["result_id"],
+                    "_object_id": document["object_id"],
+                    "_sort_name": document["sort_name"],
+                    **({"rank": document["rank"]} if search else {}),
+                }
+            )
+
+    for entity in entities - indexed_entities:
+        entity_meta = entity_map[entity]
+        klass_qs, entity_name = class_queryset(
+            view=view,
+            klass=entity_meta["klass"],
+            project_id=project_id,
+            query=query,
+            search_fields=entity_meta["search_fields"],
+            extra_fields=entity_meta["extra_fields"],
+        )
+        counts[entity_name] = klass_qs.count()
+        klass_qs = klass_qs.order_by("-rank") if search else klass_qs.order_by(F("_sort_name").asc(nulls_first=True))
+        results.extend(klass_qs[:LIMIT])
+
+    # Results are already sorted by name within each entity
+    if search:
+        results.sort(key=lambda result: result["rank"], reverse=True)
+    else:
+        results.sort(key=lambda result: result["type"])
+    results = results[:LIMIT]
+
+    _add_extra_fields(results, entity_map)
+    for result in results:
+        result.pop("_sort_name", None)
+    return results, counts
+
+
+def _search_document_access_filter(view: TeamAndOrgViewSetMixin, entity: str) -> Q:
+    """Filters the documents of the entity by the access controls of their objects."""
+    klass = SEARCH_DOCUMENT_ENTITIES[entity].klass
+    access_filter = Q(entity_type=entity)
+    resource = model_to_resource(klass)
+    if resource:
+        resource_filter = view.user_access_control.access_level_filter_for_resource(
+            resource,
+            id_field="object_id",
+            creator_field="created_by" if hasattr(klass, "created_by") else None,
+        )
+        if resource_filter is not None:
+            access_filter &= resource_filter
+    return access_filter
+
+
+def _add_extra_fields(results: list[dict[str, Any]], entity_map: dict[str, EntityConfig]) -> None:
+    """Fetches the extra fields of the indexed results from their models, with one query per entity."""
+    results_by_entity: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for result in results:
+        if "_object_id" in result:
+            results_by_entity[result["type"]].append(result)
+
+    for entity, entity_results in results_by_entity.items():
+        entity_meta = entity_map[entity]
+        extra_fields = {
+            str(row.pop("pk")): row
+            for row in entity_meta["klass"]
+            .objects.filter(pk__in=[result["_object_id"] for result in entity_results])
+            .values("pk", *entity_meta["extra_fields"])
+        }
+        for result in entity_results:
+            result["extra_fields"] = extra_fields.get(result.pop("_object_id"), {})
+
+
 def class_queryset(
     view: TeamAndOrgViewSetMixin,
     klass: type[Model],
@@ -45,6 +45,8 @@ from posthog.models import Action
 from posthog.models.activity_logging.activity_log import Change, Detail, changes_between, load_activity, log_activity
 from posthog.models.activity_logging.activity_page import activity_page_response
 from posthog.models.feature_flag import FeatureFlag
+from posthog.models.search_document import sync_search_documents
+from posthog.models.surveys.rollups import SURVEY_EVENTS_STATES_SQL, SurveyEventsRollupRange, get_rollup_range
 from posthog.models.surveys.survey import MAX_ITERATION_COUNT, Survey, ensure_question_ids, surveys_hypercache
 from posthog.models.surveys.util import (
     SurveyEventName,
@@ -879,30 +881,41 @@ class SurveyViewSet(TeamAndOrgViewSetMixin, AccessControlViewSetMixin, viewsets.
             # If there are no surveys or none have a start date, there can be no responses.
             return Response({})
 
-        partial_responses_filter = self._get_partial_responses_filter(
-            base_conditions_sql=[
-                "team_id = %(team_id)s",
-                "timestamp >= %(timestamp)s",
-            ],
-        )
-
-        query = f"""
-            SELECT
-                JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') as survey_id,
-                count()
-            FROM events
-            WHERE
-                team_id = %(team_id)s
-                AND event = '{SurveyEventName.SENT}'
-                AND timestamp >= %(timestamp)s
-                AND {partial_responses_filter}
-            GROUP BY survey_id
-        """
+        rollup_range = get_rollup_range(earliest_survey_start_date, None)
+        if rollup_range is not None:
+            # Closed days are read from the daily rollup, only the rest from events
+            sent_states = SURVEY_EVENTS_STATES_SQL(rollup_range, event_filter=f"AND event = '{SurveyEventName.SENT}'")
+            query = f"""
+                SELECT survey_id, uniqExactMerge(submissions_state)
+                FROM ({sent_states})
+                GROUP BY survey_id
+            """
+            data = sync_execute(query, {"team_id": self.team_id, **rollup_range.params})
+        else:
+            partial_responses_filter = self._get_partial_responses_filter(
+                base_conditions_sql=[
+                    "team_id = %(team_id)s",
+                    "timestamp >= %(timestamp)s",
+                ],
+            )
 
-        data = sync_execute(
-            query,
-            {"team_id": self.team_id, "timestamp": earliest_survey_start_date},
-        )
+            query = f"""
+                SELECT
+                    JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') as survey_id,
+                    count()
+                FROM events
+                WHERE
+                    team_id = %(team_id)s
+                    AND event = '{SurveyEventName.SENT}'
+                    AND timestamp >= %(timestamp)s
+                    AND {partial_responses_filter}
+                GROUP BY survey_id
+            """
+
+            data = sync_execute(
+                query,
+                {"team_id": self.team_id, "timestamp": earliest_survey_start_date},
+            )
 
         counts = {}
         for survey_id, count in data:
@@ -1039,53 +1052,9 @@ class SurveyViewSet(TeamAndOrgViewSetMixin, AccessControlViewSetMixin, viewsets.
             }
         return rates
 
-    def _get_survey_stats(self, date_from: str | None, date_to: str | None, survey_id: str | None = None) -> dict:
-        """Get survey statistics from ClickHouse.
-
-        Args:
-            date_from: Optional ISO timestamp for start date with timezone info
-            date_to: Optional ISO timestamp for end date with timezone info
-            survey_id: Optional survey ID to filter for. If None, gets stats for all surveys.
-
-        Returns:
-            Dictionary containing survey statistics and rates
-        """
-        parsed_from, parsed_to = self._validate_and_parse_dates(date_from, date_to)
-
-        # Build query parameters
-        params: dict[str, Any] = {"team_id": str(self.team_id)}
-        date_filter = ""
-
-        if parsed_from:
-            date_filter += " AND timestamp >= %(date_from)s"
-            params["date_from"] = parsed_from
-        if parsed_to:
-            date_filter += " AND timestamp <= %(date_to)s"
-            params["date_to"] = parsed_to
-
-        # Add survey filter if specific survey
-        survey_filter = ""
-        if survey_id:
-            survey_filter = f"AND JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') = %(survey_id)s"
-            params["survey_id"] = str(survey_id)
-        else:
-            # For global stats, only include non-archived surveys
-            active_survey_ids = list(
-                Survey.objects.filter(team_id=self.team_id, archived=False).values_list("id", flat=True)
-            )
-            if not active_survey_ids:
-                return {
-                    "stats": {},
-                    "rates": {
-                        "response_rate": 0.0,
-                        "dismissal_rate": 0.0,
-                        "unique_users_response_rate": 0.0,
-                        "unique_users_dismissal_rate": 0.0,
-                    },
-                }
-            survey_filter = f"AND JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') IN %(survey_ids)s"
-            params["survey_ids"] = [str(id) for id in active_survey_ids]
-
+    def _get_survey_stats_from_events(
+        self, survey_filter: str, date_filter: str, query_params: dict[str, Any]
+    ) -> tuple[list, int]:
         partial_responses_filter = self._get_partial_responses_filter(
             base_conditions_sql=[
                 "team_id = %(team_id)s",
@@ -1117,12 +1086,6 @@ class SurveyViewSet(TeamAndOrgViewSetMixin, AccessControlViewSetMixin, viewsets.
             )
             GROUP BY event
         """
-        query_params = {
-            **params,
-            "shown": SurveyEventName.SHOWN.value,
-            "dismissed": SurveyEventName.DISMISSED.value,
-            "sent": SurveyEventName.SENT.value,
-        }
         results_base = sync_execute(base_stats_query, query_params)
 
         # Query 2: Count of unique persons who both dismissed AND sent
@@ -1148,6 +1111,108 @@ class SurveyViewSet(TeamAndOrgViewSetMixin, AccessControlViewSetMixin, viewsets.
         dismissed_and_sent_count_result = sync_execute(dismissed_and_sent_query, query_params)
         dismissed_and_sent_count = dismissed_and_sent_count_result[0][0] if dismissed_and_sent_count_result else 0
 
+        return results_base, dismissed_and_sent_count
+
+    def _get_survey_stats_from_rollup(
+        self, rollup_range: SurveyEventsRollupRange, query_params: dict[str, Any]
+    ) -> tuple[list, int]:
+        """Same as `_get_survey_stats_from_events`, with the closed days of the range read from the daily rollup."""
+        query_params = {**query_params, **rollup_range.params}
+        if "survey_id" in query_params:
+            survey_filter = "AND survey_id = %(survey_id)s"
+        else:
+            survey_filter = "AND survey_id IN %(survey_ids)s"
+
+        # Sent events are counted once per submission
+        base_stats_query = f"""
+            SELECT
+                event as event_name,
+                if(event = %(sent)s, uniqExactMerge(submissions_state), sum(total_count)) as total_count,
+                uniqExactMerge(persons_state) as unique_persons,
+                min(first_seen) as first_seen,
+                max(last_seen) as last_seen
+            FROM ({SURVEY_EVENTS_STATES_SQL(rollup_range, survey_filter=survey_filter)})
+            GROUP BY event
+        """
+        results_base = sync_execute(base_stats_query, query_params)
+
+        # Persons who both dismissed AND sent, from the size of the union of both sets of persons
+        dismissed_and_sent_states = SURVEY_EVENTS_STATES_SQL(
+            rollup_range, survey_filter=survey_filter, event_filter="AND event IN (%(dismissed)s, %(sent)s)"
+        )
+        dismissed_and_sent_query = f"""
+            SELECT
+                uniqExactMergeIf(persons_state, event = %(dismissed)s)
+                + uniqExactMergeIf(persons_state, event = %(sent)s)
+                - uniqExactMerge(persons_state)
+            FROM ({dismissed_and_sent_states})
+        """
+        dismissed_and_sent_count_result = sync_execute(dismissed_and_sent_query, query_params)
+        dismissed_and_sent_count = dismissed_and_sent_count_result[0][0] if dismissed_and_sent_count_result else 0
+
+        return results_base, dismissed_and_sent_count
+
+    def _get_survey_stats(self, date_from: str | None, date_to: str | None, survey_id: str | None = None) -> dict:
+        """Get survey statistics from ClickHouse.
+
+        Args:
+            date_from: Optional ISO timestamp for start date with timezone info
+            date_to: Optional ISO timestamp for end date with timezone info
+            survey_id: Optional survey ID to filter for. If None, gets stats for all surveys.
+
+        Returns:
+            Dictionary containing survey statistics and rates
+        """
+        parsed_from, parsed_to = self._validate_and_parse_dates(date_from, date_to)
+
+        # Build query parameters
+        params: dict[str, Any] = {"team_id": str(self.team_id)}
+        date_filter = ""
+
+        if parsed_from:
+            date_filter += " AND timestamp >= %(date_from)s"
+            params["date_from"] = parsed_from
+        if parsed_to:
+            date_filter += " AND timestamp <= %(date_to)s"
+            params["date_to"] = parsed_to
+
+        # Add survey filter if specific survey
+        survey_filter = ""
+        if survey_id:
+            survey_filter = f"AND JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') = %(survey_id)s"
+            params["survey_id"] = str(survey_id)
+        else:
+            # For global stats, only include non-archived surveys
+            active_survey_ids = list(
+                Survey.objects.filter(team_id=self.team_id, archived=False).values_list("id", flat=True)
+            )
+            if not active_survey_ids:
+                return {
+                    "stats": {},
+                    "rates": {
+                        "response_rate": 0.0,
+                        "dismissal_rate": 0.0,
+                        "unique_users_response_rate": 0.0,
+                        "unique_users_dismissal_rate": 0.0,
+                    },
+                }
+            survey_filter = f"AND JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') IN %(survey_ids)s"
+            params["survey_ids"] = [str(id) for id in active_survey_ids]
+
+        query_params = {
+            **params,
+            "shown": SurveyEventName.SHOWN.value,
+            "dismissed": SurveyEventName.DISMISSED.value,
+            "sent": SurveyEventName.SENT.value,
+        }
+        rollup_range = get_rollup_range(parsed_from, parsed_to)
+        if rollup_range is not None:
+            results_base, dismissed_and_sent_count = self._get_survey_stats_from_rollup(rollup_range, query_params)
+        else:
+            results_base, dismissed_and_sent_count = self._get_survey_stats_from_events(
+                survey_filter, date_filter, query_params
+            )
+
         # Process initial stats
         stats = self._process_survey_results(results_base)
 
@@ -1440,6 +1505,7 @@ class SurveyViewSet(TeamAndOrgViewSetMixin, AccessControlViewSetMixin, viewsets.
 
                 # Bulk create all surveys
                 created_survey_objects = Survey.objects.bulk_create(surveys_to_create)
+                sync_search_documents("survey", created_survey_objects)
 
                 # Prepare response data and activity logs
                 for created_survey in created_survey_objects:
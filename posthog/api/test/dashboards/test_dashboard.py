@@ -1,4 +1,8 @@
 import json
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 from freezegun import freeze_time
 from posthog.test.base import APIBaseTest, FuzzyInt, QueryMatchingTest, snapshot_postgres_queries
@@ -9,15 +13,18 @@ from django.test import override_settings
 from django.utils import timezone
 from django.utils.timezone import now
 
+from asgiref.sync import async_to_sync
 from dateutil.parser import isoparse
 from rest_framework import status
 
-from posthog.api.dashboards.dashboard import DashboardSerializer
+from posthog.api.dashboards.dashboard import DashboardSerializer, serialize_tiles, serialize_tiles_as_completed
 from posthog.api.test.dashboards import DashboardAPI
+from posthog.clickhouse.query_tagging import get_query_tags, tags_context
 from posthog.constants import AvailableFeature
 from posthog.helpers.dashboard_templates import create_group_type_mapping_detail_dashboard
 from posthog.hogql_queries.legacy_compatibility.filter_to_query import filter_to_query
-from posthog.models import Dashboard, DashboardTile, Filter, Insight, Team, User
+from posthog.hogql_queries.query_runner import ExecutionMode
+from posthog.models import Dashboard, DashboardTile, Filter, Insight, Team, Text, User
 from posthog.models.file_system.file_system_view_log import FileSystemViewLog
 from posthog.models.insight_variable import InsightVariable
 from posthog.models.organization import Organization
@@ -1969,6 +1976,125 @@ class TestDashboard(APIBaseTest, QueryMatchingTest):
         self.assertEqual(regular_response["persisted_variables"], dashboard_variables)
         self.assertEqual(sse_dashboard["persisted_variables"], dashboard_variables)
 
+    def test_stream_tiles_serves_cache_hits_before_calculating(self):
+        dashboard = Dashboard.objects.create(team=self.team, name="Test Dashboard", created_by=self.user)
+        tiles = [
+            DashboardTile.objects.create(
+                dashboard=dashboard,
+                text=Text.objects.create(team=self.team, body=f"tile {y}"),
+                layouts={"sm": {"x": 0, "y": y}},
+            )
+            for y in range(5)
+        ]
+        cached_tile_ids = {tiles[3].id}
+
+        with patch(
+            "posthog.api.dashboards.dashboard._is_fresh_cache_hit",
+            side_effect=lambda tile_data: tile_data["id"] in cached_tile_ids,
+        ):
+            response = self.client.get(
+                f"/api/projects/{self.team.id}/dashboards/{dashboard.id}/stream_tiles/?refresh=blocking"
+            )
+            content = b"".join(response.streaming_content).decode("utf-8")  # type: ignore
+
+        events = [json.loads(line[6:]) for line in content.split("\n") if line.startswith("data: ")]
+        assert [event["type"] for event in events] == ["metadata", "tile", "tile", "tile", "complete"]
+        assert [tile["id"] for tile in events[0]["dashboard"]["tiles"]] == [tiles[0].id, tiles[1].id]
+        # The cached tile goes first, the rest follow in layout order
+        assert [(event["order"], event["tile"]["id"]) for event in events[1:4]] == [
+            (3, tiles[3].id),
+            (2, tiles[2].id),
+            (4, tiles[4].id),
+        ]
+
+    @override_settings(DASHBOARD_TILE_CONCURRENCY=2)
+    def test_serialize_tiles_concurrently(self):
+        dashboard = Dashboard.objects.create(team=self.team, name="Test Dashboard", created_by=self.user)
+        tiles = [DashboardTile(id=tile_id, dashboard=dashboard) for tile_id in range(6)]
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+        tagged_team_ids = []
+
+        def serialize_tile(tile, order, context):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+                tagged_team_ids.append(get_query_tags().team_id)
+            # Later tiles finish first
+            time.sleep(0.01 * (6 - order))
+            with lock:
+                running -= 1
+            return order, {"id": tile.id}
+
+        with (
+            patch("posthog.api.dashboards.dashboard.serialize_tile_with_context", side_effect=serialize_tile),
+            tags_context(team_id=self.team.pk),
+        ):
+            # Two requests for dashboards of the same team share its limit
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = list(
+                    executor.map(
+                        lambda _: contextvars.copy_context().run(serialize_tiles, tiles, {"dashboard": dashboard}),
+                        range(2),
+                    )
+                )
+
+        assert results == [[{"id": tile_id} for tile_id in range(6)]] * 2
+        assert max_running == 2
+        assert tagged_team_ids == [self.team.pk] * 12
+
+    @override_settings(DASHBOARD_TILE_CONCURRENCY=2)
+    def test_serialize_tiles_as_completed_concurrently(self):
+        dashboard = Dashboard.objects.create(team=self.team, name="Test Dashboard", created_by=self.user)
+        tiles = [(order, DashboardTile(id=order, dashboard=dashboard)) for order in range(6)]
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+        thread_ids = set()
+        serialized_tile_ids = []
+
+        def serialize_tile(tile, order, context):
+            nonlocal running, max_running
+            cache_only = context.get("execution_mode_override") == ExecutionMode.CACHE_ONLY_NEVER_CALCULATE
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+                thread_ids.add(threading.get_ident())
+                serialized_tile_ids.append(tile.id)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            if cache_only and tile.id != 4:
+                return order, {"id": tile.id, "insight": {"is_cached": False, "result": None}}
+            return order, {"id": tile.id, "insight": {"is_cached": cache_only, "result": [tile.id]}}
+
+        async def collect():
+            return [
+                (order, tile_data)
+                async for order, _, tile_data in serialize_tiles_as_completed(tiles, {"dashboard": dashboard})
+            ]
+
+        with (
+            patch("posthog.api.dashboards.dashboard.serialize_tile_with_context", side_effect=serialize_tile),
+            patch(
+                "posthog.api.dashboards.dashboard._tile_execution_mode",
+                return_value=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
+            ),
+        ):
+            results = async_to_sync(collect)()
+
+        # The cache hit goes first and is serialized once, the other tiles are calculated after the cache is checked
+        assert results[0] == (4, {"id": 4, "insight": {"is_cached": True, "result": [4]}})
+        assert sorted(results[1:]) == [
+            (order, {"id": order, "insight": {"is_cached": False, "result": [order]}}) for order in (0, 1, 2, 3, 5)
+        ]
+        assert sorted(serialized_tile_ids) == [0, 0, 1, 1, 2, 2, 3, 3, 4, 5, 5]
+        assert max_running == 2
+        # Tiles are calculated in worker threads rather than on the request's thread
+        assert threading.get_ident() not in thread_ids
+
     def test_create_unlisted_dashboard_creates_tags_without_tagging_feature(self):
         """Test that unlisted dashboards get tags even if org doesn't have TAGGING feature"""
         # Remove TAGGING feature from organization
@@ -25,6 +25,7 @@ from rest_framework import status
 from posthog.models import Action, Element, Organization, Person, PropertyDefinition, User
 from posthog.models.cohort import Cohort
 from posthog.models.event.query_event_list import insight_query_with_columns
+from posthog.tasks.tasks import refresh_property_value_sketches
 from posthog.test.test_journeys import journeys_for
 
 
@@ -425,6 +426,60 @@ class TestEvents(ClickhouseTestMixin, APIBaseTest):
             ).json()
             assert response == []
 
+    def test_event_property_values_from_sketch(self):
+        with freeze_time("2020-01-20 20:00:00"):
+            for browser in ["Chrome", "Firefox", "Chrome"]:
+                _create_event(distinct_id="bla", event="$pageview", team=self.team, properties={"$browser": browser})
+
+            # Not sketched yet, read from the events
+            response = self.client.get(f"/api/projects/{self.team.id}/events/values/?key=$browser").json()
+            assert sorted(value["name"] for value in response) == ["Chrome", "Firefox"]
+
+        with freeze_time("2020-01-20 20:01:00"):
+            refresh_property_value_sketches()
+            _create_event(distinct_id="bla", event="$pageview", team=self.team, properties={"$browser": "Safari"})
+
+            with patch("posthog.api.event.execute_hogql_query") as execute_hogql_query_mock:
+                response = self.client.get(f"/api/projects/{self.team.id}/events/values/?key=$browser").json()
+                assert [value["name"] for value in response] == ["Chrome", "Firefox"]
+
+                response = self.client.get(
+                    f"/api/projects/{self.team.id}/events/values/?key=$browser&value=FIRE"
+                ).json()
+                assert [value["name"] for value in response] == ["Firefox"]
+
+                execute_hogql_query_mock.assert_not_called()
+
+        with freeze_time("2020-01-20 20:02:00"):
+            refresh_property_value_sketches()
+
+            # The counts of the previous refresh decayed, so Safari is ranked before Firefox
+            response = self.client.get(f"/api/projects/{self.team.id}/events/values/?key=$browser").json()
+            assert [value["name"] for value in response] == ["Chrome", "Safari", "Firefox"]
+
+            # Values of specific events are read from the events
+            response = self.client.get(
+                f"/api/projects/{self.team.id}/events/values/?key=$browser&event_name=$autocapture"
+            ).json()
+            assert response == []
+
+    @patch("posthog.queries.property_value_sketches.PROPERTY_VALUE_SKETCH_SIZE", 2)
+    def test_event_property_values_from_full_sketch(self):
+        with freeze_time("2020-01-20 20:00:00"):
+            for browser in ["Chrome", "Chrome", "Firefox", "Firefox", "Safari"]:
+                _create_event(distinct_id="bla", event="$pageview", team=self.team, properties={"$browser": browser})
+            self.client.get(f"/api/projects/{self.team.id}/events/values/?key=$browser")
+
+        with freeze_time("2020-01-20 20:01:00"):
+            refresh_property_value_sketches()
+
+            # Safari was dropped from the full sketch, so searches which don't fill the suggestions read the events
+            response = self.client.get(f"/api/projects/{self.team.id}/events/values/?key=$browser&value=saf").json()
+            assert [value["name"] for value in response] == ["Safari"]
+
+            response = self.client.get(f"/api/projects/{self.team.id}/events/values/?key=$browser").json()
+            assert [value["name"] for value in response] == ["Chrome", "Firefox"]
+
     @also_test_with_materialized_columns(["test_prop"])
     @freeze_time("2020-01-20 20:00:00")
     @snapshot_clickhouse_queries
@@ -26,11 +26,12 @@ from temporalio import common
 
 import posthog.models.person.deletion
 from posthog.clickhouse.client import sync_execute
-from posthog.models import Cohort, Organization, Person, PropertyDefinition, Team
+from posthog.models import ActivityLog, Cohort, Organization, Person, PropertyDefinition, Team
 from posthog.models.async_deletion import AsyncDeletion, DeletionType
 from posthog.models.person import PersonDistinctId
 from posthog.models.person.sql import PERSON_DISTINCT_ID2_TABLE
 from posthog.models.person.util import create_person, create_person_distinct_id
+from posthog.tasks.tasks import refresh_property_value_sketches
 from posthog.temporal.delete_recordings.types import RecordingsWithPersonInput
 
 
@@ -176,6 +177,33 @@ class TestPerson(ClickhouseTestMixin, APIBaseTest):
         self.assertEqual(response.json()[0]["name"], "qwerty")
         self.assertEqual(response.json()[0]["count"], 1)
 
+    def test_person_property_values_from_sketch(self):
+        with freeze_time("2020-01-20 20:00:00"):
+            for index, value in enumerate(["asdf", "qwerty", "asdf"]):
+                _create_person(distinct_ids=[f"person_{index}"], team=self.team, properties={"random_prop": value})
+            flush_persons_and_events()
+
+            # Not sketched yet, read from the persons
+            response = self.client.get("/api/person/values/?key=random_prop").json()
+            self.assertEqual(response, [{"name": "asdf", "count": 2}, {"name": "qwerty", "count": 1}])
+
+        with freeze_time("2020-01-20 20:01:00"):
+            refresh_property_value_sketches()
+            for index in [3, 4]:
+                _create_person(distinct_ids=[f"person_{index}"], team=self.team, properties={"random_prop": "qwerty"})
+            flush_persons_and_events()
+
+            with patch("posthog.api.person.get_person_property_values_for_key") as get_values_mock:
+                response = self.client.get("/api/person/values/?key=random_prop&value=QW").json()
+                self.assertEqual(response, [{"name": "qwerty", "count": 1}])
+                get_values_mock.assert_not_called()
+
+        with freeze_time("2020-01-20 20:02:00"):
+            refresh_property_value_sketches()
+
+            response = self.client.get("/api/person/values/?key=random_prop").json()
+            self.assertEqual(response, [{"name": "qwerty", "count": 3}, {"name": "asdf", "count": 2}])
+
     @also_test_with_materialized_columns(event_properties=["email"], person_properties=["email"])
     @snapshot_clickhouse_queries
     def test_filter_person_email(self):
@@ -558,6 +586,58 @@ class TestPerson(ClickhouseTestMixin, APIBaseTest):
         )[0][0]
         self.assertEqual(ch_events, 3)
 
+    @freeze_time("2021-08-25T22:09:14.252Z")
+    def test_bulk_delete_matches_deleting_each_person(self):
+        person = _create_person(
+            team=self.team,
+            distinct_ids=["person_1", "anonymous_id"],
+            properties={"$os": "Chrome"},
+            immediate=True,
+        )
+        person2 = _create_person(
+            team=self.team,
+            distinct_ids=["person_2"],
+            properties={"$os": "Chrome"},
+            immediate=True,
+        )
+
+        # Both distinct IDs of the first person match it
+        response = self.client.post(
+            f"/api/person/bulk_delete/",
+            {"distinct_ids": ["person_1", "anonymous_id", "person_2"], "delete_events": True},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.content)
+        self.assertEqual(Person.objects.filter(team=self.team).count(), 0)
+        self.assertEqual(PersonDistinctId.objects.filter(team=self.team).count(), 0)
+
+        ch_persons = sync_execute(
+            "SELECT id, version, is_deleted FROM person FINAL WHERE team_id = %(team_id)s ORDER BY id",
+            {"team_id": self.team.pk},
+        )
+        self.assertEqual(sorted([(person.uuid, 100, 1), (person2.uuid, 100, 1)]), ch_persons)
+        ch_distinct_ids = sync_execute(
+            f"SELECT distinct_id, person_id, version, is_deleted FROM {PERSON_DISTINCT_ID2_TABLE} FINAL WHERE team_id = %(team_id)s ORDER BY distinct_id",
+            {"team_id": self.team.pk},
+        )
+        self.assertEqual(
+            [
+                ("anonymous_id", person.uuid, 100, 1),
+                ("person_1", person.uuid, 100, 1),
+                ("person_2", person2.uuid, 100, 1),
+            ],
+            ch_distinct_ids,
+        )
+
+        deleted_logs = ActivityLog.objects.filter(team_id=self.team.pk, scope="Person", activity="deleted")
+        self.assertEqual(
+            sorted([str(person.pk), str(person2.pk)]), sorted(deleted_logs.values_list("item_id", flat=True))
+        )
+        self.assertEqual(
+            sorted([str(person.uuid), str(person2.uuid)]),
+            sorted(AsyncDeletion.objects.filter(team_id=self.team.pk).values_list("key", flat=True)),
+        )
+
     @freeze_time("2021-08-25T22:09:14.252Z")
     def test_split_people_keep_props(self) -> None:
         # created first
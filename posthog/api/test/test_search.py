@@ -2,13 +2,19 @@ import pytest
 from posthog.test.base import APIBaseTest
 
 from django.db import connection
+from django.test import override_settings
 
+from posthog.api.search import ENTITY_MAP, LIMIT
+from posthog.constants import AvailableFeature
 from posthog.helpers.full_text_search import process_query
-from posthog.models import Dashboard, FeatureFlag, Insight, Team
+from posthog.models import Dashboard, DashboardTile, FeatureFlag, Insight, SearchDocument, Team, User
 from posthog.models.event_definition import EventDefinition
+from posthog.models.search_document import SEARCH_DOCUMENT_ENTITIES
 
 from products.notebooks.backend.models import Notebook
 
+from ee.models.rbac.access_control import AccessControl
+
 
 class TestSearch(APIBaseTest):
     insight_1: Insight
@@ -138,6 +144,78 @@ class TestSearch(APIBaseTest):
 
         self.assertEqual(response.status_code, 200)
 
+    def test_search_index_follows_saves_and_deletes(self):
+        self.insight_1.name = "renamed insight"
+        self.insight_1.save()
+        self.dashboard_1.deleted = True
+        self.dashboard_1.save()
+
+        response = self.client.get("/api/projects/@current/search?q=renamed")
+        self.assertEqual(response.json()["counts"]["insight"], 1)
+        self.assertEqual(response.json()["results"][0]["result_id"], self.insight_1.short_id)
+
+        response = self.client.get("/api/projects/@current/search?q=second")
+        self.assertEqual(response.json()["counts"]["insight"], 0)
+        self.assertEqual(response.json()["counts"]["dashboard"], 0)
+
+        self.notebook_1.delete()
+        self.assertFalse(
+            SearchDocument.objects.filter(entity_type="notebook", object_id=str(self.notebook_1.pk)).exists()
+        )
+
+    def test_counts_include_entities_beyond_the_results(self):
+        for i in range(LIMIT + 5):
+            Dashboard.objects.create(name=f"bulk dashboard {i}", team=self.team, created_by=self.user)
+
+        response = self.client.get("/api/projects/@current/search?q=bulk")
+
+        self.assertEqual(len(response.json()["results"]), LIMIT)
+        self.assertEqual(response.json()["counts"]["dashboard"], LIMIT + 5)
+        self.assertEqual(response.json()["counts"]["insight"], 0)
+
+    def test_search_respects_access_controls(self):
+        self.organization.available_product_features = [
+            {"key": AvailableFeature.ADVANCED_PERMISSIONS, "name": AvailableFeature.ADVANCED_PERMISSIONS}
+        ]
+        self.organization.save()
+        hidden_dashboard = Dashboard.objects.create(name="hidden dashboard", team=self.team, created_by=self.user)
+        AccessControl.objects.create(
+            resource="dashboard", resource_id=hidden_dashboard.id, team=self.team, access_level="none"
+        )
+
+        other_user = User.objects.create_and_join(self.organization, "other@posthog.com", None)
+        self.client.force_login(other_user)
+        response = self.client.get("/api/projects/@current/search?q=dashboard&entities=dashboard")
+        self.assertEqual(response.json()["counts"]["dashboard"], 2)
+        self.assertNotIn(str(hidden_dashboard.id), [result["result_id"] for result in response.json()["results"]])
+
+        # Creators keep access to their objects
+        self.client.force_login(self.user)
+        response = self.client.get("/api/projects/@current/search?q=dashboard&entities=dashboard")
+        self.assertEqual(response.json()["counts"]["dashboard"], 3)
+
+    def test_indexed_entities_match_entity_map(self):
+        for entity_type, entity in SEARCH_DOCUMENT_ENTITIES.items():
+            self.assertEqual(entity.klass, ENTITY_MAP[entity_type]["klass"])
+            self.assertEqual(entity.search_fields, ENTITY_MAP[entity_type]["search_fields"])
+
+
+@override_settings(SEARCH_INDEX_ENABLED=True)
+class TestIndexedSearch(TestSearch):
+    def test_search_index_follows_bulk_writes(self):
+        DashboardTile.objects.create(dashboard=self.dashboard_1, insight=self.insight_1)
+
+        self.client.patch(
+            f"/api/projects/{self.team.id}/dashboards/{self.dashboard_1.id}",
+            {"deleted": True, "delete_insights": True},
+        )
+        response = self.client.get("/api/projects/@current/search?q=second&entities=insight")
+        self.assertEqual(response.json()["counts"]["insight"], 0)
+
+        self.client.patch(f"/api/projects/{self.team.id}/dashboards/{self.dashboard_1.id}", {"deleted": False})
+        response = self.client.get("/api/projects/@current/search?q=second&entities=insight")
+        self.assertEqual(response.json()["counts"]["insight"], 1)
+
 
 @pytest.mark.django_db
 @pytest.mark.parametrize(
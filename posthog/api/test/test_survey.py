@@ -2,7 +2,7 @@ import re
 import json
 import time
 import uuid
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
 import pytest
@@ -27,10 +27,19 @@ from rest_framework import status
 
 from posthog.api.survey import nh3_clean_with_allow_list
 from posthog.api.test.test_personal_api_keys import PersonalAPIKeysBaseTest
+from posthog.clickhouse.client import sync_execute
 from posthog.constants import AvailableFeature
 from posthog.models import Action, FeatureFlag, Person, Team
 from posthog.models.cohort.cohort import Cohort
 from posthog.models.organization import Organization
+from posthog.models.surveys.rollups import (
+    SurveyEventsRolledUpDays,
+    backfill_survey_events,
+    get_rolled_up_days,
+    get_rollup_range,
+    rollup_recent_survey_events,
+)
+from posthog.models.surveys.sql import SURVEY_EVENTS_DAILY_TABLE
 from posthog.models.surveys.survey import MAX_ITERATION_COUNT, Survey
 
 
@@ -3782,6 +3791,146 @@ class TestSurveyStats(ClickhouseTestMixin, APIBaseTest):
         self.assertIn("Available variants: option_1, option_2", error_data["detail"])
 
 
+class TestSurveyEventsRollup(ClickhouseTestMixin, APIBaseTest):
+    """
+    Compares the survey stats and responses counts when the closed days are read from the daily rollup with the ones
+    read from events only.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.survey = Survey.objects.create(
+            team=self.team,
+            name="Rolled up survey",
+            type="popover",
+            questions=[{"type": "open", "question": "How are you?"}],
+            enable_partial_responses=True,
+            start_date=datetime(2024, 6, 1, tzinfo=UTC),
+        )
+        self.persons = [Person.objects.create(team=self.team, distinct_ids=[str(uuid.uuid4())]) for _ in range(4)]
+
+        submission_id = str(uuid.uuid4())
+        survey_id = str(self.survey.id)
+        events = [
+            # 2024-06-08
+            ("survey shown", 0, "2024-06-08 09:00:00", {}),
+            ("survey sent", 0, "2024-06-08 09:05:00", {}),
+            ("survey shown", 1, "2024-06-08 10:00:00", {}),
+            ("survey dismissed", 1, "2024-06-08 10:01:00", {}),
+            # 2024-06-09, a partial response which is sent twice and a partially completed dismissal
+            ("survey sent", 0, "2024-06-09 10:00:00", {}),
+            ("survey shown", 2, "2024-06-09 11:00:00", {}),
+            ("survey sent", 2, "2024-06-09 11:01:00", {"$survey_submission_id": submission_id}),
+            ("survey sent", 2, "2024-06-09 11:02:00", {"$survey_submission_id": submission_id}),
+            ("survey dismissed", 2, "2024-06-09 11:03:00", {"$survey_partially_completed": True}),
+            # 2024-06-10
+            ("survey shown", 1, "2024-06-10 08:00:00", {}),
+            ("survey sent", 1, "2024-06-10 08:02:00", {}),
+            ("survey shown", 3, "2024-06-10 12:00:00", {}),
+            # 2024-06-11, today, which isn't rolled up yet
+            ("survey shown", 3, "2024-06-11 07:00:00", {}),
+            ("survey dismissed", 3, "2024-06-11 07:01:00", {}),
+        ]
+        for event, person_index, timestamp, properties in events:
+            _create_event(
+                team=self.team,
+                event=event,
+                distinct_id=self.persons[person_index].distinct_ids[0],
+                timestamp=timestamp,
+                properties={"$survey_id": survey_id, **properties},
+            )
+        flush_persons_and_events()
+
+    def _get_stats(self, date_from: str | None = None, date_to: str | None = None) -> dict[str, Any]:
+        params = {key: value for key, value in {"date_from": date_from, "date_to": date_to}.items() if value}
+        response = self.client.get(f"/api/projects/{self.team.id}/surveys/{self.survey.id}/stats/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def _get_responses_count(self) -> dict[str, int]:
+        response = self.client.get(f"/api/projects/{self.team.id}/surveys/responses_count")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def _rollup(self) -> None:
+        rollup_recent_survey_events(today=date(2024, 6, 11))
+        backfill_survey_events(days=2)
+
+    @freeze_time("2024-06-11 10:00:00")
+    def test_rolled_up_days(self):
+        self._rollup()
+
+        self.assertEqual(
+            get_rolled_up_days(), SurveyEventsRolledUpDays(first_day=date(2024, 6, 7), end_day=date(2024, 6, 11))
+        )
+        rollup_range = get_rollup_range(datetime(2024, 6, 8, 12, tzinfo=UTC), datetime(2024, 6, 10, 12, tzinfo=UTC))
+        assert rollup_range is not None
+        self.assertEqual((rollup_range.rollup_from, rollup_range.rollup_to), (date(2024, 6, 9), date(2024, 6, 10)))
+        self.assertIsNone(
+            get_rollup_range(datetime(2024, 6, 10, 12, tzinfo=UTC), datetime(2024, 6, 11, 12, tzinfo=UTC))
+        )
+
+    @freeze_time("2024-06-11 10:00:00")
+    def test_survey_stats_match_events(self):
+        date_ranges = [
+            (None, None),
+            ("2024-06-08T00:00:00Z", None),
+            ("2024-06-08T09:30:00Z", "2024-06-10T09:00:00Z"),
+            ("2024-06-09T00:00:00Z", "2024-06-11T00:00:00Z"),
+        ]
+        expected = [self._get_stats(date_from, date_to) for date_from, date_to in date_ranges]
+
+        self._rollup()
+
+        for (date_from, date_to), expected_stats in zip(date_ranges, expected):
+            self.assertEqual(self._get_stats(date_from, date_to), expected_stats, (date_from, date_to))
+
+        stats = expected[0]["stats"]
+        self.assertEqual(stats["survey sent"]["total_count"], 4)
+        self.assertEqual(stats["survey sent"]["unique_persons"], 3)
+        self.assertEqual(stats["survey dismissed"]["total_count"], 2)
+        # Person 1 dismissed and later sent the survey
+        self.assertEqual(stats["survey dismissed"]["unique_persons"], 1)
+
+    @freeze_time("2024-06-11 10:00:00")
+    def test_rollup_rows(self):
+        self._rollup()
+
+        rows = sync_execute(
+            f"""
+            SELECT day, event, total_count, uniqExactMerge(persons_state), uniqExactMerge(submissions_state)
+            FROM {SURVEY_EVENTS_DAILY_TABLE} FINAL
+            WHERE team_id = %(team_id)s
+            GROUP BY day, event, total_count
+            ORDER BY day, event
+            """,
+            {"team_id": self.team.pk},
+        )
+
+        self.assertEqual(
+            rows,
+            [
+                (date(2024, 6, 8), "survey dismissed", 1, 1, 0),
+                (date(2024, 6, 8), "survey sent", 1, 1, 1),
+                (date(2024, 6, 8), "survey shown", 2, 2, 0),
+                # The partially completed dismissal isn't rolled up, and the partial response is a single submission
+                (date(2024, 6, 9), "survey sent", 3, 2, 2),
+                (date(2024, 6, 9), "survey shown", 1, 1, 0),
+                (date(2024, 6, 10), "survey sent", 1, 1, 1),
+                (date(2024, 6, 10), "survey shown", 2, 2, 0),
+            ],
+        )
+
+    @freeze_time("2024-06-11 10:00:00")
+    def test_responses_count_match_events(self):
+        expected = self._get_responses_count()
+
+        self._rollup()
+
+        self.assertEqual(self._get_responses_count(), expected)
+        self.assertEqual(expected, {str(self.survey.id): 4})
+
+
 class TestExternalSurveyValidation(APIBaseTest):
     """Test external survey specific validation logic"""
 
@@ -0,0 +1,140 @@
+"""
+Converts values read from ClickHouse's HTTP interface into the Python values `clickhouse_driver` returns.
+
+The HTTP interface returns rows as JSON, so e.g. dates, UUIDs and decimals come back as strings. The async query path
+converts them based on the column types ClickHouse returns along with the rows, so that callers get the same results
+no matter which client ran the query.
+
+The query needs to be run with the settings in `HTTP_OUTPUT_SETTINGS`, so values that JSON can't represent
+(64-bit integers, decimals, NaN and infinity) come back as strings.
+"""
+
+import re
+import uuid
+import decimal
+import datetime as dt
+import ipaddress
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+from zoneinfo import ZoneInfo
+
+HTTP_OUTPUT_SETTINGS = {
+    "output_format_json_quote_64bit_integers": 1,
+    "output_format_json_quote_decimals": 1,
+    "output_format_json_quote_denormals": 1,
+    "output_format_json_named_tuples_as_objects": 0,
+}
+
+Converter = Callable[[Any], Any]
+
+_TYPE_WITH_ARGUMENTS = re.compile(r"^(\w+)\((.*)\)$", re.DOTALL)
+# Named tuple elements, e.g. `Tuple(a String, b UInt8)`
+_NAMED_ELEMENT = re.compile(r"^[A-Za-z_]\w*\s+(.+)$", re.DOTALL)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def split_type_arguments(arguments: str) -> list[str]:
+    """Splits e.g. `String, Array(Tuple(UInt8, String))` into its top level arguments."""
+    parts: list[str] = []
+    depth = 0
+    in_quote = False
+    start = 0
+    for index, char in enumerate(arguments):
+        if char == "'" and (index == 0 or arguments[index - 1] != "\\"):
+            in_quote = not in_quote
+        elif in_quote:
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(arguments[start:index].strip())
+            start = index + 1
+    last = arguments[start:].strip()
+    if last:
+        parts.append(last)
+    return parts
+
+
+def _timezone_argument(arguments: list[str]) -> ZoneInfo | None:
+    for argument in arguments:
+        if argument.startswith("'"):
+            return ZoneInfo(argument.strip("'"))
+    return None
+
+
+def _datetime_converter(timezone: ZoneInfo | None) -> Converter:
+    def convert(value: str) -> dt.datetime:
+        date_part, _, fraction = value.partition(".")
+        parsed = dt.datetime.fromisoformat(date_part)
+        if fraction:
+            # DateTime64 can have up to nanosecond precision, Python only keeps microseconds
+            parsed = parsed.replace(microsecond=int(fraction[:6].ljust(6, "0")))
+        return parsed.replace(tzinfo=timezone) if timezone else parsed
+
+    return convert
+
+
+def _nullable(convert: Converter) -> Converter:
+    return lambda value: None if value is None else convert(value)
+
+
+@lru_cache(maxsize=1024)
+def converter_for_type(type_name: str) -> Converter:
+    """Returns a function converting a JSON value of the ClickHouse type into its `clickhouse_driver` value."""
+    type_name = type_name.strip()
+    match = _TYPE_WITH_ARGUMENTS.match(type_name)
+    base, arguments = (match.group(1), split_type_arguments(match.group(2))) if match else (type_name, [])
+
+    if base in ("Nullable", "LowCardinality", "SimpleAggregateFunction"):
+        return _nullable(converter_for_type(arguments[-1]))
+    if base.startswith(("Int", "UInt")):
+        return int
+    if base.startswith("Float"):
+        return float
+    if base.startswith("Decimal"):
+        return decimal.Decimal
+    if base == "Bool":
+        return bool
+    if base == "UUID":
+        return uuid.UUID
+    if base in ("Date", "Date32"):
+        return dt.date.fromisoformat
+    if base in ("DateTime", "DateTime64"):
+        return _datetime_converter(_timezone_argument(arguments))
+    if base == "IPv4":
+        return ipaddress.IPv4Address
+    if base == "IPv6":
+        return ipaddress.IPv6Address
+    if base == "Array":
+        element = converter_for_type(arguments[0])
+        if element is _identity:
+            return _identity
+        return lambda value: [element(item) for item in value]
+    if base == "Tuple":
+        elements = [converter_for_type(_element_type(argument)) for argument in arguments]
+        return lambda value: tuple(convert(item) for convert, item in zip(elements, value))
+    if base == "Map":
+        convert_key, convert_value = converter_for_type(arguments[0]), converter_for_type(arguments[1])
+        return lambda value: {convert_key(key): convert_value(item) for key, item in value.items()}
+    # Strings, enums, JSON and anything JSON already represents the same way
+    return _identity
+
+
+def _element_type(argument: str) -> str:
+    if _TYPE_WITH_ARGUMENTS.match(argument):
+        return argument
+    named = _NAMED_ELEMENT.match(argument)
+    return named.group(1) if named else argument
+
+
+def convert_rows(rows: list[list[Any]], column_types: list[str]) -> list[tuple]:
+    converters = [converter_for_type(type_name) for type_name in column_types]
+    if all(convert is _identity for convert in converters):
+        return [tuple(row) for row in rows]
+    return [tuple(convert(value) for convert, value in zip(converters, row)) for row in rows]
@@ -1,3 +1,4 @@
+import re
 import types
 import logging
 import threading
@@ -10,16 +11,22 @@ from typing import Any, Optional, Union
 
 from django.conf import settings as app_settings
 
+import orjson
+import aiohttp
 import sqlparse
+from asgiref.sync import sync_to_async
 from clickhouse_driver import Client as SyncClient
+from clickhouse_driver.errors import ServerException
 from opentelemetry import trace
 from prometheus_client import Counter
 
+from posthog.clickhouse.client.column_types import HTTP_OUTPUT_SETTINGS, convert_rows
 from posthog.clickhouse.client.connection import (
     ClickHouseUser,
     Workload,
     get_client_from_pool,
     get_default_clickhouse_workload_type,
+    get_kwargs_for_client,
 )
 from posthog.clickhouse.client.escape import substitute_params
 from posthog.clickhouse.client.tracing import trace_clickhouse_query_decorator
@@ -35,7 +42,12 @@ from posthog.cloud_utils import is_cloud
 from posthog.errors import ch_error_type, wrap_query_error
 from posthog.exceptions import ClickHouseAtCapacity
 from posthog.settings import API_QUERIES_ON_ONLINE_CLUSTER, CLICKHOUSE_PER_TEAM_QUERY_SETTINGS, TEST
-from posthog.temporal.common.clickhouse import update_query_tags_with_temporal_info
+from posthog.temporal.common.clickhouse import (
+    ClickHouseClient as AsyncClickHouseClient,
+    ClickHouseError as AsyncClickHouseError,
+    get_connection_pool,
+    update_query_tags_with_temporal_info,
+)
 from posthog.utils import generate_short_id, patchable
 
 QUERY_STARTED_COUNTER = Counter(
@@ -114,32 +126,19 @@ def validated_client_query_id() -> Optional[str]:
 logger = logging.getLogger(__name__)
 
 
-@patchable
-@trace_clickhouse_query_decorator
-def sync_execute(
-    query,
-    args=None,
-    settings=None,
-    with_column_types=False,
-    flush=True,
-    *,
-    workload: Workload = Workload.DEFAULT,
-    team_id: Optional[int] = None,
-    readonly=False,
-    sync_client: Optional[SyncClient] = None,
-    ch_user: ClickHouseUser = ClickHouseUser.DEFAULT,
-):
-    if not workload:
-        workload = Workload.DEFAULT
-        # TODO replace this by assert, sorry, no messing with ClickHouse should be possible
-        logging.warning(f"workload is None", traceback.format_stack())
-    if TEST and flush:
-        try:
-            from posthog.test.base import flush_persons_and_events
+def _flush_test_data() -> None:
+    try:
+        from posthog.test.base import flush_persons_and_events
 
-            flush_persons_and_events()
-        except ModuleNotFoundError:  # when we run plugin server tests it tries to run above, ignore
-            pass
+        flush_persons_and_events()
+    except ModuleNotFoundError:  # when we run plugin server tests it tries to run above, ignore
+        pass
+
+
+def _route_query(
+    workload: Workload, team_id: Optional[int], ch_user: ClickHouseUser
+) -> tuple[Workload, ClickHouseUser]:
+    """Picks the cluster and user to run the query with, based on the query tags. Also updates the tags."""
     tags = get_query_tags()
     is_personal_api_key = tags.access_method == AccessMethod.PERSONAL_API_KEY
 
@@ -172,15 +171,6 @@ def sync_execute(
     if team_id is not None:
         tags.team_id = team_id
 
-    prepared_sql, prepared_args, tags = _prepare_query(query=query, args=args, workload=workload)
-    query_id = validated_client_query_id()
-    core_settings = {
-        **default_settings(),
-        **CLICKHOUSE_PER_TEAM_QUERY_SETTINGS.get(str(team_id), {}),
-        **(settings or {}),
-    }
-    tags.query_settings = core_settings
-    query_type = tags.query_type or "Other"
     if ch_user == ClickHouseUser.DEFAULT:
         if is_personal_api_key:
             ch_user = ClickHouseUser.API
@@ -196,17 +186,62 @@ def sync_execute(
     if tags.product == Product.MAX_AI or tags.service_name == "temporal-worker-max-ai":
         ch_user = ClickHouseUser.MAX_AI
 
+    return workload, ch_user
+
+
+def _settings_for_attempt(core_settings: dict, tags: QueryTags, workload: Workload) -> dict:
+    settings = {
+        **core_settings,
+        "log_comment": tags.to_json(),
+    }
+    if workload == Workload.OFFLINE:
+        # disabling hedged requests for offline queries reduces the likelihood of these queries bleeding over into the
+        # online resource pool when the offline resource pool is under heavy load. this comes at the cost of higher and
+        # more variable latency and a higher likelihood of query failures - but offline workloads should be tolerant to
+        # these disruptions
+        settings["use_hedged_requests"] = "0"
+    return settings
+
+
+@patchable
+@trace_clickhouse_query_decorator
+def sync_execute(
+    query,
+    args=None,
+    settings=None,
+    with_column_types=False,
+    flush=True,
+    *,
+    workload: Workload = Workload.DEFAULT,
+    team_id: Optional[int] = None,
+    readonly=False,
+    sync_client: Optional[SyncClient] = None,
+    ch_user: ClickHouseUser = ClickHouseUser.DEFAULT,
+    # Inserts pass `args` as one list of values per column, which is cheaper for the client to serialize
+    columnar: bool = False,
+):
+    if not workload:
+        workload = Workload.DEFAULT
+        # TODO replace this by assert, sorry, no messing with ClickHouse should be possible
+        logging.warning(f"workload is None", traceback.format_stack())
+    if TEST and flush:
+        _flush_test_data()
+    workload, ch_user = _route_query(workload, team_id, ch_user)
+    tags = get_query_tags()
+    is_personal_api_key = tags.access_method == AccessMethod.PERSONAL_API_KEY
+
+    prepared_sql, prepared_args, tags = _prepare_query(query=query, args=args, workload=workload)
+    query_id = validated_client_query_id()
+    core_settings = {
+        **default_settings(),
+        **CLICKHOUSE_PER_TEAM_QUERY_SETTINGS.get(str(team_id), {}),
+        **(settings or {}),
+    }
+    tags.query_settings = core_settings
+    query_type = tags.query_type or "Other"
+
     while True:
-        settings = {
-            **core_settings,
-            "log_comment": tags.to_json(),
-        }
-        if workload == Workload.OFFLINE:
-            # disabling hedged requests for offline queries reduces the likelihood of these queries bleeding over into the
-            # online resource pool when the offline resource pool is under heavy load. this comes at the cost of higher and
-            # more variable latency and a higher likelihood of query failures - but offline workloads should be tolerant to
-            # these disruptions
-            settings["use_hedged_requests"] = "0"
+        settings = _settings_for_attempt(core_settings, tags, workload)
         start_time = perf_counter()
         try:
             QUERY_STARTED_COUNTER.labels(
@@ -221,6 +256,7 @@ def sync_execute(
                     settings=settings,
                     with_column_types=with_column_types,
                     query_id=query_id,
+                    columnar=columnar,
                 )
                 if "INSERT INTO" in prepared_sql and client.last_query.progress.written_rows > 0:
                     result = client.last_query.progress.written_rows
@@ -259,6 +295,153 @@ def sync_execute(
     return result
 
 
+def _http_url(client_kwargs: dict) -> Optional[str]:
+    """The HTTP URL of the cluster `get_client_from_pool` would connect to, if there is one."""
+    host = client_kwargs.get("host")
+    if host is None:
+        return app_settings.CLICKHOUSE_HTTP_URL
+    if host == app_settings.CLICKHOUSE_OFFLINE_CLUSTER_HOST:
+        return app_settings.CLICKHOUSE_OFFLINE_HTTP_URL
+    return None
+
+
+def _http_params(settings: dict) -> dict[str, str | int | float]:
+    return {
+        key: int(value) if isinstance(value, bool) else value for key, value in settings.items() if value is not None
+    }
+
+
+def _server_exception(message: str) -> Optional[ServerException]:
+    """Turns an error returned by the HTTP interface into the exception `clickhouse_driver` would raise."""
+    match = re.search(r"Code: (\d+)\. (.*)", message, re.DOTALL)
+    if match is None:
+        return None
+    return ServerException(match.group(2).strip(), code=int(match.group(1)))
+
+
+def _read_json_compact(body: bytes, with_column_types: bool):
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        # If the query fails after ClickHouse started sending rows, the error is appended to the response
+        error = _server_exception(body.decode(errors="replace"))
+        if error is None:
+            raise
+        raise error
+    column_types = [(column["name"], column["type"]) for column in payload["meta"]]
+    rows = convert_rows(payload["data"], [type_name for _, type_name in column_types])
+    return (rows, column_types) if with_column_types else rows
+
+
+async def aexecute(
+    query,
+    args: Optional[NonInsertParams] = None,
+    settings=None,
+    with_column_types=False,
+    *,
+    workload: Workload = Workload.DEFAULT,
+    team_id: Optional[int] = None,
+    readonly=False,
+    ch_user: ClickHouseUser = ClickHouseUser.DEFAULT,
+):
+    """
+    Like `sync_execute`, but runs the query over ClickHouse's HTTP interface without blocking the event loop, using
+    the pooled connections of the async client. Only meant for reads, results are returned the same way as by
+    `sync_execute`.
+
+    Queries to clusters without an HTTP URL in the settings (e.g. logs, or teams with their own cluster) run
+    `sync_execute` in a thread instead.
+    """
+    if TEST:
+        await sync_to_async(_flush_test_data)()
+
+    workload, ch_user = _route_query(workload or Workload.DEFAULT, team_id, ch_user)
+    if workload == Workload.LOGS or _http_url(get_kwargs_for_client(workload, team_id, readonly, ch_user)) is None:
+        return await sync_to_async(sync_execute, thread_sensitive=False)(
+            query,
+            args,
+            settings,
+            with_column_types,
+            flush=False,
+            workload=workload,
+            team_id=team_id,
+            readonly=readonly,
+            ch_user=ch_user,
+        )
+
+    tags = get_query_tags()
+    is_personal_api_key = tags.access_method == AccessMethod.PERSONAL_API_KEY
+    prepared_sql, _, tags = _prepare_query(query=query, args=args, workload=workload)
+    query_id = validated_client_query_id()
+    core_settings = {
+        **default_settings(),
+        **CLICKHOUSE_PER_TEAM_QUERY_SETTINGS.get(str(team_id), {}),
+        **(settings or {}),
+    }
+    tags.query_settings = core_settings
+    query_type = tags.query_type or "Other"
+
+    while True:
+        # Like `sync_execute`, connects to the cluster of the workload of each attempt, as it changes on fallbacks
+        client_kwargs = get_kwargs_for_client(workload, team_id, readonly, ch_user)
+        url = _http_url(client_kwargs)
+        assert url is not None, f"No HTTP URL for the {workload} workload"
+        pool = get_connection_pool(url, timeout=aiohttp.ClientTimeout(total=None, sock_connect=30))
+        settings = {
+            **_settings_for_attempt(core_settings, tags, workload),
+            **HTTP_OUTPUT_SETTINGS,
+            "default_format": "JSONCompact",
+        }
+        start_time = perf_counter()
+        try:
+            QUERY_STARTED_COUNTER.labels(
+                team_id=str(team_id or ""),
+                access_method=tags.access_method or "other",
+                chargeable=str(tags.chargeable or "0"),
+            ).inc()
+            async with AsyncClickHouseClient(
+                url=url,
+                user=client_kwargs["user"],
+                password=client_kwargs["password"],
+                database=app_settings.CLICKHOUSE_DATABASE,
+                pool=pool,
+                **_http_params(settings),
+            ) as client:
+                async with client.apost_query(prepared_sql, query_parameters=None, query_id=query_id) as response:
+                    body = await response.read()
+            result = _read_json_compact(body, with_column_types)
+        except Exception as e:
+            if isinstance(e, AsyncClickHouseError):
+                e = _server_exception(str(e)) or e
+            exception_type = ch_error_type(e)
+            QUERY_ERROR_COUNTER.labels(
+                exception_type=exception_type,
+                query_type=query_type,
+                workload=workload.value,
+                chargeable=str(tags.chargeable or "0"),
+            ).inc()
+            err = wrap_query_error(e)
+            if isinstance(err, ClickHouseAtCapacity) and is_personal_api_key and workload == Workload.OFFLINE:
+                workload = Workload.ONLINE
+                tags.clickhouse_exception_type = exception_type
+                tags.workload = str(workload)
+                continue
+            raise err from e
+        finally:
+            QUERY_FINISHED_COUNTER.labels(
+                team_id=str(team_id or ""),
+                access_method=tags.access_method or "other",
+                chargeable=str(tags.chargeable or "0"),
+            ).inc()
+
+            if app_settings.SHELL_PLUS_PRINT_SQL:
+                print("Execution time: %.6fs" % (perf_counter() - start_time,))  # noqa T201
+
+        break
+
+    return result
+
+
 def query_with_columns(
     query: str,
     args: Optional[QueryArgs] = None,
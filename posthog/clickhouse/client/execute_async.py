@@ -1,3 +1,4 @@
+import time
 import uuid
 import datetime
 from typing import TYPE_CHECKING, Optional
@@ -5,7 +6,7 @@ from typing import TYPE_CHECKING, Optional
 import orjson as json
 import structlog
 import posthoganalytics
-from prometheus_client import Histogram
+from prometheus_client import Counter, Histogram
 from pydantic import BaseModel
 from rest_framework.exceptions import APIException, NotFound
 
@@ -41,6 +42,19 @@ QUERY_PROCESS_TIME = Histogram(
 )
 
 
+QUERY_SINGLE_FLIGHT_COUNTER = Counter(
+    "query_single_flight_total",
+    "Blocking query calculations going through the single-flight lease, by outcome",
+    labelnames=["outcome"],
+)
+
+QUERY_SINGLE_FLIGHT_WAIT_TIME = Histogram(
+    "query_single_flight_wait_seconds",
+    "Time spent waiting for another worker to calculate the same query",
+    buckets=CUSTOM_BUCKETS,
+)
+
+
 class QueryNotFoundError(NotFound):
     pass
 
@@ -166,6 +180,81 @@ class QueryStatusManager:
         self.redis_client.hdel(self.running_queries_key, cache_key)
 
 
+class QuerySingleFlight:
+    """
+    Makes sure only one worker at a time runs a blocking calculation for a given cache key.
+
+    The worker that acquires the lease calculates and fills the cache, then releases the lease, which notifies the
+    waiting workers so they can read the result from the cache. The lease expires on its own in case its holder dies.
+    """
+
+    KEY_PREFIX = "query_single_flight"
+    LEASE_TTL_SECONDS = 60 * 10  # 10 minutes, the longest a query can run
+
+    def __init__(self, team_id: int, cache_key: str):
+        self.redis_client = redis.get_client()
+        self.team_id = team_id
+        self.cache_key = cache_key
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+
+    @property
+    def lease_key(self) -> str:
+        return f"{self.KEY_PREFIX}:{self.team_id}:{self.cache_key}"
+
+    @property
+    def channel(self) -> str:
+        return f"{self.lease_key}:done"
+
+    def acquire(self) -> bool:
+        """Takes the lease. Returns False if another worker is calculating the query already."""
+        try:
+            self.acquired = bool(self.redis_client.set(self.lease_key, self.token, nx=True, ex=self.LEASE_TTL_SECONDS))
+        except Exception as e:
+            capture_exception(e, {"team_id": self.team_id, "cache_key": self.cache_key})
+            # Calculate without the lease rather than failing the query
+            return True
+        return self.acquired
+
+    def release(self) -> None:
+        if not self.acquired:
+            return
+        self.acquired = False
+        try:
+            with self.redis_client.pipeline() as pipe:
+                # Only delete the lease if we still hold it, it may have expired and been taken over by another worker
+                pipe.watch(self.lease_key)
+                if pipe.get(self.lease_key) == self.token.encode():
+                    pipe.multi()
+                    pipe.delete(self.lease_key)
+                    pipe.publish(self.channel, "done")
+                    pipe.execute()
+        except Exception as e:
+            # The lease expires on its own, and waiters fall back to calculating after their timeout
+            capture_exception(e, {"team_id": self.team_id, "cache_key": self.cache_key})
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Waits for the lease holder to be done. Returns False if it's still calculating after `timeout` seconds.
+        """
+        start_time = time.monotonic()
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self.channel)
+            # The holder may have been done before we subscribed
+            while self.redis_client.exists(self.lease_key):
+                remaining = timeout - (time.monotonic() - start_time)
+                if remaining <= 0:
+                    return False
+                # Poll in short intervals, so a lease that expired without notification doesn't keep us waiting
+                if pubsub.get_message(timeout=min(remaining, 1.0)) is not None:
+                    break
+            return True
+        finally:
+            QUERY_SINGLE_FLIGHT_WAIT_TIME.observe(time.monotonic() - start_time)
+            pubsub.close()
+
+
 def execute_process_query(
     team_id: int,
     user_id: Optional[int],
@@ -2,11 +2,12 @@ import time
 import uuid
 import dataclasses
 from collections.abc import Callable
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from functools import wraps
 from time import sleep
 from typing import Optional
 
+from asgiref.sync import sync_to_async
 from celery import current_task
 from prometheus_client import Counter
 
@@ -92,6 +93,23 @@ class RateLimit:
             if applicable and running_task_key and task_id:
                 self.release(running_task_key, task_id)
 
+    @asynccontextmanager
+    async def arun(self, *args, **kwargs):
+        """
+        Like `run`, for async callers. The resource is acquired and released in threads, but always by this context
+        manager, so it's entered and exited on the event loop.
+        """
+        applicable = not self.applicable or self.applicable(*args, **kwargs)
+
+        if applicable:
+            running_task_key, task_id = await sync_to_async(self.use, thread_sensitive=False)(*args, **kwargs)
+
+        try:
+            yield
+        finally:
+            if applicable and running_task_key and task_id:
+                await sync_to_async(self.release, thread_sensitive=False)(running_task_key, task_id)
+
     def use(self, *args, **kwargs) -> tuple[Optional[str], Optional[str]]:
         """
         Acquire the resource before execution or throw exception.
@@ -0,0 +1,72 @@
+import uuid
+import decimal
+import datetime as dt
+import ipaddress
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from posthog.clickhouse.client.column_types import convert_rows, converter_for_type, split_type_arguments
+
+
+@pytest.mark.parametrize(
+    "arguments,expected",
+    [
+        ("String", ["String"]),
+        ("String, UInt8", ["String", "UInt8"]),
+        (
+            "Array(Tuple(UInt8, String)), Map(String, Array(Int64))",
+            ["Array(Tuple(UInt8, String))", "Map(String, Array(Int64))"],
+        ),
+        ("6, 'Europe/Berlin'", ["6", "'Europe/Berlin'"]),
+        ("'a, (b' = 1, 'c' = 2", ["'a, (b' = 1", "'c' = 2"]),
+    ],
+)
+def test_split_type_arguments(arguments, expected):
+    assert split_type_arguments(arguments) == expected
+
+
+@pytest.mark.parametrize(
+    "type_name,value,expected",
+    [
+        ("String", "hello", "hello"),
+        ("UInt64", "18446744073709551615", 18446744073709551615),
+        ("Int8", -1, -1),
+        ("Float64", "nan", pytest.approx(float("nan"), nan_ok=True)),
+        ("Float64", "-inf", float("-inf")),
+        ("Float32", 1.5, 1.5),
+        ("Decimal(18, 4)", "1.2500", decimal.Decimal("1.2500")),
+        ("Bool", True, True),
+        ("UUID", "01890a5d-ac96-774b-bcce-21ae1bd7afaa", uuid.UUID("01890a5d-ac96-774b-bcce-21ae1bd7afaa")),
+        ("Date", "2025-01-02", dt.date(2025, 1, 2)),
+        ("DateTime", "2025-01-02 03:04:05", dt.datetime(2025, 1, 2, 3, 4, 5)),
+        (
+            "DateTime('Europe/Berlin')",
+            "2025-01-02 03:04:05",
+            dt.datetime(2025, 1, 2, 3, 4, 5, tzinfo=ZoneInfo("Europe/Berlin")),
+        ),
+        (
+            "DateTime64(9, 'UTC')",
+            "2025-01-02 03:04:05.123456789",
+            dt.datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=ZoneInfo("UTC")),
+        ),
+        ("DateTime64(3)", "2025-01-02 03:04:05.120", dt.datetime(2025, 1, 2, 3, 4, 5, 120000)),
+        ("Nullable(UUID)", None, None),
+        ("LowCardinality(Nullable(String))", "a", "a"),
+        ("IPv4", "127.0.0.1", ipaddress.IPv4Address("127.0.0.1")),
+        ("Array(Nullable(Int64))", ["1", None], [1, None]),
+        ("Tuple(String, Array(UInt64))", ["a", ["1", "2"]], ("a", [1, 2])),
+        ("Tuple(name String, created_at Date)", ["a", "2025-01-02"], ("a", dt.date(2025, 1, 2))),
+        ("Map(UInt64, Array(String))", {"1": ["a"]}, {1: ["a"]}),
+        ("Enum8('a' = 1, 'b' = 2)", "a", "a"),
+        ("JSON", {"a": 1}, {"a": 1}),
+    ],
+)
+def test_converter_for_type(type_name, value, expected):
+    assert converter_for_type(type_name)(value) == expected
+
+
+def test_convert_rows():
+    rows = convert_rows([["a", "1", "2025-01-02"], ["b", "2", None]], ["String", "Int64", "Nullable(Date)"])
+
+    assert rows == [("a", 1, dt.date(2025, 1, 2)), ("b", 2, None)]
@@ -0,0 +1,63 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from clickhouse_driver.errors import ServerException
+
+from posthog.clickhouse.client import aexecute
+from posthog.clickhouse.client.connection import Workload
+from posthog.clickhouse.query_tagging import AccessMethod, tags_context
+
+
+class FakeAsyncClickHouseClient:
+    """Stands in for the async client, failing the queries sent to the URLs in `at_capacity`."""
+
+    def __init__(self, urls: list[str], at_capacity: set[str], url: str, **kwargs):
+        self.urls = urls
+        self.at_capacity = at_capacity
+        self.url = url
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    @asynccontextmanager
+    async def apost_query(self, query, query_parameters=None, query_id=None):
+        self.urls.append(self.url)
+        if self.url in self.at_capacity:
+            raise ServerException("Too many simultaneous queries", code=202)
+        response = MagicMock()
+
+        async def read():
+            return b'{"meta": [{"name": "x", "type": "UInt8"}], "data": [[1]]}'
+
+        response.read = read
+        yield response
+
+
+@pytest.mark.django_db
+def test_aexecute_falls_back_to_the_online_cluster_when_offline_is_at_capacity(settings):
+    settings.CLICKHOUSE_OFFLINE_CLUSTER_HOST = "ch-offline.example.com"
+    settings.CLICKHOUSE_OFFLINE_HTTP_URL = "http://ch-offline.example.com:8123/"
+    settings.CLICKHOUSE_HTTP_URL = "http://ch-online.example.com:8123/"
+    urls: list[str] = []
+
+    with (
+        patch(
+            "posthog.clickhouse.client.execute.AsyncClickHouseClient",
+            side_effect=lambda url, **kwargs: FakeAsyncClickHouseClient(
+                urls, {settings.CLICKHOUSE_OFFLINE_HTTP_URL}, url, **kwargs
+            ),
+        ),
+        patch("posthog.clickhouse.client.execute.get_connection_pool") as mock_get_connection_pool,
+        tags_context(access_method=AccessMethod.PERSONAL_API_KEY),
+    ):
+        result = async_to_sync(aexecute)("SELECT 1 AS x", workload=Workload.OFFLINE)
+
+    assert result == [(1,)]
+    assert urls == [settings.CLICKHOUSE_OFFLINE_HTTP_URL, settings.CLICKHOUSE_HTTP_URL]
+    assert [call.args[0] for call in mock_get_connection_pool.call_args_list] == urls
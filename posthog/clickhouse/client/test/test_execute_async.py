@@ -1,5 +1,6 @@
 import json
 import uuid
+import threading
 from typing import Any
 
 from posthog.test.base import ClickhouseTestMixin, snapshot_clickhouse_queries
@@ -18,7 +19,12 @@ from posthog.clickhouse.client import (
 )
 from posthog.clickhouse.client.async_task_chain import task_chain_context
 from posthog.clickhouse.client.connection import ClickHouseUser, Workload
-from posthog.clickhouse.client.execute_async import QueryNotFoundError, QueryStatusManager, execute_process_query
+from posthog.clickhouse.client.execute_async import (
+    QueryNotFoundError,
+    QuerySingleFlight,
+    QueryStatusManager,
+    execute_process_query,
+)
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.errors import CHQueryErrorTooManySimultaneousQueries
 from posthog.models import Organization, Team
@@ -102,6 +108,49 @@ class TestQueryStatusManager(SimpleTestCase):
         self.assertEqual(self.manager.get_query_status(show_progress=True), self.query_status)
 
 
+class TestQuerySingleFlight(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        get_client().flushall()
+        self.leader = QuerySingleFlight(team_id=12345, cache_key="cache_key")
+        self.follower = QuerySingleFlight(team_id=12345, cache_key="cache_key")
+
+    def test_only_one_worker_acquires_the_lease(self):
+        self.assertTrue(self.leader.acquire())
+        self.assertFalse(self.follower.acquire())
+        self.assertTrue(QuerySingleFlight(team_id=12345, cache_key="other_cache_key").acquire())
+        self.assertTrue(QuerySingleFlight(team_id=54321, cache_key="cache_key").acquire())
+
+    def test_lease_can_be_acquired_after_release(self):
+        self.leader.acquire()
+        self.leader.release()
+
+        self.assertTrue(self.follower.acquire())
+
+    def test_release_keeps_lease_taken_over_by_another_worker(self):
+        self.leader.acquire()
+        # The lease expired, and another worker took it
+        get_client().set(self.leader.lease_key, self.follower.token)
+        self.follower.acquired = True
+
+        self.leader.release()
+
+        self.assertTrue(get_client().exists(self.leader.lease_key))
+
+    def test_wait_times_out_while_lease_is_held(self):
+        self.leader.acquire()
+
+        self.assertFalse(self.follower.wait(timeout=0.1))
+
+    def test_wait_returns_once_lease_is_released(self):
+        self.leader.acquire()
+        released = threading.Timer(0.2, self.leader.release)
+        released.start()
+
+        self.assertTrue(self.follower.wait(timeout=5))
+        released.join()
+
+
 class TestExecuteProcessQuery(TestCase):
     def setUp(self):
         self.user = User.objects.create(email="test@posthog.com")
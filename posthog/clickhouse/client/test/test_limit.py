@@ -101,6 +101,18 @@ class TestRateLimit(BaseTest):
 
         assert result == 7
 
+    def test_async_context(self):
+        async def run_queries():
+            async with self.limit.arun(is_api=True, team_id=9, task_id=17):
+                with self.assertRaises(ConcurrencyLimitExceeded):
+                    async with self.limit.arun(is_api=True, team_id=9, task_id=18):
+                        pass
+            # The first task released its slot on exit
+            async with self.limit.arun(is_api=True, team_id=9, task_id=18):
+                pass
+
+        asyncio.run(run_queries())
+
     def test_custom_rate_limit_fail(self):
         self.cancels.append(self.limit.use(is_api=True, team_id=8, task_id=17))
         self.cancels.append(self.limit.use(is_api=True, team_id=8, task_id=18, limit=2))
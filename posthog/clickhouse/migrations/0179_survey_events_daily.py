@@ -0,0 +1,9 @@
+from posthog.clickhouse.client.connection import NodeRole
+from posthog.clickhouse.client.migration_tools import run_sql_with_exceptions
+from posthog.models.surveys.sql import SURVEY_EVENTS_DAILY_TABLE_SQL
+
+operations = [
+    run_sql_with_exceptions(
+        SURVEY_EVENTS_DAILY_TABLE_SQL(on_cluster=False), node_roles=[NodeRole.DATA, NodeRole.COORDINATOR]
+    ),
+]
@@ -0,0 +1,17 @@
+from posthog.clickhouse.client.connection import NodeRole
+from posthog.clickhouse.client.migration_tools import run_sql_with_exceptions
+from posthog.models.ai.trace_summaries import (
+    DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE_SQL,
+    LLM_TRACE_SUMMARIES_MV_SQL,
+    SHARDED_LLM_TRACE_SUMMARIES_TABLE_SQL,
+    WRITABLE_LLM_TRACE_SUMMARIES_TABLE_SQL,
+)
+
+operations = [
+    run_sql_with_exceptions(SHARDED_LLM_TRACE_SUMMARIES_TABLE_SQL(), node_roles=[NodeRole.DATA]),
+    run_sql_with_exceptions(WRITABLE_LLM_TRACE_SUMMARIES_TABLE_SQL(), node_roles=[NodeRole.DATA]),
+    run_sql_with_exceptions(
+        DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE_SQL(), node_roles=[NodeRole.DATA, NodeRole.COORDINATOR]
+    ),
+    run_sql_with_exceptions(LLM_TRACE_SUMMARIES_MV_SQL(), node_roles=[NodeRole.DATA], sharded=False),
+]
@@ -0,0 +1,15 @@
+from posthog.clickhouse.client.connection import NodeRole
+from posthog.clickhouse.client.migration_tools import run_sql_with_exceptions
+from posthog.heatmaps.sql import (
+    DISTRIBUTED_HEATMAPS_DAILY_TABLE_SQL,
+    HEATMAPS_DAILY_MV_SQL,
+    HEATMAPS_DAILY_TABLE_SQL,
+    WRITABLE_HEATMAPS_DAILY_TABLE_SQL,
+)
+
+operations = [
+    run_sql_with_exceptions(HEATMAPS_DAILY_TABLE_SQL(), node_roles=[NodeRole.DATA]),
+    run_sql_with_exceptions(WRITABLE_HEATMAPS_DAILY_TABLE_SQL(), node_roles=[NodeRole.DATA]),
+    run_sql_with_exceptions(DISTRIBUTED_HEATMAPS_DAILY_TABLE_SQL(), node_roles=[NodeRole.DATA, NodeRole.COORDINATOR]),
+    run_sql_with_exceptions(HEATMAPS_DAILY_MV_SQL(), node_roles=[NodeRole.DATA], sharded=False),
+]
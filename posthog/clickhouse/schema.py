@@ -22,13 +22,23 @@ from posthog.clickhouse.query_log_archive import (
     QUERY_LOG_ARCHIVE_NEW_TABLE_SQL,
 )
 from posthog.heatmaps.sql import (
+    DISTRIBUTED_HEATMAPS_DAILY_TABLE_SQL,
     DISTRIBUTED_HEATMAPS_TABLE_SQL,
+    HEATMAPS_DAILY_MV_SQL,
+    HEATMAPS_DAILY_TABLE_SQL,
     HEATMAPS_TABLE_MV_SQL,
     HEATMAPS_TABLE_SQL,
     KAFKA_HEATMAPS_TABLE_SQL,
+    WRITABLE_HEATMAPS_DAILY_TABLE_SQL,
     WRITABLE_HEATMAPS_TABLE_SQL,
 )
 from posthog.models.ai.pg_embeddings import PG_EMBEDDINGS_TABLE_SQL
+from posthog.models.ai.trace_summaries import (
+    DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE_SQL,
+    LLM_TRACE_SUMMARIES_MV_SQL,
+    SHARDED_LLM_TRACE_SUMMARIES_TABLE_SQL,
+    WRITABLE_LLM_TRACE_SUMMARIES_TABLE_SQL,
+)
 from posthog.models.app_metrics.sql import (
     APP_METRICS_DATA_TABLE_SQL,
     APP_METRICS_MV_TABLE_SQL,
@@ -144,6 +154,7 @@ from posthog.models.sessions.sql import (
     SESSIONS_VIEW_SQL,
     WRITABLE_SESSIONS_TABLE_SQL,
 )
+from posthog.models.surveys.sql import SURVEY_EVENTS_DAILY_TABLE_SQL
 from posthog.models.web_preaggregated.sql import (
     WEB_BOUNCES_COMBINED_VIEW_SQL,
     WEB_BOUNCES_DAILY_SQL,
@@ -226,6 +237,9 @@ CREATE_MERGETREE_TABLE_QUERIES = (
     lambda: QUERY_LOG_ARCHIVE_NEW_TABLE_SQL(table_name=QUERY_LOG_ARCHIVE_DATA_TABLE),
     COHORT_MEMBERSHIP_TABLE_SQL,
     PRECALCULATED_EVENTS_SHARDED_TABLE_SQL,
+    SURVEY_EVENTS_DAILY_TABLE_SQL,
+    SHARDED_LLM_TRACE_SUMMARIES_TABLE_SQL,
+    HEATMAPS_DAILY_TABLE_SQL,
 )
 CREATE_DISTRIBUTED_TABLE_QUERIES = (
     WRITABLE_EVENTS_TABLE_SQL,
@@ -261,6 +275,10 @@ CREATE_DISTRIBUTED_TABLE_QUERIES = (
     WRITABLE_APP_METRICS2_TABLE_SQL,
     WRITABLE_ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL,
     WRITABLE_EVENTS_RECENT_TABLE_SQL,
+    WRITABLE_LLM_TRACE_SUMMARIES_TABLE_SQL,
+    DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE_SQL,
+    WRITABLE_HEATMAPS_DAILY_TABLE_SQL,
+    DISTRIBUTED_HEATMAPS_DAILY_TABLE_SQL,
 )
 CREATE_KAFKA_TABLE_QUERIES = (
     KAFKA_LOG_ENTRIES_TABLE_SQL,
@@ -316,6 +334,8 @@ CREATE_MV_TABLE_QUERIES = (
     QUERY_LOG_ARCHIVE_NEW_MV_SQL(view_name=QUERY_LOG_ARCHIVE_MV, dest_table=QUERY_LOG_ARCHIVE_DATA_TABLE),
     COHORT_MEMBERSHIP_MV_SQL,
     PRECALCULATED_EVENTS_MV_SQL,
+    LLM_TRACE_SUMMARIES_MV_SQL,
+    HEATMAPS_DAILY_MV_SQL,
 )
 
 CREATE_TABLE_QUERIES = (
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Any, List, Literal, cast  # noqa: UP035
+from typing import Any, Literal, cast
 
 from django.core.exceptions import FieldError
 from django.db.models import Q
@@ -7,23 +7,18 @@ from django.http import HttpResponse
 
 from rest_framework import request, response, serializers, status, viewsets
 
-from posthog.schema import DateRange, HogQLFilters, HogQLQueryResponse
+from posthog.schema import CachedHeatmapsQueryResponse, DateRange, HeatmapsQuery, HeatmapsQueryAggregation
 
-from posthog.hogql import ast
-from posthog.hogql.ast import Constant
-from posthog.hogql.base import Expr
 from posthog.hogql.constants import LimitContext
-from posthog.hogql.context import HogQLContext
-from posthog.hogql.filters import replace_filters
-from posthog.hogql.parser import parse_expr, parse_select
-from posthog.hogql.query import execute_hogql_query
 
 from posthog.api.forbid_destroy_model import ForbidDestroyModel
 from posthog.api.routing import TeamAndOrgViewSetMixin
 from posthog.api.shared import UserBasicSerializer
 from posthog.api.utils import action
 from posthog.auth import TemporaryTokenAuthentication
+from posthog.heatmaps.heatmaps_query_runner import HeatmapsQueryRunner
 from posthog.heatmaps.heatmaps_utils import DEFAULT_TARGET_WIDTHS, is_url_allowed
+from posthog.hogql_queries.query_runner import ExecutionMode
 from posthog.models import User
 from posthog.models.activity_logging.activity_log import Detail, log_activity
 from posthog.models.heatmap_saved import SavedHeatmap
@@ -36,40 +31,6 @@ from posthog.rate_limit import (
 from posthog.tasks.heatmap_screenshot import generate_heatmap_screenshot
 from posthog.utils import relative_date_parse_with_delta_mapping
 
-DEFAULT_QUERY = """
-            select pointer_target_fixed, pointer_relative_x, client_y, {aggregation_count}
-            from (
-                     select
-                        distinct_id,
-                        pointer_target_fixed,
-                        round((x / viewport_width), 2) as pointer_relative_x,
-                        y * scale_factor as client_y
-                     from heatmaps
-                     where {predicates}
-                )
-            group by `pointer_target_fixed`, pointer_relative_x, client_y
-            """
-
-SCROLL_DEPTH_QUERY = """
-SELECT
-    bucket,
-    cnt as bucket_count,
-    sum(cnt) OVER (ORDER BY bucket DESC) AS cumulative_count
-FROM (
-    SELECT
-        intDiv(scroll_y, 100) * 100 as bucket,
-        {aggregation_count} as cnt
-    FROM (
-        SELECT
-           distinct_id, (y + viewport_height) * scale_factor as scroll_y
-        FROM heatmaps
-        WHERE {predicates}
-    )
-    GROUP BY bucket
-)
-ORDER BY bucket
-"""
-
 
 class HeatmapsRequestSerializer(serializers.Serializer):
     viewport_width_min = serializers.IntegerField(required=False)
@@ -179,86 +140,34 @@ class HeatmapViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet):
     def list(self, request: request.Request, *args: Any, **kwargs: Any) -> response.Response:
         request_serializer = HeatmapsRequestSerializer(data=request.query_params, context={"team": self.team})
         request_serializer.is_valid(raise_exception=True)
+        data = request_serializer.validated_data
+
+        date_to: date = data.get("date_to") or date.today()
+        query = HeatmapsQuery(
+            type=data["type"],
+            dateRange=DateRange(date_from=data["date_from"].strftime("%Y-%m-%d"), date_to=date_to.strftime("%Y-%m-%d")),
+            urlExact=data.get("url_exact"),
+            urlPattern=data.get("url_pattern"),
+            viewportWidthMin=data.get("viewport_width_min"),
+            viewportWidthMax=data.get("viewport_width_max"),
+            aggregation=HeatmapsQueryAggregation(data["aggregation"]),
+            filterTestAccounts=data.get("filter_test_accounts"),
+        )
+        runner = HeatmapsQueryRunner(query=query, team=self.team, limit_context=LimitContext.HEATMAPS)
+        results = runner.run(
+            execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE, user=cast(User, request.user)
+        )
+        assert isinstance(results, CachedHeatmapsQueryResponse)
 
-        aggregation = request_serializer.validated_data.pop("aggregation")
-        placeholders: dict[str, Expr] = {k: Constant(value=v) for k, v in request_serializer.validated_data.items()}
-        placeholders["date_to"] = placeholders.get("date_to", Constant(value=date.today().strftime("%Y-%m-%d")))
-        is_scrolldepth_query = placeholders.get("type", None) == Constant(value="scrolldepth")
-
-        raw_query = SCROLL_DEPTH_QUERY if is_scrolldepth_query else DEFAULT_QUERY
-
-        aggregation_count = self._choose_aggregation(aggregation, is_scrolldepth_query)
-        exprs = self._predicate_expressions(placeholders)
-
-        if request_serializer.validated_data.get("filter_test_accounts") is True:
-            date_from: date = request_serializer.validated_data["date_from"]
-            date_to: date | None = request_serializer.validated_data.get("date_to", None)
-            events_select = replace_filters(
-                parse_select(
-                    "SELECT distinct $session_id FROM events where notEmpty($session_id) AND {filters}", placeholders={}
-                ),
-                HogQLFilters(
-                    filterTestAccounts=True,
-                    dateRange=DateRange(
-                        date_from=date_from.strftime("%Y-%m-%d"),
-                        date_to=date_to.strftime("%Y-%m-%d") if date_to else (date.today()).strftime("%Y-%m-%d"),
-                    ),
-                ),
-                self.team,
-            )
-            session_filter_expr = ast.CompareOperation(
-                op=ast.CompareOperationOp.In,
-                left=ast.Field(chain=["session_id"]),
-                right=events_select,
-            )
-            exprs.append(session_filter_expr)
-
-        stmt = parse_select(raw_query, {"aggregation_count": aggregation_count, "predicates": ast.And(exprs=exprs)})
-        context = HogQLContext(team_id=self.team.pk, limit_top_select=False)
-        results = execute_hogql_query(query=stmt, team=self.team, limit_context=LimitContext.HEATMAPS, context=context)
-
-        if is_scrolldepth_query:
+        if runner.is_scrolldepth_query:
             return self._return_scroll_depth_response(results)
         else:
             return self._return_heatmap_coordinates_response(results)
 
-    def _choose_aggregation(self, aggregation, is_scrolldepth_query):
-        aggregation_value = "count(*) as cnt" if aggregation == "total_count" else "count(distinct distinct_id) as cnt"
-        if is_scrolldepth_query:
-            aggregation_value = "count(*)" if aggregation == "total_count" else "count(distinct distinct_id)"
-        aggregation_count = parse_expr(aggregation_value)
-        return aggregation_count
-
-    @staticmethod
-    def _predicate_expressions(placeholders: dict[str, Expr]) -> List[ast.Expr]:  # noqa: UP006
-        predicate_expressions: list[ast.Expr] = []
-
-        predicate_mapping: dict[str, str] = {
-            # should always have values
-            "date_from": "timestamp >= {date_from}",
-            "type": "`type` = {type}",
-            # optional
-            "date_to": "timestamp <= {date_to} + interval 1 day",
-            "viewport_width_min": "viewport_width >= round({viewport_width_min} / 16)",
-            "viewport_width_max": "viewport_width <= round({viewport_width_max} / 16)",
-            "url_exact": "current_url = {url_exact}",
-            "url_pattern": "match(current_url, {url_pattern})",
-        }
-
-        for predicate_key in placeholders.keys():
-            # we e.g. don't want to add the filter_test_accounts predicate here
-            if predicate_key in predicate_mapping:
-                predicate_expressions.append(
-                    parse_expr(predicate_mapping[predicate_key], {predicate_key: placeholders[predicate_key]})
-                )
-
-        if len(predicate_expressions) == 0:
-            raise serializers.ValidationError("must always generate some filter conditions")
-
-        return predicate_expressions
-
+    # The rows are encoded as they come from clickhouse, validating thousands of them with the response serializers
+    # took longer than the query itself, the serializers only document the response
     @staticmethod
-    def _return_heatmap_coordinates_response(query_response: HogQLQueryResponse) -> response.Response:
+    def _return_heatmap_coordinates_response(query_response: CachedHeatmapsQueryResponse) -> response.Response:
         data = [
             {
                 "pointer_target_fixed": item[0],
@@ -269,16 +178,13 @@ class HeatmapViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet):
             for item in query_response.results or []
         ]
 
-        response_serializer = HeatmapsResponseSerializer(data={"results": data})
-        response_serializer.is_valid(raise_exception=True)
-
-        resp = response.Response(response_serializer.data, status=status.HTTP_200_OK)
+        resp = response.Response({"results": data}, status=status.HTTP_200_OK)
         resp["Cache-Control"] = "max-age=30"
         resp["Vary"] = "Accept, Accept-Encoding, Query-String"
         return resp
 
     @staticmethod
-    def _return_scroll_depth_response(query_response: HogQLQueryResponse) -> response.Response:
+    def _return_scroll_depth_response(query_response: CachedHeatmapsQueryResponse) -> response.Response:
         data = [
             {
                 "scroll_depth_bucket": item[0],
@@ -288,10 +194,7 @@ class HeatmapViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet):
             for item in query_response.results or []
         ]
 
-        response_serializer = HeatmapsScrollDepthResponseSerializer(data={"results": data})
-        response_serializer.is_valid(raise_exception=True)
-
-        resp = response.Response(response_serializer.data, status=status.HTTP_200_OK)
+        resp = response.Response({"results": data}, status=status.HTTP_200_OK)
         resp["Cache-Control"] = "max-age=30"
         resp["Vary"] = "Accept, Accept-Encoding, Query-String"
         return resp
@@ -0,0 +1,251 @@
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Optional
+
+from django.conf import settings
+
+from posthog.schema import (
+    CachedHeatmapsQueryResponse,
+    DateRange,
+    HeatmapsQuery,
+    HeatmapsQueryAggregation,
+    HeatmapsQueryResponse,
+    HogQLFilters,
+)
+
+from posthog.hogql import ast
+from posthog.hogql.ast import Constant
+from posthog.hogql.context import HogQLContext
+from posthog.hogql.filters import replace_filters
+from posthog.hogql.parser import parse_expr, parse_select
+from posthog.hogql.query import execute_hogql_query
+
+from posthog.hogql_queries.query_runner import AnalyticsQueryRunner
+
+DEFAULT_QUERY = """
+            select pointer_target_fixed, pointer_relative_x, client_y, {aggregation_count}
+            from (
+                     select
+                        distinct_id,
+                        pointer_target_fixed,
+                        round((x / viewport_width), 2) as pointer_relative_x,
+                        y * scale_factor as client_y
+                     from heatmaps
+                     where {predicates}
+                )
+            group by `pointer_target_fixed`, pointer_relative_x, client_y
+            """
+
+# The whole days of the range are read from the daily buckets, and the partial days at its edges from the heatmaps
+DAILY_QUERY = """
+            select pointer_target_fixed, pointer_relative_x, client_y, {aggregation_count}
+            from (
+                     select
+                        pointer_target_fixed,
+                        pointer_relative_x,
+                        client_y,
+                        toUInt64(total_count) as total_count,
+                        unique_visitors
+                     from heatmaps_daily
+                     where {daily_predicates}
+
+                     union all
+
+                     select
+                        pointer_target_fixed,
+                        round((x / viewport_width), 2) as pointer_relative_x,
+                        y * scale_factor as client_y,
+                        count() as total_count,
+                        uniqExactState(distinct_id) as unique_visitors
+                     from heatmaps
+                     where {predicates}
+                     group by `pointer_target_fixed`, pointer_relative_x, client_y
+                )
+            group by `pointer_target_fixed`, pointer_relative_x, client_y
+            """
+
+SCROLL_DEPTH_QUERY = """
+SELECT
+    bucket,
+    cnt as bucket_count,
+    sum(cnt) OVER (ORDER BY bucket DESC) AS cumulative_count
+FROM (
+    SELECT
+        intDiv(scroll_y, 100) * 100 as bucket,
+        {aggregation_count} as cnt
+    FROM (
+        SELECT
+           distinct_id, (y + viewport_height) * scale_factor as scroll_y
+        FROM heatmaps
+        WHERE {predicates}
+    )
+    GROUP BY bucket
+)
+ORDER BY bucket
+"""
+
+
+def _ceil_day(value: datetime) -> date:
+    value = value.astimezone(UTC)
+    day = value.date()
+    return day if value == datetime.combine(day, time.min, tzinfo=UTC) else day + timedelta(days=1)
+
+
+class HeatmapsQueryRunner(AnalyticsQueryRunner[HeatmapsQueryResponse]):
+    query: HeatmapsQuery
+    cached_response: CachedHeatmapsQueryResponse
+
+    @property
+    def is_scrolldepth_query(self) -> bool:
+        return self.query.type == "scrolldepth"
+
+    @property
+    def date_from(self) -> date:
+        assert self.query.dateRange.date_from is not None
+        return date.fromisoformat(self.query.dateRange.date_from)
+
+    @property
+    def date_to(self) -> date:
+        return date.fromisoformat(self.query.dateRange.date_to) if self.query.dateRange.date_to else date.today()
+
+    def _calculate(self) -> HeatmapsQueryResponse:
+        response = execute_hogql_query(
+            query_type="HeatmapsQuery",
+            query=self.to_query(),
+            team=self.team,
+            timings=self.timings,
+            modifiers=self.modifiers,
+            limit_context=self.limit_context,
+            context=HogQLContext(team_id=self.team.pk, limit_top_select=False),
+        )
+        return HeatmapsQueryResponse(
+            results=response.results,
+            timings=response.timings,
+            hogql=response.hogql,
+            modifiers=self.modifiers,
+        )
+
+    def to_query(self) -> ast.SelectQuery | ast.SelectSetQuery:
+        rollup_days = self._rollup_days()
+        if rollup_days is not None:
+            return self._daily_query(*rollup_days)
+
+        exprs = self._predicate_expressions(
+            [
+                parse_expr("timestamp >= {date_from}", {"date_from": Constant(value=self.date_from)}),
+                parse_expr("timestamp <= {date_to} + interval 1 day", {"date_to": Constant(value=self.date_to)}),
+            ]
+        )
+        if self.query.filterTestAccounts:
+            exprs.append(self._test_accounts_session_filter())
+
+        return parse_select(
+            SCROLL_DEPTH_QUERY if self.is_scrolldepth_query else DEFAULT_QUERY,
+            {"aggregation_count": self._choose_aggregation(), "predicates": ast.And(exprs=exprs)},
+        )
+
+    def _rollup_days(self) -> Optional[tuple[date, date]]:
+        """
+        The whole UTC days of the range, the end is exclusive. None if the daily buckets can't be used, as they only
+        hold clicks and movements by coordinates, without the sessions needed to filter out the test accounts.
+        """
+        if not settings.HEATMAPS_DAILY_ENABLED or self.is_scrolldepth_query or self.query.filterTestAccounts:
+            return None
+
+        tz = self.team.timezone_info
+        rollup_from = _ceil_day(datetime.combine(self.date_from, time.min, tzinfo=tz))
+        rollup_to = datetime.combine(self.date_to + timedelta(days=1), time.min, tzinfo=tz).astimezone(UTC).date()
+        if rollup_from >= rollup_to:
+            return None
+        return rollup_from, rollup_to
+
+    def _daily_query(self, rollup_from: date, rollup_to: date) -> ast.SelectQuery | ast.SelectSetQuery:
+        tz = self.team.timezone_info
+        range_from = datetime.combine(self.date_from, time.min, tzinfo=tz)
+        range_to = datetime.combine(self.date_to + timedelta(days=1), time.min, tzinfo=tz)
+
+        daily_exprs = self._predicate_expressions(
+            [
+                parse_expr(
+                    "day >= {rollup_from} and day < {rollup_to}",
+                    {"rollup_from": Constant(value=rollup_from), "rollup_to": Constant(value=rollup_to)},
+                )
+            ]
+        )
+        tail_exprs = self._predicate_expressions(
+            [
+                parse_expr(
+                    "(timestamp >= {range_from} and timestamp < {rollup_from}) or (timestamp >= {rollup_to} and timestamp <= {range_to})",
+                    {
+                        "range_from": Constant(value=range_from),
+                        "rollup_from": Constant(value=datetime.combine(rollup_from, time.min, tzinfo=UTC)),
+                        "rollup_to": Constant(value=datetime.combine(rollup_to, time.min, tzinfo=UTC)),
+                        "range_to": Constant(value=range_to),
+                    },
+                )
+            ]
+        )
+
+        aggregation = (
+            "uniqExactMerge(unique_visitors) as cnt"
+            if self.query.aggregation == HeatmapsQueryAggregation.UNIQUE_VISITORS
+            else "sum(total_count) as cnt"
+        )
+        return parse_select(
+            DAILY_QUERY,
+            {
+                "aggregation_count": parse_expr(aggregation),
+                "daily_predicates": ast.And(exprs=daily_exprs),
+                "predicates": ast.And(exprs=tail_exprs),
+            },
+        )
+
+    def _choose_aggregation(self) -> ast.Expr:
+        is_total_count = self.query.aggregation == HeatmapsQueryAggregation.TOTAL_COUNT
+        aggregation_value = "count(*) as cnt" if is_total_count else "count(distinct distinct_id) as cnt"
+        if self.is_scrolldepth_query:
+            aggregation_value = "count(*)" if is_total_count else "count(distinct distinct_id)"
+        return parse_expr(aggregation_value)
+
+    def _predicate_expressions(self, date_predicates: list[ast.Expr]) -> list[ast.Expr]:
+        predicates: list[tuple[str, Optional[int | str]]] = [
+            ("viewport_width >= round({value} / 16)", self.query.viewportWidthMin),
+            ("viewport_width <= round({value} / 16)", self.query.viewportWidthMax),
+            ("`type` = {value}", self.query.type),
+        ]
+        url_predicates: list[tuple[str, Optional[int | str]]] = [
+            ("current_url = {value}", self.query.urlExact),
+            ("match(current_url, {value})", self.query.urlPattern),
+        ]
+
+        return [
+            *(
+                parse_expr(predicate, {"value": Constant(value=value)})
+                for predicate, value in predicates
+                if value is not None
+            ),
+            *date_predicates,
+            *(
+                parse_expr(predicate, {"value": Constant(value=value)})
+                for predicate, value in url_predicates
+                if value is not None
+            ),
+        ]
+
+    def _test_accounts_session_filter(self) -> ast.Expr:
+        events_select = replace_filters(
+            parse_select(
+                "SELECT distinct $session_id FROM events where notEmpty($session_id) AND {filters}", placeholders={}
+            ),
+            HogQLFilters(
+                filterTestAccounts=True,
+                dateRange=DateRange(
+                    date_from=self.date_from.strftime("%Y-%m-%d"), date_to=self.date_to.strftime("%Y-%m-%d")
+                ),
+            ),
+            self.team,
+        )
+        return ast.CompareOperation(
+            op=ast.CompareOperationOp.In,
+            left=ast.Field(chain=["session_id"]),
+            right=events_select,
+        )
@@ -1,7 +1,7 @@
 from django.conf import settings
 
 from posthog.clickhouse.kafka_engine import kafka_engine, ttl_period
-from posthog.clickhouse.table_engines import Distributed, MergeTreeEngine, ReplicationScheme
+from posthog.clickhouse.table_engines import AggregatingMergeTree, Distributed, MergeTreeEngine, ReplicationScheme
 from posthog.kafka_client.topics import KAFKA_CLICKHOUSE_HEATMAP_EVENTS
 from posthog.session_recordings.sql.session_recording_event_sql import ON_CLUSTER_CLAUSE
 
@@ -165,3 +165,114 @@ TRUNCATE_HEATMAPS_TABLE_SQL = lambda: (f"TRUNCATE TABLE IF EXISTS {HEATMAPS_DATA
 ALTER_TABLE_ADD_TTL_PERIOD = lambda: (
     f"ALTER TABLE {HEATMAPS_DATA_TABLE()} MODIFY {ttl_period('timestamp', 90, unit='DAY')}"
 )
+
+"""
+The clicks of each team, type, url and viewport width are pre-bucketed per day by their coordinates, so that heatmaps
+of wide date ranges merge the daily buckets instead of reading every click. The unique visitors of each bucket are
+kept as an exact state, so that they can be merged across days.
+"""
+
+HEATMAPS_DAILY_DATA_TABLE = lambda: "sharded_heatmaps_daily"
+
+HEATMAPS_DAILY_TABLE_BASE_SQL = """
+CREATE TABLE IF NOT EXISTS {table_name}
+(
+    team_id Int64,
+    type LowCardinality(String),
+    day Date,
+    current_url VARCHAR,
+    viewport_width Int16,
+    pointer_target_fixed Bool,
+    -- the same buckets as the heatmaps query, round(x / viewport_width, 2) and y * scale_factor
+    pointer_relative_x Float64,
+    client_y Int32,
+    total_count SimpleAggregateFunction(sum, UInt64),
+    unique_visitors AggregateFunction(uniqExact, String)
+) ENGINE = {engine}
+"""
+
+HEATMAPS_DAILY_DATA_TABLE_ENGINE = lambda: AggregatingMergeTree(
+    "heatmaps_daily", replication_scheme=ReplicationScheme.SHARDED
+)
+
+HEATMAPS_DAILY_TABLE_SQL = lambda: (
+    HEATMAPS_DAILY_TABLE_BASE_SQL
+    + """
+    PARTITION BY toYYYYMM(day)
+    ORDER BY (type, team_id, day, current_url, viewport_width, pointer_target_fixed, pointer_relative_x, client_y)
+    {ttl_period}
+"""
+).format(
+    table_name=HEATMAPS_DAILY_DATA_TABLE(),
+    engine=HEATMAPS_DAILY_DATA_TABLE_ENGINE(),
+    ttl_period=ttl_period("day", 90, unit="DAY"),
+)
+
+# This table is responsible for writing to sharded_heatmaps_daily based on a sharding key.
+WRITABLE_HEATMAPS_DAILY_TABLE_SQL = lambda: HEATMAPS_DAILY_TABLE_BASE_SQL.format(
+    table_name="writable_heatmaps_daily",
+    engine=Distributed(
+        data_table=HEATMAPS_DAILY_DATA_TABLE(),
+        # all the buckets of a page are on the same shard
+        sharding_key="cityHash64(concat(toString(team_id), '-', current_url))",
+    ),
+)
+
+# This table is responsible for reading from heatmaps_daily on a cluster setting
+DISTRIBUTED_HEATMAPS_DAILY_TABLE_SQL = lambda: HEATMAPS_DAILY_TABLE_BASE_SQL.format(
+    table_name="heatmaps_daily",
+    engine=Distributed(
+        data_table=HEATMAPS_DAILY_DATA_TABLE(),
+        sharding_key="cityHash64(concat(toString(team_id), '-', current_url))",
+    ),
+)
+
+HEATMAPS_DAILY_SELECT_SQL = (
+    lambda source_table, where="TRUE": f"""
+SELECT
+    team_id,
+    type,
+    toDate(timestamp) AS day,
+    current_url,
+    viewport_width,
+    pointer_target_fixed,
+    round((x / viewport_width), 2) AS pointer_relative_x,
+    y * scale_factor AS client_y,
+    count() AS total_count,
+    uniqExactState(distinct_id) AS unique_visitors
+FROM {source_table}
+WHERE {where}
+GROUP BY team_id, type, day, current_url, viewport_width, pointer_target_fixed, pointer_relative_x, client_y
+"""
+)
+
+HEATMAPS_DAILY_MV_SQL = (
+    lambda: """
+CREATE MATERIALIZED VIEW IF NOT EXISTS heatmaps_daily_mv
+TO {database}.writable_heatmaps_daily
+AS{select_sql}""".format(
+        database=settings.CLICKHOUSE_DATABASE,
+        # use sharded_heatmaps, this means that the mv MUST be created on every data node
+        select_sql=HEATMAPS_DAILY_SELECT_SQL(f"{settings.CLICKHOUSE_DATABASE}.{HEATMAPS_DATA_TABLE()}"),
+    )
+)
+
+HEATMAPS_DAILY_BACKFILL_SQL = (
+    lambda where="TRUE": """
+INSERT INTO {database}.writable_heatmaps_daily
+{select_sql}
+""".format(
+        database=settings.CLICKHOUSE_DATABASE,
+        select_sql=HEATMAPS_DAILY_SELECT_SQL(f"{settings.CLICKHOUSE_DATABASE}.heatmaps", where=where),
+    )
+)
+
+DROP_HEATMAPS_DAILY_TABLE_SQL = lambda: (f"DROP TABLE IF EXISTS {HEATMAPS_DAILY_DATA_TABLE()}")
+
+DROP_WRITABLE_HEATMAPS_DAILY_TABLE_SQL = lambda: (f"DROP TABLE IF EXISTS writable_heatmaps_daily")
+
+DROP_DISTRIBUTED_HEATMAPS_DAILY_TABLE_SQL = lambda: (f"DROP TABLE IF EXISTS heatmaps_daily")
+
+DROP_HEATMAPS_DAILY_MV_SQL = lambda: (f"DROP TABLE IF EXISTS heatmaps_daily_mv")
+
+TRUNCATE_HEATMAPS_DAILY_TABLE_SQL = lambda: (f"TRUNCATE TABLE IF EXISTS {HEATMAPS_DAILY_DATA_TABLE()}")
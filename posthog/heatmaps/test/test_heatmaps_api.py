@@ -7,6 +7,7 @@ from posthog.test.base import (
     snapshot_clickhouse_queries,
 )
 
+from django.core.cache import cache
 from django.http import HttpResponse
 
 from parameterized import parameterized
@@ -527,6 +528,29 @@ class TestSessionRecordings(APIBaseTest, ClickhouseTestMixin, QueryMatchingTest)
         self._assert_heatmap_single_result_count({"date_from": "2023-03-08"}, 3)
         self._assert_heatmap_single_result_count({"date_from": "2023-03-08", "aggregation": "unique_visitors"}, 2)
 
+    @freezegun.freeze_time("2023-03-08T09:00:00")
+    def test_daily_buckets_match_the_heatmaps(self) -> None:
+        # the range starts at 05:00 UTC, so the first and last days are partially read from the heatmaps
+        self.team.timezone = "America/New_York"
+        self.team.save()
+
+        # before the range in the team's timezone
+        self._create_heatmap_event("session_1", "click", "2023-03-06T03:00:00", distinct_id="12345")
+        self._create_heatmap_event("session_1", "click", "2023-03-06T12:00:00", distinct_id="12345")
+        self._create_heatmap_event("session_2", "click", "2023-03-07T10:00:00", distinct_id="12345")
+        self._create_heatmap_event("session_2", "click", "2023-03-07T11:00:00", distinct_id="12345")
+        self._create_heatmap_event("session_3", "click", "2023-03-08T08:00:00", distinct_id="54321")
+
+        params = {"date_from": "2023-03-06", "date_to": "2023-03-08"}
+        unique_params = {**params, "aggregation": "unique_visitors"}
+        self._assert_heatmap_single_result_count(params, 4)
+        self._assert_heatmap_single_result_count(unique_params, 2)
+
+        cache.clear()
+        with self.settings(HEATMAPS_DAILY_ENABLED=True):
+            self._assert_heatmap_single_result_count(params, 4)
+            self._assert_heatmap_single_result_count(unique_params, 2)
+
     @parameterized.expand(
         [
             ("boolean_true_is_valid", True, status.HTTP_200_OK),
@@ -63,6 +63,9 @@ class HogQLContext:
 
     property_swapper: Optional["PropertySwapper"] = None
 
+    # Properties the ClickHouse printer read from JSON, as (table, table column, property name)
+    property_accesses: set[tuple[str, str, str]] = field(default_factory=set)
+
     def __post_init__(self):
         if self.team:
             self.team_id = self.team.id
@@ -64,7 +64,8 @@ from posthog.hogql.database.schema.events import EventsTable
 from posthog.hogql.database.schema.exchange_rate import ExchangeRateTable
 from posthog.hogql.database.schema.groups import GroupsTable, RawGroupsTable
 from posthog.hogql.database.schema.groups_revenue_analytics import GroupsRevenueAnalyticsTable
-from posthog.hogql.database.schema.heatmaps import HeatmapsTable
+from posthog.hogql.database.schema.heatmaps import HeatmapsDailyTable, HeatmapsTable
+from posthog.hogql.database.schema.llm_trace_summaries import LLMTraceSummariesTable
 from posthog.hogql.database.schema.log_entries import (
     BatchExportLogEntriesTable,
     LogEntriesTable,
@@ -182,9 +183,11 @@ class Database(BaseModel):
             "batch_export_log_entries": TableNode(name="batch_export_log_entries", table=BatchExportLogEntriesTable()),
             "sessions": TableNode(name="sessions", table=SessionsTableV1()),
             "heatmaps": TableNode(name="heatmaps", table=HeatmapsTable()),
+            "heatmaps_daily": TableNode(name="heatmaps_daily", table=HeatmapsDailyTable()),
             "exchange_rate": TableNode(name="exchange_rate", table=ExchangeRateTable()),
             "document_embeddings": TableNode(name="document_embeddings", table=DocumentEmbeddingsTable()),
             "pg_embeddings": TableNode(name="pg_embeddings", table=PgEmbeddingsTable()),
+            "llm_trace_summaries": TableNode(name="llm_trace_summaries", table=LLMTraceSummariesTable()),
             "logs": TableNode(name="logs", table=LogsTable()),
             "numbers": TableNode(name="numbers", table=NumbersTable()),
             "system": SystemTables(),  # This is a `TableNode` already, refer to implementation
@@ -1,7 +1,10 @@
 from posthog.hogql.database.models import (
     BooleanDatabaseField,
+    DatabaseField,
+    DateDatabaseField,
     DateTimeDatabaseField,
     FieldOrTable,
+    FloatDatabaseField,
     IntegerDatabaseField,
     StringDatabaseField,
     Table,
@@ -29,3 +32,29 @@ class HeatmapsTable(Table):
 
     def to_printed_hogql(self):
         return "heatmaps"
+
+
+class HeatmapsDailyTable(Table):
+    """
+    The heatmap coordinates of each day, type, url and viewport width, the rows must be aggregated again, e.g.
+    `sum(total_count)` and `uniqExactMerge(unique_visitors)`.
+    """
+
+    fields: dict[str, FieldOrTable] = {
+        "team_id": IntegerDatabaseField(name="team_id", nullable=False),
+        "type": StringDatabaseField(name="type", nullable=False),
+        "day": DateDatabaseField(name="day", nullable=False),
+        "current_url": StringDatabaseField(name="current_url", nullable=False),
+        "viewport_width": IntegerDatabaseField(name="viewport_width", nullable=False),
+        "pointer_target_fixed": BooleanDatabaseField(name="pointer_target_fixed", nullable=False),
+        "pointer_relative_x": FloatDatabaseField(name="pointer_relative_x", nullable=False),
+        "client_y": IntegerDatabaseField(name="client_y", nullable=False),
+        "total_count": IntegerDatabaseField(name="total_count", nullable=False),
+        "unique_visitors": DatabaseField(name="unique_visitors"),
+    }
+
+    def to_printed_clickhouse(self, context):
+        return "heatmaps_daily"
+
+    def to_printed_hogql(self):
+        return "heatmaps_daily"
@@ -0,0 +1,39 @@
+from posthog.hogql.database.models import (
+    DateDatabaseField,
+    DateTimeDatabaseField,
+    FieldOrTable,
+    FloatDatabaseField,
+    IntegerDatabaseField,
+    StringDatabaseField,
+    Table,
+)
+
+
+class LLMTraceSummariesTable(Table):
+    """
+    Aggregates of the `$ai_*` events of each trace and day, the rows of a trace must be aggregated again on trace_id,
+    e.g. `sum(total_cost)` and `max(last_timestamp)`.
+    """
+
+    fields: dict[str, FieldOrTable] = {
+        "team_id": IntegerDatabaseField(name="team_id", nullable=False),
+        "trace_id": StringDatabaseField(name="trace_id", nullable=False),
+        "day": DateDatabaseField(name="day", nullable=False),
+        "first_timestamp": DateTimeDatabaseField(name="first_timestamp", nullable=False),
+        "last_timestamp": DateTimeDatabaseField(name="last_timestamp", nullable=False),
+        "generation_latency": FloatDatabaseField(name="generation_latency", nullable=True),
+        "generations_with_latency": IntegerDatabaseField(name="generations_with_latency", nullable=False),
+        "others_with_latency": IntegerDatabaseField(name="others_with_latency", nullable=False),
+        "root_latency": FloatDatabaseField(name="root_latency", nullable=True),
+        "input_tokens": FloatDatabaseField(name="input_tokens", nullable=True),
+        "output_tokens": FloatDatabaseField(name="output_tokens", nullable=True),
+        "input_cost": FloatDatabaseField(name="input_cost", nullable=True),
+        "output_cost": FloatDatabaseField(name="output_cost", nullable=True),
+        "total_cost": FloatDatabaseField(name="total_cost", nullable=True),
+    }
+
+    def to_printed_clickhouse(self, context):
+        return "llm_trace_summaries"
+
+    def to_printed_hogql(self):
+        return "llm_trace_summaries"
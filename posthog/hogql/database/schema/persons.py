@@ -251,6 +251,7 @@ class RawPersonsTable(Table):
         **PERSONS_FIELDS,
         "is_deleted": BooleanDatabaseField(name="is_deleted", nullable=False),
         "version": IntegerDatabaseField(name="version", nullable=False),
+        "updated_at": DateTimeDatabaseField(name="_timestamp", nullable=False),
     }
 
     def to_printed_clickhouse(self, context):
@@ -89,7 +89,9 @@ HOGQL_AGGREGATIONS: dict[str, HogQLFunctionMeta] = {
     "argMax": HogQLFunctionMeta("argMax", 2, 2, aggregate=True),
     "argMaxIf": HogQLFunctionMeta("argMaxIf", 3, 3, aggregate=True),
     "argMinMerge": HogQLFunctionMeta("argMinMerge", 1, 1, aggregate=True),
+    "argMinMergeIf": HogQLFunctionMeta("argMinMergeIf", 2, 2, aggregate=True),
     "argMaxMerge": HogQLFunctionMeta("argMaxMerge", 1, 1, aggregate=True),
+    "argMaxMergeIf": HogQLFunctionMeta("argMaxMergeIf", 2, 2, aggregate=True),
     "avgState": HogQLFunctionMeta("avgState", 1, 1, aggregate=True),
     "avgStateIf": HogQLFunctionMeta("avgStateIf", 2, 2, aggregate=True),
     "avgMerge": HogQLFunctionMeta("avgMerge", 1, 1, aggregate=True),
@@ -102,6 +104,8 @@ HOGQL_AGGREGATIONS: dict[str, HogQLFunctionMeta] = {
     # "topKWeighted": HogQLFunctionMeta("topKWeighted", 1, 1, aggregate=True),
     # "topKWeightedIf": HogQLFunctionMeta("topKWeightedIf", 2, 2, aggregate=True),
     "groupArrayIf": HogQLFunctionMeta("groupArrayIf", 2, 2, aggregate=True),
+    "groupArraySorted": HogQLFunctionMeta("groupArraySorted", 1, 1, min_params=1, max_params=1, aggregate=True),
+    "groupArraySortedIf": HogQLFunctionMeta("groupArraySortedIf", 2, 2, min_params=1, max_params=1, aggregate=True),
     # "groupArrayLast": HogQLFunctionMeta("groupArrayLast", 1, 1, aggregate=True),
     # "groupArrayLastIf": HogQLFunctionMeta("groupArrayLastIf", 2, 2, aggregate=True),
     "groupUniqArray": HogQLFunctionMeta("groupUniqArray", 1, 1, aggregate=True),
@@ -191,6 +195,7 @@ HOGQL_AGGREGATIONS: dict[str, HogQLFunctionMeta] = {
     "uniqState": HogQLFunctionMeta("uniqState", 1, 1, aggregate=True),
     "uniqStateIf": HogQLFunctionMeta("uniqStateIf", 2, 2, aggregate=True),
     "uniqUpToMerge": HogQLFunctionMeta("uniqUpToMerge", 1, 1, 1, 1, aggregate=True),
+    "uniqExactState": HogQLFunctionMeta("uniqExactState", 1, None, aggregate=True),
     "uniqExactMerge": HogQLFunctionMeta("uniqExactMerge", 1, 1, aggregate=True),
     "median": HogQLFunctionMeta("median", 1, 1, aggregate=True),
     "medianIf": HogQLFunctionMeta("medianIf", 2, 2, aggregate=True),
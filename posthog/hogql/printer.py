@@ -1698,10 +1698,28 @@ class _Printer(Visitor[str]):
                     materialized_property_sql, [self.context.add_value(name) for name in type.chain[1:]]
                 )
 
+        self.__record_property_access(type)
         return self._unsafe_json_extract_trim_quotes(
             self.visit(type.field_type), [self.context.add_value(name) for name in type.chain]
         )
 
+    def __record_property_access(self, type: ast.PropertyType) -> None:
+        """Keep track of the properties read from JSON, they're candidates for materialization."""
+        if self.dialect != "clickhouse":
+            return
+
+        table = type.field_type.table_type
+        while isinstance(table, ast.TableAliasType) or isinstance(table, ast.VirtualTableType):
+            table = table.table_type
+        if not isinstance(table, ast.TableType):
+            return
+
+        field = type.field_type.resolve_database_field(self.context)
+        if field is not None:
+            self.context.property_accesses.add(
+                (table.table.to_printed_clickhouse(self.context), field.name, str(type.chain[0]))
+            )
+
     def visit_sample_expr(self, node: ast.SampleExpr):
         sample_value = self.visit_ratio_expr(node.sample_value)
         offset_clause = ""
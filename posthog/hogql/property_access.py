@@ -0,0 +1,167 @@
+"""
+Counts the JSON property accesses the HogQL printer emits, so that materialized columns can be picked from what
+queries actually read, rather than from the query text in `system.query_log`.
+
+Every query records the properties it read from JSON (i.e. not from a materialized column) along with its team, kind
+and duration into a process-local aggregate. The aggregate is flushed to Redis at most every
+`PROPERTY_ACCESS_FLUSH_INTERVAL_SECONDS`, into one hash per day, so recording a query doesn't talk to Redis.
+"""
+
+import json
+import time
+import threading
+from collections.abc import Collection
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from posthog.exceptions_capture import capture_exception
+from posthog.redis import get_client
+
+PROPERTY_ACCESS_FLUSH_INTERVAL_SECONDS = 60
+# Keeps the aggregate from growing without bound if flushing fails, accesses of new keys are dropped until the next flush
+PROPERTY_ACCESS_MAX_KEYS = 20_000
+PROPERTY_ACCESS_RETENTION_DAYS = 8
+PROPERTY_ACCESS_REDIS_KEY = "posthog:hogql:property_access"
+
+# (table, table column, property name), e.g. ("events", "properties", "$browser")
+PropertyAccess = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class PropertyAccessKey:
+    table: str
+    table_column: str
+    property_name: str
+    team_id: int
+    query_kind: str
+    # Queries are bucketed by duration, so the totals can be split by how slow the queries were.
+    # Bucket `n` holds the queries that took [2^(n-1), 2^n) milliseconds.
+    duration_bucket: int
+
+    def to_redis_field(self) -> str:
+        return json.dumps(
+            [
+                self.table,
+                self.table_column,
+                self.property_name,
+                self.team_id,
+                self.query_kind,
+                self.duration_bucket,
+            ]
+        )
+
+    @classmethod
+    def from_redis_field(cls, field: bytes | str) -> "PropertyAccessKey":
+        return cls(*json.loads(field))
+
+    @property
+    def max_duration_ms(self) -> int:
+        return 2**self.duration_bucket
+
+
+@dataclass
+class PropertyAccessStats:
+    # Number of queries that read the property
+    count: int = 0
+    # Time of those queries attributed to the property, each query's time is split between the properties it read
+    duration_ms: int = 0
+
+
+def duration_bucket(duration_ms: float) -> int:
+    return int(duration_ms).bit_length()
+
+
+class PropertyAccessAggregate:
+    def __init__(self, max_keys: int = PROPERTY_ACCESS_MAX_KEYS):
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+        self._stats: dict[PropertyAccessKey, PropertyAccessStats] = {}
+
+    def record(
+        self, accesses: Collection[PropertyAccess], *, team_id: int, query_kind: str, duration_ms: float
+    ) -> None:
+        if not accesses:
+            return
+        bucket = duration_bucket(duration_ms)
+        attributed_duration_ms = int(duration_ms / len(accesses))
+        with self._lock:
+            for table, table_column, property_name in accesses:
+                key = PropertyAccessKey(table, table_column, property_name, team_id, query_kind, bucket)
+                stats = self._stats.get(key)
+                if stats is None:
+                    if len(self._stats) >= self._max_keys:
+                        continue
+                    stats = self._stats[key] = PropertyAccessStats()
+                stats.count += 1
+                stats.duration_ms += attributed_duration_ms
+
+    def drain(self) -> dict[PropertyAccessKey, PropertyAccessStats]:
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+
+def _redis_keys(day: datetime) -> tuple[str, str]:
+    prefix = f"{PROPERTY_ACCESS_REDIS_KEY}:{day:%Y%m%d}"
+    return f"{prefix}:count", f"{prefix}:duration_ms"
+
+
+def flush_property_accesses(aggregate: PropertyAccessAggregate) -> None:
+    stats = aggregate.drain()
+    if not stats:
+        return
+
+    count_key, duration_key = _redis_keys(datetime.now(UTC))
+    pipeline = get_client().pipeline(transaction=False)
+    for key, key_stats in stats.items():
+        field = key.to_redis_field()
+        pipeline.hincrby(count_key, field, key_stats.count)
+        pipeline.hincrby(duration_key, field, key_stats.duration_ms)
+    for redis_key in (count_key, duration_key):
+        pipeline.expire(redis_key, timedelta(days=PROPERTY_ACCESS_RETENTION_DAYS))
+    pipeline.execute()
+
+
+def get_property_access_stats(since_hours_ago: int) -> dict[PropertyAccessKey, PropertyAccessStats]:
+    """The flushed stats of the days overlapping the last `since_hours_ago` hours, summed over the days."""
+    client = get_client()
+    now = datetime.now(UTC)
+
+    stats: dict[PropertyAccessKey, PropertyAccessStats] = {}
+    for days_ago in range(since_hours_ago // 24 + 2):
+        count_key, duration_key = _redis_keys(now - timedelta(days=days_ago))
+        durations = client.hgetall(duration_key)
+        for field, count in client.hgetall(count_key).items():
+            key_stats = stats.setdefault(PropertyAccessKey.from_redis_field(field), PropertyAccessStats())
+            key_stats.count += int(count)
+            key_stats.duration_ms += int(durations.get(field, 0))
+    return stats
+
+
+property_access_aggregate = PropertyAccessAggregate()
+_last_flush = time.monotonic()
+_flush_lock = threading.Lock()
+
+
+def record_property_accesses(
+    accesses: Collection[PropertyAccess], *, team_id: int, query_kind: str, duration_ms: float
+) -> None:
+    global _last_flush
+
+    property_access_aggregate.record(accesses, team_id=team_id, query_kind=query_kind, duration_ms=duration_ms)
+
+    if time.monotonic() - _last_flush < PROPERTY_ACCESS_FLUSH_INTERVAL_SECONDS or not _flush_lock.acquire(
+        blocking=False
+    ):
+        return
+    try:
+        _last_flush = time.monotonic()
+        flush_property_accesses(property_access_aggregate)
+    except Exception as e:
+        # Losing some counts is fine, failing the query isn't
+        capture_exception(e)
+    finally:
+        _flush_lock.release()
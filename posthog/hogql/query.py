@@ -1,4 +1,6 @@
 import dataclasses
+from contextlib import contextmanager
+from time import perf_counter
 from typing import ClassVar, Optional, Union, cast
 
 from opentelemetry import trace
@@ -22,18 +24,20 @@ from posthog.hogql.modifiers import create_default_modifiers_for_team
 from posthog.hogql.parser import parse_select
 from posthog.hogql.placeholders import find_placeholders, replace_placeholders
 from posthog.hogql.printer import prepare_and_print_ast, prepare_ast_for_printing, print_prepared_ast
+from posthog.hogql.property_access import record_property_accesses
 from posthog.hogql.resolver_utils import extract_select_queries
 from posthog.hogql.timings import HogQLTimings
 from posthog.hogql.transforms.preaggregated_table_transformation import do_preaggregated_table_transforms
 from posthog.hogql.variables import replace_variables
 from posthog.hogql.visitor import clone_expr
 
-from posthog.clickhouse.client import sync_execute
+from posthog.clickhouse.client import aexecute, sync_execute
 from posthog.clickhouse.client.connection import Workload
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.errors import ExposedCHQueryError
 from posthog.models.team import Team
-from posthog.settings import HOGQL_INCREASED_MAX_EXECUTION_TIME
+from posthog.settings import HOGQL_INCREASED_MAX_EXECUTION_TIME, TEST
+from posthog.sync import database_sync_to_async
 
 tracer = trace.get_tracer(__name__)
 
@@ -205,6 +209,7 @@ class HogQLQueryExecutor:
                 # it's valid to reuse the hogql DB because the modifiers are the same,
                 # and if we don't we end up creating the virtual DB twice per query
                 database=self.hogql_context.database if self.hogql_context else None,
+                property_accesses=set(),
             )
             with self.timings.measure("prepare_and_print_ast"):
                 self.clickhouse_sql, self.clickhouse_prepared_ast = prepare_and_print_ast(
@@ -224,22 +229,39 @@ class HogQLQueryExecutor:
             else:
                 raise
 
+    def _tag_clickhouse_query(self):
+        assert self.clickhouse_sql
+        tag_queries(
+            team_id=self.team.pk,
+            query_type=self.query_type,
+            has_joins="JOIN" in self.clickhouse_sql,
+            has_json_operations="JSONExtract" in self.clickhouse_sql or "JSONHas" in self.clickhouse_sql,
+            timings=self.timings.to_dict(),
+            modifiers=(
+                {k: v for k, v in self.modifiers.model_dump().items() if v is not None} if self.modifiers else {}
+            ),
+        )
+
+    @contextmanager
+    def _record_property_accesses(self):
+        """Records the properties the query read from JSON along with how long it took, including when it failed."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            if self.clickhouse_context.property_accesses:
+                record_property_accesses(
+                    self.clickhouse_context.property_accesses,
+                    team_id=self.team.pk,
+                    query_kind=self.query_type,
+                    duration_ms=(perf_counter() - start) * 1000,
+                )
+
     @tracer.start_as_current_span("HogQLQueryExecutor._execute_clickhouse_query")
     def _execute_clickhouse_query(self):
         assert self.clickhouse_sql
-        timings_dict = self.timings.to_dict()
-        with self.timings.measure("clickhouse_execute"):
-            tag_queries(
-                team_id=self.team.pk,
-                query_type=self.query_type,
-                has_joins="JOIN" in self.clickhouse_sql,
-                has_json_operations="JSONExtract" in self.clickhouse_sql or "JSONHas" in self.clickhouse_sql,
-                timings=timings_dict,
-                modifiers=(
-                    {k: v for k, v in self.modifiers.model_dump().items() if v is not None} if self.modifiers else {}
-                ),
-            )
-
+        self._tag_clickhouse_query()
+        with self.timings.measure("clickhouse_execute"), self._record_property_accesses():
             try:
                 self.results, self.types = sync_execute(
                     self.clickhouse_sql,
@@ -300,6 +322,32 @@ class HogQLQueryExecutor:
         if self.clickhouse_sql is not None:
             self._execute_clickhouse_query()
 
+        return self._response()
+
+    async def aexecute(self) -> HogQLQueryResponse:
+        """
+        Like `execute`, but waits for ClickHouse on the event loop. Generating the SQL can hit Postgres, so that
+        part still runs in a thread.
+        """
+        if self.debug:
+            # Debug queries also run EXPLAIN and build metadata, there's no need to make them fast
+            return await database_sync_to_async(self.execute, thread_sensitive=TEST)()
+
+        await database_sync_to_async(self.generate_clickhouse_sql, thread_sensitive=TEST)()
+        self._tag_clickhouse_query()
+        with self.timings.measure("clickhouse_execute"), self._record_property_accesses():
+            self.results, self.types = await aexecute(
+                self.clickhouse_sql,
+                self.clickhouse_context.values,
+                with_column_types=True,
+                workload=self.workload,
+                team_id=self.team.pk,
+                readonly=True,
+            )
+
+        return self._response()
+
+    def _response(self) -> HogQLQueryResponse:
         return HogQLQueryResponse(
             query=self.query,
             hogql=self.hogql,
@@ -317,3 +365,7 @@ class HogQLQueryExecutor:
 
 def execute_hogql_query(*args, **kwargs) -> HogQLQueryResponse:
     return HogQLQueryExecutor(*args, **kwargs).execute()
+
+
+async def aexecute_hogql_query(*args, **kwargs) -> HogQLQueryResponse:
+    return await HogQLQueryExecutor(*args, **kwargs).aexecute()
@@ -519,6 +519,21 @@ class TestPrinter(BaseTest):
             "events.mat_nullable_property",
         )
 
+    def test_records_json_property_accesses(self):
+        context = HogQLContext(team_id=self.team.pk, enable_select_queries=True)
+        self._select(
+            "SELECT properties.$browser, e.properties.$os FROM events e WHERE properties.$browser = 'Chrome'",
+            context,
+        )
+        self.assertEqual(
+            context.property_accesses,
+            {("events", "properties", "$browser"), ("events", "properties", "$os")},
+        )
+
+        hogql_context = HogQLContext(team_id=self.team.pk, enable_select_queries=True)
+        self._expr("properties.$browser", hogql_context, dialect="hogql")
+        self.assertEqual(hogql_context.property_accesses, set())
+
     def test_property_groups(self):
         context = HogQLContext(
             team_id=self.team.pk,
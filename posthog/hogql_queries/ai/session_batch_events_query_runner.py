@@ -1,8 +1,11 @@
 from typing import Any
 
+from django.conf import settings
+
 from posthog.schema import (
     CachedSessionBatchEventsQueryResponse,
     EventsQuery,
+    HogQLQueryResponse,
     SessionBatchEventsQuery,
     SessionBatchEventsQueryResponse,
     SessionEventsItem,
@@ -18,6 +21,7 @@ from posthog.session_recordings.constants import (
     MAX_TOTAL_EVENTS_PER_QUERY,
 )
 from posthog.session_recordings.queries.session_replay_events import DEFAULT_EVENT_FIELDS
+from posthog.sync import database_sync_to_async
 
 # Type alias for convenience
 SessionEventsResults = dict[str, list[list[Any]]]  # session_id -> events mapping
@@ -95,7 +99,22 @@ class SessionBatchEventsQueryRunner(QueryRunner):
                 modifiers=self.modifiers,
                 limit_context=self.limit_context,
             )
+        return self._session_batch_response(query_result)
+
+    async def acalculate(self) -> SessionBatchEventsQueryResponse:
+        query = await database_sync_to_async(self.to_query, thread_sensitive=settings.TEST)()
+        with tags_context(product=Product.MAX_AI):
+            query_result = await self.paginator.aexecute_hogql_query(
+                query=query,
+                team=self.team,
+                query_type="SessionBatchEventsQuery",
+                timings=self.timings,
+                modifiers=self.modifiers,
+                limit_context=self.limit_context,
+            )
+        return self._session_batch_response(query_result)
 
+    def _session_batch_response(self, query_result: HogQLQueryResponse) -> SessionBatchEventsQueryResponse:
         # If group_by_session is False, return the base response as-is, without session_events grouping
         if not self.query.group_by_session:
             return SessionBatchEventsQueryResponse(
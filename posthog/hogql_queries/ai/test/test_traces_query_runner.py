@@ -7,6 +7,8 @@ import pytest
 from freezegun import freeze_time
 from posthog.test.base import BaseTest, ClickhouseTestMixin, _create_event, _create_person, snapshot_clickhouse_queries
 
+from django.test import override_settings
+
 from posthog.schema import (
     DateRange,
     EventPropertyFilter,
@@ -17,6 +19,8 @@ from posthog.schema import (
     TracesQuery,
 )
 
+from posthog.hogql.query import execute_hogql_query
+
 from posthog.hogql_queries.ai.traces_query_runner import TracesQueryRunner
 from posthog.models import PropertyDefinition, Team
 from posthog.models.property_definition import PropertyType
@@ -1555,3 +1559,108 @@ class TestTracesQueryRunner(ClickhouseTestMixin, BaseTest):
         expected_input_tokens = 39
         self.assertIsNotNone(trace.inputTokens)
         self.assertEqual(trace.inputTokens, expected_input_tokens)
+
+    @freeze_time("2025-01-16T00:00:00Z")
+    def test_trace_summaries_match_events(self):
+        _create_person(distinct_ids=["person1"], team=self.team)
+        # Only generations have a latency, spanning two days
+        _create_ai_generation_event(
+            distinct_id="person1", trace_id="generations", team=self.team, timestamp=datetime(2025, 1, 14, 23, 59)
+        )
+        _create_ai_generation_event(
+            distinct_id="person1",
+            trace_id="generations",
+            input="Longer input",
+            team=self.team,
+            timestamp=datetime(2025, 1, 15, 0, 1),
+            properties={"$ai_latency": 2.5},
+        )
+        # A span with a latency, so only the direct children of the trace are summed
+        _create_ai_span_event(
+            trace_id="spans",
+            input_state={},
+            output_state={},
+            team=self.team,
+            distinct_id="person1",
+            timestamp=datetime(2025, 1, 15, 1),
+            properties={"$ai_span_id": "span_a", "$ai_latency": 3},
+        )
+        _create_ai_generation_event(
+            distinct_id="person1",
+            trace_id="spans",
+            team=self.team,
+            timestamp=datetime(2025, 1, 15, 1, 1),
+            properties={"$ai_parent_id": "span_a", "$ai_latency": 2},
+        )
+        _create_ai_generation_event(
+            distinct_id="person1",
+            trace_id="spans",
+            team=self.team,
+            timestamp=datetime(2025, 1, 15, 1, 2),
+            properties={"$ai_parent_id": "spans", "$ai_latency": 4},
+        )
+        _create_ai_embedding_event(
+            distinct_id="person1", trace_id="embeddings", team=self.team, timestamp=datetime(2025, 1, 15, 2)
+        )
+        _create_ai_trace_event(
+            trace_id="embeddings",
+            trace_name="Embeddings",
+            input_state={},
+            output_state={},
+            team=self.team,
+            distinct_id="person1",
+            timestamp=datetime(2025, 1, 15, 2, 1),
+        )
+
+        summaries = execute_hogql_query(
+            """
+            SELECT
+                trace_id,
+                min(first_timestamp),
+                round(
+                    if(
+                        sum(others_with_latency) = 0 AND sum(generations_with_latency) > 0,
+                        sum(generation_latency),
+                        sum(root_latency)
+                    ),
+                    2
+                ),
+                sum(input_tokens),
+                sum(output_tokens),
+                round(sum(input_cost), 4),
+                round(sum(output_cost), 4),
+                round(sum(total_cost), 4)
+            FROM llm_trace_summaries
+            GROUP BY trace_id
+            ORDER BY trace_id
+            """,
+            team=self.team,
+        ).results
+
+        response = TracesQueryRunner(team=self.team, query=TracesQuery()).calculate()
+        traces = sorted(response.results, key=lambda trace: trace.id)
+        self.assertEqual(
+            summaries,
+            [
+                (
+                    trace.id,
+                    datetime.fromisoformat(trace.createdAt),
+                    trace.totalLatency,
+                    trace.inputTokens,
+                    trace.outputTokens,
+                    trace.inputCost,
+                    trace.outputCost,
+                    trace.totalCost,
+                )
+                for trace in traces
+            ],
+        )
+        self.assertEqual([trace.totalLatency for trace in traces], [0.5, 3.5, 7.0])
+
+        # Listing the traces from the summaries returns the same traces
+        for query in [TracesQuery(), TracesQuery(limit=1, offset=1), TracesQuery(dateRange=DateRange(date_from="-1d"))]:
+            with override_settings(LLM_TRACE_SUMMARIES_ENABLED=True):
+                from_summaries = TracesQueryRunner(team=self.team, query=query).calculate()
+            from_events = TracesQueryRunner(team=self.team, query=query).calculate()
+            self.assertEqual(from_summaries.results, from_events.results)
+            self.assertEqual(from_summaries.hasMore, from_events.hasMore)
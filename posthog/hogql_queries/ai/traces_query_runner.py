@@ -3,6 +3,8 @@ from functools import cached_property
 from typing import Any, cast
 from uuid import UUID
 
+from django.conf import settings
+
 import orjson
 import structlog
 
@@ -75,34 +77,15 @@ class TracesQueryRunner(AnalyticsQueryRunner[TracesQueryResponse]):
             offset_value = self.query.offset if self.query.offset else 0
             pagination_limit = limit_value + offset_value + 1
 
-            trace_ids_query = parse_select(
-                """
-                SELECT
-                    groupArray(trace_id) as trace_ids,
-                    min(first_ts) as min_timestamp,
-                    max(last_ts) as max_timestamp
-                FROM (
-                    SELECT
-                        properties.$ai_trace_id as trace_id,
-                        min(timestamp) as first_ts,
-                        max(timestamp) as last_ts
-                    FROM events
-                    WHERE event IN ('$ai_span', '$ai_generation', '$ai_embedding', '$ai_metric', '$ai_feedback', '$ai_trace')
-                      AND {conditions}
-                    GROUP BY trace_id
-                    ORDER BY max(timestamp) DESC
-                    LIMIT {limit}
-                )
-                """,
-            )
+            if self._can_use_trace_summaries():
+                trace_ids_query, placeholders = self._trace_ids_query_from_summaries(pagination_limit)
+            else:
+                trace_ids_query, placeholders = self._trace_ids_query_from_events(pagination_limit)
 
             trace_ids_result = execute_hogql_query(
                 query_type="TracesQuery_TraceIds",
                 query=trace_ids_query,
-                placeholders={
-                    "conditions": self._get_subquery_filter(),
-                    "limit": ast.Constant(value=pagination_limit),
-                },
+                placeholders=placeholders,
                 team=self.team,
                 timings=self.timings,
                 modifiers=self.modifiers,
@@ -120,6 +103,83 @@ class TracesQueryRunner(AnalyticsQueryRunner[TracesQueryResponse]):
 
             return trace_ids, min_timestamp, max_timestamp
 
+    def _can_use_trace_summaries(self) -> bool:
+        """
+        The summaries only hold the aggregates of each trace, so filters on the properties of the events, persons or
+        groups of a trace still need its events.
+        """
+        return (
+            settings.LLM_TRACE_SUMMARIES_ENABLED
+            and not self.query.properties
+            and not self.query.personId
+            and not (self.query.groupKey and self.query.groupTypeIndex is not None)
+            and not (self.query.filterTestAccounts and self.team.test_account_filters)
+        )
+
+    def _trace_ids_query_from_summaries(
+        self, pagination_limit: int
+    ) -> tuple[ast.SelectQuery | ast.SelectSetQuery, dict[str, ast.Expr]]:
+        """
+        Same as the query on events, but reading the summaries of the days in the date range. The time range is capped
+        to the date range, so that the events of the traces are read in the same range as without summaries.
+        """
+        query = parse_select(
+            """
+            SELECT
+                groupArray(trace_id) as trace_ids,
+                greatest(min(first_ts), {date_from}) as min_timestamp,
+                least(max(last_ts), {date_to}) as max_timestamp
+            FROM (
+                SELECT
+                    trace_id,
+                    min(first_timestamp) as first_ts,
+                    max(last_timestamp) as last_ts
+                FROM llm_trace_summaries
+                WHERE day >= toDate(toTimeZone({date_from}, 'UTC'))
+                  AND day <= toDate(toTimeZone({date_to}, 'UTC'))
+                GROUP BY trace_id
+                HAVING last_ts >= {date_from} AND first_ts <= {date_to}
+                ORDER BY last_ts DESC
+                LIMIT {limit}
+            )
+            """,
+        )
+        placeholders: dict[str, ast.Expr] = {
+            "date_from": self._date_range.date_from_as_hogql(),
+            "date_to": self._date_range.date_to_as_hogql(),
+            "limit": ast.Constant(value=pagination_limit),
+        }
+        return query, placeholders
+
+    def _trace_ids_query_from_events(
+        self, pagination_limit: int
+    ) -> tuple[ast.SelectQuery | ast.SelectSetQuery, dict[str, ast.Expr]]:
+        query = parse_select(
+            """
+            SELECT
+                groupArray(trace_id) as trace_ids,
+                min(first_ts) as min_timestamp,
+                max(last_ts) as max_timestamp
+            FROM (
+                SELECT
+                    properties.$ai_trace_id as trace_id,
+                    min(timestamp) as first_ts,
+                    max(timestamp) as last_ts
+                FROM events
+                WHERE event IN ('$ai_span', '$ai_generation', '$ai_embedding', '$ai_metric', '$ai_feedback', '$ai_trace')
+                  AND {conditions}
+                GROUP BY trace_id
+                ORDER BY max(timestamp) DESC
+                LIMIT {limit}
+            )
+            """,
+        )
+        placeholders: dict[str, ast.Expr] = {
+            "conditions": self._get_subquery_filter(),
+            "limit": ast.Constant(value=pagination_limit),
+        }
+        return query, placeholders
+
     def _calculate(self):
         # First, get the trace IDs and time range
         trace_ids, min_timestamp, max_timestamp = self._get_trace_ids()
@@ -97,7 +97,11 @@ class HogQLCohortQuery:
         cohort_query: Optional[CohortQuery] = None,
         cohort: Optional[Cohort] = None,
         team: Optional[Team] = None,
+        restrict_to_persons: Optional[ast.SelectQuery | ast.SelectSetQuery] = None,
     ):
+        # When set, every condition is only evaluated for the person ids returned by this query.
+        # Used by incremental cohort calculation to re-evaluate only the persons that may have changed.
+        self.restrict_to_persons = restrict_to_persons
         if cohort is not None:
             self.hogql_context = HogQLContext(team_id=cohort.team.pk, enable_select_queries=True)
             self.team = team or cohort.team
@@ -117,10 +121,10 @@ class HogQLCohortQuery:
         else:
             raise
 
-    def get_query_executor(self) -> HogQLQueryExecutor:
+    def get_query_executor(self, query: Optional[SelectQuery | SelectSetQuery] = None) -> HogQLQueryExecutor:
         return HogQLQueryExecutor(
             query_type="HogQLCohortQuery",
-            query=self.get_query(),
+            query=query or self.get_query(),
             modifiers=HogQLQueryModifiers(personsOnEventsMode=PersonsOnEventsMode.PERSON_ID_OVERRIDE_PROPERTIES_JOINED),
             team=self.team,
             limit_context=LimitContext.COHORT_CALCULATION,
@@ -412,7 +416,21 @@ class HogQLCohortQuery:
             ),
         )
 
+    def _restrict(self, condition: ast.SelectQuery | ast.SelectSetQuery) -> ast.SelectQuery | ast.SelectSetQuery:
+        if self.restrict_to_persons is None:
+            return condition
+        return cast(
+            ast.SelectQuery,
+            parse_select(
+                "SELECT id FROM {condition} WHERE id IN {persons}",
+                {"condition": condition, "persons": self.restrict_to_persons},
+            ),
+        )
+
     def _get_condition_for_property(self, prop: Property) -> ast.SelectQuery | ast.SelectSetQuery:
+        return self._restrict(self._get_unrestricted_condition_for_property(prop))
+
+    def _get_unrestricted_condition_for_property(self, prop: Property) -> ast.SelectQuery | ast.SelectSetQuery:
         if prop.type == "behavioral":
             if prop.value == "performed_event":
                 return self.get_performed_event_condition(prop)
@@ -516,7 +534,7 @@ class HogQLCohortQuery:
 
             if should_combine_person_properties:
                 if prop.type == PropertyOperatorType.AND and can_combine_person_properties(prop.values):
-                    return Condition(combine_person_properties(prop.values), False)
+                    return Condition(self._restrict(combine_person_properties(prop.values)), False)
 
             children = [build_conditions(property) for property in prop.values]
 
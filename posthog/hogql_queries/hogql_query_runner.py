@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any, Optional, cast
 
@@ -17,7 +17,7 @@ from posthog.hogql.constants import HogQLGlobalSettings
 from posthog.hogql.filters import replace_filters
 from posthog.hogql.parser import parse_select
 from posthog.hogql.placeholders import find_placeholders, replace_placeholders
-from posthog.hogql.query import execute_hogql_query
+from posthog.hogql.query import aexecute_hogql_query, execute_hogql_query
 from posthog.hogql.utils import deserialize_hx_ast
 from posthog.hogql.variables import replace_variables
 
@@ -25,6 +25,7 @@ from posthog import settings as app_settings
 from posthog.caching.utils import ThresholdMode, staleness_threshold_map
 from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
 from posthog.hogql_queries.query_runner import AnalyticsQueryRunner
+from posthog.sync import database_sync_to_async
 
 
 class HogQLQueryRunner(AnalyticsQueryRunner[HogQLQueryResponse]):
@@ -83,15 +84,13 @@ class HogQLQueryRunner(AnalyticsQueryRunner[HogQLQueryResponse]):
     def to_actors_query(self) -> ast.SelectQuery | ast.SelectSetQuery:
         return self.to_query()
 
-    def _calculate(self) -> HogQLQueryResponse:
+    def _prepare_execution(
+        self,
+    ) -> tuple[ast.SelectQuery | ast.SelectSetQuery, Optional[HogQLHasMorePaginator], dict[str, Any]]:
         query = self.to_query()
         paginator = None
         if isinstance(query, ast.SelectQuery) and not query.limit:
             paginator = HogQLHasMorePaginator.from_limit_context(limit_context=self.limit_context)
-        func = cast(
-            Callable[..., HogQLQueryResponse],
-            execute_hogql_query if paginator is None else paginator.execute_hogql_query,
-        )
 
         if (
             self.is_query_service
@@ -104,22 +103,48 @@ class HogQLQueryRunner(AnalyticsQueryRunner[HogQLQueryResponse]):
             # p95 duration of HogQL query is 2.78sec
             self.settings.max_execution_time = 10
 
-        response = func(
-            query_type="HogQLQuery",
-            query=query,
-            filters=self.query.filters,
-            modifiers=self.query.modifiers or self.modifiers,
-            team=self.team,
-            timings=self.timings,
-            variables=self.query.variables,
-            limit_context=self.limit_context,
-            workload=self.workload,
-            settings=self.settings,
-        )
+        execution_kwargs = {
+            "query_type": "HogQLQuery",
+            "query": query,
+            "filters": self.query.filters,
+            "modifiers": self.query.modifiers or self.modifiers,
+            "team": self.team,
+            "timings": self.timings,
+            "variables": self.query.variables,
+            "limit_context": self.limit_context,
+            "workload": self.workload,
+            "settings": self.settings,
+        }
+        return query, paginator, execution_kwargs
+
+    def _paginated_response(
+        self, response: HogQLQueryResponse, paginator: Optional[HogQLHasMorePaginator]
+    ) -> HogQLQueryResponse:
         if paginator:
             response = response.model_copy(update={**paginator.response_params(), "results": paginator.results})
         return response
 
+    def _calculate(self) -> HogQLQueryResponse:
+        _, paginator, execution_kwargs = self._prepare_execution()
+        func = cast(
+            Callable[..., HogQLQueryResponse],
+            execute_hogql_query if paginator is None else paginator.execute_hogql_query,
+        )
+        return self._paginated_response(func(**execution_kwargs), paginator)
+
+    async def acalculate(self) -> HogQLQueryResponse:
+        _, paginator, execution_kwargs = await database_sync_to_async(
+            self._prepare_execution, thread_sensitive=app_settings.TEST
+        )()
+        func = cast(
+            Callable[..., Awaitable[HogQLQueryResponse]],
+            aexecute_hogql_query if paginator is None else paginator.aexecute_hogql_query,
+        )
+        response = self._paginated_response(await func(**execution_kwargs), paginator)
+        if not self.modifiers.timings:
+            response.timings = None
+        return response
+
     def apply_dashboard_filters(self, dashboard_filter: DashboardFilter):
         self.query.filters = self.query.filters or HogQLFilters()
 
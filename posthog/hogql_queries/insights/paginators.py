@@ -12,7 +12,7 @@ from posthog.hogql.constants import (
     get_default_limit_for_context,
     get_max_limit_for_context,
 )
-from posthog.hogql.query import execute_hogql_query
+from posthog.hogql.query import aexecute_hogql_query, execute_hogql_query
 
 
 class HogQLHasMorePaginator:
@@ -87,6 +87,21 @@ class HogQLHasMorePaginator:
         self.results = self.trim_results()
         return self.response
 
+    async def aexecute_hogql_query(
+        self,
+        query: Union[ast.SelectQuery, ast.SelectSetQuery],
+        *,
+        query_type: str,
+        **kwargs,
+    ) -> HogQLQueryResponse:
+        self.response = await aexecute_hogql_query(
+            query=self.paginate(query),
+            query_type=query_type,
+            **kwargs if self.limit_context is None else {"limit_context": self.limit_context, **kwargs},
+        )
+        self.results = self.trim_results()
+        return self.response
+
     def response_params(self):
         return {
             "hasMore": self.has_more(),
@@ -12,6 +12,7 @@ from posthog.cache_utils import OrjsonJsonSerializer
 from posthog.clickhouse.query_tagging import get_query_tag_value
 from posthog.exceptions_capture import capture_exception
 from posthog.hogql_queries.query_cache_base import QueryCacheManagerBase
+from posthog.hogql_queries.query_cache_columnar import decode_columnar, encode_columnar, is_columnar_payload
 from posthog.metrics import LABEL_TEAM_ID, pushed_metrics_registry
 from posthog.utils import get_safe_cache
 
@@ -163,7 +164,10 @@ class DjangoCacheQueryCacheManager(QueryCacheManagerBase):
     """
 
     def set_cache_data(self, *, response: dict, target_age: Optional[datetime]) -> None:
-        fresh_response_serialized = OrjsonJsonSerializer({}).dumps(response)
+        if settings.QUERY_CACHE_COLUMNAR_FORMAT:
+            fresh_response_serialized = encode_columnar(response)
+        else:
+            fresh_response_serialized = OrjsonJsonSerializer({}).dumps(response)
         data_size = len(fresh_response_serialized)
 
         cache.set(self.cache_key, fresh_response_serialized, settings.CACHED_RESULTS_TTL)
@@ -182,4 +186,6 @@ class DjangoCacheQueryCacheManager(QueryCacheManagerBase):
         if not cached_response_bytes:
             return None
 
+        if is_columnar_payload(cached_response_bytes):
+            return decode_columnar(cached_response_bytes)
         return OrjsonJsonSerializer({}).loads(cached_response_bytes)
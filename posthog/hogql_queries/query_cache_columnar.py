@@ -0,0 +1,185 @@
+"""
+Columnar encoding of cached query responses.
+
+The default cache payload is the whole response as one JSON document, with the results repeated row by row. Reading
+anything out of it, even just `last_refresh`, means parsing all of it.
+
+The columnar payload stores everything but the results as a small JSON header, followed by the tabular results as
+an Arrow IPC stream with one typed column per result column:
+
+    MAGIC | header length (uint32, big-endian) | header (JSON) | body
+
+The header can be read without touching the body. Columns that hold a single JSON-native type (bool, int, float,
+str) are stored as typed Arrow columns, any other column is stored as one JSON value per row, so that decoding
+gives back exactly what the JSON format would. Results that aren't a table (e.g. trends series) are stored as a
+JSON body.
+"""
+
+import math
+import struct
+from collections.abc import Sequence
+from time import perf_counter
+from typing import Any, Optional
+
+import zstd
+import orjson
+import pyarrow as pa
+
+from posthog.cache_utils import OrjsonJsonSerializer
+
+MAGIC = b"\x00PHQC1"
+_HEADER_LENGTH = struct.Struct(">I")
+# Describes the body, kept in the header next to the response metadata
+_FORMAT_KEY = "_columnar"
+
+BODY_ARROW = "arrow"
+BODY_JSON = "json"
+BODY_NONE = "none"
+
+_ARROW_TYPES: dict[type, pa.DataType] = {
+    bool: pa.bool_(),
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+}
+
+
+def _json_dumps(value: Any) -> bytes:
+    return OrjsonJsonSerializer({}).dumps(value)
+
+
+def is_columnar_payload(payload: bytes) -> bool:
+    return payload.startswith(MAGIC)
+
+
+def _tabular_results(results: Any) -> Optional[list[Sequence]]:
+    if not isinstance(results, list) or not results:
+        return None
+    if not all(isinstance(row, list | tuple) for row in results):
+        return None
+    width = len(results[0])
+    if width == 0 or any(len(row) != width for row in results):
+        return None
+    return results
+
+
+def _encode_column(values: list) -> tuple[pa.Array, bool]:
+    """Returns the column as an Arrow array, and whether its values are stored as JSON."""
+    value_types = {type(value) for value in values if value is not None}
+    if not value_types:
+        return pa.nulls(len(values)), False
+
+    if len(value_types) == 1:
+        (value_type,) = value_types
+        arrow_type = _ARROW_TYPES.get(value_type)
+        if arrow_type is not None:
+            if value_type is float:
+                # JSON has no NaN or infinity, the JSON format reads them back as null
+                values = [value if value is None or math.isfinite(value) else None for value in values]
+            try:
+                return pa.array(values, type=arrow_type), False
+            except (pa.ArrowInvalid, OverflowError):
+                # e.g. UInt64 values that don't fit into an int64
+                pass
+
+    return pa.array([_json_dumps(value) for value in values], type=pa.binary()), True
+
+
+def encode_columnar(response: dict) -> bytes:
+    header = {key: value for key, value in response.items() if key != "results"}
+
+    rows = _tabular_results(response.get("results"))
+    if rows is not None:
+        arrays: list[pa.Array] = []
+        json_columns: list[int] = []
+        for index, values in enumerate(zip(*rows)):
+            array, is_json = _encode_column(list(values))
+            arrays.append(array)
+            if is_json:
+                json_columns.append(index)
+
+        table = pa.Table.from_arrays(arrays, names=[str(index) for index in range(len(arrays))])
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue().to_pybytes()
+        header[_FORMAT_KEY] = {"body": BODY_ARROW, "json_columns": json_columns}
+    elif "results" in response:
+        body = _json_dumps(response["results"])
+        header[_FORMAT_KEY] = {"body": BODY_JSON}
+    else:
+        body = b""
+        header[_FORMAT_KEY] = {"body": BODY_NONE}
+
+    header_bytes = _json_dumps(header)
+    return MAGIC + _HEADER_LENGTH.pack(len(header_bytes)) + header_bytes + body
+
+
+def _split_payload(payload: bytes) -> tuple[dict, bytes]:
+    if not is_columnar_payload(payload):
+        raise ValueError("Not a columnar cache payload")
+    header_start = len(MAGIC) + _HEADER_LENGTH.size
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload, len(MAGIC))
+    header = orjson.loads(payload[header_start : header_start + header_length])
+    return header, payload[header_start + header_length :]
+
+
+def decode_columnar_header(payload: bytes) -> dict:
+    """The cached response without its results, without decoding them."""
+    header, _ = _split_payload(payload)
+    header.pop(_FORMAT_KEY, None)
+    return header
+
+
+def decode_columnar(payload: bytes) -> dict:
+    response, body = _split_payload(payload)
+    body_format = response.pop(_FORMAT_KEY)
+
+    if body_format["body"] == BODY_ARROW:
+        table = pa.ipc.open_stream(body).read_all()
+        json_columns = set(body_format["json_columns"])
+        columns = []
+        for index, column in enumerate(table.columns):
+            values = column.to_pylist()
+            if index in json_columns:
+                values = [orjson.loads(value) for value in values]
+            columns.append(values)
+        response["results"] = [list(row) for row in zip(*columns)]
+    elif body_format["body"] == BODY_JSON:
+        response["results"] = orjson.loads(body)
+
+    return response
+
+
+def compare_formats(response: dict, repeat: int = 5) -> dict[str, float]:
+    """
+    Compares the size and speed of the JSON and columnar payloads for a response. Sizes are reported both raw and
+    zstd-compressed, as the cache compresses the payloads.
+    """
+    serializer = OrjsonJsonSerializer({})
+    formats = {
+        "json": (serializer.dumps, serializer.loads),
+        "columnar": (encode_columnar, decode_columnar),
+    }
+
+    report: dict[str, float] = {}
+    for name, (encode, decode) in formats.items():
+        start = perf_counter()
+        for _ in range(repeat):
+            payload = encode(response)
+        report[f"{name}_encode_ms"] = (perf_counter() - start) * 1000 / repeat
+
+        start = perf_counter()
+        for _ in range(repeat):
+            decode(payload)
+        report[f"{name}_decode_ms"] = (perf_counter() - start) * 1000 / repeat
+
+        report[f"{name}_bytes"] = len(payload)
+        report[f"{name}_compressed_bytes"] = len(zstd.compress(payload))
+
+    start = perf_counter()
+    for _ in range(repeat):
+        decode_columnar_header(payload)
+    report["columnar_header_decode_ms"] = (perf_counter() - start) * 1000 / repeat
+
+    return report
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import StrEnum
+from functools import partial
 from time import perf_counter
 from types import UnionType
 from typing import Any, Generic, Optional, Protocol, TypeGuard, TypeVar, Union, cast, get_args
@@ -27,6 +31,7 @@ from posthog.schema import (
     FunnelsQuery,
     GenericCachedQueryResponse,
     GroupsQuery,
+    HeatmapsQuery,
     HogQLASTQuery,
     HogQLQuery,
     HogQLQueryModifiers,
@@ -75,7 +80,13 @@ from posthog.hogql.timings import HogQLTimings
 from posthog import settings
 from posthog.caching.utils import ThresholdMode, cache_target_age, is_stale, last_refresh_from_cached_result
 from posthog.clickhouse.client.connection import Workload
-from posthog.clickhouse.client.execute_async import QueryNotFoundError, enqueue_process_query_task, get_query_status
+from posthog.clickhouse.client.execute_async import (
+    QUERY_SINGLE_FLIGHT_COUNTER,
+    QueryNotFoundError,
+    QuerySingleFlight,
+    enqueue_process_query_task,
+    get_query_status,
+)
 from posthog.clickhouse.client.limit import (
     get_api_team_rate_limiter,
     get_app_dashboard_queries_rate_limiter,
@@ -94,6 +105,7 @@ from posthog.models import Team, User
 from posthog.models.team import WeekStartDay
 from posthog.rbac.user_access_control import UserAccessControlError
 from posthog.schema_helpers import to_dict
+from posthog.sync import database_sync_to_async
 from posthog.utils import generate_cache_key, get_from_dict_or_attr, to_json
 
 logger = structlog.get_logger(__name__)
@@ -125,6 +137,12 @@ BLOCKING_EXECUTION_MODES: set[ExecutionMode] = {
     ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS,
 }
 
+# Blocking modes that are fine with a result someone else just calculated, so concurrent calculations are coalesced
+SINGLE_FLIGHT_EXECUTION_MODES: set[ExecutionMode] = {
+    ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
+    ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS,
+}
+
 _REFRESH_TO_EXECUTION_MODE: dict[str | bool, ExecutionMode] = {
     **ExecutionMode._value2member_map_,  # type: ignore
     True: ExecutionMode.CALCULATE_BLOCKING_ALWAYS,
@@ -725,6 +743,16 @@ def get_query_runner(
             limit_context=limit_context,
             modifiers=modifiers,
         )
+    if kind == "HeatmapsQuery":
+        from posthog.heatmaps.heatmaps_query_runner import HeatmapsQueryRunner
+
+        return HeatmapsQueryRunner(
+            query=cast(HeatmapsQuery | dict[str, Any], query),
+            team=team,
+            timings=timings,
+            limit_context=limit_context,
+            modifiers=modifiers,
+        )
     if kind == "VectorSearchQuery":
         from .ai.vector_search_query_runner import VectorSearchQueryRunner
 
@@ -802,6 +830,23 @@ R = TypeVar("R", bound=BaseModel)
 CR = TypeVar("CR", bound=GenericCachedQueryResponse)
 
 
+@dataclass
+class PendingCalculation:
+    """What `QueryRunner.run` carries over from looking up the cache to storing the calculated result."""
+
+    cache_key: str
+    cache_manager: QueryCacheManagerBase
+    execution_mode: ExecutionMode
+    trigger: Optional[str]
+    start_time: float
+    insight_id: Optional[int]
+    dashboard_id: Optional[int]
+    single_flight: Optional[QuerySingleFlight]
+    last_refresh: datetime
+    target_age: Optional[datetime]
+    query_duration_ms: Optional[float] = None
+
+
 class QueryRunner(ABC, Generic[Q, R, CR]):
     query: Q
     response: R
@@ -895,6 +940,13 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
     def _calculate(self) -> R:
         raise NotImplementedError()
 
+    async def acalculate(self) -> R:
+        """
+        Like `calculate`, for `arun`. Runners that can wait for ClickHouse without holding a thread override this,
+        by default `calculate` runs in a thread.
+        """
+        return await database_sync_to_async(self.calculate, thread_sensitive=settings.TEST)()
+
     def enqueue_async_calculation(
         self,
         *,
@@ -1022,209 +1074,363 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
         dashboard_id: Optional[int] = None,
         cache_age_seconds: Optional[int] = None,
     ) -> CR | CacheMissResponse | QueryStatusResponse:
+        with posthoganalytics.new_context():
+            pending = self._prepare_run(execution_mode, user, query_id, insight_id, dashboard_id, cache_age_seconds)
+            if not isinstance(pending, PendingCalculation):
+                return pending
+
+            try:
+                self._apply_user_modifiers(user)
+                with self._concurrency_limits(dashboard_id):
+                    query_start_time = perf_counter()
+                    query_result = self.calculate()
+                    pending.query_duration_ms = round((perf_counter() - query_start_time) * 1000, 2)
+                fresh_response_dict = self._store_fresh_response(pending, query_result, user)
+            finally:
+                if pending.single_flight is not None:
+                    pending.single_flight.release()
+
+            return self._fresh_response(pending, fresh_response_dict, user)
+
+    async def arun(
+        self,
+        execution_mode: ExecutionMode = ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
+        user: Optional[User] = None,
+        query_id: Optional[str] = None,
+        insight_id: Optional[int] = None,
+        dashboard_id: Optional[int] = None,
+        cache_age_seconds: Optional[int] = None,
+    ) -> CR | CacheMissResponse | QueryStatusResponse:
+        """
+        Like `run`, but the calculation waits for ClickHouse on the event loop instead of holding a thread, for
+        runners implementing `acalculate`. Looking up the cache, rate limiting and storing the result are quick and
+        run in a thread, so many slow queries can run concurrently from one event loop.
+        """
+        in_thread = partial(database_sync_to_async, thread_sensitive=settings.TEST)
+        with posthoganalytics.new_context():
+            pending = await in_thread(self._prepare_run)(
+                execution_mode, user, query_id, insight_id, dashboard_id, cache_age_seconds
+            )
+            if not isinstance(pending, PendingCalculation):
+                return pending
+
+            try:
+                await in_thread(self._apply_user_modifiers)(user)
+                async with self._aconcurrency_limits(dashboard_id):
+                    query_start_time = perf_counter()
+                    query_result = await self.acalculate()
+                    pending.query_duration_ms = round((perf_counter() - query_start_time) * 1000, 2)
+                fresh_response_dict = await in_thread(self._store_fresh_response)(pending, query_result, user)
+            finally:
+                if pending.single_flight is not None:
+                    await in_thread(pending.single_flight.release)()
+
+            return await in_thread(self._fresh_response)(pending, fresh_response_dict, user)
+
+    def _prepare_run(
+        self,
+        execution_mode: ExecutionMode,
+        user: Optional[User],
+        query_id: Optional[str],
+        insight_id: Optional[int],
+        dashboard_id: Optional[int],
+        cache_age_seconds: Optional[int],
+    ) -> Union[CR, CacheMissResponse, QueryStatusResponse, PendingCalculation]:
+        """
+        Everything `run` does before calculating: checking access, and returning the cached result or the async
+        query status if there's no need to calculate. Otherwise returns what's needed to calculate.
+        """
         start_time = perf_counter()
         cache_key = self.get_cache_key()
 
-        with posthoganalytics.new_context():
-            posthoganalytics.tag("cache_key", cache_key)
-            posthoganalytics.tag("query_type", getattr(self.query, "kind", "Other"))
-
-            if insight_id:
-                posthoganalytics.tag("insight_id", str(insight_id))
-            if dashboard_id:
-                posthoganalytics.tag("dashboard_id", str(dashboard_id))
-            if tags := getattr(self.query, "tags", None):
-                if tags.productKey:
-                    posthoganalytics.tag("product_key", tags.productKey)
-                if tags.scene:
-                    posthoganalytics.tag("scene", tags.scene)
-
-            # Abort early if the user doesn't have access to the query runner
-            # We'll proceed as usual if there's no user connected to this request
-            # We're capturing the error for analytics purposes, but we reraise the same one
-            if user is not None:
-                try:
-                    self.validate_query_runner_access(user)
-                except UserAccessControlError as error:
-                    posthoganalytics.capture(
-                        distinct_id=user.distinct_id,
-                        event="query access control error",
-                        properties={
-                            "query_runner": self.__class__.__name__,
-                            "query_id": self.query_id,
-                            "insight_id": insight_id,
-                            "dashboard_id": dashboard_id,
-                            "execution_mode": execution_mode.value,
-                            "query_type": getattr(self.query, "kind", "Other"),
-                            "resource": error.resource,
-                            "required_level": error.required_level,
-                            "resource_id": error.resource_id,
-                            "cache_key": cache_key,
-                        },
-                    )
+        posthoganalytics.tag("cache_key", cache_key)
+        posthoganalytics.tag("query_type", getattr(self.query, "kind", "Other"))
+
+        if insight_id:
+            posthoganalytics.tag("insight_id", str(insight_id))
+        if dashboard_id:
+            posthoganalytics.tag("dashboard_id", str(dashboard_id))
+        if tags := getattr(self.query, "tags", None):
+            if tags.productKey:
+                posthoganalytics.tag("product_key", tags.productKey)
+            if tags.scene:
+                posthoganalytics.tag("scene", tags.scene)
+
+        # Abort early if the user doesn't have access to the query runner
+        # We'll proceed as usual if there's no user connected to this request
+        # We're capturing the error for analytics purposes, but we reraise the same one
+        if user is not None:
+            try:
+                self.validate_query_runner_access(user)
+            except UserAccessControlError as error:
+                posthoganalytics.capture(
+                    distinct_id=user.distinct_id,
+                    event="query access control error",
+                    properties={
+                        "query_runner": self.__class__.__name__,
+                        "query_id": self.query_id,
+                        "insight_id": insight_id,
+                        "dashboard_id": dashboard_id,
+                        "execution_mode": execution_mode.value,
+                        "query_type": getattr(self.query, "kind", "Other"),
+                        "resource": error.resource,
+                        "required_level": error.required_level,
+                        "resource_id": error.resource_id,
+                        "cache_key": cache_key,
+                    },
+                )
 
-                    raise
+                raise
 
-            trigger: str | None = get_query_tag_value("trigger")
+        trigger: str | None = get_query_tag_value("trigger")
 
-            self.query_id = query_id or self.query_id
-            self._cache_age_override = cache_age_seconds
-            CachedResponse: type[CR] = self.cached_response_type
-            cache_manager = get_query_cache_manager(
-                team=self.team,
-                cache_key=cache_key,
-                insight_id=insight_id,
-                dashboard_id=dashboard_id,
-            )
+        self.query_id = query_id or self.query_id
+        self._cache_age_override = cache_age_seconds
+        CachedResponse: type[CR] = self.cached_response_type
+        cache_manager = get_query_cache_manager(
+            team=self.team,
+            cache_key=cache_key,
+            insight_id=insight_id,
+            dashboard_id=dashboard_id,
+        )
 
-            if execution_mode == ExecutionMode.CALCULATE_ASYNC_ALWAYS:
-                # We should always kick off async calculation and disregard the cache
-                return QueryStatusResponse(
-                    query_status=self.enqueue_async_calculation(
-                        refresh_requested=True, cache_manager=cache_manager, user=user
-                    )
+        if execution_mode == ExecutionMode.CALCULATE_ASYNC_ALWAYS:
+            # We should always kick off async calculation and disregard the cache
+            return QueryStatusResponse(
+                query_status=self.enqueue_async_calculation(
+                    refresh_requested=True, cache_manager=cache_manager, user=user
                 )
-            elif execution_mode != ExecutionMode.CALCULATE_BLOCKING_ALWAYS:
-                # Let's look in the cache first
-                results = self.handle_cache_and_async_logic(
-                    execution_mode=execution_mode, cache_manager=cache_manager, user=user
+            )
+        elif execution_mode != ExecutionMode.CALCULATE_BLOCKING_ALWAYS:
+            # Let's look in the cache first
+            results = self.handle_cache_and_async_logic(
+                execution_mode=execution_mode, cache_manager=cache_manager, user=user
+            )
+            if results:
+                cache_tracking_props = {}
+                if isinstance(results, CachedResponse):
+                    if (not trigger or not trigger.startswith("warming")) and results.query_metadata:
+                        log_event_usage_from_query_metadata(
+                            results.query_metadata,
+                            team_id=self.team.id,
+                            user_id=user.id if user else None,
+                        )
+
+                    last_refresh = last_refresh_from_cached_result(results)
+                    cache_tracking_props = {
+                        "is_cache_stale": self._is_stale(last_refresh=last_refresh),
+                        "calculation_trigger": results.calculation_trigger,
+                        "cache_age_seconds": round((datetime.now(UTC) - last_refresh).total_seconds(), 2)
+                        if last_refresh
+                        else None,
+                        "last_refresh": last_refresh.isoformat() if last_refresh else None,
+                    }
+
+                posthoganalytics.capture(
+                    distinct_id=user.distinct_id if user else str(self.team.uuid),
+                    event="query executed",
+                    properties={
+                        "insight_id": insight_id,
+                        "dashboard_id": dashboard_id,
+                        "execution_mode": execution_mode.value,
+                        "query_type": getattr(self.query, "kind", "Other"),
+                        "cache_key": cache_key,
+                        "cache_hit": True if isinstance(results, CachedResponse) else False,
+                        "response_time_ms": round((perf_counter() - start_time) * 1000, 2),
+                        **cache_tracking_props,
+                    },
+                    groups=(groups(self.team.organization, self.team)),
                 )
-                if results:
-                    cache_tracking_props = {}
-                    if isinstance(results, CachedResponse):
-                        if (not trigger or not trigger.startswith("warming")) and results.query_metadata:
-                            log_event_usage_from_query_metadata(
-                                results.query_metadata,
-                                team_id=self.team.id,
-                                user_id=user.id if user else None,
-                            )
-
-                        last_refresh = last_refresh_from_cached_result(results)
-                        cache_tracking_props = {
-                            "is_cache_stale": self._is_stale(last_refresh=last_refresh),
-                            "calculation_trigger": results.calculation_trigger,
-                            "cache_age_seconds": round((datetime.now(UTC) - last_refresh).total_seconds(), 2)
-                            if last_refresh
-                            else None,
-                            "last_refresh": last_refresh.isoformat() if last_refresh else None,
-                        }
-
-                    posthoganalytics.capture(
-                        distinct_id=user.distinct_id if user else str(self.team.uuid),
-                        event="query executed",
-                        properties={
-                            "insight_id": insight_id,
-                            "dashboard_id": dashboard_id,
-                            "execution_mode": execution_mode.value,
-                            "query_type": getattr(self.query, "kind", "Other"),
-                            "cache_key": cache_key,
-                            "cache_hit": True if isinstance(results, CachedResponse) else False,
-                            "response_time_ms": round((perf_counter() - start_time) * 1000, 2),
-                            **cache_tracking_props,
-                        },
-                        groups=(groups(self.team.organization, self.team)),
-                    )
-
-                    return results
 
-            last_refresh = datetime.now(UTC)
-            target_age = self.cache_target_age(last_refresh=last_refresh)
+                return results
 
-            # Avoid affecting cache key
-            # Add user based modifiers here, primarily for user specific feature flagging
-            if user:
-                self.modifiers = create_default_modifiers_for_user(user, self.team, self.modifiers)
-                self.modifiers.useMaterializedViews = True
+        single_flight: Optional[QuerySingleFlight] = None
+        if settings.QUERY_SINGLE_FLIGHT_ENABLED and execution_mode in SINGLE_FLIGHT_EXECUTION_MODES:
+            single_flight = QuerySingleFlight(team_id=self.team.pk, cache_key=cache_key)
+            if single_flight.acquire():
+                QUERY_SINGLE_FLIGHT_COUNTER.labels(outcome="calculated").inc()
+            else:
+                # Someone else is calculating this exact query, let's use their result
+                coalesced_response = self._wait_for_concurrent_calculation(single_flight, cache_manager)
+                if coalesced_response is not None:
+                    return coalesced_response
+
+        last_refresh = datetime.now(UTC)
+        return PendingCalculation(
+            cache_key=cache_key,
+            cache_manager=cache_manager,
+            execution_mode=execution_mode,
+            trigger=trigger,
+            start_time=start_time,
+            insight_id=insight_id,
+            dashboard_id=dashboard_id,
+            single_flight=single_flight,
+            last_refresh=last_refresh,
+            target_age=self.cache_target_age(last_refresh=last_refresh),
+        )
+
+    def _apply_user_modifiers(self, user: Optional[User]) -> None:
+        # Avoid affecting cache key
+        # Add user based modifiers here, primarily for user specific feature flagging
+        if user:
+            self.modifiers = create_default_modifiers_for_user(user, self.team, self.modifiers)
+            self.modifiers.useMaterializedViews = True
+
+    @contextmanager
+    def _concurrency_limits(self, dashboard_id: Optional[int]) -> Iterator[None]:
+        concurrency_limit = self.get_api_queries_concurrency_limit()
+        with get_api_team_rate_limiter().run(
+            is_api=self.is_query_service,
+            team_id=self.team.pk,
+            task_id=self.query_id,
+            limit=concurrency_limit,
+        ):
+            if self.is_query_service:
+                tag_queries(chargeable=1)
 
-            concurrency_limit = self.get_api_queries_concurrency_limit()
-            with get_api_team_rate_limiter().run(
-                is_api=self.is_query_service,
-                team_id=self.team.pk,
+            with get_app_org_rate_limiter().run(
+                org_id=self.team.organization_id,
                 task_id=self.query_id,
-                limit=concurrency_limit,
+                team_id=self.team.id,
+                is_api=get_query_tag_value("access_method") == "personal_api_key",
+                limit=get_org_app_concurrency_limit(self.team.organization_id),
             ):
-                if self.is_query_service:
-                    tag_queries(chargeable=1)
+                with get_app_dashboard_queries_rate_limiter().run(
+                    org_id=self.team.organization_id,
+                    dashboard_id=dashboard_id,
+                    task_id=self.query_id,
+                    team_id=self.team.id,
+                    is_api=get_query_tag_value("access_method") == "personal_api_key",
+                ):
+                    yield
+
+    def _get_concurrency_limits(self) -> tuple[Optional[int], Optional[int]]:
+        return self.get_api_queries_concurrency_limit(), get_org_app_concurrency_limit(self.team.organization_id)
+
+    @asynccontextmanager
+    async def _aconcurrency_limits(self, dashboard_id: Optional[int]) -> AsyncIterator[None]:
+        """Same limits as `_concurrency_limits`, acquired and released from the event loop."""
+        concurrency_limit, org_concurrency_limit = await database_sync_to_async(
+            self._get_concurrency_limits, thread_sensitive=settings.TEST
+        )()
+        async with get_api_team_rate_limiter().arun(
+            is_api=self.is_query_service,
+            team_id=self.team.pk,
+            task_id=self.query_id,
+            limit=concurrency_limit,
+        ):
+            if self.is_query_service:
+                tag_queries(chargeable=1)
 
-                with get_app_org_rate_limiter().run(
+            async with get_app_org_rate_limiter().arun(
+                org_id=self.team.organization_id,
+                task_id=self.query_id,
+                team_id=self.team.id,
+                is_api=get_query_tag_value("access_method") == "personal_api_key",
+                limit=org_concurrency_limit,
+            ):
+                async with get_app_dashboard_queries_rate_limiter().arun(
                     org_id=self.team.organization_id,
+                    dashboard_id=dashboard_id,
                     task_id=self.query_id,
                     team_id=self.team.id,
                     is_api=get_query_tag_value("access_method") == "personal_api_key",
-                    limit=get_org_app_concurrency_limit(self.team.organization_id),
                 ):
-                    with get_app_dashboard_queries_rate_limiter().run(
-                        org_id=self.team.organization_id,
-                        dashboard_id=dashboard_id,
-                        task_id=self.query_id,
-                        team_id=self.team.id,
-                        is_api=get_query_tag_value("access_method") == "personal_api_key",
-                    ):
-                        query_start_time = perf_counter()
-                        query_result = self.calculate()
-                        query_duration_ms = round((perf_counter() - query_start_time) * 1000, 2)
-
-                        fresh_response_dict = {
-                            **query_result.model_dump(),
-                            "is_cached": False,
-                            "last_refresh": last_refresh,
-                            "next_allowed_client_refresh": last_refresh + self._refresh_frequency(),
-                            "cache_key": cache_key,
-                            "timezone": self.team.timezone,
-                            "cache_target_age": target_age,
-                        }
+                    yield
+
+    def _store_fresh_response(self, pending: PendingCalculation, query_result: R, user: Optional[User]) -> dict:
+        fresh_response_dict = {
+            **query_result.model_dump(),
+            "is_cached": False,
+            "last_refresh": pending.last_refresh,
+            "next_allowed_client_refresh": pending.last_refresh + self._refresh_frequency(),
+            "cache_key": pending.cache_key,
+            "timezone": self.team.timezone,
+            "cache_target_age": pending.target_age,
+        }
 
-            try:
-                query_metadata = extract_query_metadata(query=self.query, team=self.team).model_dump()
-                fresh_response_dict["query_metadata"] = query_metadata
-
-                # Don't log usage for warming queries
-                if not trigger or not trigger.startswith("warming"):
-                    log_event_usage_from_query_metadata(
-                        query_metadata,
-                        team_id=self.team.id,
-                        user_id=user.id if user else None,
-                    )
-            except Exception as e:
-                # fail silently if we can't extract query metadata
-                capture_exception(
-                    e, {"query": self.query, "team_id": self.team.pk, "context": "query_metadata_extract"}
-                )
+        try:
+            query_metadata = extract_query_metadata(query=self.query, team=self.team).model_dump()
+            fresh_response_dict["query_metadata"] = query_metadata
 
-            if trigger:
-                fresh_response_dict["calculation_trigger"] = trigger
-
-            # Don't cache debug queries with errors and export queries
-            errors: Optional[list] = fresh_response_dict.get("error", None)
-            has_error = errors is not None and len(errors) > 0
-            if not has_error and self.limit_context != LimitContext.EXPORT:
-                cache_manager.set_cache_data(
-                    response=fresh_response_dict,
-                    # This would be a possible place to decide to not ever keep this cache warm
-                    # Example: Not for super quickly calculated insights
-                    # Set target_age to None in that case
-                    target_age=target_age,
+            # Don't log usage for warming queries
+            if not pending.trigger or not pending.trigger.startswith("warming"):
+                log_event_usage_from_query_metadata(
+                    query_metadata,
+                    team_id=self.team.id,
+                    user_id=user.id if user else None,
                 )
-
-            posthoganalytics.capture(
-                distinct_id=user.distinct_id if user else str(self.team.uuid),
-                event="query executed",
-                properties={
-                    "insight_id": insight_id,
-                    "dashboard_id": dashboard_id,
-                    "cache_hit": False,
-                    "cache_key": cache_key,
-                    "calculation_trigger": trigger,
-                    "execution_mode": execution_mode.value,
-                    "query_type": getattr(self.query, "kind", "Other"),
-                    "response_time_ms": round((perf_counter() - start_time) * 1000, 2),
-                    "query_duration_ms": query_duration_ms,
-                    "has_error": has_error,
-                },
-                groups=(groups(self.team.organization, self.team)),
+        except Exception as e:
+            # fail silently if we can't extract query metadata
+            capture_exception(e, {"query": self.query, "team_id": self.team.pk, "context": "query_metadata_extract"})
+
+        if pending.trigger:
+            fresh_response_dict["calculation_trigger"] = pending.trigger
+
+        # Don't cache debug queries with errors and export queries
+        if not self._has_error(fresh_response_dict) and self.limit_context != LimitContext.EXPORT:
+            pending.cache_manager.set_cache_data(
+                response=fresh_response_dict,
+                # This would be a possible place to decide to not ever keep this cache warm
+                # Example: Not for super quickly calculated insights
+                # Set target_age to None in that case
+                target_age=pending.target_age,
             )
+        return fresh_response_dict
+
+    @staticmethod
+    def _has_error(response_dict: dict) -> bool:
+        errors: Optional[list] = response_dict.get("error", None)
+        return errors is not None and len(errors) > 0
+
+    def _fresh_response(self, pending: PendingCalculation, fresh_response_dict: dict, user: Optional[User]) -> CR:
+        posthoganalytics.capture(
+            distinct_id=user.distinct_id if user else str(self.team.uuid),
+            event="query executed",
+            properties={
+                "insight_id": pending.insight_id,
+                "dashboard_id": pending.dashboard_id,
+                "cache_hit": False,
+                "cache_key": pending.cache_key,
+                "calculation_trigger": pending.trigger,
+                "execution_mode": pending.execution_mode.value,
+                "query_type": getattr(self.query, "kind", "Other"),
+                "response_time_ms": round((perf_counter() - pending.start_time) * 1000, 2),
+                "query_duration_ms": pending.query_duration_ms,
+                "has_error": self._has_error(fresh_response_dict),
+            },
+            groups=(groups(self.team.organization, self.team)),
+        )
+
+        return self.cached_response_type(**fresh_response_dict)
 
-            return CachedResponse(**fresh_response_dict)
+    def _wait_for_concurrent_calculation(
+        self, single_flight: QuerySingleFlight, cache_manager: QueryCacheManagerBase
+    ) -> Optional[CR]:
+        """
+        Waits for the worker holding the lease to calculate the query, then returns its result from the cache.
+        Returns None if that took too long or didn't produce a fresh result, so the query should be calculated here.
+        """
+        if not single_flight.wait(timeout=settings.QUERY_SINGLE_FLIGHT_WAIT_SECONDS):
+            QUERY_SINGLE_FLIGHT_COUNTER.labels(outcome="timeout").inc()
+            return None
+
+        cached_response_candidate = cache_manager.get_cache_data()
+        if self.is_cached_response(cached_response_candidate):
+            try:
+                cached_response = self.cached_response_type(**{**cached_response_candidate, "is_cached": True})
+            except Exception:
+                cached_response = None
+            if cached_response is not None and not self._is_stale(
+                last_refresh=last_refresh_from_cached_result(cached_response)
+            ):
+                QUERY_SINGLE_FLIGHT_COUNTER.labels(outcome="coalesced").inc()
+                count_query_cache_hit(self.team.pk, hit="hit", trigger="single_flight")
+                return cached_response
+
+        # The calculation failed, or its result wasn't cached
+        QUERY_SINGLE_FLIGHT_COUNTER.labels(outcome="no_result").inc()
+        return None
 
     def get_api_queries_concurrency_limit(self):
         """
@@ -4,6 +4,8 @@ from typing import cast
 from posthog.test.base import APIBaseTest, ClickhouseTestMixin, _create_event, _create_person, flush_persons_and_events
 from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
+
 from posthog.schema import (
     CachedHogQLQueryResponse,
     HogQLASTQuery,
@@ -55,6 +57,24 @@ class TestHogQLQueryRunner(ClickhouseTestMixin, APIBaseTest):
         super().setUp()
         self.random_uuid = self._create_random_persons()
 
+    def test_acalculate_matches_calculate(self):
+        query = HogQLQuery(
+            query="""
+                select event, timestamp, uuid, person.properties.email, toDecimal64(1.5, 2), [1, 2], tuple('a', 1)
+                from events
+                order by event
+            """
+        )
+
+        response = self._create_runner(query).calculate()
+        async_response = async_to_sync(self._create_runner(query).acalculate)()
+
+        self.assertEqual(len(response.results), 10)
+        self.assertEqual(async_response.results, response.results)
+        self.assertEqual(async_response.columns, response.columns)
+        self.assertEqual(async_response.types, response.types)
+        self.assertEqual(async_response.hogql, response.hogql)
+
     def test_default_hogql_query(self):
         runner = self._create_runner(HogQLQuery(query="select count(event) from events"))
         query = runner.to_query()
@@ -0,0 +1,63 @@
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from unittest import TestCase
+
+from posthog.cache_utils import OrjsonJsonSerializer
+from posthog.hogql_queries.query_cache_columnar import (
+    decode_columnar,
+    decode_columnar_header,
+    encode_columnar,
+    is_columnar_payload,
+)
+
+
+def _json_round_trip(response: dict) -> dict:
+    serializer = OrjsonJsonSerializer({})
+    return serializer.loads(serializer.dumps(response))
+
+
+class TestQueryCacheColumnar(TestCase):
+    def setUp(self):
+        self.response = {
+            "columns": ["uuid", "event", "count", "ratio", "is_identified", "timestamp", "properties", "empty"],
+            "results": [
+                (uuid.uuid4(), "$pageview", 10, 0.5, True, datetime(2025, 1, 1, tzinfo=UTC), {"a": 1}, None),
+                (uuid.uuid4(), "$pageleave", 2**64 - 1, float("nan"), False, None, ["b"], None),
+                (uuid.uuid4(), None, None, None, None, datetime(2025, 1, 2, tzinfo=UTC), None, None),
+            ],
+            "is_cached": False,
+            "last_refresh": datetime(2025, 1, 3, tzinfo=UTC),
+            "cache_key": "cache_key",
+            "timezone": "UTC",
+            "hogql": "SELECT 1",
+        }
+
+    def test_round_trip_matches_json_format(self):
+        payload = encode_columnar(self.response)
+
+        assert is_columnar_payload(payload)
+        assert decode_columnar(payload) == _json_round_trip(self.response)
+
+    def test_mixed_types_round_trip_matches_json_format(self):
+        response = {"results": [[1, Decimal("1.5")], [2.5, "2"], ["3", 3]]}
+
+        assert decode_columnar(encode_columnar(response)) == _json_round_trip(response)
+
+    def test_non_tabular_results_round_trip(self):
+        for results in ([{"data": [1, 2], "label": "series"}], [], [[], []], None):
+            response = {"results": results, "timezone": "UTC"}
+            assert decode_columnar(encode_columnar(response)) == _json_round_trip(response)
+
+        assert decode_columnar(encode_columnar({"timezone": "UTC"})) == {"timezone": "UTC"}
+
+    def test_header_is_decoded_without_results(self):
+        header = decode_columnar_header(encode_columnar(self.response))
+
+        expected = _json_round_trip(self.response)
+        del expected["results"]
+        assert header == expected
+
+    def test_json_payload_is_not_columnar(self):
+        assert not is_columnar_payload(OrjsonJsonSerializer({}).dumps(self.response))
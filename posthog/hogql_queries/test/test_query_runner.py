@@ -8,6 +8,7 @@ from unittest import mock
 
 from django.core.cache import cache
 
+from asgiref.sync import async_to_sync
 from pydantic import BaseModel
 
 from posthog.schema import (
@@ -329,6 +330,28 @@ class TestQueryRunner(BaseTest):
             self.assertEqual(response.last_refresh.isoformat(), "2023-02-04T13:37:42+00:00")
             mock_on_commit.assert_called_once()
 
+    @mock.patch("django.db.transaction.on_commit")
+    def test_arun_matches_run(self, mock_on_commit):
+        TestQueryRunner = self.setup_test_query_runner_class()
+
+        runner = TestQueryRunner(query={"some_attr": "bla"}, team=self.team)
+
+        with freeze_time(datetime(2023, 2, 4, 13, 37, 42)):
+            response = async_to_sync(runner.arun)(execution_mode=ExecutionMode.CACHE_ONLY_NEVER_CALCULATE)
+            self.assertIsInstance(response, CacheMissResponse)
+
+            response = async_to_sync(runner.arun)(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+            self.assertIsInstance(response, TheTestCachedBasicQueryResponse)
+            self.assertEqual(response.is_cached, False)
+            self.assertEqual(response.last_refresh.isoformat(), "2023-02-04T13:37:42+00:00")
+
+            # the result cached by `arun` is used by `run`, and the other way around
+            response = runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+            self.assertEqual(response.is_cached, True)
+            runner.run(execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS)
+            response = async_to_sync(runner.arun)(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+            self.assertEqual(response.is_cached, True)
+
     def test_modifier_passthrough(self):
         try:
             from posthog.hogql_queries.hogql_query_runner import HogQLQueryRunner
@@ -1,14 +1,28 @@
+from datetime import UTC, datetime
 from typing import Optional
 
+from posthog.schema import HogQLQueryModifiers
+
 from posthog.hogql import ast
 from posthog.hogql.database.schema.channel_type import ChannelTypeExprs, create_channel_type_expr
+from posthog.hogql.parser import parse_select
 from posthog.hogql.property import property_to_expr
+from posthog.hogql.query import execute_hogql_query
 
 from posthog.hogql_queries.web_analytics.pre_aggregated.property_transformer import (
     ChannelTypeReplacer,
     PreAggregatedPropertyTransformer,
 )
 
+
+class LiveTailCoversRangeError(Exception):
+    """None of the range of the query is covered by complete pre-aggregated buckets."""
+
+    def __init__(self, tail_start: datetime):
+        super().__init__(f"The pre-aggregated tables have no complete buckets after {tail_start.isoformat()}")
+        self.tail_start = tail_start
+
+
 get_stats_table = lambda use_v2: "web_pre_aggregated_stats" if use_v2 else "web_stats_combined"
 get_bounces_table = lambda use_v2: "web_pre_aggregated_bounces" if use_v2 else "web_bounces_combined"
 
@@ -18,6 +32,11 @@ class WebAnalyticsPreAggregatedQueryBuilder:
         self.runner = runner
         self.supported_props_filters = supported_props_filters
 
+    @property
+    def supports_live_tail(self) -> bool:
+        """Whether the builder can read the buckets not yet fully aggregated from events, see `get_live_tail_start`"""
+        return False
+
     @property
     def stats_table(self) -> str:
         return get_stats_table(self.runner.use_v2_tables)
@@ -35,6 +54,65 @@ class WebAnalyticsPreAggregatedQueryBuilder:
 
         return True
 
+    @property
+    def modifiers(self) -> HogQLQueryModifiers:
+        # Pre-aggregated tables store data in UTC **buckets**, so we need to disable timezone conversion
+        # to prevent HogQL from automatically converting DateTime fields to team timezone.
+        # We don't plot or show the actual bucket dates anywhere, so since this is just filtering,
+        # we can rely on the bucket aggregation to get the correct results for the time window.
+        modifiers = self.runner.modifiers.model_copy() if self.runner.modifiers else HogQLQueryModifiers()
+        modifiers.convertToProjectTimezone = False
+        return modifiers
+
+    def get_unaggregated_tail_start(self) -> Optional[datetime]:
+        """
+        Returns the start of the data the pre-aggregated tables don't have complete buckets for. The tables are
+        written hourly and the current hour is rewritten until it's over, so the latest bucket can still be missing
+        events. `None` if the tables have no buckets for the team yet.
+        """
+        response = execute_hogql_query(
+            query_type="web_analytics_preaggregated_tail_start",
+            query=parse_select(
+                "SELECT period_bucket FROM {table_name} ORDER BY period_bucket DESC LIMIT 1",
+                placeholders={"table_name": ast.Field(chain=[self.bounces_table])},
+            ),
+            team=self.runner.team,
+            timings=self.runner.timings,
+            modifiers=self.modifiers,
+            limit_context=self.runner.limit_context,
+        )
+        if not response.results:
+            return None
+
+        latest_bucket: datetime = response.results[0][0]
+        return latest_bucket if latest_bucket.tzinfo else latest_bucket.replace(tzinfo=UTC)
+
+    def get_live_tail_start(self) -> Optional[datetime]:
+        """
+        Plans how the query reads the pre-aggregated tables. Returns the start of the live tail if the complete
+        buckets are read from the pre-aggregated tables and the rest of the range from events, `None` if the
+        pre-aggregated tables are read for the whole range.
+
+        Raises `LiveTailCoversRangeError` if none of the range is covered by complete buckets, as the raw query is
+        cheaper then.
+        """
+        if not self.supports_live_tail or not self.runner.use_v2_tables:
+            return None
+
+        tail_start = self.get_unaggregated_tail_start()
+        if tail_start is None or tail_start > self.runner.query_date_range.date_to():
+            return None
+
+        date_from = (
+            self.runner.query_compare_to_date_range.date_from()
+            if self.runner.query_compare_to_date_range
+            else self.runner.query_date_range.date_from()
+        )
+        if tail_start <= date_from:
+            raise LiveTailCoversRangeError(tail_start)
+
+        return tail_start
+
     def _get_channel_type_expr(self) -> ast.Expr:
         def _wrap_with_null_if_empty(expr: ast.Expr) -> ast.Expr:
             return ast.Call(
@@ -0,0 +1,127 @@
+from datetime import UTC, datetime
+from typing import Optional
+
+import pytest
+from freezegun import freeze_time
+from posthog.test.base import _create_event, _create_person, flush_persons_and_events
+
+from posthog.schema import CompareFilter, DateRange, HogQLQueryModifiers, SessionTableVersion, WebOverviewQuery
+
+from posthog.clickhouse.client.execute import sync_execute
+from posthog.hogql_queries.web_analytics.pre_aggregated.query_builder import LiveTailCoversRangeError
+from posthog.hogql_queries.web_analytics.test.web_preaggregated_test_base import WebAnalyticsPreAggregatedTestBase
+from posthog.hogql_queries.web_analytics.web_overview import WebOverviewQueryRunner
+from posthog.models.utils import uuid7
+from posthog.models.web_preaggregated.sql import WEB_BOUNCES_INSERT_SQL
+
+
+class TestWebOverviewLiveTail(WebAnalyticsPreAggregatedTestBase):
+    """
+    Compares the results of the web overview when the pre-aggregated tables are only populated up to a point, and the
+    rest of the range is read from events, with the results of the raw query.
+    """
+
+    NOW = "2024-01-03T15:00:00Z"
+    # The tables are populated up to 12:00, so the bucket of 11:00 is the latest one and is read from events
+    AGGREGATED_UNTIL = "2024-01-03 12:00:00"
+    TAIL_START = datetime(2024, 1, 3, 11, tzinfo=UTC)
+
+    def _setup_test_data(self):
+        sessions = [
+            # Complete buckets
+            ("user1", ["2024-01-01T10:00:00", "2024-01-01T10:05:00", "2024-01-01T10:12:00"]),
+            ("user2", ["2024-01-02T12:00:00"]),
+            ("user3", ["2024-01-03T09:00:00", "2024-01-03T09:03:00"]),
+            # The latest bucket, which is still being aggregated
+            ("user4", ["2024-01-03T11:30:00", "2024-01-03T11:31:00"]),
+            # Not aggregated yet
+            ("user5", ["2024-01-03T14:00:00"]),
+            ("user1", ["2024-01-03T14:10:00", "2024-01-03T14:20:00", "2024-01-03T14:25:00"]),
+        ]
+
+        with freeze_time("2024-01-01T09:00:00Z"):
+            for distinct_id in {distinct_id for distinct_id, _ in sessions}:
+                _create_person(team_id=self.team.pk, distinct_ids=[distinct_id])
+
+        for distinct_id, timestamps in sessions:
+            session_id = str(uuid7(f"{timestamps[0]}+00:00"))
+            for timestamp in timestamps:
+                _create_event(
+                    team=self.team,
+                    event="$pageview",
+                    distinct_id=distinct_id,
+                    timestamp=f"{timestamp}Z",
+                    properties={"$session_id": session_id, "$current_url": "https://example.com/landing"},
+                )
+
+        flush_persons_and_events()
+        sync_execute(
+            WEB_BOUNCES_INSERT_SQL(
+                date_start="2024-01-01",
+                date_end=self.AGGREGATED_UNTIL,
+                team_ids=[self.team.pk],
+                table_name="web_pre_aggregated_bounces",
+                granularity="hourly",
+            )
+        )
+
+    def _run(self, date_from: str, date_to: Optional[str], compare: bool, use_pre_aggregated_tables: bool):
+        with freeze_time(self.NOW):
+            query = WebOverviewQuery(
+                dateRange=DateRange(date_from=date_from, date_to=date_to),
+                properties=[],
+                compareFilter=CompareFilter(compare=compare),
+            )
+            modifiers = HogQLQueryModifiers(
+                useWebAnalyticsPreAggregatedTables=use_pre_aggregated_tables,
+                sessionTableVersion=SessionTableVersion.V2,
+            )
+            runner = WebOverviewQueryRunner(query=query, team=self.team, modifiers=modifiers)
+            return runner, runner.calculate()
+
+    def _assert_matches_raw_query(self, date_from: str, date_to: Optional[str], compare: bool = False):
+        _, raw_response = self._run(date_from, date_to, compare, use_pre_aggregated_tables=False)
+        runner, response = self._run(date_from, date_to, compare, use_pre_aggregated_tables=True)
+
+        assert not raw_response.usedPreAggregatedTables
+        for raw_item, item in zip(raw_response.results, response.results, strict=True):
+            assert item.key == raw_item.key
+            assert item.value == pytest.approx(raw_item.value), item.key
+            assert item.previous == pytest.approx(raw_item.previous), item.key
+        return runner, response
+
+    def test_tail_start_is_the_latest_bucket(self):
+        runner, _ = self._run("2024-01-01", "2024-01-03", compare=False, use_pre_aggregated_tables=True)
+
+        assert runner.preaggregated_query_builder.get_unaggregated_tail_start() == self.TAIL_START
+
+    def test_range_ending_now_reads_tail_from_events(self):
+        runner, response = self._assert_matches_raw_query("2024-01-01", None)
+
+        with freeze_time(self.NOW):
+            assert runner.preaggregated_query_builder.get_live_tail_start() == self.TAIL_START
+        assert response.usedPreAggregatedTables
+        results = {item.key: item.value for item in response.results}
+        assert results["visitors"] == 5
+        assert results["sessions"] == 6
+        assert results["views"] == 12
+
+    def test_range_ending_now_with_comparison(self):
+        _, response = self._assert_matches_raw_query("2024-01-02", "2024-01-03", compare=True)
+
+        assert response.usedPreAggregatedTables
+
+    def test_range_before_tail_reads_only_pre_aggregated_tables(self):
+        runner, response = self._assert_matches_raw_query("2024-01-01", "2024-01-02")
+
+        with freeze_time(self.NOW):
+            assert runner.preaggregated_query_builder.get_live_tail_start() is None
+        assert response.usedPreAggregatedTables
+
+    def test_range_inside_tail_uses_raw_query(self):
+        runner, response = self._assert_matches_raw_query("2024-01-03T13:00:00", None)
+
+        with freeze_time(self.NOW):
+            with pytest.raises(LiveTailCoversRangeError):
+                runner.preaggregated_query_builder.get_live_tail_start()
+        assert not response.usedPreAggregatedTables
@@ -3,12 +3,7 @@ from typing import Optional, Union
 
 import structlog
 
-from posthog.schema import (
-    CachedWebOverviewQueryResponse,
-    HogQLQueryModifiers,
-    WebOverviewQuery,
-    WebOverviewQueryResponse,
-)
+from posthog.schema import CachedWebOverviewQueryResponse, WebOverviewQuery, WebOverviewQueryResponse
 
 from posthog.hogql import ast
 from posthog.hogql.database.schema.exchange_rate import revenue_sum_expression_for_events
@@ -16,6 +11,7 @@ from posthog.hogql.parser import parse_select
 from posthog.hogql.property import property_to_expr
 from posthog.hogql.query import execute_hogql_query
 
+from posthog.hogql_queries.web_analytics.pre_aggregated.query_builder import LiveTailCoversRangeError
 from posthog.hogql_queries.web_analytics.web_analytics_query_runner import WebAnalyticsQueryRunner
 from posthog.hogql_queries.web_analytics.web_overview_pre_aggregated import WebOverviewPreAggregatedQueryBuilder
 from posthog.models.filters.mixins.utils import cached_property
@@ -49,19 +45,24 @@ class WebOverviewQueryRunner(WebAnalyticsQueryRunner[WebOverviewQueryResponse]):
             return None
 
         try:
-            # Pre-aggregated tables store data in UTC **buckets**, so we need to disable timezone conversion
-            # to prevent HogQL from automatically converting DateTime fields to team timezone.
-            # We don't plot or show the actual bucket dates anywhere, so since this is just filtering,
-            # we can rely on the bucket aggregation to get the correct results for the time window.
-            pre_agg_modifiers = self.modifiers.model_copy() if self.modifiers else HogQLQueryModifiers()
-            pre_agg_modifiers.convertToProjectTimezone = False
+            try:
+                tail_start = self.preaggregated_query_builder.get_live_tail_start()
+            except LiveTailCoversRangeError:
+                return None
+
+            # The buckets not yet fully aggregated are read from events, so ranges ending now include the latest data
+            if tail_start is None:
+                query_type, query = "web_overview_preaggregated_query", self.preaggregated_query_builder.get_query()
+            else:
+                query_type = "web_overview_preaggregated_live_tail_query"
+                query = self.preaggregated_query_builder.get_hybrid_query(tail_start)
 
             response = execute_hogql_query(
-                query_type="web_overview_preaggregated_query",
-                query=self.preaggregated_query_builder.get_query(),
+                query_type=query_type,
+                query=query,
                 team=self.team,
                 timings=self.timings,
-                modifiers=pre_agg_modifiers,
+                modifiers=self.preaggregated_query_builder.modifiers,
                 limit_context=self.limit_context,
             )
 
@@ -1,8 +1,11 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, cast
 
 from posthog.hogql import ast
 from posthog.hogql.parser import parse_select
 from posthog.hogql.property import property_to_expr
+from posthog.hogql.transforms.state_aggregations import transform_query_to_state_aggregations
+from posthog.hogql.visitor import clone_expr
 
 from posthog.hogql_queries.web_analytics.pre_aggregated.properties import WEB_OVERVIEW_SUPPORTED_PROPERTIES
 from posthog.hogql_queries.web_analytics.pre_aggregated.query_builder import WebAnalyticsPreAggregatedQueryBuilder
@@ -15,6 +18,11 @@ class WebOverviewPreAggregatedQueryBuilder(WebAnalyticsPreAggregatedQueryBuilder
     def __init__(self, runner: "WebOverviewQueryRunner") -> None:
         super().__init__(runner, supported_props_filters=WEB_OVERVIEW_SUPPORTED_PROPERTIES)
 
+    @property
+    def supports_live_tail(self) -> bool:
+        # Conversions are already read from events, see `_get_conversion_query`
+        return not self.runner.query.conversionGoal
+
     def get_query(self) -> ast.SelectQuery:
         previous_period_filter, current_period_filter = self.get_date_ranges()
 
@@ -22,7 +30,105 @@ class WebOverviewPreAggregatedQueryBuilder(WebAnalyticsPreAggregatedQueryBuilder
             return self._get_conversion_query(current_period_filter, previous_period_filter)
 
         table_name = self.bounces_table
+        query = self._get_overview_query(ast.Field(chain=[table_name]), current_period_filter, previous_period_filter)
+
+        filters = self._get_filters(table_name=table_name)
+        if filters:
+            query.where = filters
+
+        return query
+
+    def get_hybrid_query(self, tail_start: datetime) -> ast.SelectQuery:
+        """
+        Reads the complete buckets before `tail_start` from the pre-aggregated table, and the sessions starting from
+        `tail_start` from events, aggregated to the same states so both are merged together.
+        """
+        previous_period_filter, current_period_filter = self.get_date_ranges()
+
+        states = ast.SelectSetQuery(
+            initial_select_query=self._get_pre_aggregated_states(tail_start),
+            subsequent_select_queries=[
+                ast.SelectSetNode(set_operator="UNION ALL", select_query=self._get_live_tail_states(tail_start))
+            ],
+        )
+        return self._get_overview_query(states, current_period_filter, previous_period_filter)
+
+    def _get_pre_aggregated_states(self, tail_start: datetime) -> ast.SelectQuery:
+        table_name = self.bounces_table
+        query = cast(
+            ast.SelectQuery,
+            parse_select(
+                """
+            SELECT
+                period_bucket,
+                persons_uniq_state,
+                sessions_uniq_state,
+                pageviews_count_state,
+                bounces_count_state,
+                total_session_duration_state,
+                total_session_count_state
+            FROM {table_name}
+            """,
+                placeholders={"table_name": ast.Field(chain=[table_name])},
+            ),
+        )
+        query.where = ast.And(
+            exprs=[
+                self._get_filters(table_name=table_name),
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.Lt,
+                    left=ast.Field(chain=[table_name, "period_bucket"]),
+                    right=ast.Constant(value=tail_start),
+                ),
+            ]
+        )
+        return query
+
+    def _get_live_tail_states(self, tail_start: datetime) -> ast.SelectQuery:
+        """Aggregates the sessions of the raw query starting from `tail_start` to the states of the pre-aggregated table"""
+        sessions = cast(ast.SelectQuery, clone_expr(self.runner.inner_select))
+        sessions.where = ast.And(
+            exprs=[
+                *([sessions.where] if sessions.where else []),
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.GtEq,
+                    left=ast.Field(chain=["timestamp"]),
+                    right=ast.Constant(value=tail_start),
+                ),
+            ]
+        )
+        sessions.having = ast.And(
+            exprs=[
+                *([sessions.having] if sessions.having else []),
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.GtEq,
+                    left=ast.Field(chain=["start_timestamp"]),
+                    right=ast.Constant(value=tail_start),
+                ),
+            ]
+        )
 
+        # The casts match the types of the states of the pre-aggregated table, so the states can be merged together
+        query = parse_select(
+            """
+            SELECT
+                toStartOfMinute(start_timestamp) AS period_bucket,
+                uniq(assumeNotNull(session_person_id)) AS persons_uniq_state,
+                uniq(assumeNotNull(toString(session_id))) AS sessions_uniq_state,
+                sum(_toUInt64(filtered_pageview_count)) AS pageviews_count_state,
+                sum(_toUInt64(ifNull(is_bounce, 0))) AS bounces_count_state,
+                sum(_toInt64(ifNull(session_duration, 0))) AS total_session_duration_state,
+                sum(_toUInt64(1)) AS total_session_count_state
+            FROM {sessions}
+            GROUP BY period_bucket
+            """,
+            placeholders={"sessions": sessions},
+        )
+        return cast(ast.SelectQuery, transform_query_to_state_aggregations(query))
+
+    def _get_overview_query(
+        self, table: ast.Expr, current_period_filter: ast.Expr, previous_period_filter: ast.Expr
+    ) -> ast.SelectQuery:
         query = parse_select(
             """
             SELECT
@@ -43,10 +149,10 @@ class WebOverviewPreAggregatedQueryBuilder(WebAnalyticsPreAggregatedQueryBuilder
 
                 NULL AS revenue,
                 NULL AS previous_revenue
-        FROM {table_name}
+        FROM {table}
         """,
             placeholders={
-                "table_name": ast.Field(chain=[table_name]),
+                "table": table,
                 "unique_persons_current": self._uniq_merge_if("persons_uniq_state", current_period_filter),
                 "unique_persons_previous": self._uniq_merge_if("persons_uniq_state", previous_period_filter),
                 "pageviews_current": self._sum_merge_if("pageviews_count_state", current_period_filter),
@@ -69,11 +175,6 @@ class WebOverviewPreAggregatedQueryBuilder(WebAnalyticsPreAggregatedQueryBuilder
         )
 
         assert isinstance(query, ast.SelectQuery)
-
-        filters = self._get_filters(table_name=table_name)
-        if filters:
-            query.where = filters
-
         return query
 
     def _get_conversion_query(
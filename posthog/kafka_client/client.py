@@ -1,10 +1,15 @@
+import re
 import json
-from collections.abc import Callable
+import uuid
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable
 from enum import StrEnum
 from typing import Any, Optional
 
 from django.conf import settings
 
+import orjson
 from kafka import (
     KafkaConsumer as KC,
     KafkaProducer as KP,
@@ -23,6 +28,59 @@ KAFKA_PRODUCER_RETRIES = 5
 logger = get_logger(__name__)
 
 
+def _fast_json_default(obj: Any) -> Any:
+    # orjson serializes `UUID`s natively, but not subclasses such as `UUIDT`
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def fast_json_serializer(d: Any) -> bytes:
+    """
+    Serializes `d` like `_KafkaProducer.json_serializer`, and raises `TypeError` on the same objects, such as
+    datetimes, except that:
+    - UUIDs are serialized as strings.
+    - NaN and infinite floats are serialized as `null`, where `json.dumps` writes `NaN` and `Infinity`, which are not
+      valid JSON.
+    """
+    return orjson.dumps(d, default=_fast_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+
+
+class _DeliveryReport:
+    """
+    Tallies the deliveries of the messages of a `produce_many` call, and reports them with a single statsd increment
+    per outcome once all of them are settled, instead of one increment per message.
+    """
+
+    def __init__(self, topic: str, pending: int):
+        self.topic = topic
+        self._lock = threading.Lock()
+        self._pending = pending
+        self.succeeded = 0
+        self.failed: Counter[str] = Counter()
+
+    def on_success(self, _: RecordMetadata) -> None:
+        with self._lock:
+            self.succeeded += 1
+            self._settle()
+
+    def on_failure(self, exc: Exception) -> None:
+        with self._lock:
+            self.failed[exc.__class__.__name__] += 1
+            self._settle()
+
+    def _settle(self) -> None:
+        self._pending -= 1
+        if self._pending > 0:
+            return
+        if self.succeeded:
+            statsd.incr("posthog_cloud_kafka_send_success", count=self.succeeded, tags={"topic": self.topic})
+        for exception, count in self.failed.items():
+            statsd.incr(
+                "posthog_cloud_kafka_send_failure", count=count, tags={"topic": self.topic, "exception": exception}
+            )
+
+
 class KafkaProducerForTests:
     def __init__(self):
         pass
@@ -178,6 +236,34 @@ class _KafkaProducer:
         future.add_callback(self.on_send_success).add_errback(lambda exc: self.on_send_failure(topic=topic, exc=exc))
         return future
 
+    def produce_many(
+        self,
+        topic: str,
+        messages: Iterable[Any],
+        key: Optional[Callable[[Any], Optional[str]]] = None,
+        value_serializer: Optional[Callable[[Any], bytes]] = None,
+    ) -> list[FutureRecordMetadata]:
+        """
+        Produces `messages` to `topic`, serialized with `fast_json_serializer` unless `value_serializer` is given, and
+        keyed by `key(message)` if `key` is given. Deliveries are reported to statsd once for the whole batch.
+        """
+        if not value_serializer:
+            value_serializer = fast_json_serializer
+        messages = list(messages)
+        report = _DeliveryReport(topic, pending=len(messages))
+
+        futures = []
+        for message in messages:
+            message_key = key(message) if key else None
+            future = self.producer.send(
+                topic,
+                value=value_serializer(message),
+                key=message_key.encode("utf-8") if message_key is not None else None,
+            )
+            future.add_callback(report.on_success).add_errback(report.on_failure)
+            futures.append(future)
+        return futures
+
     def flush(self, timeout=None):
         self.producer.flush(timeout)
 
@@ -262,6 +348,9 @@ def build_kafka_consumer(
     return consumer
 
 
+_ROW_PARAMETER_RE = re.compile(r"%\((\w+)\)s")
+
+
 class ClickhouseProducer:
     producer: Optional[_KafkaProducer]
 
@@ -273,3 +362,20 @@ class ClickhouseProducer:
             self.producer.produce(topic=topic, data=data)
         else:
             sync_execute(sql, data)
+
+    def produce_many(self, sql: str, topic: str, rows: Iterable[dict[str, Any]]):
+        if self.producer is not None:
+            self.producer.produce_many(topic=topic, messages=rows)
+        else:
+            # The insert statements select the values of a single row, so the rows are inserted together by selecting
+            # the values of each of them with its own parameters
+            rows = list(rows)
+            if not rows:
+                return
+            insert, _, select = sql.partition(" SELECT ")
+            parameters: dict[str, Any] = {}
+            selects = []
+            for index, row in enumerate(rows):
+                selects.append(_ROW_PARAMETER_RE.sub(rf"%(\g<1>_{index})s", select))
+                parameters.update({f"{name}_{index}": value for name, value in row.items()})
+            sync_execute(f"{insert} SELECT " + " UNION ALL SELECT ".join(selects), parameters)
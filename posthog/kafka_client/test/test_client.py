@@ -1,10 +1,19 @@
+import json
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from posthog.test.base import BaseTest, ClickhouseTestMixin
 from unittest.mock import patch
 
 from django.test import TestCase, override_settings
 
 import kafka
 
-from posthog.kafka_client.client import _KafkaProducer, build_kafka_consumer
+from posthog.clickhouse.client import sync_execute
+from posthog.kafka_client.client import ClickhouseProducer, _KafkaProducer, build_kafka_consumer, fast_json_serializer
+from posthog.kafka_client.topics import KAFKA_PERSON_DISTINCT_ID
+from posthog.models.person.sql import INSERT_PERSON_DISTINCT_ID2
+from posthog.models.utils import UUIDT
 
 
 @override_settings(TEST=False)
@@ -22,6 +31,55 @@ class KafkaClientTestCase(TestCase):
         msg = next(consumer)
         self.assertEqual(msg, "message 1 from test_topic topic")
 
+    @patch("posthog.kafka_client.client.statsd")
+    def test_kafka_produce_many_reports_deliveries_once(self, mock_statsd):
+        producer = _KafkaProducer(test=True)
+
+        futures = producer.produce_many(
+            topic=self.topic, messages=[{"id": i} for i in range(10)], key=lambda message: str(message["id"])
+        )
+
+        self.assertEqual(len(futures), 10)
+        self.assertTrue(all(future.succeeded() for future in futures))
+        mock_statsd.incr.assert_called_once_with(
+            "posthog_cloud_kafka_send_success", count=10, tags={"topic": self.topic}
+        )
+
+    def test_fast_json_serializer(self):
+        uuid = UUIDT()
+        payload = {
+            "id": uuid,
+            "created_at": "2025-01-02 03:04:05.000006",
+            "team_id": 1,
+            "properties": '{"$browser": "Chrome"}',
+        }
+
+        self.assertEqual(
+            fast_json_serializer(payload),
+            b'{"id":"%s","created_at":"2025-01-02 03:04:05.000006","team_id":1,"properties":"{\\"$browser\\": \\"Chrome\\"}"}'
+            % str(uuid).encode(),
+        )
+        self.assertEqual(json.loads(fast_json_serializer(self.payload)), self.payload)
+
+    def test_fast_json_serializer_differences_with_json_serializer(self):
+        # Datetimes are rejected by both
+        payload = {"created_at": datetime(2025, 1, 2, tzinfo=UTC)}
+        with self.assertRaises(TypeError):
+            _KafkaProducer.json_serializer(payload)
+        with self.assertRaises(TypeError):
+            fast_json_serializer(payload)
+
+        # UUIDs are only serialized by `fast_json_serializer`
+        uuid = uuid4()
+        with self.assertRaises(TypeError):
+            _KafkaProducer.json_serializer({"id": uuid})
+        self.assertEqual(fast_json_serializer({"id": uuid}), b'{"id":"%s"}' % str(uuid).encode())
+
+        # Non-finite floats are written as invalid JSON by `json_serializer`, as null by `fast_json_serializer`
+        payload = {"nan": float("nan"), "inf": float("inf")}
+        self.assertEqual(_KafkaProducer.json_serializer(payload), b'{"nan": NaN, "inf": Infinity}')
+        self.assertEqual(fast_json_serializer(payload), b'{"nan":null,"inf":null}')
+
     def test_kafka_produce(self):
         producer = _KafkaProducer(test=False)
         producer.produce(topic=self.topic, data=self.payload)
@@ -76,3 +134,29 @@ class KafkaClientTestCase(TestCase):
             producer = _KafkaProducer(test=False)
         for key, value in expected_sasl_config.items():
             self.assertEqual(value, producer.producer.config[key])  # type: ignore
+
+
+class ClickhouseProducerTestCase(ClickhouseTestMixin, BaseTest):
+    def test_produce_many_inserts_the_rows_in_one_query(self):
+        rows = [
+            {
+                "distinct_id": f"distinct-{i}",
+                "person_id": str(uuid4()),
+                "team_id": self.team.pk,
+                "version": i,
+                "is_deleted": 0,
+            }
+            for i in range(3)
+        ]
+
+        with patch("posthog.kafka_client.client.sync_execute", wraps=sync_execute) as mock_sync_execute:
+            ClickhouseProducer().produce_many(sql=INSERT_PERSON_DISTINCT_ID2, topic=KAFKA_PERSON_DISTINCT_ID, rows=rows)
+
+        mock_sync_execute.assert_called_once()
+        self.assertEqual(
+            sync_execute(
+                "SELECT distinct_id, toString(person_id), version FROM person_distinct_id2 WHERE team_id = %(team_id)s ORDER BY distinct_id",
+                {"team_id": self.team.pk},
+            ),
+            [(row["distinct_id"], row["person_id"], row["version"]) for row in rows],
+        )
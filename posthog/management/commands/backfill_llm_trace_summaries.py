@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+import structlog
+
+from posthog.clickhouse.client import sync_execute
+from posthog.models.ai.trace_summaries import LLM_TRACE_SUMMARIES_BACKFILL_SQL
+
+logger = structlog.get_logger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Backfill the LLM trace summaries with the events ingested before the materialized view was created"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-date", type=str, required=True, help="First day to backfill (YYYY-MM-DD)")
+        parser.add_argument("--end-date", type=str, required=True, help="Last day to backfill (YYYY-MM-DD)")
+        parser.add_argument(
+            "--mv-created-at",
+            type=str,
+            required=True,
+            help="When the materialized view was created (ISO 8601, UTC), the events ingested after it are already "
+            "summarized and backfilling them would count them twice",
+        )
+        parser.add_argument("--team-id", type=int, help="Backfill the traces of a specific team only")
+
+    def handle(self, *args, **options):
+        start_date = datetime.strptime(options["start_date"], "%Y-%m-%d").date()
+        end_date = datetime.strptime(options["end_date"], "%Y-%m-%d").date()
+        mv_created_at = datetime.fromisoformat(options["mv_created_at"])
+
+        where = "toDate(timestamp) = %(day)s AND _timestamp < %(mv_created_at)s"
+        if options["team_id"]:
+            where += " AND team_id = %(team_id)s"
+
+        day = start_date
+        while day <= end_date:
+            sync_execute(
+                LLM_TRACE_SUMMARIES_BACKFILL_SQL(where=where, use_sharded_source=False),
+                {"day": day.isoformat(), "mv_created_at": mv_created_at, "team_id": options["team_id"]},
+            )
+            logger.info("llm_trace_summaries_backfilled", day=day.isoformat())
+            day += timedelta(days=1)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled LLM trace summaries from {start_date.isoformat()} to {end_date.isoformat()}"
+            )
+        )
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posthog.models.search_document import (
+    SEARCH_DOCUMENT_BATCH_SIZE,
+    SEARCH_DOCUMENT_ENTITIES,
+    build_search_documents,
+    save_search_documents,
+    searchable_queryset,
+)
+
+
+class Command(BaseCommand):
+    help = "Backfill the search index of the entities searched in the app, documents are kept up to date on save"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=SEARCH_DOCUMENT_BATCH_SIZE, help="Number of objects indexed per batch"
+        )
+        parser.add_argument("--sleep-interval", type=float, default=0.1, help="Sleep time between batches in seconds")
+        parser.add_argument("--team-id", type=int, help="Index the objects of a specific team only")
+        parser.add_argument(
+            "--entity", choices=list(SEARCH_DOCUMENT_ENTITIES.keys()), help="Index a specific entity only"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        entity_types = [options["entity"]] if options["entity"] else list(SEARCH_DOCUMENT_ENTITIES.keys())
+
+        for entity_type in entity_types:
+            qs = searchable_queryset(entity_type)
+            if options["team_id"]:
+                qs = qs.filter(team_id=options["team_id"])
+
+            indexed = 0
+            last_pk = None
+            while True:
+                batch_qs = qs.order_by("pk")
+                if last_pk is not None:
+                    batch_qs = batch_qs.filter(pk__gt=last_pk)
+                pks = list(batch_qs.values_list("pk", flat=True)[:batch_size])
+                if not pks:
+                    break
+
+                save_search_documents(build_search_documents(entity_type, qs.filter(pk__in=pks)))
+                indexed += len(pks)
+                last_pk = pks[-1]
+
+                if options["sleep_interval"] > 0:
+                    time.sleep(options["sleep_interval"])
+
+            self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} objects of {entity_type}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posthog.models.surveys.rollups import backfill_survey_events
+
+
+class Command(BaseCommand):
+    help = "Roll up the survey events of the days before the first rolled up day, the later days are rolled up daily"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="Number of days to roll up")
+
+    def handle(self, *args, **options):
+        rolled_up = backfill_survey_events(options["days"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Survey events are rolled up from {rolled_up.first_day.isoformat()} to {rolled_up.end_day.isoformat()}"
+            )
+        )
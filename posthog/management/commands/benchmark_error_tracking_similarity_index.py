@@ -0,0 +1,84 @@
+import time
+import random
+import logging
+import statistics
+
+from django.core.management.base import BaseCommand
+
+import structlog
+
+from posthog.schema import ErrorTrackingSimilarIssuesQuery
+
+from posthog.models import Team
+
+from products.error_tracking.backend.hogql_queries.error_tracking_similar_issues_query_runner import (
+    ErrorTrackingSimilarIssuesQueryRunner,
+)
+from products.error_tracking.backend.models import ErrorTrackingIssue
+from products.error_tracking.backend.similarity_index import build_team_similarity_index
+
+logger = structlog.get_logger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class Command(BaseCommand):
+    help = "Compare recall and latency of the ANN similar issues lookup against the brute-force query"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team-id", required=True, type=int, help="Team ID to benchmark")
+        parser.add_argument("--samples", default=20, type=int, help="Number of random issues to look up")
+        parser.add_argument("--limit", default=10, type=int, help="Number of similar issues to fetch per lookup")
+        parser.add_argument("--model-name", default=None, type=str, help="Embedding model name")
+        parser.add_argument("--rendering", default=None, type=str, help="Embedding rendering")
+        parser.add_argument("--build", action="store_true", help="(Re)build the index before benchmarking")
+
+    def handle(self, *args, **options):
+        team = Team.objects.get(pk=options["team_id"])
+        base_query = ErrorTrackingSimilarIssuesQuery(
+            issueId="", limit=options["limit"], modelName=options["model_name"], rendering=options["rendering"]
+        )
+        # Resolve the defaults the runner would use
+        defaults_runner = ErrorTrackingSimilarIssuesQueryRunner(query=base_query, team=team)
+
+        if options["build"]:
+            start = time.perf_counter()
+            team_index = build_team_similarity_index(team.pk, defaults_runner.model_name, defaults_runner.rendering)
+            if team_index is None:
+                self.stdout.write("Not enough embeddings to build an index for this team")
+                return
+            self.stdout.write(f"Built index of {len(team_index.index)} vectors in {time.perf_counter() - start:.2f}s")
+
+        issue_ids = list(ErrorTrackingIssue.objects.filter(team=team).values_list("id", flat=True)[:10_000])
+        sample = random.sample(issue_ids, min(options["samples"], len(issue_ids)))
+
+        recalls: list[float] = []
+        exact_timings: list[float] = []
+        ann_timings: list[float] = []
+        for issue_id in sample:
+            query = base_query.model_copy(update={"issueId": str(issue_id)})
+            try:
+                start = time.perf_counter()
+                exact = ErrorTrackingSimilarIssuesQueryRunner(
+                    query=query, team=team, use_similarity_index=False
+                ).calculate()
+                exact_timings.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                approximate = ErrorTrackingSimilarIssuesQueryRunner(query=query, team=team).calculate()
+                ann_timings.append(time.perf_counter() - start)
+            except Exception as e:
+                logger.warning("Skipping issue", issue_id=issue_id, error=str(e))
+                continue
+
+            expected = {issue.id for issue in exact.results}
+            if expected:
+                recalls.append(len(expected & {issue.id for issue in approximate.results}) / len(expected))
+
+        if not exact_timings:
+            self.stdout.write("No issues could be benchmarked")
+            return
+
+        self.stdout.write(f"Issues benchmarked: {len(exact_timings)}")
+        self.stdout.write(f"Recall@{options['limit']}: {statistics.mean(recalls) if recalls else 1.0:.3f}")
+        for name, timings in (("brute force", exact_timings), ("ann", ann_timings)):
+            self.stdout.write(f"{name}: p50={statistics.median(timings) * 1000:.1f}ms max={max(timings) * 1000:.1f}ms")
@@ -0,0 +1,55 @@
+import json
+import time
+from datetime import UTC, datetime
+
+from django.core.management.base import BaseCommand
+
+from posthog.kafka_client.client import KafkaProducerForTests, _KafkaProducer
+from posthog.models.utils import UUIDT
+
+
+def _person_rows(count: int) -> list[dict]:
+    created_at = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")
+    return [
+        {
+            "id": str(UUIDT()),
+            "team_id": 1,
+            "properties": json.dumps({"email": f"person-{i}@example.com", "$browser": "Chrome", "plan": "free"}),
+            "is_identified": 1,
+            "is_deleted": 0,
+            "created_at": created_at,
+            "version": i,
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compare producing rows one by one with `produce` against `produce_many`, without a Kafka broker"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", default=100_000, type=int, help="Number of rows produced per round")
+        parser.add_argument("--repeat", default=5, type=int, help="Number of rounds to average")
+
+    def handle(self, *args, **options):
+        # Sends to the in-memory stand-in, so only serialization and delivery accounting are measured
+        producer = _KafkaProducer(test=True)
+        assert isinstance(producer.producer, KafkaProducerForTests)
+        rows = _person_rows(options["rows"])
+        repeat = options["repeat"]
+
+        def produce_one_by_one():
+            for row in rows:
+                producer.produce(topic="benchmark", data=row, key=row["id"])
+
+        def produce_many():
+            producer.produce_many(topic="benchmark", messages=rows, key=lambda row: row["id"])
+
+        for name, produce in (("produce", produce_one_by_one), ("produce_many", produce_many)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                produce()
+            elapsed = (time.perf_counter() - start) / repeat
+            self.stdout.write(
+                f"{name:>12}: {elapsed * 1000:.1f}ms per {len(rows)} rows, {len(rows) / elapsed:,.0f} rows/s"
+            )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from posthog.schema import HogQLQuery
+
+from posthog.hogql_queries.hogql_query_runner import HogQLQueryRunner
+from posthog.hogql_queries.query_cache_columnar import compare_formats
+from posthog.models import Team
+
+
+class Command(BaseCommand):
+    help = "Compare the size and encode/decode time of the JSON and columnar query cache formats for a query"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team-id", required=True, type=int, help="Team ID to run the query for")
+        parser.add_argument(
+            "--query",
+            default="SELECT uuid, event, timestamp, distinct_id, properties.$browser FROM events LIMIT 10000",
+            type=str,
+            help="HogQL query whose response is encoded",
+        )
+        parser.add_argument("--repeat", default=5, type=int, help="Number of encode/decode rounds to average")
+
+    def handle(self, *args, **options):
+        team = Team.objects.get(pk=options["team_id"])
+        runner = HogQLQueryRunner(query=HogQLQuery(query=options["query"]), team=team)
+        response = runner.calculate().model_dump()
+
+        rows = len(response.get("results") or [])
+        report = compare_formats(response, repeat=options["repeat"])
+
+        self.stdout.write(f"{rows} rows, {len(response.get('columns') or [])} columns")
+        for name in ("json", "columnar"):
+            self.stdout.write(
+                f"{name:>9}: {report[f'{name}_bytes']:>10} bytes ({report[f'{name}_compressed_bytes']} compressed, "
+                f"{report[f'{name}_bytes'] / max(rows, 1):.1f} per row), "
+                f"encode {report[f'{name}_encode_ms']:.2f}ms, decode {report[f'{name}_decode_ms']:.2f}ms"
+            )
+        self.stdout.write(f"columnar header only: decode {report['columnar_header_decode_ms']:.3f}ms")
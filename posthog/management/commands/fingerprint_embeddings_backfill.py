@@ -61,15 +61,13 @@ class Command(BaseCommand):
             batch.append(fingerprint)
             if len(batch) == 100:
                 events = create_embedding_events(batch)
-                for event in events:
-                    KafkaProducer().produce(KAFKA_ERROR_TRACKING_ISSUE_FINGERPRINT_EMBEDDINGS, event)
+                KafkaProducer().produce_many(KAFKA_ERROR_TRACKING_ISSUE_FINGERPRINT_EMBEDDINGS, events)
                 logger.info(f"Processed {len(batch)} fingerprints, last created_at: {batch[-1].created_at}")
                 batch.clear()
 
         if len(batch) > 0:
             events = create_embedding_events(batch)
-            for event in events:
-                KafkaProducer().produce(KAFKA_ERROR_TRACKING_ISSUE_FINGERPRINT_EMBEDDINGS, event)
+            KafkaProducer().produce_many(KAFKA_ERROR_TRACKING_ISSUE_FINGERPRINT_EMBEDDINGS, events)
             logger.info(f"Processed {len(batch)} fingerprints, last created_at: {batch[-1].created_at}")
             batch.clear()
 
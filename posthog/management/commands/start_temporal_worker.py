@@ -21,6 +21,7 @@ from posthog.temporal.ai import (
     ACTIVITIES as AI_ACTIVITIES,
     WORKFLOWS as AI_WORKFLOWS,
 )
+from posthog.temporal.common.clickhouse import close_connection_pools
 from posthog.temporal.common.logger import configure_logger, get_logger
 from posthog.temporal.common.worker import create_worker
 from posthog.temporal.data_imports.settings import (
@@ -369,3 +370,5 @@ class Command(BaseCommand):
                 logger.info("Waiting on shutdown_task")
                 _ = runner.run(asyncio.wait([shutdown_task]))
                 logger.info("Finished Temporal worker shutdown")
+
+            runner.run(close_connection_pools())
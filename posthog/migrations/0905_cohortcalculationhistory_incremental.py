@@ -0,0 +1,34 @@
+# Generated by Django 4.2.22 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posthog", "0904_alter_dashboard_creation_mode"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cohortcalculationhistory",
+            name="is_incremental",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether only persons that changed since the previous calculation were re-evaluated",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cohortcalculationhistory",
+            name="added_count",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Number of people added compared to the previous version", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="cohortcalculationhistory",
+            name="removed_count",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Number of people removed compared to the previous version", null=True
+            ),
+        ),
+    ]
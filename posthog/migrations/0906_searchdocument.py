@@ -0,0 +1,52 @@
+# Generated by Django 4.2.22 on 2026-10-18 11:04
+
+import django.db.models.deletion
+import django.contrib.postgres.search
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posthog", "0905_cohortcalculationhistory_incremental"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("entity_type", models.CharField(max_length=32)),
+                ("object_id", models.CharField(max_length=200)),
+                ("result_id", models.CharField(max_length=200)),
+                ("sort_name", models.TextField(blank=True, null=True)),
+                ("search_vector", django.contrib.postgres.search.SearchVectorField(null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("team", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="posthog.team")),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["team", "entity_type", "sort_name"], name="search_document_sort_idx"),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="search_document_vector_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("team", "entity_type", "object_id"), name="unique_search_document"
+            ),
+        ),
+    ]
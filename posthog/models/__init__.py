@@ -71,6 +71,7 @@ from .proxy_record import ProxyRecord
 from .remote_config import RemoteConfig
 from .scheduled_change import ScheduledChange
 from .schema import EventSchema, SchemaPropertyGroup, SchemaPropertyGroupProperty
+from .search_document import SearchDocument
 from .share_password import SharePassword
 from .sharing_configuration import SharingConfiguration
 from .subscription import Subscription
@@ -202,6 +203,7 @@ __all__ = [
     "UserGroupMembership",
     "DataWarehouseTable",
     "ScheduledChange",
+    "SearchDocument",
     "WebExperiment",
     "Comment",
     # Deprecated models here for backwards compatibility
@@ -384,6 +384,7 @@ field_exclusions: dict[ActivityScope, list[str]] = {
         "latest_error",
         "sync_frequency_interval",
         "deleted_name",
+        "incremental_cursor_value",
     ],
     "Endpoint": [
         "saved_query",
@@ -922,9 +923,22 @@ def load_all_activity(scope_list: list[ActivityScope], team_id: int, limit: int
 @receiver(post_save, sender=ActivityLog)
 def activity_log_created(sender, instance: "ActivityLog", created, **kwargs):
     from posthog.api.advanced_activity_logs import ActivityLogSerializer
+    from posthog.api.advanced_activity_logs.field_catalog import record_activity_log_fields
     from posthog.api.shared import UserBasicSerializer
     from posthog.cdp.internal_events import InternalEventEvent, InternalEventPerson, produce_internal_event
 
+    if created and instance.organization_id is not None:
+        # Recorded once committed, so that the fields of rolled back logs aren't
+        try:
+            organization_id = str(instance.organization_id)
+            records = [
+                {"scope": instance.scope, "detail": json.loads(json.dumps(instance.detail, cls=ActivityDetailEncoder))}
+            ]
+            transaction.on_commit(lambda: record_activity_log_fields(organization_id, records))
+        except Exception as e:
+            logger.exception("Failed to record activity log fields", error=e)
+            capture_exception(e)
+
     try:
         serialized_data = ActivityLogSerializer(instance).data
         # We need to serialize the detail object using the encoder to avoid unsupported types like timedelta
@@ -0,0 +1,215 @@
+from django.conf import settings
+
+from posthog.clickhouse.table_engines import AggregatingMergeTree, Distributed, ReplicationScheme
+
+"""LLM trace summaries table
+
+A materialized view on the events aggregates the `$ai_*` events of each trace into its first and last timestamps,
+latency, tokens and costs, so that traces can be listed, sorted and filtered without aggregating their events.
+
+The aggregates of a trace are stored per day of its events, and clickhouse merges the rows of a trace and day in the
+background, so queries should always aggregate again on trace_id.
+"""
+
+TABLE_BASE_NAME = "llm_trace_summaries"
+
+AI_TRACE_EVENTS = ("$ai_span", "$ai_generation", "$ai_embedding", "$ai_metric", "$ai_feedback", "$ai_trace")
+
+
+def DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE():
+    return TABLE_BASE_NAME
+
+
+def SHARDED_LLM_TRACE_SUMMARIES_TABLE():
+    return f"sharded_{TABLE_BASE_NAME}"
+
+
+def WRITABLE_LLM_TRACE_SUMMARIES_TABLE():
+    return f"writable_{TABLE_BASE_NAME}"
+
+
+def LLM_TRACE_SUMMARIES_MV():
+    return f"{TABLE_BASE_NAME}_mv"
+
+
+def TRUNCATE_LLM_TRACE_SUMMARIES_TABLE_SQL():
+    return f"TRUNCATE TABLE IF EXISTS {SHARDED_LLM_TRACE_SUMMARIES_TABLE()}"
+
+
+def DROP_LLM_TRACE_SUMMARIES_SHARDED_TABLE_SQL():
+    return f"DROP TABLE IF EXISTS {SHARDED_LLM_TRACE_SUMMARIES_TABLE()} SYNC"
+
+
+def DROP_LLM_TRACE_SUMMARIES_DISTRIBUTED_TABLE_SQL():
+    return f"DROP TABLE IF EXISTS {DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE()}"
+
+
+def DROP_LLM_TRACE_SUMMARIES_WRITABLE_TABLE_SQL():
+    return f"DROP TABLE IF EXISTS {WRITABLE_LLM_TRACE_SUMMARIES_TABLE()}"
+
+
+def DROP_LLM_TRACE_SUMMARIES_MV_SQL():
+    return f"DROP TABLE IF EXISTS {LLM_TRACE_SUMMARIES_MV()}"
+
+
+# if updating these column definitions
+# you'll need to update the columns selected by the materialized view below
+LLM_TRACE_SUMMARIES_TABLE_BASE_SQL = """
+CREATE TABLE IF NOT EXISTS {table_name}
+(
+    team_id Int64,
+    trace_id String,
+    day Date,
+
+    first_timestamp SimpleAggregateFunction(min, DateTime64(6, 'UTC')),
+    last_timestamp SimpleAggregateFunction(max, DateTime64(6, 'UTC')),
+
+    -- The latency of a trace is the sum of its generations if only generations have a latency,
+    -- otherwise the sum of the direct children of the trace
+    generation_latency SimpleAggregateFunction(sum, Nullable(Float64)),
+    generations_with_latency SimpleAggregateFunction(sum, UInt64),
+    others_with_latency SimpleAggregateFunction(sum, UInt64),
+    root_latency SimpleAggregateFunction(sum, Nullable(Float64)),
+
+    -- Tokens and costs of the generations and embeddings
+    input_tokens SimpleAggregateFunction(sum, Nullable(Float64)),
+    output_tokens SimpleAggregateFunction(sum, Nullable(Float64)),
+    input_cost SimpleAggregateFunction(sum, Nullable(Float64)),
+    output_cost SimpleAggregateFunction(sum, Nullable(Float64)),
+    total_cost SimpleAggregateFunction(sum, Nullable(Float64))
+) ENGINE = {engine}
+"""
+
+
+def SHARDED_LLM_TRACE_SUMMARIES_TABLE_ENGINE():
+    return AggregatingMergeTree(TABLE_BASE_NAME, replication_scheme=ReplicationScheme.SHARDED)
+
+
+def SHARDED_LLM_TRACE_SUMMARIES_TABLE_SQL():
+    return (
+        LLM_TRACE_SUMMARIES_TABLE_BASE_SQL
+        + """
+PARTITION BY toYYYYMM(day)
+ORDER BY (team_id, day, trace_id)
+"""
+    ).format(
+        table_name=SHARDED_LLM_TRACE_SUMMARIES_TABLE(),
+        engine=SHARDED_LLM_TRACE_SUMMARIES_TABLE_ENGINE(),
+    )
+
+
+# Distributed engine tables are only created if CLICKHOUSE_REPLICATED
+
+# This table is responsible for writing to sharded_llm_trace_summaries based on a sharding key.
+
+
+def WRITABLE_LLM_TRACE_SUMMARIES_TABLE_SQL():
+    return LLM_TRACE_SUMMARIES_TABLE_BASE_SQL.format(
+        table_name=WRITABLE_LLM_TRACE_SUMMARIES_TABLE(),
+        engine=Distributed(
+            data_table=SHARDED_LLM_TRACE_SUMMARIES_TABLE(),
+            # shard via trace_id so that all events of a trace are on the same shard
+            sharding_key="cityHash64(trace_id)",
+        ),
+    )
+
+
+# This table is responsible for reading from llm_trace_summaries on a cluster setting
+
+
+def DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE_SQL():
+    return LLM_TRACE_SUMMARIES_TABLE_BASE_SQL.format(
+        table_name=DISTRIBUTED_LLM_TRACE_SUMMARIES_TABLE(),
+        engine=Distributed(
+            data_table=SHARDED_LLM_TRACE_SUMMARIES_TABLE(),
+            sharding_key="cityHash64(trace_id)",
+        ),
+    )
+
+
+def _string_property(name: str) -> str:
+    # Same as reading the property in HogQL, so that numbers are read as strings too
+    return f"replaceRegexpAll(nullIf(nullIf(JSONExtractRaw(properties, '{name}'), ''), 'null'), '^\"|\"$', '')"
+
+
+def _float_property(name: str) -> str:
+    return f"accurateCastOrNull({_string_property(name)}, 'Float64')"
+
+
+def LLM_TRACE_SUMMARIES_MV_SELECT_SQL(source_table: str, where: str = "TRUE") -> str:
+    return """
+WITH
+    {trace_id} AS event_trace_id,
+    {parent_id} AS parent_id,
+    {latency} AS latency,
+    ifNull(latency, 0) > 0 AS has_latency,
+    event IN ('$ai_generation', '$ai_embedding') AS is_generation_or_embedding
+SELECT
+    team_id,
+    event_trace_id AS trace_id,
+    toDate(timestamp) AS day,
+
+    timestamp AS first_timestamp,
+    timestamp AS last_timestamp,
+
+    if(event = '$ai_generation' AND has_latency, latency, NULL) AS generation_latency,
+    toUInt64(event = '$ai_generation' AND has_latency) AS generations_with_latency,
+    toUInt64(event != '$ai_generation' AND has_latency) AS others_with_latency,
+    if(parent_id IS NULL OR parent_id = event_trace_id, latency, NULL) AS root_latency,
+
+    if(is_generation_or_embedding, {input_tokens}, NULL) AS input_tokens,
+    if(is_generation_or_embedding, {output_tokens}, NULL) AS output_tokens,
+    if(is_generation_or_embedding, {input_cost}, NULL) AS input_cost,
+    if(is_generation_or_embedding, {output_cost}, NULL) AS output_cost,
+    if(is_generation_or_embedding, {total_cost}, NULL) AS total_cost
+FROM {source_table}
+WHERE event IN {events}
+    AND event_trace_id IS NOT NULL
+    AND event_trace_id != ''
+    AND {where}
+""".format(
+        trace_id=_string_property("$ai_trace_id"),
+        parent_id=_string_property("$ai_parent_id"),
+        latency=_float_property("$ai_latency"),
+        input_tokens=_float_property("$ai_input_tokens"),
+        output_tokens=_float_property("$ai_output_tokens"),
+        input_cost=_float_property("$ai_input_cost_usd"),
+        output_cost=_float_property("$ai_output_cost_usd"),
+        total_cost=_float_property("$ai_total_cost_usd"),
+        source_table=source_table,
+        events=str(AI_TRACE_EVENTS),
+        where=where,
+    )
+
+
+def LLM_TRACE_SUMMARIES_MV_SQL():
+    return """
+CREATE MATERIALIZED VIEW IF NOT EXISTS {table_name}
+TO {database}.{target_table}
+AS
+{select_sql}
+""".format(
+        table_name=LLM_TRACE_SUMMARIES_MV(),
+        target_table=WRITABLE_LLM_TRACE_SUMMARIES_TABLE(),
+        database=settings.CLICKHOUSE_DATABASE,
+        select_sql=LLM_TRACE_SUMMARIES_MV_SELECT_SQL(
+            # use sharded_events, this means that the mv MUST be created on every data node
+            source_table=f"{settings.CLICKHOUSE_DATABASE}.sharded_events",
+        ),
+    )
+
+
+def LLM_TRACE_SUMMARIES_BACKFILL_SQL(where: str = "TRUE", use_sharded_source: bool = True):
+    return """
+INSERT INTO {database}.{writable_table}
+{select_sql}
+""".format(
+        database=settings.CLICKHOUSE_DATABASE,
+        writable_table=WRITABLE_LLM_TRACE_SUMMARIES_TABLE(),
+        select_sql=LLM_TRACE_SUMMARIES_MV_SELECT_SQL(
+            where=where,
+            source_table=f"{settings.CLICKHOUSE_DATABASE}.sharded_events"
+            if use_sharded_source
+            else f"{settings.CLICKHOUSE_DATABASE}.events",
+        ),
+    )
@@ -18,6 +18,17 @@ class CohortCalculationHistory(RootTeamMixin, UUIDModel):
     filters = models.JSONField(help_text="Cohort filters/properties at time of calculation")
     count = models.PositiveIntegerField(null=True, blank=True, help_text="Number of people in cohort")
 
+    # Incremental calculation
+    is_incremental = models.BooleanField(
+        default=False, help_text="Whether only persons that changed since the previous calculation were re-evaluated"
+    )
+    added_count = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Number of people added compared to the previous version"
+    )
+    removed_count = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Number of people removed compared to the previous version"
+    )
+
     # Timing
     started_at = models.DateTimeField(default=timezone.now, help_text="When calculation started")
     finished_at = models.DateTimeField(null=True, blank=True, help_text="When calculation finished")
@@ -0,0 +1,232 @@
+"""
+Incremental ("delta") recalculation of dynamic cohort membership.
+
+A full recalculation evaluates the cohort filters for every person of the team. For cohorts whose filters only
+depend on person properties and on events inside a relative time window, a person's membership can only change if:
+
+- the person was created or its properties were updated, or
+- the person has newly ingested matching events inside the window, or
+- one of the person's matching events moved out of the time window.
+
+The delta calculation only re-evaluates those persons and copies the membership of everyone else over from the
+previous version. Cohorts that don't fit these rules (sequences, lifecycle-style behavioral filters, nested
+cohorts, absolute dates) are always recalculated in full, and every cohort gets a full recalculation at least
+once every `MAX_INCREMENTAL_CHAIN_AGE` to bound any drift.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, cast
+
+from django.utils import timezone
+
+import posthoganalytics
+from dateutil.relativedelta import relativedelta
+
+from posthog.hogql import ast
+from posthog.hogql.parser import parse_select
+
+from posthog.models import Action, Team
+from posthog.models.cohort.calculation_history import CohortCalculationHistory
+from posthog.models.cohort.cohort import Cohort
+from posthog.models.property import Property
+
+# Behavioral filters whose result only depends on the matching events inside a relative window
+INCREMENTAL_BEHAVIORAL_VALUES = {"performed_event", "performed_event_multiple"}
+# Force a full recalculation if the last one is older than this
+MAX_INCREMENTAL_CHAIN_AGE = timedelta(hours=24)
+# Events and person updates can be ingested with a delay, so re-evaluate a bit more than strictly needed
+WATERMARK_SAFETY_MARGIN = timedelta(minutes=10)
+# Relative date ranges are rounded to the start of the day (in the team's timezone)
+WINDOW_ROUNDING_MARGIN = timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class IncrementalCalculationPlan:
+    previous_version: int
+    # Persons with matching events or property updates after this are re-evaluated
+    since: datetime
+    # Events that can affect membership, None if any event can
+    event_names: Optional[list[str]]
+    # Relative time windows of the behavioral filters, used to find events that aged out
+    windows: list[relativedelta]
+
+
+def _window_for_property(prop: Property) -> Optional[relativedelta]:
+    if prop.explicit_datetime or not prop.time_value or not prop.time_interval:
+        return None
+    try:
+        value = int(prop.time_value)
+    except (TypeError, ValueError):
+        return None
+    if prop.time_interval not in ("day", "week", "month", "year"):
+        return None
+    return relativedelta(**{f"{prop.time_interval}s": value})
+
+
+def _event_names_for_property(prop: Property, team: Team) -> Optional[list[str]]:
+    if prop.event_type == "events":
+        return [str(prop.key)]
+    action = Action.objects.filter(pk=int(prop.key), team__project_id=team.project_id).first()
+    if action is None or any(step.event is None for step in action.steps):
+        return None
+    return [cast(str, step.event) for step in action.steps]
+
+
+def _should_calculate_incrementally(team: Team) -> bool:
+    return bool(
+        posthoganalytics.feature_enabled(
+            "cohort-incremental-calculation",
+            str(team.uuid),
+            groups={"organization": str(team.organization_id), "project": str(team.id)},
+            group_properties={
+                "organization": {"id": str(team.organization_id)},
+                "project": {"id": str(team.id)},
+            },
+            only_evaluate_locally=False,
+            send_feature_flag_events=False,
+        )
+    )
+
+
+def get_incremental_calculation_plan(cohort: Cohort, team: Team) -> Optional[IncrementalCalculationPlan]:
+    """
+    Returns how to recalculate the cohort incrementally for the team, or None if it needs a full recalculation.
+    """
+    if cohort.is_static or cohort.version is None or cohort.last_calculation is None or not cohort.properties.values:
+        return None
+
+    event_names: Optional[set[str]] = set()
+    windows: list[relativedelta] = []
+    if not _should_calculate_incrementally(team):
+        return None
+
+    for prop in cohort.properties.flat:
+        if prop.type == "person":
+            continue
+        if prop.type != "behavioral" or prop.value not in INCREMENTAL_BEHAVIORAL_VALUES:
+            return None
+        window = _window_for_property(prop)
+        if window is None:
+            return None
+        windows.append(window)
+        property_event_names = _event_names_for_property(prop, team)
+        if property_event_names is None or event_names is None:
+            event_names = None
+        else:
+            event_names.update(property_event_names)
+
+    filters = cohort.properties.to_dict()
+    # Only calculations that are part of a round that completed for all environments produced `cohort.version`
+    successful_calculations = CohortCalculationHistory.objects.filter(
+        team=team,
+        cohort=cohort,
+        finished_at__isnull=False,
+        error__isnull=True,
+        started_at__lte=cohort.last_calculation,
+    ).order_by("-started_at")
+    previous = successful_calculations.first()
+    if previous is None or previous.filters != filters:
+        # Never calculated, or the filters changed since
+        return None
+
+    last_full = successful_calculations.filter(is_incremental=False).first()
+    if last_full is None or last_full.started_at < timezone.now() - MAX_INCREMENTAL_CHAIN_AGE:
+        return None
+
+    return IncrementalCalculationPlan(
+        previous_version=cohort.version,
+        since=previous.started_at - WATERMARK_SAFETY_MARGIN,
+        event_names=sorted(event_names) if event_names is not None else None,
+        windows=windows,
+    )
+
+
+def _timestamp_compare(op: ast.CompareOperationOp, field: str, value: datetime) -> ast.CompareOperation:
+    return ast.CompareOperation(op=op, left=ast.Field(chain=[field]), right=ast.Constant(value=value))
+
+
+def get_changed_persons_query(plan: IncrementalCalculationPlan) -> ast.SelectQuery | ast.SelectSetQuery:
+    """Persons whose membership may have changed since the previous calculation."""
+    updated_persons = parse_select(
+        "SELECT DISTINCT id FROM raw_persons WHERE updated_at >= {since}", {"since": ast.Constant(value=plan.since)}
+    )
+    if not plan.windows:
+        # Only person properties matter
+        return updated_persons
+
+    now = timezone.now()
+    widest_window_start = min(now - window for window in plan.windows)
+    time_conditions: list[ast.Expr] = [
+        # Events ingested since the previous calculation, no matter their timestamp, as long as they are in a window
+        ast.And(
+            exprs=[
+                _timestamp_compare(ast.CompareOperationOp.GtEq, "created_at", plan.since),
+                _timestamp_compare(
+                    ast.CompareOperationOp.GtEq, "timestamp", widest_window_start - WINDOW_ROUNDING_MARGIN
+                ),
+            ]
+        )
+    ]
+    for window in plan.windows:
+        # Events that were inside the window at the previous calculation, but aren't anymore
+        time_conditions.append(
+            ast.And(
+                exprs=[
+                    _timestamp_compare(
+                        ast.CompareOperationOp.GtEq, "timestamp", plan.since - window - WINDOW_ROUNDING_MARGIN
+                    ),
+                    _timestamp_compare(ast.CompareOperationOp.Lt, "timestamp", now - window + WINDOW_ROUNDING_MARGIN),
+                ]
+            )
+        )
+
+    event_conditions: list[ast.Expr] = [ast.Or(exprs=time_conditions)]
+    if plan.event_names is not None:
+        event_conditions.append(
+            ast.CompareOperation(
+                op=ast.CompareOperationOp.In,
+                left=ast.Field(chain=["event"]),
+                right=ast.Constant(value=plan.event_names),
+            )
+        )
+
+    events_persons = parse_select(
+        "SELECT DISTINCT person_id AS id FROM events WHERE {event_conditions}",
+        {"event_conditions": ast.And(exprs=event_conditions)},
+    )
+    return ast.SelectSetQuery(
+        initial_select_query=events_persons,
+        subsequent_select_queries=[ast.SelectSetNode(select_query=updated_persons, set_operator="UNION DISTINCT")],
+    )
+
+
+def get_incremental_cohort_query(cohort: Cohort, team: Team, plan: IncrementalCalculationPlan) -> ast.SelectSetQuery:
+    """
+    The new membership: the previous members that can't have changed, plus the changed persons that match now.
+    """
+    from posthog.hogql_queries.hogql_cohort_query import HogQLCohortQuery
+
+    changed_persons = get_changed_persons_query(plan)
+    matching_changed_persons = HogQLCohortQuery(
+        cohort=cohort, team=team, restrict_to_persons=changed_persons
+    ).get_query()
+
+    return cast(
+        ast.SelectSetQuery,
+        parse_select(
+            """
+            SELECT DISTINCT person_id AS id
+            FROM raw_cohort_people
+            WHERE cohort_id = {cohort_id} AND version = {previous_version} AND person_id NOT IN {changed_persons}
+            UNION ALL
+            SELECT id FROM {matching_changed_persons}
+            """,
+            {
+                "cohort_id": ast.Constant(value=cohort.pk),
+                "previous_version": ast.Constant(value=plan.previous_version),
+                "changed_persons": changed_persons,
+                "matching_changed_persons": matching_changed_persons,
+            },
+        ),
+    )
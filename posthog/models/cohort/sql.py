@@ -50,6 +50,17 @@ FROM (
 SETTINGS optimize_aggregation_in_order = 1, join_algorithm = 'auto'
 """
 
+# Number of people added and removed between two versions of a cohort
+GET_COHORT_VERSION_DIFF_SQL = """
+SELECT countIf(in_new AND NOT in_previous) AS added, countIf(in_previous AND NOT in_new) AS removed
+FROM (
+    SELECT person_id, max(version = %(new_version)s) AS in_new, max(version = %(previous_version)s) AS in_previous
+    FROM cohortpeople
+    WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version IN (%(previous_version)s, %(new_version)s)
+    GROUP BY person_id
+)
+"""
+
 # NOTE: Group by version id to ensure that signs are summed between corresponding rows.
 # Version filtering is not necessary as only positive rows of the latest version will be selected by sum(sign) > 0
 
@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from freezegun import freeze_time
+from posthog.test.base import BaseTest, ClickhouseTestMixin, _create_event, _create_person, flush_persons_and_events
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from posthog.models.cohort import Cohort
+from posthog.models.cohort.calculation_history import CohortCalculationHistory
+from posthog.models.cohort.incremental import MAX_INCREMENTAL_CHAIN_AGE, get_incremental_calculation_plan
+from posthog.models.cohort.util import get_cohort_size
+
+BEHAVIORAL_FILTERS = {
+    "properties": {
+        "type": "AND",
+        "values": [
+            {
+                "key": "$pageview",
+                "event_type": "events",
+                "time_value": 7,
+                "time_interval": "day",
+                "value": "performed_event",
+                "type": "behavioral",
+            },
+            {"key": "$browser", "value": "Chrome", "type": "person"},
+        ],
+    }
+}
+
+
+@patch("posthog.models.cohort.incremental._should_calculate_incrementally", return_value=True)
+class TestIncrementalCohortCalculation(ClickhouseTestMixin, BaseTest):
+    def _calculate(self, cohort: Cohort) -> None:
+        cohort.calculate_people_ch(pending_version=(cohort.version or 0) + 1)
+        cohort.refresh_from_db()
+
+    def test_no_plan_before_first_calculation(self, _flag):
+        cohort = Cohort.objects.create(team=self.team, filters=BEHAVIORAL_FILTERS)
+
+        assert get_incremental_calculation_plan(cohort, self.team) is None
+
+    def test_no_plan_for_unsupported_filters(self, _flag):
+        cohort = Cohort.objects.create(
+            team=self.team,
+            filters={
+                "properties": {
+                    "type": "AND",
+                    "values": [
+                        {
+                            "key": "$pageview",
+                            "event_type": "events",
+                            "time_value": 7,
+                            "time_interval": "day",
+                            "value": "stopped_performing_event",
+                            "seq_time_value": 3,
+                            "seq_time_interval": "day",
+                            "type": "behavioral",
+                        }
+                    ],
+                }
+            },
+        )
+        self._calculate(cohort)
+
+        assert get_incremental_calculation_plan(cohort, self.team) is None
+
+    def test_plan_after_full_calculation(self, _flag):
+        cohort = Cohort.objects.create(team=self.team, filters=BEHAVIORAL_FILTERS)
+        self._calculate(cohort)
+
+        plan = get_incremental_calculation_plan(cohort, self.team)
+
+        assert plan is not None
+        assert plan.previous_version == cohort.version
+        assert plan.event_names == ["$pageview"]
+        assert len(plan.windows) == 1
+
+    def test_no_plan_when_filters_changed(self, _flag):
+        cohort = Cohort.objects.create(team=self.team, filters=BEHAVIORAL_FILTERS)
+        self._calculate(cohort)
+
+        cohort.filters = {
+            "properties": {"type": "AND", "values": [{"key": "$browser", "value": "Safari", "type": "person"}]}
+        }
+        cohort.save()
+
+        assert get_incremental_calculation_plan(cohort, self.team) is None
+
+    def test_full_calculation_forced_periodically(self, _flag):
+        cohort = Cohort.objects.create(team=self.team, filters=BEHAVIORAL_FILTERS)
+        self._calculate(cohort)
+
+        with freeze_time(timezone.now() + MAX_INCREMENTAL_CHAIN_AGE + timedelta(minutes=1)):
+            assert get_incremental_calculation_plan(cohort, self.team) is None
+
+    def test_incremental_calculation_matches_full_calculation(self, _flag):
+        _create_person(team_id=self.team.pk, distinct_ids=["p1"], properties={"$browser": "Chrome"})
+        _create_person(team_id=self.team.pk, distinct_ids=["p2"], properties={"$browser": "Chrome"})
+        _create_person(team_id=self.team.pk, distinct_ids=["p3"], properties={"$browser": "Safari"})
+        _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp=timezone.now())
+        _create_event(team=self.team, event="$pageview", distinct_id="p3", timestamp=timezone.now())
+        flush_persons_and_events()
+
+        cohort = Cohort.objects.create(team=self.team, filters=BEHAVIORAL_FILTERS)
+        self._calculate(cohort)
+        assert cohort.count == 1
+
+        # p2 becomes a member through a new event
+        _create_event(team=self.team, event="$pageview", distinct_id="p2", timestamp=timezone.now())
+        flush_persons_and_events()
+
+        self._calculate(cohort)
+
+        history = CohortCalculationHistory.objects.filter(cohort=cohort).order_by("-started_at").first()
+        assert history is not None
+        assert history.is_incremental
+        assert (history.added_count, history.removed_count) == (1, 0)
+        assert cohort.count == 2
+        assert get_cohort_size(cohort, team_id=self.team.pk) == 2
@@ -1,11 +1,21 @@
-from posthog.test.base import BaseTest, _create_person, flush_persons_and_events
+import threading
+
+from posthog.test.base import BaseTest, ClickhouseTestMixin, NonAtomicBaseTest, _create_person, flush_persons_and_events
+from unittest.mock import patch
+
+from django.db import connections
+from django.test import override_settings
 
 from posthog.hogql.hogql import HogQLContext
 
+from posthog.models import Team
 from posthog.models.cohort import Cohort, CohortOrEmpty
+from posthog.models.cohort.calculation_history import CohortCalculationHistory
 from posthog.models.cohort.util import (
     get_all_cohort_dependencies,
+    get_cohort_size,
     print_cohort_hogql_query,
+    recalculate_cohortpeople,
     simplified_cohort_filter_properties,
     sort_cohorts_topologically,
 )
@@ -629,3 +639,47 @@ class TestSortCohortsTopologically(BaseTest):
         result = sort_cohorts_topologically(all_cohort_ids, seen_cohorts_cache)
 
         self.assertEqual(result, [cohort.pk])
+
+
+class TestRecalculateCohortpeople(ClickhouseTestMixin, NonAtomicBaseTest):
+    @override_settings(COHORT_CALCULATION_MAX_PARALLEL_TEAMS=2)
+    def test_recalculates_the_environments_of_the_project_in_parallel(self):
+        environments = [
+            self.team,
+            *(
+                Team.objects.create(
+                    organization=self.organization, name=f"Environment {i}", project_id=self.team.project_id
+                )
+                for i in range(2)
+            ),
+        ]
+        for persons, environment in enumerate(environments, start=1):
+            for i in range(persons):
+                _create_person(team_id=environment.pk, distinct_ids=[f"p{i}"], properties={"$browser": "Chrome"})
+        flush_persons_and_events()
+        cohort = _create_cohort(
+            team=self.team,
+            name="chrome",
+            groups=[{"properties": [{"key": "$browser", "value": "Chrome", "type": "person"}]}],
+        )
+        pending_version = (cohort.version or 0) + 1
+        close_all = connections.close_all
+        close_all_thread_ids = []
+
+        def record_close_all():
+            close_all_thread_ids.append(threading.get_ident())
+            close_all()
+
+        with patch("posthog.models.cohort.util.connections.close_all", side_effect=record_close_all):
+            count = recalculate_cohortpeople(cohort, pending_version, initiating_user_id=None)
+
+        self.assertEqual(count, 1)
+        for persons, environment in enumerate(environments, start=1):
+            self.assertEqual(get_cohort_size(cohort, override_version=pending_version, team_id=environment.pk), persons)
+        self.assertCountEqual(
+            CohortCalculationHistory.objects.filter(cohort=cohort).values_list("team_id", flat=True),
+            [environment.pk for environment in environments],
+        )
+        # Each environment is calculated in a worker thread, which closes its own connections
+        self.assertEqual(len(close_all_thread_ids), len(environments))
+        self.assertNotIn(threading.get_ident(), close_all_thread_ids)
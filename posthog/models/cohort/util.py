@@ -1,8 +1,10 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Optional, Union, cast
 
 from django.conf import settings
+from django.db import connections
 from django.utils import timezone
 
 import structlog
@@ -25,9 +27,15 @@ from posthog.models.action.util import format_action_filter
 from posthog.models.cohort.calculation_history import CohortCalculationHistory
 from posthog.models.cohort.cohort import Cohort, CohortOrEmpty, CohortPeople
 from posthog.models.cohort.dependencies import get_cohort_dependents
+from posthog.models.cohort.incremental import (
+    IncrementalCalculationPlan,
+    get_incremental_calculation_plan,
+    get_incremental_cohort_query,
+)
 from posthog.models.cohort.sql import (
     CALCULATE_COHORT_PEOPLE_SQL,
     GET_COHORT_SIZE_SQL,
+    GET_COHORT_VERSION_DIFF_SQL,
     GET_COHORTS_BY_PERSON_UUID,
     GET_PERSON_ID_BY_PRECALCULATED_COHORT_ID,
     GET_STATIC_COHORTPEOPLE_BY_PERSON_UUID,
@@ -455,22 +463,35 @@ def recalculate_cohortpeople(
 ) -> Optional[int]:
     """
     Recalculate cohort people for all environments of the project.
+    Environments are independent of each other, so they are calculated in parallel.
     NOTE: Currently, this only returns the count for the team where the cohort was created. Instead, it should return for all teams.
     """
-    relevant_teams = Team.objects.order_by("id").filter(project_id=cohort.team.project_id)
-    count_by_team_id: dict[int, int] = {}
-    tag_queries(cohort_id=cohort.id)
-    if initiating_user_id:
-        tag_queries(user_id=initiating_user_id)
-    for team in relevant_teams:
-        tag_queries(team_id=team.id)
-        _recalculate_cohortpeople_for_team(cohort, pending_version, team)
-        count: Optional[int]
-        if cohort.is_static:
-            count = get_static_cohort_size(cohort_id=cohort.id, team_id=team.id)
-        else:
-            count = get_cohort_size(cohort, override_version=pending_version, team_id=team.id)
-        count_by_team_id[team.id] = count if count is not None else 0
+    relevant_teams = list(Team.objects.order_by("id").filter(project_id=cohort.team.project_id))
+    parallelism = min(settings.COHORT_CALCULATION_MAX_PARALLEL_TEAMS, len(relevant_teams))
+
+    def recalculate_for_team(team: Team) -> int:
+        try:
+            tag_queries(cohort_id=cohort.id, team_id=team.id)
+            if initiating_user_id:
+                tag_queries(user_id=initiating_user_id)
+            _recalculate_cohortpeople_for_team(cohort, pending_version, team)
+            count: Optional[int]
+            if cohort.is_static:
+                count = get_static_cohort_size(cohort_id=cohort.id, team_id=team.id)
+            else:
+                count = get_cohort_size(cohort, override_version=pending_version, team_id=team.id)
+            return count if count is not None else 0
+        finally:
+            if parallelism > 1:
+                # Worker threads get their own database connections, which need to be closed explicitly
+                connections.close_all()
+
+    if parallelism <= 1:
+        count_by_team_id = {team.id: recalculate_for_team(team) for team in relevant_teams}
+    else:
+        with ThreadPoolExecutor(max_workers=parallelism) as pool:
+            counts = pool.map(recalculate_for_team, relevant_teams)
+            count_by_team_id = {team.id: count for team, count in zip(relevant_teams, counts)}
 
     return count_by_team_id[cohort.team_id]
 
@@ -478,12 +499,19 @@ def recalculate_cohortpeople(
 def _recalculate_cohortpeople_for_team(cohort: Cohort, pending_version: int, team: Team) -> int:
     tag_queries(name="recalculate_cohortpeople_for_team_hogql")
 
+    # Decide before creating this calculation's history, which would otherwise become the "previous" calculation
+    plan = get_incremental_calculation_plan(cohort, team) if not cohort.is_static else None
     history = CohortCalculationHistory.objects.create(
-        team=team, cohort=cohort, filters=cohort.properties.to_dict() if cohort.properties.values else {}
+        team=team,
+        cohort=cohort,
+        filters=cohort.properties.to_dict() if cohort.properties.values else {},
+        is_incremental=plan is not None,
     )
 
     try:
-        result = _recalculate_cohortpeople_for_team_hogql(cohort, pending_version, team, history)
+        result = _recalculate_cohortpeople_for_team_hogql(cohort, pending_version, team, history, plan)
+        if not cohort.is_static and cohort.version is not None:
+            _record_cohort_version_diff(cohort, cohort.version, pending_version, team, history)
         return result
 
     except Exception as e:
@@ -493,8 +521,38 @@ def _recalculate_cohortpeople_for_team(cohort: Cohort, pending_version: int, tea
         raise
 
 
+def _record_cohort_version_diff(
+    cohort: Cohort, previous_version: int, new_version: int, team: Team, history: CohortCalculationHistory
+) -> None:
+    rows = sync_execute(
+        GET_COHORT_VERSION_DIFF_SQL,
+        {
+            "cohort_id": cohort.pk,
+            "team_id": team.id,
+            "previous_version": previous_version,
+            "new_version": new_version,
+        },
+        workload=Workload.OFFLINE,
+        ch_user=ClickHouseUser.COHORTS,
+    )
+    history.added_count, history.removed_count = rows[0] if rows else (0, 0)
+    history.save(update_fields=["added_count", "removed_count"])
+    logger.info(
+        "cohort_calculation_diff",
+        cohort_id=cohort.pk,
+        team_id=team.id,
+        is_incremental=history.is_incremental,
+        added=history.added_count,
+        removed=history.removed_count,
+    )
+
+
 def _recalculate_cohortpeople_for_team_hogql(
-    cohort: Cohort, pending_version: int, team: Team, history: CohortCalculationHistory
+    cohort: Cohort,
+    pending_version: int,
+    team: Team,
+    history: CohortCalculationHistory,
+    plan: Optional[IncrementalCalculationPlan] = None,
 ) -> int:
     cohort_params: dict[str, Any]
     if cohort.is_static:
@@ -508,9 +566,10 @@ def _recalculate_cohortpeople_for_team_hogql(
     else:
         from posthog.hogql_queries.hogql_cohort_query import HogQLCohortQuery
 
-        cohort_query, hogql_context = (
-            HogQLCohortQuery(cohort=cohort, team=team).get_query_executor().generate_clickhouse_sql()
-        )
+        hogql_cohort_query = HogQLCohortQuery(cohort=cohort, team=team)
+        cohort_query, hogql_context = hogql_cohort_query.get_query_executor(
+            get_incremental_cohort_query(cohort, team, plan) if plan is not None else None
+        ).generate_clickhouse_sql()
         cohort_params = hogql_context.values
 
         # Hacky: Clickhouse doesn't like there being a top level "SETTINGS" clause in a SelectSet statement when that SelectSet
@@ -131,6 +131,32 @@ def create_person(
     timestamp: Optional[Union[datetime.datetime, str]] = None,
     created_at: Optional[datetime.datetime] = None,
 ) -> str:
+    data = _person_row(
+        team_id=team_id,
+        version=version,
+        uuid=uuid,
+        properties=properties,
+        is_identified=is_identified,
+        is_deleted=is_deleted,
+        timestamp=timestamp,
+        created_at=created_at,
+    )
+    p = ClickhouseProducer()
+    p.produce(topic=KAFKA_PERSON, sql=INSERT_PERSON_SQL, data=data, sync=sync)
+    return data["id"]
+
+
+def _person_row(
+    *,
+    team_id: int,
+    version: int,
+    uuid: Optional[str] = None,
+    properties: Optional[dict] = None,
+    is_identified: bool = False,
+    is_deleted: bool = False,
+    timestamp: Optional[Union[datetime.datetime, str]] = None,
+    created_at: Optional[datetime.datetime] = None,
+) -> dict:
     if properties is None:
         properties = {}
     if uuid:
@@ -151,7 +177,7 @@ def create_person(
     else:
         created_at = created_at.astimezone(ZoneInfo("UTC"))
 
-    data = {
+    return {
         "id": str(uuid),
         "team_id": team_id,
         "properties": json.dumps(properties),
@@ -161,9 +187,6 @@ def create_person(
         "version": version,
         "_timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
     }
-    p = ClickhouseProducer()
-    p.produce(topic=KAFKA_PERSON, sql=INSERT_PERSON_SQL, data=data, sync=sync)
-    return uuid
 
 
 def create_person_distinct_id(
@@ -178,17 +201,21 @@ def create_person_distinct_id(
     p.produce(
         topic=KAFKA_PERSON_DISTINCT_ID,
         sql=INSERT_PERSON_DISTINCT_ID2,
-        data={
-            "distinct_id": distinct_id,
-            "person_id": person_id,
-            "team_id": team_id,
-            "version": version,
-            "is_deleted": int(is_deleted),
-        },
+        data=_person_distinct_id_row(team_id, distinct_id, person_id, version, is_deleted),
         sync=sync,
     )
 
 
+def _person_distinct_id_row(team_id: int, distinct_id: str, person_id: str, version: int, is_deleted: bool) -> dict:
+    return {
+        "distinct_id": distinct_id,
+        "person_id": person_id,
+        "team_id": team_id,
+        "version": version,
+        "is_deleted": int(is_deleted),
+    }
+
+
 def get_persons_by_distinct_ids(team_id: int, distinct_ids: list[str]) -> QuerySet:
     return Person.objects.db_manager(READ_DB_FOR_PERSONS).filter(
         team_id=team_id,
@@ -209,6 +236,51 @@ def delete_person(person: Person, sync: bool = False) -> None:
         _delete_ch_distinct_id(person.team_id, person.uuid, distinct_id, version, sync)
 
 
+def delete_persons(team_id: int, persons: list[Person]) -> None:
+    """
+    Same as `delete_person` for each of the persons, with the distinct IDs of all of them read in one query and the
+    deletions of all of them produced in one batch per topic.
+    """
+    if not persons:
+        return
+
+    distinct_ids_by_person: dict[int, dict[str, int]] = {person.pk: {} for person in persons}
+    for person_id, distinct_id, version in (
+        PersonDistinctId.objects.db_manager(READ_DB_FOR_PERSONS)
+        .filter(person_id__in=list(distinct_ids_by_person), team_id=team_id)
+        .order_by("id")
+        .values_list("person_id", "distinct_id", "version")
+    ):
+        distinct_ids_by_person[person_id][distinct_id] = int(version or 0)
+
+    p = ClickhouseProducer()
+    p.produce_many(
+        topic=KAFKA_PERSON,
+        sql=INSERT_PERSON_SQL,
+        rows=[
+            _person_row(
+                uuid=str(person.uuid),
+                team_id=team_id,
+                # Same version as `_delete_person`
+                version=int(person.version or 0) + 100,
+                created_at=person.created_at,
+                is_deleted=True,
+            )
+            for person in persons
+        ],
+    )
+    p.produce_many(
+        topic=KAFKA_PERSON_DISTINCT_ID,
+        sql=INSERT_PERSON_DISTINCT_ID2,
+        rows=[
+            # Same version as `_delete_ch_distinct_id`
+            _person_distinct_id_row(team_id, distinct_id, str(person.uuid), version + 100, is_deleted=True)
+            for person in persons
+            for distinct_id, version in distinct_ids_by_person[person.pk].items()
+        ],
+    )
+
+
 def _delete_person(
     team_id: int,
     uuid: UUID,
@@ -0,0 +1,202 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any, Literal, Optional
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.db.models import CharField, F, Model, QuerySet, Value
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save
+
+from posthog.exceptions_capture import capture_exception
+from posthog.helpers.full_text_search import build_search_vector
+from posthog.models.action import Action
+from posthog.models.cohort import Cohort
+from posthog.models.dashboard import Dashboard
+from posthog.models.experiment import Experiment
+from posthog.models.feature_flag import FeatureFlag
+from posthog.models.insight import Insight
+from posthog.models.signals import mutable_receiver
+from posthog.models.surveys.survey import Survey
+
+from products.notebooks.backend.models import Notebook
+
+SEARCH_DOCUMENT_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class SearchDocumentEntity:
+    klass: type[Model]
+    # The value corresponds to the PostgreSQL weighting i.e. A, B, C or D
+    search_fields: dict[str, Literal["A", "B", "C"]]
+    result_id_field: str = "pk"
+    sort_field: Optional[str] = "name"
+    # Fields which remove the object from the search results, e.g. soft deletion
+    visibility_fields: list[str] = field(default_factory=lambda: ["deleted"])
+
+
+SEARCH_DOCUMENT_ENTITIES: dict[str, SearchDocumentEntity] = {
+    "insight": SearchDocumentEntity(
+        klass=Insight, search_fields={"name": "A", "description": "C"}, result_id_field="short_id"
+    ),
+    "dashboard": SearchDocumentEntity(
+        klass=Dashboard,
+        search_fields={"name": "A", "description": "C"},
+        visibility_fields=["deleted", "creation_mode"],
+    ),
+    "experiment": SearchDocumentEntity(klass=Experiment, search_fields={"name": "A", "description": "C"}),
+    "feature_flag": SearchDocumentEntity(klass=FeatureFlag, search_fields={"key": "A", "name": "C"}),
+    "notebook": SearchDocumentEntity(
+        klass=Notebook,
+        search_fields={"title": "A", "text_content": "C"},
+        result_id_field="short_id",
+        sort_field="title",
+    ),
+    "action": SearchDocumentEntity(klass=Action, search_fields={"name": "A", "description": "C"}),
+    "cohort": SearchDocumentEntity(klass=Cohort, search_fields={"name": "A", "description": "C"}),
+    "survey": SearchDocumentEntity(klass=Survey, search_fields={"name": "A", "description": "C"}),
+}
+"""
+Map of entity names to the models indexed in `SearchDocument`. Event definitions aren't indexed, as they're written
+by ingestion without going through Django.
+"""
+
+
+class SearchDocument(models.Model):
+    """
+    Search index of the entities searched in the app, with the full-text search vector of every object computed when
+    it's saved, so that searching all entities of a project is a single indexed query.
+    """
+
+    team = models.ForeignKey("posthog.Team", on_delete=models.CASCADE)
+    entity_type = models.CharField(max_length=32)
+    # Primary key of the object, which is also the resource ID of its access controls
+    object_id = models.CharField(max_length=200)
+    # ID of the object in its URL, e.g. the short ID of insights
+    result_id = models.CharField(max_length=200)
+    sort_name = models.TextField(null=True, blank=True)
+    created_by = models.ForeignKey("posthog.User", on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team", "entity_type", "object_id"], name="unique_search_document"),
+        ]
+        indexes = [
+            models.Index(fields=["team", "entity_type", "sort_name"], name="search_document_sort_idx"),
+            GinIndex(fields=["search_vector"], name="search_document_vector_idx"),
+        ]
+
+
+def searchable_queryset(entity_type: str) -> QuerySet[Any]:
+    """Objects of the entity which show up in search results."""
+    entity = SEARCH_DOCUMENT_ENTITIES[entity_type]
+    qs: QuerySet[Any] = entity.klass.objects.all()
+    # Exclude generated dashboards
+    if entity_type == "dashboard":
+        qs = qs.exclude(creation_mode="template")
+    return qs
+
+
+def build_search_documents(entity_type: str, qs: QuerySet[Any]) -> list[SearchDocument]:
+    entity = SEARCH_DOCUMENT_ENTITIES[entity_type]
+    has_creator = hasattr(entity.klass, "created_by")
+    rows = qs.annotate(
+        _result_id=Cast(entity.result_id_field, CharField()),
+        _sort_name=F(entity.sort_field) if entity.sort_field else Value(None, output_field=CharField()),
+        _search_vector=build_search_vector(entity.search_fields, config="simple"),
+    ).values("pk", "team_id", "_result_id", "_sort_name", "_search_vector", *(["created_by_id"] if has_creator else []))
+    return [
+        SearchDocument(
+            team_id=row["team_id"],
+            entity_type=entity_type,
+            object_id=str(row["pk"]),
+            result_id=row["_result_id"],
+            sort_name=row["_sort_name"],
+            created_by_id=row.get("created_by_id"),
+            search_vector=row["_search_vector"],
+        )
+        for row in rows
+    ]
+
+
+def save_search_documents(documents: Iterable[SearchDocument]) -> None:
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=SEARCH_DOCUMENT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["team", "entity_type", "object_id"],
+        update_fields=["result_id", "sort_name", "created_by", "search_vector"],
+    )
+
+
+def sync_search_documents(entity_type: str, instances: Iterable[Model]) -> None:
+    """
+    Reindexes objects written without sending signals, i.e. by `bulk_create`, `bulk_update` or `QuerySet.update`.
+    Errors are captured rather than raised, as the objects themselves are already written.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    try:
+        pks = [instance.pk for instance in instances]
+        documents = build_search_documents(entity_type, searchable_queryset(entity_type).filter(pk__in=pks))
+        save_search_documents(documents)
+        indexed_object_ids = {document.object_id for document in documents}
+        SearchDocument.objects.filter(
+            team_id__in={instance.team_id for instance in instances},  # type: ignore
+            entity_type=entity_type,
+            object_id__in=[str(pk) for pk in pks if str(pk) not in indexed_object_ids],
+        ).delete()
+    except Exception as e:
+        capture_exception(e, additional_properties={"entity_type": entity_type})
+
+
+def sync_search_document(entity_type: str, instance: Model) -> None:
+    documents = build_search_documents(entity_type, searchable_queryset(entity_type).filter(pk=instance.pk))
+    if documents:
+        save_search_documents(documents)
+    else:
+        delete_search_document(entity_type, instance)
+
+
+def delete_search_document(entity_type: str, instance: Model) -> None:
+    SearchDocument.objects.filter(
+        team_id=instance.team_id,  # type: ignore
+        entity_type=entity_type,
+        object_id=str(instance.pk),
+    ).delete()
+
+
+def _indexed_fields(entity: SearchDocumentEntity) -> set[str]:
+    fields = {*entity.search_fields, entity.result_id_field, *entity.visibility_fields, "created_by", "team"}
+    if entity.sort_field:
+        fields.add(entity.sort_field)
+    return fields
+
+
+def _register_search_document_receivers(entity_type: str, entity: SearchDocumentEntity) -> None:
+    indexed_fields = _indexed_fields(entity)
+
+    @mutable_receiver(post_save, sender=entity.klass, weak=False)
+    def _search_document_post_save(sender, instance: Model, update_fields=None, **kwargs):
+        if update_fields is not None and not indexed_fields.intersection(update_fields):
+            return
+        try:
+            sync_search_document(entity_type, instance)
+        except Exception as e:
+            # Don't raise exceptions in signals
+            capture_exception(e, additional_properties={"entity_type": entity_type, "object_id": str(instance.pk)})
+
+    @mutable_receiver(post_delete, sender=entity.klass, weak=False)
+    def _search_document_post_delete(sender, instance: Model, **kwargs):
+        try:
+            delete_search_document(entity_type, instance)
+        except Exception as e:
+            # Don't raise exceptions in signals
+            capture_exception(e, additional_properties={"entity_type": entity_type, "object_id": str(instance.pk)})
+
+
+for _entity_type, _entity in SEARCH_DOCUMENT_ENTITIES.items():
+    _register_search_document_receivers(_entity_type, _entity)
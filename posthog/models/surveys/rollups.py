@@ -0,0 +1,189 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+import structlog
+
+from posthog.clickhouse.client import sync_execute
+from posthog.models.surveys.sql import (
+    SURVEY_EVENTS_DAILY_INSERT_SQL,
+    SURVEY_EVENTS_DAILY_TABLE,
+    SURVEY_EVENTS_FILTER_SQL,
+    SURVEY_EVENTS_STATE_COLUMNS_SQL,
+)
+from posthog.models.surveys.util import SurveyEventProperties
+
+logger = structlog.get_logger(__name__)
+
+SURVEY_EVENTS_ROLLED_UP_DAYS_CACHE_KEY = "survey_events_daily_rolled_up_days"
+# Events arriving late are included by rolling up the previous days again
+SURVEY_EVENTS_ROLLUP_LOOKBACK_DAYS = 2
+
+
+@dataclass(frozen=True)
+class SurveyEventsRolledUpDays:
+    first_day: date
+    # Exclusive, the days before it are closed and rolled up
+    end_day: date
+
+
+def get_rolled_up_days() -> Optional[SurveyEventsRolledUpDays]:
+    value = cache.get(SURVEY_EVENTS_ROLLED_UP_DAYS_CACHE_KEY)
+    if not value:
+        return None
+    return SurveyEventsRolledUpDays(first_day=date.fromisoformat(value[0]), end_day=date.fromisoformat(value[1]))
+
+
+def set_rolled_up_days(first_day: date, end_day: date) -> None:
+    cache.set(SURVEY_EVENTS_ROLLED_UP_DAYS_CACHE_KEY, (first_day.isoformat(), end_day.isoformat()), timeout=None)
+
+
+def clear_rolled_up_days() -> None:
+    cache.delete(SURVEY_EVENTS_ROLLED_UP_DAYS_CACHE_KEY)
+
+
+def _days(start: date, end: date) -> Iterator[date]:
+    day = start
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+
+def rollup_survey_events(day: date, team_ids: Optional[list[int]] = None) -> None:
+    """Rolls up the survey events of the day, replacing the rows of any previous rollup of it."""
+    team_filter = "AND team_id IN %(team_ids)s" if team_ids else ""
+    sync_execute(
+        SURVEY_EVENTS_DAILY_INSERT_SQL(team_filter=team_filter),
+        {"day": day.isoformat(), "team_ids": team_ids},
+    )
+
+
+def rollup_recent_survey_events(today: Optional[date] = None) -> SurveyEventsRolledUpDays:
+    """
+    Rolls up the days closed since the last run, and the previous days again for the events arriving late. The rolled
+    up days are only recorded once all of them are rolled up, so that requests never read a partial rollup.
+    """
+    today = today or timezone.now().astimezone(UTC).date()
+    rolled_up = get_rolled_up_days()
+
+    start = today - timedelta(days=SURVEY_EVENTS_ROLLUP_LOOKBACK_DAYS)
+    first_day = start
+    if rolled_up is not None:
+        # Catch up on the days missed since the last run, if any
+        start = min(start, rolled_up.end_day)
+        first_day = rolled_up.first_day
+
+    for day in _days(start, today):
+        rollup_survey_events(day)
+        logger.info("survey_events_rolled_up", day=day.isoformat())
+
+    set_rolled_up_days(first_day, today)
+    return SurveyEventsRolledUpDays(first_day=first_day, end_day=today)
+
+
+def backfill_survey_events(days: int) -> SurveyEventsRolledUpDays:
+    """Rolls up the days before the first rolled up day, most recent first."""
+    rolled_up = get_rolled_up_days() or rollup_recent_survey_events()
+
+    first_day = rolled_up.first_day
+    for _ in range(days):
+        first_day -= timedelta(days=1)
+        rollup_survey_events(first_day)
+        # Recorded after each day, so that an interrupted backfill can be resumed
+        set_rolled_up_days(first_day, rolled_up.end_day)
+
+    return SurveyEventsRolledUpDays(first_day=first_day, end_day=rolled_up.end_day)
+
+
+def _ceil_day(value: datetime) -> date:
+    value = value.astimezone(UTC)
+    day = value.date()
+    return day if value == datetime.combine(day, time.min, tzinfo=UTC) else day + timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class SurveyEventsRollupRange:
+    """
+    Splits a date range in the closed days read from the rollup, and the live tail read from events, which is the time
+    before the first of these days and the time after the last one.
+    """
+
+    rollup_from: date
+    # Exclusive
+    rollup_to: date
+    date_from: Optional[datetime]
+    date_to: Optional[datetime]
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {
+            "rollup_from": self.rollup_from.isoformat(),
+            "rollup_to": self.rollup_to.isoformat(),
+            "tail_date_from": self.date_from,
+            "tail_date_to": self.date_to,
+        }
+
+    @property
+    def tail_filter_sql(self) -> str:
+        before = "timestamp < toDateTime(%(rollup_from)s, 'UTC')"
+        if self.date_from is not None:
+            before += " AND timestamp >= %(tail_date_from)s"
+        after = "timestamp >= toDateTime(%(rollup_to)s, 'UTC')"
+        if self.date_to is not None:
+            after += " AND timestamp <= %(tail_date_to)s"
+        return f"({before}) OR ({after})"
+
+
+def get_rollup_range(date_from: Optional[datetime], date_to: Optional[datetime]) -> Optional[SurveyEventsRollupRange]:
+    """The split of the date range, or None if no complete day of the range is rolled up."""
+    rolled_up = get_rolled_up_days()
+    if rolled_up is None:
+        return None
+
+    rollup_from = rolled_up.first_day
+    if date_from is not None:
+        rollup_from = max(rollup_from, _ceil_day(date_from))
+    rollup_to = rolled_up.end_day
+    if date_to is not None:
+        # The end of the range is inclusive, so the day it falls in is read from events
+        rollup_to = min(rollup_to, date_to.astimezone(UTC).date())
+
+    if rollup_from >= rollup_to:
+        return None
+    return SurveyEventsRollupRange(rollup_from=rollup_from, rollup_to=rollup_to, date_from=date_from, date_to=date_to)
+
+
+def SURVEY_EVENTS_STATES_SQL(
+    rollup_range: SurveyEventsRollupRange, survey_filter: str = "", event_filter: str = ""
+) -> str:
+    """
+    States of the survey events of each survey and event, from the rolled up days and from the events of the live tail.
+    The filters apply to the `survey_id` and `event` of both, and the query takes the params of the range.
+    """
+    return f"""
+    SELECT survey_id, event, total_count, persons_state, submissions_state, first_seen, last_seen
+    FROM {SURVEY_EVENTS_DAILY_TABLE} FINAL
+    WHERE team_id = %(team_id)s
+        AND day >= %(rollup_from)s
+        AND day < %(rollup_to)s
+        {survey_filter}
+        {event_filter}
+
+    UNION ALL
+
+    SELECT
+        JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') AS survey_id,
+        event,
+        {SURVEY_EVENTS_STATE_COLUMNS_SQL}
+    FROM events
+    WHERE team_id = %(team_id)s
+        AND {SURVEY_EVENTS_FILTER_SQL}
+        {survey_filter}
+        {event_filter}
+        AND ({rollup_range.tail_filter_sql})
+    GROUP BY survey_id, event
+    """
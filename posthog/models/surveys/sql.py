@@ -0,0 +1,94 @@
+from posthog.clickhouse.cluster import ON_CLUSTER_CLAUSE
+from posthog.clickhouse.table_engines import ReplacingMergeTree, ReplicationScheme
+from posthog.models.surveys.util import SurveyEventName, SurveyEventProperties
+
+SURVEY_EVENTS_DAILY_TABLE = "survey_events_daily"
+
+
+def SURVEY_EVENTS_DAILY_TABLE_SQL(on_cluster=True):
+    """
+    Daily rollup of the survey events of each survey. The persons and submissions are kept as uniqExact states, so that
+    the days can be merged with each other and with the events not rolled up yet without changing the numbers.
+
+    A day is rolled up again by inserting all of its rows, and the rows of the latest insert replace the previous ones.
+    """
+    return """
+CREATE TABLE IF NOT EXISTS {table_name} {on_cluster_clause}
+(
+    team_id Int64,
+    survey_id String,
+    day Date,
+    event LowCardinality(String),
+    total_count UInt64,
+    persons_state AggregateFunction(uniqExact, UUID),
+    -- Only for sent events, the submissions of partial responses are counted once
+    submissions_state AggregateFunction(uniqExact, String),
+    first_seen DateTime64(6, 'UTC'),
+    last_seen DateTime64(6, 'UTC'),
+    _inserted_at DateTime64(6, 'UTC') DEFAULT now64()
+) ENGINE = {engine}
+PARTITION BY toYYYYMM(day)
+ORDER BY (team_id, survey_id, day, event)
+""".format(
+        table_name=SURVEY_EVENTS_DAILY_TABLE,
+        on_cluster_clause=ON_CLUSTER_CLAUSE(on_cluster),
+        engine=ReplacingMergeTree(
+            SURVEY_EVENTS_DAILY_TABLE, replication_scheme=ReplicationScheme.REPLICATED, ver="_inserted_at"
+        ),
+    )
+
+
+def DROP_SURVEY_EVENTS_DAILY_TABLE_SQL():
+    return f"DROP TABLE IF EXISTS {SURVEY_EVENTS_DAILY_TABLE}"
+
+
+def TRUNCATE_SURVEY_EVENTS_DAILY_TABLE_SQL():
+    return f"TRUNCATE TABLE IF EXISTS {SURVEY_EVENTS_DAILY_TABLE}"
+
+
+# Partial responses send several events with the same submission ID, legacy responses don't have one
+SURVEY_SUBMISSION_KEY_SQL = f"""
+    if(
+        COALESCE(JSONExtractString(properties, '{SurveyEventProperties.SURVEY_SUBMISSION_ID}'), '') = '',
+        toString(uuid),
+        JSONExtractString(properties, '{SurveyEventProperties.SURVEY_SUBMISSION_ID}')
+    )
+"""
+
+# Dismissals of surveys which were partially completed aren't counted as dismissals
+SURVEY_EVENTS_FILTER_SQL = f"""
+    event IN ('{SurveyEventName.SHOWN.value}', '{SurveyEventName.DISMISSED.value}', '{SurveyEventName.SENT.value}')
+    AND (
+        event != '{SurveyEventName.DISMISSED.value}'
+        OR COALESCE(JSONExtractBool(properties, '{SurveyEventProperties.SURVEY_PARTIALLY_COMPLETED}'), False) = False
+    )
+"""
+
+# The columns of the rollup, aggregated from the events
+SURVEY_EVENTS_STATE_COLUMNS_SQL = f"""
+    count() AS total_count,
+    uniqExactState(person_id) AS persons_state,
+    uniqExactStateIf({SURVEY_SUBMISSION_KEY_SQL}, event = '{SurveyEventName.SENT.value}') AS submissions_state,
+    min(timestamp) AS first_seen,
+    max(timestamp) AS last_seen
+"""
+
+
+def SURVEY_EVENTS_DAILY_INSERT_SQL(team_filter: str = ""):
+    """Rolls up the survey events of the day `%(day)s`, optionally for some teams only."""
+    return f"""
+INSERT INTO {SURVEY_EVENTS_DAILY_TABLE}
+    (team_id, survey_id, day, event, total_count, persons_state, submissions_state, first_seen, last_seen)
+SELECT
+    team_id,
+    JSONExtractString(properties, '{SurveyEventProperties.SURVEY_ID}') AS survey_id,
+    toDate(timestamp) AS day,
+    event,
+    {SURVEY_EVENTS_STATE_COLUMNS_SQL}
+FROM events
+WHERE timestamp >= toDateTime(%(day)s, 'UTC')
+    AND timestamp < toDateTime(%(day)s, 'UTC') + INTERVAL 1 DAY
+    AND {SURVEY_EVENTS_FILTER_SQL}
+    {team_filter}
+GROUP BY team_id, survey_id, day, event
+"""
@@ -0,0 +1,273 @@
+"""
+Property value sketches
+
+The value pickers suggest the values of a property key on every keystroke, which used to scan a week of events or the
+most recent persons with ILIKE every time. Instead, the most frequent values of the keys picked recently are kept in a
+redis sorted set per team and key, a top-K sketch which is updated with the events and persons ingested since its last
+update, and the suggestions are filtered from it. Keys without a sketch yet fall back to ClickHouse, and are sketched by
+the next refresh, which reads the new values of all keys of a team at once. Searches which could match values dropped
+from a full sketch fall back to ClickHouse as well.
+"""
+
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from enum import StrEnum
+from typing import Any, Optional
+
+from django.utils import timezone
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+from posthog.clickhouse.client import sync_execute
+from posthog.models.property.util import get_property_string_expr
+from posthog.models.team import Team
+from posthog.redis import get_client
+
+logger = structlog.get_logger(__name__)
+
+# Number of values kept per key, the least frequent values are dropped when there are more
+PROPERTY_VALUE_SKETCH_SIZE = 1000
+# The counts of the event values decay on every refresh, so that values not seen anymore are replaced
+EVENT_PROPERTY_VALUE_SKETCH_DECAY = 0.98
+# Number of keys of a team whose new values are read by one query
+PROPERTY_VALUE_SKETCH_KEYS_PER_QUERY = 50
+# Keys not picked for this long aren't refreshed anymore
+PROPERTY_VALUE_SKETCH_TTL = timedelta(days=7)
+# The first refresh of an event property reads the same week of events as the values endpoint
+EVENT_PROPERTY_VALUE_SKETCH_WINDOW = timedelta(days=7)
+# Same as the values endpoint, the first refresh of a person property reads the most recent persons only
+PERSON_PROPERTY_VALUE_SKETCH_MAX_PERSONS = 100_000
+
+PROPERTY_VALUE_SKETCH_REQUESTS_COUNTER = Counter(
+    "posthog_property_value_sketch_requests_total",
+    "Property value suggestions requested, by whether the sketch of the key answered (hit), wasn't ready (cold) or was "
+    "missing values dropped from it (incomplete)",
+    labelnames=["property_type", "result"],
+)
+PROPERTY_VALUE_SUGGESTIONS_TIME_HISTOGRAM = Histogram(
+    "posthog_property_value_suggestions_seconds",
+    "Time to suggest the values of a property, from the sketch or from ClickHouse",
+    labelnames=["property_type", "source"],
+)
+
+
+class PropertyValueSketchType(StrEnum):
+    EVENT = "event"
+    PERSON = "person"
+
+
+def _sketch_name(team_id: int, property_type: PropertyValueSketchType, key: str) -> str:
+    return f"{team_id}:{property_type}:{key}"
+
+
+def _values_key(name: str) -> str:
+    return f"property_value_sketch:{name}"
+
+
+def _refreshed_at_key(name: str) -> str:
+    return f"property_value_sketch_refreshed_at:{name}"
+
+
+# Sorted set of the sketches, scored by when they were last picked
+PROPERTY_VALUE_SKETCH_PICKED_KEY = "property_value_sketch_picked"
+
+
+def get_property_value_suggestions(
+    team: Team,
+    property_type: PropertyValueSketchType,
+    key: str,
+    value: Optional[str] = None,
+    limit: int = 10,
+    order_by_length: bool = False,
+) -> Optional[list[tuple[str, int]]]:
+    """
+    The most frequent values of the key containing the value, case insensitively, with their counts. With
+    `order_by_length`, values matching the search are ordered by length instead, as the shortest are the closest to it.
+    None if the key isn't sketched yet, or if values dropped from the sketch could be missing from the suggestions.
+    """
+    start = time.monotonic()
+    redis = get_client()
+    name = _sketch_name(team.pk, property_type, key)
+    redis.zadd(PROPERTY_VALUE_SKETCH_PICKED_KEY, {name: time.time()})
+
+    if not redis.exists(_refreshed_at_key(name)):
+        PROPERTY_VALUE_SKETCH_REQUESTS_COUNTER.labels(property_type=property_type.value, result="cold").inc()
+        return None
+
+    values = [
+        (member.decode("utf-8"), int(round(score)))
+        for member, score in redis.zrevrange(_values_key(name), 0, -1, withscores=True)
+    ]
+    if value:
+        sketch_full = len(values) >= PROPERTY_VALUE_SKETCH_SIZE
+        search = value.lower()
+        values = [(member, count) for member, count in values if search in member.lower()]
+        # A full sketch dropped the least frequent values, which can match the search when too few of the others do
+        if sketch_full and len(values) < limit:
+            PROPERTY_VALUE_SKETCH_REQUESTS_COUNTER.labels(property_type=property_type.value, result="incomplete").inc()
+            return None
+        if order_by_length:
+            values.sort(key=lambda item: len(item[0]))
+    PROPERTY_VALUE_SKETCH_REQUESTS_COUNTER.labels(property_type=property_type.value, result="hit").inc()
+
+    PROPERTY_VALUE_SUGGESTIONS_TIME_HISTOGRAM.labels(property_type=property_type.value, source="sketch").observe(
+        time.monotonic() - start
+    )
+    return values[:limit]
+
+
+def _event_value_counts(team_id: int, keys: list[str], since: datetime, until: datetime) -> list[tuple[str, str, int]]:
+    params: dict[str, Any] = {"team_id": team_id, "since": since, "until": until, "limit": PROPERTY_VALUE_SKETCH_SIZE}
+    key_values: list[str] = []
+    property_exists_filters: list[str] = []
+    for index, key in enumerate(keys):
+        params[f"key_{index}"] = key
+        property_field, mat_column_exists = get_property_string_expr("events", key, f"%(key_{index})s", "properties")
+        key_values.append(f"(%(key_{index})s, {property_field})")
+        property_exists_filters.append(
+            f"notEmpty({property_field})" if mat_column_exists else f"JSONHas(properties, %(key_{index})s)"
+        )
+    return sync_execute(
+        f"""
+        SELECT key_value.1 AS key, key_value.2 AS value, count() AS count
+        FROM events
+        ARRAY JOIN [{", ".join(key_values)}] AS key_value
+        WHERE team_id = %(team_id)s
+            AND timestamp >= %(since)s
+            AND timestamp < %(until)s
+            AND ({" OR ".join(property_exists_filters)})
+            AND value NOT IN ('', 'null')
+        GROUP BY key, value
+        ORDER BY key, count DESC
+        LIMIT %(limit)s BY key
+        """,
+        params,
+    )
+
+
+def _person_value_counts(
+    team_id: int, keys: list[str], since: Optional[datetime], until: datetime
+) -> list[tuple[str, str, int]]:
+    params: dict[str, Any] = {
+        "team_id": team_id,
+        "since": since,
+        "until": until,
+        "max_persons": PERSON_PROPERTY_VALUE_SKETCH_MAX_PERSONS,
+        "limit": PROPERTY_VALUE_SKETCH_SIZE,
+    }
+    key_values: list[str] = []
+    property_exists_filters: list[str] = []
+    for index, key in enumerate(keys):
+        params[f"key_{index}"] = key
+        property_field, _ = get_property_string_expr("person", key, f"%(key_{index})s", "properties")
+        key_values.append(f"(%(key_{index})s, {property_field})")
+        property_exists_filters.append(f"{property_field} != ''")
+    # Persons updated since the last refresh are counted again, as for the values endpoint the counts are approximate
+    since_filter = "AND _timestamp >= %(since)s" if since else ""
+    return sync_execute(
+        f"""
+        SELECT key_value.1 AS key, key_value.2 AS value, count() AS count
+        FROM (
+            SELECT [{", ".join(key_values)}] AS key_values
+            FROM person
+            WHERE team_id = %(team_id)s
+                AND is_deleted = 0
+                AND _timestamp < %(until)s
+                {since_filter}
+                AND ({" OR ".join(property_exists_filters)})
+            ORDER BY id DESC
+            LIMIT %(max_persons)s
+        )
+        ARRAY JOIN key_values AS key_value
+        WHERE value != ''
+        GROUP BY key, value
+        ORDER BY key, count DESC
+        LIMIT %(limit)s BY key
+        """,
+        params,
+    )
+
+
+def _refresh_property_value_sketches(
+    team_id: int, property_type: PropertyValueSketchType, keys: list[str], since: Optional[datetime], until: datetime
+) -> None:
+    redis = get_client()
+    if property_type == PropertyValueSketchType.EVENT:
+        rows = _event_value_counts(team_id, keys, since or until - EVENT_PROPERTY_VALUE_SKETCH_WINDOW, until)
+    else:
+        rows = _person_value_counts(team_id, keys, since, until)
+
+    counts: dict[str, list[tuple[str, int]]] = defaultdict(list)
+    for key, value, count in rows:
+        counts[key].append((value, count))
+
+    pipeline = redis.pipeline()
+    for key in keys:
+        name = _sketch_name(team_id, property_type, key)
+        values_key = _values_key(name)
+        if property_type == PropertyValueSketchType.EVENT and since:
+            pipeline.zunionstore(values_key, {values_key: EVENT_PROPERTY_VALUE_SKETCH_DECAY})
+        for value, count in counts[key]:
+            pipeline.zincrby(values_key, count, value)
+        # Keep the most frequent values only
+        pipeline.zremrangebyrank(values_key, 0, -PROPERTY_VALUE_SKETCH_SIZE - 1)
+        pipeline.set(_refreshed_at_key(name), until.isoformat())
+    pipeline.execute()
+
+
+def refresh_team_property_value_sketches(team_id: int, names: list[str]) -> int:
+    """
+    Adds the values ingested since the last refresh to the sketches of the team, and drops the least frequent ones.
+    Keys last refreshed at the same time are read with a single query. Returns the number of sketches refreshed.
+    """
+    if not names:
+        return 0
+    redis = get_client()
+    # Persons are versioned by the second
+    until = timezone.now().replace(microsecond=0)
+
+    keys_to_refresh: dict[tuple[PropertyValueSketchType, Optional[datetime]], list[str]] = defaultdict(list)
+    for name, refreshed_at in zip(names, redis.mget([_refreshed_at_key(name) for name in names])):
+        _, property_type, key = name.split(":", 2)
+        since = datetime.fromisoformat(refreshed_at.decode("utf-8")) if refreshed_at else None
+        keys_to_refresh[(PropertyValueSketchType(property_type), since)].append(key)
+
+    refreshed = 0
+    for (property_type, since), keys in keys_to_refresh.items():
+        for index in range(0, len(keys), PROPERTY_VALUE_SKETCH_KEYS_PER_QUERY):
+            batch = keys[index : index + PROPERTY_VALUE_SKETCH_KEYS_PER_QUERY]
+            try:
+                _refresh_property_value_sketches(team_id, property_type, batch, since, until)
+                refreshed += len(batch)
+            except Exception as e:
+                logger.exception(
+                    "property_value_sketch_refresh_failed",
+                    team_id=team_id,
+                    property_type=property_type.value,
+                    keys=batch,
+                    error=str(e),
+                )
+    return refreshed
+
+
+def delete_property_value_sketch(name: str) -> None:
+    redis = get_client()
+    redis.delete(_values_key(name), _refreshed_at_key(name))
+    redis.zrem(PROPERTY_VALUE_SKETCH_PICKED_KEY, name)
+
+
+def get_picked_property_value_sketches() -> dict[int, list[str]]:
+    """Deletes the sketches of the keys not picked recently, and returns the others by team."""
+    redis = get_client()
+    expired_before = time.time() - PROPERTY_VALUE_SKETCH_TTL.total_seconds()
+    for expired in redis.zrangebyscore(PROPERTY_VALUE_SKETCH_PICKED_KEY, "-inf", expired_before):
+        delete_property_value_sketch(expired.decode("utf-8"))
+
+    sketches: dict[int, list[str]] = defaultdict(list)
+    for member in redis.zrangebyscore(PROPERTY_VALUE_SKETCH_PICKED_KEY, expired_before, "+inf"):
+        name = member.decode("utf-8")
+        team_id, _ = name.split(":", 1)
+        sketches[int(team_id)].append(name)
+    return dict(sketches)
@@ -708,18 +708,35 @@ class UserAccessControl:
         if not resource:
             return queryset
 
+        access_filter = self.access_level_filter_for_resource(
+            resource,
+            creator_field="created_by" if hasattr(model, "created_by") else None,
+            include_all_if_admin=include_all_if_admin,
+        )
+        return queryset.filter(access_filter) if access_filter is not None else queryset
+
+    def access_level_filter_for_resource(
+        self,
+        resource: APIScopeObject,
+        id_field: str = "id",
+        creator_field: Optional[str] = "created_by",
+        include_all_if_admin=False,
+    ) -> Optional[Q]:
+        """
+        Returns the filter of `filter_queryset_by_access_level` for objects of the resource, with the object IDs and
+        creators in the given fields, or `None` if no object is filtered out. Useful for querysets of another model
+        which references the objects, e.g. the search index.
+        """
         if include_all_if_admin:
             org_membership = self._organization_membership
 
             if org_membership and org_membership.level >= OrganizationMembership.Level.ADMIN:
-                return queryset
+                return None
 
         # Check if user has "none" access at resource level
         resource_access_level = self.access_level_for_resource(resource)
         has_resource_access = resource_access_level and resource_access_level != NO_ACCESS_LEVEL
 
-        model_has_creator = hasattr(model, "created_by")
-
         filters = self._access_controls_filters_for_queryset(resource)
         access_controls = self._get_access_controls(filters)
 
@@ -758,18 +775,16 @@ class UserAccessControl:
         if not has_resource_access and allowed_resource_ids:
             # User has "none" resource access but specific object access
             # Only show objects they have explicit access to (plus created objects)
-            if model_has_creator:
-                queryset = queryset.filter(Q(id__in=allowed_resource_ids) | Q(created_by=self._user))
-            else:
-                queryset = queryset.filter(id__in=allowed_resource_ids)
+            if creator_field:
+                return Q(**{f"{id_field}__in": allowed_resource_ids}) | Q(**{creator_field: self._user})
+            return Q(**{f"{id_field}__in": allowed_resource_ids})
         elif blocked_resource_ids:
             # Standard case: exclude explicitly blocked objects
-            if model_has_creator:
-                queryset = queryset.exclude(Q(id__in=blocked_resource_ids) & ~Q(created_by=self._user))
-            else:
-                queryset = queryset.exclude(id__in=blocked_resource_ids)
+            if creator_field:
+                return ~(Q(**{f"{id_field}__in": blocked_resource_ids}) & ~Q(**{creator_field: self._user}))
+            return ~Q(**{f"{id_field}__in": blocked_resource_ids})
 
-        return queryset
+        return None
 
     def filter_and_annotate_file_system_queryset(self, queryset: QuerySet["FileSystem"]) -> QuerySet["FileSystem"]:
         """
@@ -1706,6 +1706,11 @@ class GoalLine(BaseModel):
     value: float
 
 
+class HeatmapsQueryAggregation(StrEnum):
+    TOTAL_COUNT = "total_count"
+    UNIQUE_VISITORS = "unique_visitors"
+
+
 class HedgehogColorOptions(StrEnum):
     GREEN = "green"
     RED = "red"
@@ -2169,6 +2174,7 @@ class NodeKind(StrEnum):
     ERROR_TRACKING_ISSUE_CORRELATION_QUERY = "ErrorTrackingIssueCorrelationQuery"
     LOGS_QUERY = "LogsQuery"
     SESSION_BATCH_EVENTS_QUERY = "SessionBatchEventsQuery"
+    HEATMAPS_QUERY = "HeatmapsQuery"
     DATA_TABLE_NODE = "DataTableNode"
     DATA_VISUALIZATION_NODE = "DataVisualizationNode"
     SAVED_INSIGHT_NODE = "SavedInsightNode"
@@ -6784,6 +6790,43 @@ class CachedGroupsQueryResponse(BaseModel):
     types: list[str]
 
 
+class CachedHeatmapsQueryResponse(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    cache_key: str
+    cache_target_age: Optional[datetime] = None
+    calculation_trigger: Optional[str] = Field(
+        default=None, description="What triggered the calculation of the query, leave empty if user/immediate"
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Query error. Returned only if 'explain' or `modifiers.debug` is true. Throws an error otherwise.",
+    )
+    hogql: Optional[str] = Field(default=None, description="Generated HogQL query.")
+    is_cached: bool
+    last_refresh: datetime
+    modifiers: Optional[HogQLQueryModifiers] = Field(
+        default=None, description="Modifiers used when performing the query"
+    )
+    next_allowed_client_refresh: datetime
+    query_metadata: Optional[dict[str, Any]] = None
+    query_status: Optional[QueryStatus] = Field(
+        default=None, description="Query status indicates whether next to the provided data, a query is still running."
+    )
+    resolved_date_range: Optional[ResolvedDateRangeResponse] = Field(
+        default=None, description="The date range used for the query"
+    )
+    results: list[list] = Field(
+        ...,
+        description="`[pointer_target_fixed, pointer_relative_x, pointer_y, count]` rows, or `[scroll_depth_bucket, bucket_count, cumulative_count]` rows for scroll depth",
+    )
+    timezone: str
+    timings: Optional[list[QueryTiming]] = Field(
+        default=None, description="Measured timings for different parts of the query generation process"
+    )
+
+
 class CachedLifecycleQueryResponse(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
@@ -9675,6 +9718,33 @@ class HeatMapQuerySource(RootModel[EventsNode]):
     root: EventsNode
 
 
+class HeatmapsQueryResponse(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Query error. Returned only if 'explain' or `modifiers.debug` is true. Throws an error otherwise.",
+    )
+    hogql: Optional[str] = Field(default=None, description="Generated HogQL query.")
+    modifiers: Optional[HogQLQueryModifiers] = Field(
+        default=None, description="Modifiers used when performing the query"
+    )
+    query_status: Optional[QueryStatus] = Field(
+        default=None, description="Query status indicates whether next to the provided data, a query is still running."
+    )
+    resolved_date_range: Optional[ResolvedDateRangeResponse] = Field(
+        default=None, description="The date range used for the query"
+    )
+    results: list[list] = Field(
+        ...,
+        description="`[pointer_target_fixed, pointer_relative_x, pointer_y, count]` rows, or `[scroll_depth_bucket, bucket_count, cumulative_count]` rows for scroll depth",
+    )
+    timings: Optional[list[QueryTiming]] = Field(
+        default=None, description="Measured timings for different parts of the query generation process"
+    )
+
+
 class HogQLFilters(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
@@ -13004,6 +13074,27 @@ class GroupsQuery(BaseModel):
     version: Optional[float] = Field(default=None, description="version of the node, used for schema migrations")
 
 
+class HeatmapsQuery(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    aggregation: HeatmapsQueryAggregation
+    dateRange: DateRange = Field(..., description="Dates of the first and last days, both included")
+    filterTestAccounts: Optional[bool] = None
+    kind: Literal["HeatmapsQuery"] = "HeatmapsQuery"
+    modifiers: Optional[HogQLQueryModifiers] = Field(
+        default=None, description="Modifiers used when performing the query"
+    )
+    response: Optional[HeatmapsQueryResponse] = None
+    tags: Optional[QueryLogTags] = None
+    type: str = Field(..., description="The heatmap type, e.g. `click` or `scrolldepth`")
+    urlExact: Optional[str] = None
+    urlPattern: Optional[str] = Field(default=None, description="Anchored pattern matched against the URL")
+    version: Optional[float] = Field(default=None, description="version of the node, used for schema migrations")
+    viewportWidthMax: Optional[int] = None
+    viewportWidthMin: Optional[int] = None
+
+
 class HogQLASTQuery(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
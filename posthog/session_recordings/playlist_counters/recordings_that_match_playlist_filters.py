@@ -1,4 +1,6 @@
 import json
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
@@ -22,8 +24,9 @@ from posthog.schema import (
 
 from posthog.clickhouse.query_tagging import Product, tag_queries
 from posthog.helpers.session_recording_playlist_templates import DEFAULT_PLAYLIST_NAMES
-from posthog.redis import get_client
+from posthog.redis import get_client, redis
 from posthog.session_recordings.models.session_recording_playlist import SessionRecordingPlaylist
+from posthog.session_recordings.queries.session_recording_counts_from_queries import SessionRecordingCountsFromQueries
 from posthog.session_recordings.session_recording_api import filter_from_params_to_query, list_recordings_from_query
 from posthog.session_recordings.session_recording_playlist_api import PLAYLIST_COUNT_REDIS_PREFIX
 from posthog.tasks.utils import CeleryQueue
@@ -84,6 +87,23 @@ REPLAY_PLAYLIST_COUNT_TIMER = Histogram(
     buckets=(1, 2, 4, 8, 10, 30, 60, 120, 240, 300, 360, 420, 480, 540, 600, float("inf")),
 )
 
+REPLAY_PLAYLIST_SHARED_SCAN_COUNT_TIMER = Histogram(
+    "replay_playlist_shared_scan_count_timer_seconds",
+    "Time spent loading session recordings that match the filters of several playlists in one query in seconds",
+    buckets=(1, 2, 4, 8, 10, 30, 60, 120, 240, 300, 360, 420, 480, 540, 600, float("inf")),
+)
+
+REPLAY_PLAYLIST_SHARED_SCAN_SIZE = Histogram(
+    "replay_playlist_shared_scan_size",
+    "Number of playlists counted in one query",
+    buckets=(1, 2, 4, 8, 16, 32, 64, float("inf")),
+)
+
+REPLAY_PLAYLIST_SHARED_SCAN_FAILED = Counter(
+    "replay_playlist_shared_scan_failed",
+    "when counting several playlists in one query fails, and they are counted one by one instead",
+)
+
 REPLAY_TOTAL_PLAYLISTS_GAUGE = Gauge(
     "replay_total_playlists_gauge",
     "Total number of playlists in the database",
@@ -386,6 +406,101 @@ def should_skip_task(existing_value: dict[str, Any], playlist_filters: dict[str,
     return False
 
 
+def _get_existing_value(redis_client: redis.Redis, playlist: SessionRecordingPlaylist) -> dict[str, Any]:
+    existing_value = redis_client.getex(
+        name=f"{PLAYLIST_COUNT_REDIS_PREFIX}{playlist.short_id}", ex=THIRTY_SIX_HOURS_IN_SECONDS
+    )
+    return json.loads(existing_value) if existing_value else {}
+
+
+def _prepare_query(playlist: SessionRecordingPlaylist, existing_value: dict[str, Any]) -> tuple[RecordingsQuery, bool]:
+    """Returns the query to count the playlist with, and whether its results should be merged with the existing ones"""
+    query = convert_filters_to_recordings_query(playlist)
+
+    # if we already have some data and the query is sorted by start_time,
+    # we can query only new recordings, to (hopefully) reduce load on CH
+    has_existing_data = existing_value.get("refreshed_at", None)
+    can_query_only_new_recordings = query.order == "start_time"
+
+    if has_existing_data and can_query_only_new_recordings:
+        query.date_from = existing_value["refreshed_at"]
+        return query, True
+
+    return query, False
+
+
+def _store_counted_session_ids(
+    redis_client: redis.Redis,
+    playlist: SessionRecordingPlaylist,
+    existing_value: dict[str, Any],
+    session_ids: list[str],
+    has_more: bool,
+    merge_with_existing: bool,
+) -> None:
+    counted_at_date = timezone.now()
+    new_session_ids = session_ids
+
+    if merge_with_existing:
+        # these results are only used for counting and checking if unwatched
+        # so we can merge them without caring about order
+        new_session_ids = list(set(new_session_ids + existing_value["session_ids"]))
+
+    value_to_set = json.dumps(
+        {
+            "session_ids": new_session_ids,
+            "has_more": has_more,
+            "previous_ids": existing_value.get("session_ids", None),
+            "refreshed_at": counted_at_date.isoformat(),
+            "error_count": 0,
+            "errored_at": None,
+        }
+    )
+    redis_client.setex(f"{PLAYLIST_COUNT_REDIS_PREFIX}{playlist.short_id}", THIRTY_SIX_HOURS_IN_SECONDS, value_to_set)
+    playlist.last_counted_at = counted_at_date
+    playlist.save(update_fields=["last_counted_at"])
+
+    REPLAY_TEAM_PLAYLIST_COUNT_SUCCEEDED.inc()
+    posthoganalytics.capture(
+        distinct_id=f"playlist_counting_for_team_{playlist.team.pk}",
+        event="replay_playlist_saved_filters_counted",
+        properties={
+            "team_id": playlist.team.pk,
+            "saved_filters_short_id": playlist.short_id,
+            "saved_filters_name": playlist.name or playlist.derived_name,
+            "count": len(new_session_ids),
+            "previous_count": len(existing_value.get("session_ids", [])),
+        },
+    )
+
+
+def _record_count_failure(
+    e: Exception, playlist_id: int, playlist: SessionRecordingPlaylist | None, query: RecordingsQuery | None
+) -> None:
+    query_json: dict[str, Any] | None = None
+    try:
+        query_json = query.model_dump() if query else None
+    except Exception:
+        query_json = {"malformed": True}
+
+    posthoganalytics.capture_exception(
+        e,
+        properties={
+            "playlist_id": playlist_id,
+            "playlist_short_id": playlist.short_id if playlist else None,
+            "posthog_feature": "session_replay_playlist_counters",
+        },
+    )
+    logger.exception(
+        "Failed to count recordings that match playlist filters",
+        playlist_id=playlist_id,
+        playlist_short_id=playlist.short_id if playlist else None,
+        query=query_json,
+        error=e,
+    )
+    REPLAY_TEAM_PLAYLIST_COUNT_FAILED.labels(error=e.__class__.__name__).inc()
+    try_to_store_error_count(playlist.short_id if playlist else None)
+
+
 @shared_task(
     ignore_result=True,
     queue=CeleryQueue.SESSION_REPLAY_GENERAL.value,
@@ -402,66 +517,24 @@ def count_recordings_that_match_playlist_filters(playlist_id: int) -> None:
 
             tag_queries(product=Product.REPLAY, team_id=playlist.team.pk, replay_playlist_id=playlist_id)
 
-            existing_value = redis_client.getex(
-                name=f"{PLAYLIST_COUNT_REDIS_PREFIX}{playlist.short_id}", ex=THIRTY_SIX_HOURS_IN_SECONDS
-            )
-            if existing_value:
-                existing_value = json.loads(existing_value)
-            else:
-                existing_value = {}
+            existing_value = _get_existing_value(redis_client, playlist)
 
             if should_skip_task(existing_value, playlist.filters):
                 return
 
-            query = convert_filters_to_recordings_query(playlist)
-
-            # if we already have some data and the query is sorted by start_time,
-            # we can query only new recordings, to (hopefully) reduce load on CH
-            has_existing_data = existing_value.get("refreshed_at", None)
-            can_query_only_new_recordings = query.order == "start_time"
-
-            if has_existing_data and can_query_only_new_recordings:
-                query.date_from = existing_value["refreshed_at"]
+            query, merge_with_existing = _prepare_query(playlist, existing_value)
 
             (recordings, more_recordings_available, _, _) = list_recordings_from_query(
                 query, user=None, team=playlist.team
             )
 
-            counted_at_date = timezone.now()
-            new_session_ids = [r.session_id for r in recordings]
-
-            if has_existing_data and can_query_only_new_recordings:
-                # these results are only used for counting and checking if unwatched
-                # so we can merge them without caring about order
-                new_session_ids = list(set(new_session_ids + existing_value["session_ids"]))
-
-            value_to_set = json.dumps(
-                {
-                    "session_ids": new_session_ids,
-                    "has_more": more_recordings_available,
-                    "previous_ids": existing_value.get("session_ids", None),
-                    "refreshed_at": counted_at_date.isoformat(),
-                    "error_count": 0,
-                    "errored_at": None,
-                }
-            )
-            redis_client.setex(
-                f"{PLAYLIST_COUNT_REDIS_PREFIX}{playlist.short_id}", THIRTY_SIX_HOURS_IN_SECONDS, value_to_set
-            )
-            playlist.last_counted_at = counted_at_date
-            playlist.save(update_fields=["last_counted_at"])
-
-            REPLAY_TEAM_PLAYLIST_COUNT_SUCCEEDED.inc()
-            posthoganalytics.capture(
-                distinct_id=f"playlist_counting_for_team_{playlist.team.pk}",
-                event="replay_playlist_saved_filters_counted",
-                properties={
-                    "team_id": playlist.team.pk,
-                    "saved_filters_short_id": playlist.short_id,
-                    "saved_filters_name": playlist.name or playlist.derived_name,
-                    "count": len(new_session_ids),
-                    "previous_count": len(existing_value.get("session_ids", [])),
-                },
+            _store_counted_session_ids(
+                redis_client,
+                playlist,
+                existing_value,
+                [r.session_id for r in recordings],
+                more_recordings_available,
+                merge_with_existing,
             )
     except SessionRecordingPlaylist.DoesNotExist:
         logger.info(
@@ -471,29 +544,110 @@ def count_recordings_that_match_playlist_filters(playlist_id: int) -> None:
         )
         REPLAY_TEAM_PLAYLIST_COUNT_UNKNOWN.inc()
     except Exception as e:
-        query_json: dict[str, Any] | None = None
+        _record_count_failure(e, playlist_id, playlist, query)
+
+
+def _time_window(query: RecordingsQuery) -> tuple[str | None, str | None]:
+    """
+    Playlists counted in the same shared scan should read roughly the same date range, or the scan reads more than
+    the separate queries would. Playlists counted since their last count share the day they were last counted on.
+    """
+    date_from = query.date_from
+    if date_from:
+        try:
+            date_from = datetime.fromisoformat(date_from).date().isoformat()
+        except ValueError:
+            # a relative date, e.g. -3d
+            pass
+    return date_from, query.date_to
+
+
+@dataclass
+class _PendingPlaylistCount:
+    playlist: SessionRecordingPlaylist
+    existing_value: dict[str, Any]
+    query: RecordingsQuery
+    merge_with_existing: bool
+
+
+@shared_task(
+    ignore_result=True,
+    queue=CeleryQueue.SESSION_REPLAY_GENERAL.value,
+    rate_limit="1/m",
+    expires=TASK_EXPIRATION_TIME,
+)
+def count_recordings_that_match_team_playlists_filters(team_id: int, playlist_ids: list[int]) -> None:
+    """
+    Counts the playlists of a team together: playlists reading the same time window are counted in one query over
+    `session_replay_events`, instead of one query each.
+    """
+    redis_client = get_client()
+    tag_queries(product=Product.REPLAY, team_id=team_id)
+
+    pending_by_window: dict[tuple[str | None, str | None], list[_PendingPlaylistCount]] = defaultdict(list)
+    for playlist in SessionRecordingPlaylist.objects.filter(team_id=team_id, id__in=playlist_ids).select_related(
+        "team"
+    ):
+        query: RecordingsQuery | None = None
         try:
-            query_json = query.model_dump() if query else None
-        except Exception:
-            query_json = {"malformed": True}
-
-        posthoganalytics.capture_exception(
-            e,
-            properties={
-                "playlist_id": playlist_id,
-                "playlist_short_id": playlist.short_id if playlist else None,
-                "posthog_feature": "session_replay_playlist_counters",
-            },
+            existing_value = _get_existing_value(redis_client, playlist)
+            if should_skip_task(existing_value, playlist.filters):
+                continue
+
+            query, merge_with_existing = _prepare_query(playlist, existing_value)
+        except Exception as e:
+            _record_count_failure(e, playlist.id, playlist, query)
+            continue
+
+        if not SessionRecordingCountsFromQueries.can_share_scan(query):
+            count_recordings_that_match_playlist_filters.delay(playlist.id)
+            continue
+
+        pending_by_window[_time_window(query)].append(
+            _PendingPlaylistCount(playlist, existing_value, query, merge_with_existing)
         )
+
+    for pending_in_window in pending_by_window.values():
+        for start in range(0, len(pending_in_window), settings.PLAYLIST_COUNTER_SHARED_SCAN_MAX_PLAYLISTS):
+            _count_in_shared_scan(
+                redis_client, pending_in_window[start : start + settings.PLAYLIST_COUNTER_SHARED_SCAN_MAX_PLAYLISTS]
+            )
+
+
+def _count_in_shared_scan(redis_client: redis.Redis, pending: list[_PendingPlaylistCount]) -> None:
+    try:
+        with REPLAY_PLAYLIST_SHARED_SCAN_COUNT_TIMER.time():
+            results = SessionRecordingCountsFromQueries(
+                team=pending[0].playlist.team,
+                queries={str(count.playlist.id): count.query for count in pending},
+            ).run()
+    except Exception as e:
         logger.exception(
-            "Failed to count recordings that match playlist filters",
-            playlist_id=playlist_id,
-            playlist_short_id=playlist.short_id if playlist else None,
-            query=query_json,
+            "Failed to count playlists in a shared scan, counting them one by one",
+            team_id=pending[0].playlist.team_id,
+            playlist_ids=[count.playlist.id for count in pending],
             error=e,
         )
-        REPLAY_TEAM_PLAYLIST_COUNT_FAILED.labels(error=e.__class__.__name__).inc()
-        try_to_store_error_count(playlist.short_id if playlist else None)
+        REPLAY_PLAYLIST_SHARED_SCAN_FAILED.inc()
+        # so that a single broken playlist doesn't keep the other playlists from being counted
+        for count in pending:
+            count_recordings_that_match_playlist_filters.delay(count.playlist.id)
+        return
+
+    REPLAY_PLAYLIST_SHARED_SCAN_SIZE.observe(len(pending))
+    for count in pending:
+        try:
+            result = results[str(count.playlist.id)]
+            _store_counted_session_ids(
+                redis_client,
+                count.playlist,
+                count.existing_value,
+                result.session_ids,
+                result.has_more,
+                count.merge_with_existing,
+            )
+        except Exception as e:
+            _record_count_failure(e, count.playlist.id, count.playlist, count.query)
 
 
 def enqueue_recordings_that_match_playlist_filters() -> None:
@@ -510,7 +664,7 @@ def enqueue_recordings_that_match_playlist_filters() -> None:
 
     total_playlists_count = base_query.count()
 
-    all_playlists = base_query.order_by(F("last_counted_at").asc(nulls_first=True)).values_list("id", flat=True)[
+    all_playlists = base_query.order_by(F("last_counted_at").asc(nulls_first=True)).values_list("id", "team_id")[
         : settings.PLAYLIST_COUNTER_PROCESSING_PLAYLISTS_LIMIT
     ]
 
@@ -520,6 +674,16 @@ def enqueue_recordings_that_match_playlist_filters() -> None:
     REPLAY_TOTAL_PLAYLISTS_GAUGE.set(total_playlists_count)
     REPLAY_PLAYLISTS_IN_REDIS_GAUGE.set(cached_counted_playlists_count)
 
-    for playlist_id in all_playlists:
+    if settings.PLAYLIST_COUNTER_SHARED_SCAN_ENABLED:
+        playlist_ids_by_team: dict[int, list[int]] = defaultdict(list)
+        for playlist_id, team_id in all_playlists:
+            playlist_ids_by_team[team_id].append(playlist_id)
+            REPLAY_TEAM_PLAYLISTS_IN_TEAM_COUNT.inc()
+
+        for team_id, playlist_ids in playlist_ids_by_team.items():
+            count_recordings_that_match_team_playlists_filters.delay(team_id, playlist_ids)
+        return
+
+    for playlist_id, _ in all_playlists:
         count_recordings_that_match_playlist_filters.delay(playlist_id)
         REPLAY_TEAM_PLAYLISTS_IN_TEAM_COUNT.inc()
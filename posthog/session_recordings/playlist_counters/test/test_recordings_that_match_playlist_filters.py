@@ -7,6 +7,7 @@ from posthog.test.base import APIBaseTest, QueryMatchingTest, snapshot_postgres_
 from unittest import mock
 from unittest.mock import MagicMock, call, patch
 
+from django.test import override_settings
 from django.utils import timezone
 
 from posthog.schema import (
@@ -18,6 +19,7 @@ from posthog.schema import (
 )
 
 from posthog.helpers.session_recording_playlist_templates import DEFAULT_PLAYLIST_NAMES
+from posthog.models import Team
 from posthog.redis import get_client
 from posthog.session_recordings.models.session_recording import SessionRecording
 from posthog.session_recordings.models.session_recording_playlist import SessionRecordingPlaylist
@@ -25,8 +27,10 @@ from posthog.session_recordings.models.session_recording_playlist_item import Se
 from posthog.session_recordings.playlist_counters.recordings_that_match_playlist_filters import (
     DEFAULT_RECORDING_FILTERS,
     count_recordings_that_match_playlist_filters,
+    count_recordings_that_match_team_playlists_filters,
     enqueue_recordings_that_match_playlist_filters,
 )
+from posthog.session_recordings.queries.session_recording_counts_from_queries import SessionRecordingCountsResult
 from posthog.session_recordings.session_recording_playlist_api import PLAYLIST_COUNT_REDIS_PREFIX
 
 
@@ -473,6 +477,101 @@ class TestRecordingsThatMatchPlaylistFilters(APIBaseTest, QueryMatchingTest):
 
         mock_capture_exception.assert_not_called()
 
+    @patch("posthoganalytics.capture_exception")
+    @patch(
+        "posthog.session_recordings.playlist_counters.recordings_that_match_playlist_filters.SessionRecordingCountsFromQueries"
+    )
+    @patch(
+        "posthog.session_recordings.playlist_counters.recordings_that_match_playlist_filters.count_recordings_that_match_playlist_filters"
+    )
+    def test_counts_team_playlists_in_shared_scans(
+        self, mock_count_task: MagicMock, mock_counts_from_queries: MagicMock, mock_capture_exception: MagicMock
+    ):
+        three_days = [
+            SessionRecordingPlaylist.objects.create(team=self.team, name=f"3d {i}", filters={"date_from": "-3d"})
+            for i in range(2)
+        ]
+        seven_days = SessionRecordingPlaylist.objects.create(team=self.team, name="7d", filters={"date_from": "-7d"})
+        by_duration = SessionRecordingPlaylist.objects.create(
+            team=self.team,
+            name="by duration",
+            filters={
+                "date_from": "-3d",
+                "order": "duration",
+                "filter_group": {"type": "AND", "values": [{"type": "AND", "values": []}]},
+            },
+        )
+
+        def run_counts(team, queries):
+            counts = MagicMock()
+            counts.run.return_value = {
+                key: SessionRecordingCountsResult(
+                    session_ids=[f"session_for_{key}"], has_more=key == str(seven_days.id)
+                )
+                for key in queries
+            }
+            return counts
+
+        mock_counts_from_queries.side_effect = run_counts
+
+        count_recordings_that_match_team_playlists_filters(
+            self.team.pk, [playlist.id for playlist in [*three_days, seven_days, by_duration]]
+        )
+
+        # one query per time window
+        assert sorted(sorted(call.kwargs["queries"].keys()) for call in mock_counts_from_queries.call_args_list) == [
+            sorted(str(playlist.id) for playlist in three_days),
+            [str(seven_days.id)],
+        ]
+        # playlists that can't share a scan are counted on their own
+        mock_count_task.delay.assert_called_once_with(by_duration.id)
+
+        for playlist in [*three_days, seven_days]:
+            counts = self._get_counts_from_redis(playlist)
+            assert counts["session_ids"] == [f"session_for_{playlist.id}"]
+            assert counts["has_more"] == (playlist == seven_days)
+            playlist.refresh_from_db()
+            assert playlist.last_counted_at is not None
+
+        mock_capture_exception.assert_not_called()
+
+    @patch(
+        "posthog.session_recordings.playlist_counters.recordings_that_match_playlist_filters.SessionRecordingCountsFromQueries"
+    )
+    @patch(
+        "posthog.session_recordings.playlist_counters.recordings_that_match_playlist_filters.count_recordings_that_match_playlist_filters"
+    )
+    def test_shared_scan_failure_counts_playlists_one_by_one(
+        self, mock_count_task: MagicMock, mock_counts_from_queries: MagicMock
+    ):
+        playlists = [
+            SessionRecordingPlaylist.objects.create(team=self.team, name=f"3d {i}", filters={"date_from": "-3d"})
+            for i in range(2)
+        ]
+        mock_counts_from_queries.return_value.run.side_effect = Exception("boom")
+
+        count_recordings_that_match_team_playlists_filters(self.team.pk, [playlist.id for playlist in playlists])
+
+        assert sorted(call.args[0] for call in mock_count_task.delay.call_args_list) == sorted(
+            playlist.id for playlist in playlists
+        )
+
+    @override_settings(PLAYLIST_COUNTER_SHARED_SCAN_ENABLED=True)
+    @patch(
+        "posthog.session_recordings.playlist_counters.recordings_that_match_playlist_filters.count_recordings_that_match_team_playlists_filters"
+    )
+    def test_enqueues_playlists_grouped_by_team(self, mock_team_count_task: MagicMock):
+        other_team = Team.objects.create(organization=self.organization)
+        playlist1 = SessionRecordingPlaylist.objects.create(team=self.team, name="1", filters={"date_from": "-21d"})
+        playlist2 = SessionRecordingPlaylist.objects.create(team=self.team, name="2", filters={"date_from": "-21d"})
+        playlist3 = SessionRecordingPlaylist.objects.create(team=other_team, name="3", filters={"date_from": "-21d"})
+
+        enqueue_recordings_that_match_playlist_filters()
+
+        assert sorted(call.args for call in mock_team_count_task.delay.call_args_list) == sorted(
+            [(self.team.pk, [playlist1.id, playlist2.id]), (other_team.pk, [playlist3.id])]
+        )
+
     def _get_counts_from_redis(self, playlist: SessionRecordingPlaylist) -> dict:
         counts = self.redis_client.get(f"{PLAYLIST_COUNT_REDIS_PREFIX}{playlist.short_id}")
         assert counts is not None
@@ -0,0 +1,222 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from opentelemetry import trace
+
+from posthog.schema import RecordingOrder, RecordingOrderDirection, RecordingsQuery
+
+from posthog.hogql import ast
+from posthog.hogql.constants import HogQLGlobalSettings
+from posthog.hogql.functions.mapping import find_hogql_aggregation
+from posthog.hogql.query import execute_hogql_query
+from posthog.hogql.visitor import CloningVisitor, clone_expr
+
+from posthog.models import Team
+from posthog.session_recordings.queries.session_recording_list_from_query import SessionRecordingListFromQuery
+
+tracer = trace.get_tracer(__name__)
+
+
+class _QueryAggregates(CloningVisitor):
+    """
+    Rewrites the session aggregates of a query to only aggregate the rows passing its `condition`, with the `-If`
+    combinator, and its references to them to their `suffix`ed aliases.
+    """
+
+    def __init__(self, condition: ast.Expr, aliases: set[str], suffix: str):
+        super().__init__()
+        self._condition = condition
+        self._aliases = aliases
+        self._suffix = suffix
+
+    def visit_call(self, node: ast.Call):
+        call = super().visit_call(node)
+        if find_hogql_aggregation(node.name) is None:
+            return call
+        if find_hogql_aggregation(f"{node.name}If") is None:
+            raise ValueError(f"Aggregation {node.name} has no -If combinator, its query can't share a scan")
+        call.name = f"{node.name}If"
+        call.args.append(clone_expr(self._condition))
+        return call
+
+    def visit_field(self, node: ast.Field):
+        field = super().visit_field(node)
+        if len(node.chain) == 1 and node.chain[0] in self._aliases:
+            field.chain = [f"{node.chain[0]}{self._suffix}"]
+        return field
+
+    def visit_select_query(self, node: ast.SelectQuery):
+        # Subqueries aggregate their own rows
+        return clone_expr(node)
+
+
+@dataclass
+class SessionRecordingCountsResult:
+    # The most recent matching sessions, at most `limit` of them
+    session_ids: list[str]
+    has_more: bool
+
+
+class SessionRecordingCountsFromQueries:
+    """
+    Lists the most recent recordings matching each of several queries of a team, reading `session_replay_events`
+    once for all of them instead of once per query.
+
+    Every session in the union of the queries' date ranges is grouped once. Each query gets its own copy of the
+    session aggregates, with the `-If` combinator over the rows passing its own filters, so its HAVING predicates and
+    start time see the same aggregates as when the query runs on its own. The sessions matching each query are then
+    collected with `groupArraySortedIf`, most recent first.
+
+    Only queries ordered by start time, most recent first, can share a scan, see `can_share_scan`.
+    """
+
+    SESSION_RECORDINGS_DEFAULT_LIMIT = SessionRecordingListFromQuery.SESSION_RECORDINGS_DEFAULT_LIMIT
+
+    def __init__(self, team: Team, queries: dict[str, RecordingsQuery]):
+        for key, query in queries.items():
+            if not self.can_share_scan(query):
+                raise ValueError(f"Query {key} can't share a scan, it must be ordered by start_time descending")
+
+        self._team = team
+        self._keys = list(queries.keys())
+        self._list_queries = [SessionRecordingListFromQuery(team=team, query=query) for query in queries.values()]
+        self._limits = [query.limit or self.SESSION_RECORDINGS_DEFAULT_LIMIT for query in queries.values()]
+
+    @staticmethod
+    def can_share_scan(query: RecordingsQuery) -> bool:
+        return (
+            (query.order or RecordingOrder.START_TIME) == RecordingOrder.START_TIME
+            and (query.order_direction or RecordingOrderDirection.DESC) == RecordingOrderDirection.DESC
+            and query.offset is None
+            and query.after is None
+            and query.session_ids is None
+        )
+
+    def _date_range(self) -> tuple[Optional[datetime], Optional[datetime]]:
+        """The union of the date ranges of all queries"""
+        dates_from = [list_query.query_date_range.date_from() for list_query in self._list_queries]
+        dates_to = [list_query.query_date_range.date_to() for list_query in self._list_queries]
+        date_from = None if any(date is None for date in dates_from) else min(d for d in dates_from if d)
+        date_to = None if any(date is None for date in dates_to) else max(d for d in dates_to if d)
+        return date_from, date_to
+
+    def _shared_where(self) -> ast.Expr:
+        date_from, date_to = self._date_range()
+        exprs: list[ast.Expr] = []
+        if date_from:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.GtEq,
+                    left=ast.Field(chain=["s", "min_first_timestamp"]),
+                    right=ast.Constant(value=date_from),
+                )
+            )
+        if date_to:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.LtEq,
+                    left=ast.Field(chain=["s", "min_first_timestamp"]),
+                    right=ast.Constant(value=date_to),
+                )
+            )
+        return ast.And(exprs=exprs) if exprs else ast.Constant(value=True)
+
+    @tracer.start_as_current_span("SessionRecordingCountsFromQueries.get_query")
+    def get_query(self) -> ast.SelectQuery:
+        sessions_query: Optional[ast.SelectQuery] = None
+        matches: list[ast.Expr] = []
+        for index, list_query in enumerate(self._list_queries):
+            query = list_query.get_query()
+            if sessions_query is None:
+                # All queries group the same table by session, only their predicates differ
+                sessions_query = clone_expr(query)
+                sessions_query.select = [ast.Field(chain=["s", "session_id"])]
+                sessions_query.order_by = None
+
+            assert query.where is not None
+            aggregates = _QueryAggregates(
+                condition=query.where,
+                aliases={expr.alias for expr in query.select if isinstance(expr, ast.Alias)},
+                suffix=f"_{index}",
+            )
+            for expr in query.select:
+                if isinstance(expr, ast.Alias):
+                    sessions_query.select.append(
+                        ast.Alias(alias=f"{expr.alias}_{index}", expr=aggregates.visit(expr.expr))
+                    )
+
+            match_alias = f"matches_{index}"
+            sessions_query.select.append(
+                ast.Alias(
+                    alias=match_alias,
+                    expr=ast.And(
+                        exprs=[
+                            # The aggregates of sessions without any rows of the query are defaults, not a match
+                            ast.CompareOperation(
+                                op=ast.CompareOperationOp.Gt,
+                                left=ast.Call(name="countIf", args=[clone_expr(query.where)]),
+                                right=ast.Constant(value=0),
+                            ),
+                            aggregates.visit(query.having) if query.having else ast.Constant(value=True),
+                        ]
+                    ),
+                )
+            )
+            matches.append(ast.Field(chain=[match_alias]))
+
+        assert sessions_query is not None
+        sessions_query.where = self._shared_where()
+        sessions_query.having = ast.Or(exprs=matches) if len(matches) > 1 else matches[0]
+
+        select: list[ast.Expr] = []
+        for index, (match, limit) in enumerate(zip(matches, self._limits)):
+            select.append(ast.Alias(alias=f"count_{index}", expr=ast.Call(name="countIf", args=[match])))
+            select.append(
+                ast.Alias(
+                    alias=f"session_ids_{index}",
+                    expr=ast.Call(
+                        name="groupArraySortedIf",
+                        # Ascending by the negated start time is the most recent first
+                        params=[ast.Constant(value=limit)],
+                        args=[
+                            ast.Tuple(
+                                exprs=[
+                                    ast.Call(
+                                        name="negate",
+                                        args=[
+                                            ast.Call(
+                                                name="toUnixTimestamp", args=[ast.Field(chain=[f"start_time_{index}"])]
+                                            )
+                                        ],
+                                    ),
+                                    ast.Field(chain=["session_id"]),
+                                ]
+                            ),
+                            match,
+                        ],
+                    ),
+                )
+            )
+
+        return ast.SelectQuery(select=select, select_from=ast.JoinExpr(table=sessions_query))
+
+    @tracer.start_as_current_span("SessionRecordingCountsFromQueries.run")
+    def run(self) -> dict[str, SessionRecordingCountsResult]:
+        response = execute_hogql_query(
+            query=self.get_query(),
+            team=self._team,
+            query_type="SessionRecordingCountsFromQueries",
+            settings=HogQLGlobalSettings(allow_experimental_analyzer=None),  # Using global ClickHouse setting
+        )
+
+        row = response.results[0] if response.results else None
+        results: dict[str, SessionRecordingCountsResult] = {}
+        for index, (key, limit) in enumerate(zip(self._keys, self._limits)):
+            count = row[index * 2] if row else 0
+            sorted_sessions = row[index * 2 + 1] if row else []
+            results[key] = SessionRecordingCountsResult(
+                session_ids=[session_id for _, session_id in sorted_sessions],
+                has_more=count > limit,
+            )
+        return results
@@ -0,0 +1,150 @@
+from freezegun import freeze_time
+from posthog.test.base import APIBaseTest, ClickhouseTestMixin
+
+from django.utils.timezone import now
+
+from dateutil.relativedelta import relativedelta
+
+from posthog.schema import RecordingOrder, RecordingsQuery
+
+from posthog.clickhouse.client import sync_execute
+from posthog.models.utils import uuid7
+from posthog.session_recordings.queries.session_recording_counts_from_queries import SessionRecordingCountsFromQueries
+from posthog.session_recordings.queries.test.listing_recordings.test_utils import create_event, filter_recordings_by
+from posthog.session_recordings.queries.test.session_replay_sql import produce_replay_summary
+from posthog.session_recordings.session_recording_api import query_as_params_to_dict
+from posthog.session_recordings.sql.session_replay_event_sql import TRUNCATE_SESSION_REPLAY_EVENTS_TABLE_SQL
+
+
+@freeze_time("2021-01-01T13:46:23")
+class TestSessionRecordingCountsFromQueries(ClickhouseTestMixin, APIBaseTest):
+    def setUp(self):
+        super().setUp()
+        sync_execute(TRUNCATE_SESSION_REPLAY_EVENTS_TABLE_SQL())
+
+        self.recent_chrome_session = self._a_session(hours_ago=1, active_milliseconds=60_000, browser="Chrome")
+        self.recent_firefox_session = self._a_session(hours_ago=2, active_milliseconds=2_000, browser="Firefox")
+        self.old_chrome_session = self._a_session(hours_ago=24 * 5, active_milliseconds=60_000, browser="Chrome")
+
+        self.queries = {
+            "chrome_last_3_days": {
+                "date_from": "-3d",
+                "events": [
+                    {
+                        "id": "$pageview",
+                        "type": "events",
+                        "properties": [{"key": "$browser", "type": "event", "value": ["Chrome"], "operator": "exact"}],
+                    }
+                ],
+            },
+            "active_last_week": {
+                "date_from": "-7d",
+                "having_predicates": [{"type": "recording", "key": "active_seconds", "value": 5, "operator": "gt"}],
+            },
+            "everything_last_week": {"date_from": "-7d"},
+            "limited_to_one": {"date_from": "-7d", "limit": 1},
+        }
+
+    def _a_session(self, hours_ago: int, active_milliseconds: int, browser: str) -> str:
+        session_id = str(uuid7())
+        distinct_id = str(uuid7())
+        timestamp = (now() - relativedelta(hours=hours_ago)).replace(microsecond=0)
+
+        produce_replay_summary(
+            distinct_id=distinct_id,
+            session_id=session_id,
+            first_timestamp=timestamp,
+            last_timestamp=timestamp + relativedelta(minutes=2),
+            active_milliseconds=active_milliseconds,
+            team_id=self.team.id,
+        )
+        create_event(
+            team=self.team,
+            distinct_id=distinct_id,
+            timestamp=timestamp,
+            properties={"$session_id": session_id, "$window_id": "1", "$browser": browser},
+        )
+        return session_id
+
+    def test_matches_separate_queries(self):
+        results = SessionRecordingCountsFromQueries(
+            team=self.team,
+            queries={
+                key: RecordingsQuery.model_validate(query_as_params_to_dict(query))
+                for key, query in self.queries.items()
+            },
+        ).run()
+
+        for key, query in self.queries.items():
+            separate_results = filter_recordings_by(team=self.team, recordings_filter=query)
+            assert results[key].session_ids == [recording["session_id"] for recording in separate_results.results], key
+            assert results[key].has_more == separate_results.has_more_recording, key
+
+        assert results["chrome_last_3_days"].session_ids == [self.recent_chrome_session]
+        assert results["active_last_week"].session_ids == [self.recent_chrome_session, self.old_chrome_session]
+        assert results["everything_last_week"].session_ids == [
+            self.recent_chrome_session,
+            self.recent_firefox_session,
+            self.old_chrome_session,
+        ]
+        assert results["limited_to_one"].session_ids == [self.recent_chrome_session]
+        assert results["limited_to_one"].has_more
+
+    def test_matches_separate_queries_with_overlapping_date_ranges(self):
+        # A session with rows in both ranges, which only lasts two minutes within the last three days
+        long_session = str(uuid7())
+        distinct_id = str(uuid7())
+        for hours_ago, active_milliseconds in ((24 * 5, 60_000), (24, 2_000)):
+            timestamp = (now() - relativedelta(hours=hours_ago)).replace(microsecond=0)
+            produce_replay_summary(
+                distinct_id=distinct_id,
+                session_id=long_session,
+                first_timestamp=timestamp,
+                last_timestamp=timestamp + relativedelta(minutes=2),
+                active_milliseconds=active_milliseconds,
+                team_id=self.team.id,
+            )
+        queries = {
+            "long_last_3_days": {
+                "date_from": "-3d",
+                "having_predicates": [{"type": "recording", "key": "duration", "value": 3600, "operator": "gt"}],
+            },
+            "active_last_3_days": {
+                "date_from": "-3d",
+                "having_predicates": [{"type": "recording", "key": "active_seconds", "value": 5, "operator": "gt"}],
+            },
+            "long_last_week": {
+                "date_from": "-7d",
+                "having_predicates": [{"type": "recording", "key": "duration", "value": 3600, "operator": "gt"}],
+            },
+            "everything_last_3_days": {"date_from": "-3d"},
+        }
+
+        results = SessionRecordingCountsFromQueries(
+            team=self.team,
+            queries={
+                key: RecordingsQuery.model_validate(query_as_params_to_dict(query)) for key, query in queries.items()
+            },
+        ).run()
+
+        for key, query in queries.items():
+            separate_results = filter_recordings_by(team=self.team, recordings_filter=query)
+            assert results[key].session_ids == [recording["session_id"] for recording in separate_results.results], key
+            assert results[key].has_more == separate_results.has_more_recording, key
+
+        assert results["long_last_3_days"].session_ids == []
+        assert results["active_last_3_days"].session_ids == [self.recent_chrome_session]
+        assert results["long_last_week"].session_ids == [long_session]
+        assert results["everything_last_3_days"].session_ids == [
+            self.recent_chrome_session,
+            self.recent_firefox_session,
+            long_session,
+        ]
+
+    def test_only_start_time_descending_queries_share_a_scan(self):
+        assert SessionRecordingCountsFromQueries.can_share_scan(RecordingsQuery())
+        assert not SessionRecordingCountsFromQueries.can_share_scan(RecordingsQuery(order=RecordingOrder.DURATION))
+        assert not SessionRecordingCountsFromQueries.can_share_scan(RecordingsQuery(order_direction="ASC"))
+
+        with self.assertRaises(ValueError):
+            SessionRecordingCountsFromQueries(team=self.team, queries={"a": RecordingsQuery(offset=10)})
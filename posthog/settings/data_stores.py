@@ -375,6 +375,10 @@ if not REDIS_URL:
 # The ZstdCompressor uses zstd compression and can cope with compressed and uncompressed reading at the same time
 USE_REDIS_COMPRESSION = get_from_env("USE_REDIS_COMPRESSION", True, type_cast=str_to_bool)
 
+# Controls whether query results are written to the cache in the columnar format (see query_cache_columnar.py).
+# Both the columnar and the JSON format can be read at the same time, regardless of this setting
+QUERY_CACHE_COLUMNAR_FORMAT = get_from_env("QUERY_CACHE_COLUMNAR_FORMAT", False, type_cast=str_to_bool)
+
 # AWS ElastiCache supports "reader" endpoints.
 # See "Finding a Redis (Cluster Mode Disabled) Cluster's Endpoints (Console)"
 # on https://docs.aws.amazon.com/AmazonElastiCache/latest/red-ug/Endpoints.html#Endpoints.Find.Redis
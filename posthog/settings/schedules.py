@@ -16,6 +16,12 @@ CALCULATE_COHORTS_NIGHT_SCHEDULE = get_from_env(
 )
 CALCULATE_X_PARALLEL_COHORTS_DURING_NIGHT = get_from_env("CALCULATE_X_PARALLEL_COHORTS_DURING_NIGHT", 5, type_cast=int)
 
+# Max environments of a project whose cohort people are recalculated at the same time. Tests default to one after the
+# other, as they run inside a transaction that other threads' connections can't see
+COHORT_CALCULATION_MAX_PARALLEL_TEAMS = get_from_env(
+    "COHORT_CALCULATION_MAX_PARALLEL_TEAMS", 1 if TEST else 4, type_cast=int
+)
+
 ACTION_EVENT_MAPPING_INTERVAL_SECONDS = get_from_env("ACTION_EVENT_MAPPING_INTERVAL_SECONDS", 300, type_cast=int)
 
 # Schedule to syncronize insight cache states on. Follows crontab syntax.
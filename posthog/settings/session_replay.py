@@ -52,4 +52,13 @@ PLAYLIST_COUNTER_PROCESSING_PLAYLISTS_LIMIT = get_from_env(
     "PLAYLIST_COUNTER_PROCESSING_PLAYLISTS_LIMIT", 2500, type_cast=int
 )
 
+# count the playlists of a team together, with one query for playlists that read the same time window
+PLAYLIST_COUNTER_SHARED_SCAN_ENABLED = get_from_env(
+    "PLAYLIST_COUNTER_SHARED_SCAN_ENABLED", False, type_cast=str_to_bool
+)
+
+PLAYLIST_COUNTER_SHARED_SCAN_MAX_PLAYLISTS = get_from_env(
+    "PLAYLIST_COUNTER_SHARED_SCAN_MAX_PLAYLISTS", 25, type_cast=int
+)
+
 APP_STATE_LOGGING_SAMPLE_RATE = get_from_env("APP_STATE_LOGGING_SAMPLE_RATE", "0.1")
@@ -1,7 +1,7 @@
 import os
 
 from posthog.settings.base_variables import DEBUG
-from posthog.settings.utils import get_from_env
+from posthog.settings.utils import get_from_env, str_to_bool
 
 TEMPORAL_NAMESPACE: str = os.getenv("TEMPORAL_NAMESPACE", "default")
 TEMPORAL_HOST: str = os.getenv("TEMPORAL_HOST", "127.0.0.1")
@@ -34,6 +34,17 @@ CLICKHOUSE_MAX_MEMORY_USAGE: int = get_from_env(
     "CLICKHOUSE_MAX_MEMORY_USAGE", 150 * 1000 * 1000 * 1000, type_cast=int
 )  # 150GB
 CLICKHOUSE_MAX_BLOCK_SIZE_DEFAULT: int = get_from_env("CLICKHOUSE_MAX_BLOCK_SIZE_DEFAULT", 10000, type_cast=int)
+# Connections to ClickHouse shared by all activities of a worker, see `ClickHouseConnectionPool`
+CLICKHOUSE_CONNECTION_POOL_ENABLED: bool = get_from_env(
+    "CLICKHOUSE_CONNECTION_POOL_ENABLED", True, type_cast=str_to_bool
+)
+CLICKHOUSE_CONNECTION_POOL_MAX_SIZE: int = get_from_env("CLICKHOUSE_CONNECTION_POOL_MAX_SIZE", 100, type_cast=int)
+CLICKHOUSE_CONNECTION_POOL_KEEPALIVE_SECONDS: float = get_from_env(
+    "CLICKHOUSE_CONNECTION_POOL_KEEPALIVE_SECONDS", 60.0, type_cast=float
+)
+CLICKHOUSE_CONNECTION_POOL_HEALTH_CHECK_SECONDS: float = get_from_env(
+    "CLICKHOUSE_CONNECTION_POOL_HEALTH_CHECK_SECONDS", 30.0, type_cast=float
+)
 # Comma separated list of overrides in the format "team_id:block_size"
 CLICKHOUSE_MAX_BLOCK_SIZE_OVERRIDES: dict[int, int] = dict(
     [map(int, o.split(":")) for o in os.getenv("CLICKHOUSE_MAX_BLOCK_SIZE_OVERRIDES", "").split(",") if o]  # type: ignore
@@ -415,6 +415,12 @@ PROXY_BASE_CNAME = get_from_env("PROXY_BASE_CNAME", "")
 
 LOGO_DEV_TOKEN = get_from_env("LOGO_DEV_TOKEN", "")
 
+####
+# Search
+
+# Search the app's entities from the `SearchDocument` index, enable once `manage.py backfill_search_documents` has run
+SEARCH_INDEX_ENABLED = get_from_env("SEARCH_INDEX_ENABLED", False, type_cast=str_to_bool)
+
 ####
 # /decide
 
@@ -475,6 +481,23 @@ KAFKA_PRODUCE_ACK_TIMEOUT_SECONDS = int(os.getenv("KAFKA_PRODUCE_ACK_TIMEOUT_SEC
 # if `true` we highly increase the rate limit on /query endpoint and limit the number of concurrent queries
 API_QUERIES_ENABLED = get_from_env("API_QUERIES_ENABLED", False, type_cast=str_to_bool)
 
+# Concurrent blocking calculations of the same query wait for the first one to fill the cache instead of all
+# running it, falling back to running it themselves after the wait time
+QUERY_SINGLE_FLIGHT_ENABLED = get_from_env("QUERY_SINGLE_FLIGHT_ENABLED", True, type_cast=str_to_bool)
+QUERY_SINGLE_FLIGHT_WAIT_SECONDS = get_from_env("QUERY_SINGLE_FLIGHT_WAIT_SECONDS", 30, type_cast=int)
+
+# LLM analytics traces are listed from the llm_trace_summaries table instead of aggregating their events,
+# only to be enabled once the table is backfilled for the listed date ranges
+LLM_TRACE_SUMMARIES_ENABLED = get_from_env("LLM_TRACE_SUMMARIES_ENABLED", False, type_cast=str_to_bool)
+
+# Tiles of a dashboard calculated at the same time, matching the per-organization dashboard query limit. With 1, the
+# tiles are calculated one after the other on the request's thread, which tests need for their transaction
+DASHBOARD_TILE_CONCURRENCY = get_from_env("DASHBOARD_TILE_CONCURRENCY", 1 if TEST else 6, type_cast=int)
+
+# Heatmaps merge the daily buckets of the heatmaps_daily table for the whole days of their date range,
+# only to be enabled once the table is backfilled for the retention period of the heatmaps
+HEATMAPS_DAILY_ENABLED = get_from_env("HEATMAPS_DAILY_ENABLED", False, type_cast=str_to_bool)
+
 
 ####
 # Livestream
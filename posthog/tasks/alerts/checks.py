@@ -1,3 +1,4 @@
+import time
 import traceback
 from collections import defaultdict
 from collections.abc import Callable
@@ -9,8 +10,9 @@ from django.db.models import F, Q
 
 import structlog
 from celery import shared_task
-from celery.canvas import chain
+from celery.canvas import Signature, chain
 from dateutil.relativedelta import relativedelta
+from prometheus_client import Histogram
 
 from posthog.schema import AlertCalculationInterval, AlertState, TrendsQuery
 
@@ -21,7 +23,7 @@ from posthog.models import AlertConfiguration, User
 from posthog.models.alert import AlertCheck
 from posthog.ph_client import ph_scoped_capture
 from posthog.schema_migrations.upgrade_manager import upgrade_query
-from posthog.tasks.alerts.trends import check_trends_alert
+from posthog.tasks.alerts.trends import InsightResultsForAlerts, check_trends_alert
 from posthog.tasks.alerts.utils import (
     WRAPPER_NODE_KINDS,
     AlertEvaluationResult,
@@ -36,6 +38,17 @@ from posthog.utils import get_from_dict_or_attr
 
 logger = structlog.get_logger(__name__)
 
+INSIGHT_ALERTS_CHECK_TIMER = Histogram(
+    "posthog_alerts_insight_group_check_seconds",
+    "Time to check all the due alerts of an insight, sharing the insight results between them",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, float("inf")),
+)
+INSIGHT_ALERTS_GROUP_SIZE = Histogram(
+    "posthog_alerts_insight_group_size",
+    "Number of due alerts of an insight checked together",
+    buckets=(2, 3, 5, 10, 20, 50, float("inf")),
+)
+
 
 class AlertCheckException(Exception):
     """
@@ -154,7 +167,7 @@ def check_alerts_task() -> None:
         )
         .filter(Q(snoozed_until__isnull=True) | Q(snoozed_until__lt=now))
         .order_by(F("next_check_at").asc(nulls_first=True))
-        .only("id", "team", "calculation_interval")
+        .only("id", "team", "insight", "calculation_interval")
     )
 
     sorted_alerts = sorted(
@@ -164,13 +177,21 @@ def check_alerts_task() -> None:
         ),
     )
 
-    grouped_by_team = defaultdict(list)
+    # Alerts of the same insight are checked together, so the insight is calculated once for all of them
+    grouped_by_team: dict[int, dict[int, list[str]]] = defaultdict(lambda: defaultdict(list))
     for alert in sorted_alerts:
-        grouped_by_team[alert.team].append(alert.id)
+        grouped_by_team[alert.team_id][alert.insight_id].append(str(alert.id))
+
+    for grouped_by_insight in grouped_by_team.values():
+        tasks: list[Signature] = []
+        for alert_ids in grouped_by_insight.values():
+            if len(alert_ids) == 1:
+                tasks.append(check_alert_task.si(alert_ids[0]).set(expires=expire_after))
+            else:
+                tasks.append(check_alerts_for_insight_task.si(alert_ids).set(expires=expire_after))
 
-    for alert_ids in grouped_by_team.values():
         # We chain the task execution to prevent queries *for a single team* running at the same time
-        chain(*(check_alert_task.si(str(alert_id)).set(expires=expire_after) for alert_id in alert_ids))()
+        chain(*tasks)()
 
 
 @shared_task(
@@ -188,7 +209,51 @@ def check_alert_task(alert_id: str) -> None:
         check_alert(alert_id, capture_ph_event)
 
 
-def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwargs: None) -> None:
+@shared_task(
+    ignore_result=True,
+    queue=CeleryQueue.ALERTS.value,
+    autoretry_for=(CHQueryErrorTooManySimultaneousQueries,),
+    retry_backoff=1,
+    retry_backoff_max=10,
+    max_retries=3,
+    expires=60 * 60,
+)
+def check_alerts_for_insight_task(alert_ids: list[str]) -> None:
+    with ph_scoped_capture() as capture_ph_event:
+        check_alerts_for_insight(alert_ids, capture_ph_event)
+
+
+def check_alerts_for_insight(alert_ids: list[str], capture_ph_event: Callable = lambda *args, **kwargs: None) -> None:
+    """
+    Checks alerts of the same insight, calculating the insight once per effective query (date range and execution
+    mode) and evaluating every alert's threshold against that result.
+    Each alert is still checked in its own transaction, so one alert failing doesn't affect the others.
+    """
+    insight_results = InsightResultsForAlerts()
+    retryable_error: CHQueryErrorTooManySimultaneousQueries | None = None
+
+    INSIGHT_ALERTS_GROUP_SIZE.observe(len(alert_ids))
+    start_time = time.monotonic()
+    for alert_id in alert_ids:
+        try:
+            check_alert(alert_id, capture_ph_event, insight_results)
+        except CHQueryErrorTooManySimultaneousQueries as err:
+            retryable_error = err
+        except Exception:
+            # Already reported by check_alert, the other alerts still need checking
+            pass
+    INSIGHT_ALERTS_CHECK_TIMER.observe(time.monotonic() - start_time)
+
+    if retryable_error is not None:
+        # Retrying skips the alerts that were checked, as they aren't due anymore
+        raise retryable_error
+
+
+def check_alert(
+    alert_id: str,
+    capture_ph_event: Callable = lambda *args, **kwargs: None,
+    insight_results: InsightResultsForAlerts | None = None,
+) -> None:
     try:
         alert = AlertConfiguration.objects.get(id=alert_id, enabled=True)
     except AlertConfiguration.DoesNotExist:
@@ -242,7 +307,7 @@ def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwar
     alert.save()
 
     try:
-        check_alert_and_notify_atomically(alert, capture_ph_event)
+        check_alert_and_notify_atomically(alert, capture_ph_event, insight_results)
     except Exception as err:
         user = cast(User, alert.created_by)
 
@@ -278,7 +343,9 @@ def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwar
 
 
 @transaction.atomic
-def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_event: Callable) -> None:
+def check_alert_and_notify_atomically(
+    alert: AlertConfiguration, capture_ph_event: Callable, insight_results: InsightResultsForAlerts | None = None
+) -> None:
     """
     Computes insight results, checks alert for breaches and notifies user.
     Only commits updates to alert state if all of the above complete successfully.
@@ -302,7 +369,7 @@ def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_even
 
     # 1. Evaluate insight and get alert value
     try:
-        alert_evaluation_result = check_alert_for_insight(alert)
+        alert_evaluation_result = check_alert_for_insight(alert, insight_results)
         value = alert_evaluation_result.value
         breaches = alert_evaluation_result.breaches
     except CHQueryErrorTooManySimultaneousQueries:
@@ -357,7 +424,9 @@ def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_even
         raise
 
 
-def check_alert_for_insight(alert: AlertConfiguration) -> AlertEvaluationResult:
+def check_alert_for_insight(
+    alert: AlertConfiguration, insight_results: InsightResultsForAlerts | None = None
+) -> AlertEvaluationResult:
     """
     Matches insight type with alert checking logic
     """
@@ -374,7 +443,7 @@ def check_alert_for_insight(alert: AlertConfiguration) -> AlertEvaluationResult:
         match kind:
             case "TrendsQuery":
                 query = TrendsQuery.model_validate(query)
-                return check_trends_alert(alert, insight, query)
+                return check_trends_alert(alert, insight, query, insight_results)
             case _:
                 raise NotImplementedError(f"AlertCheckError: Alerts for {query.kind} are not supported yet")
 
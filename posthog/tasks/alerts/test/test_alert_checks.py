@@ -7,10 +7,11 @@ from unittest.mock import MagicMock, patch
 from posthog.schema import AlertState, ChartDisplayType, EventsNode, TrendsFilter, TrendsFormulaNode, TrendsQuery
 
 from posthog.api.test.dashboards import DashboardAPI
+from posthog.caching.calculate_results import calculate_for_query_based_insight
 from posthog.models import AlertConfiguration
 from posthog.models.alert import AlertCheck
 from posthog.models.instance_setting import set_instance_setting
-from posthog.tasks.alerts.checks import check_alert
+from posthog.tasks.alerts.checks import check_alert, check_alerts_for_insight
 from posthog.tasks.alerts.utils import send_notifications_for_breaches
 from posthog.tasks.test.utils_email_tests import mock_email_messages
 
@@ -342,6 +343,63 @@ class TestAlertChecks(APIBaseTest, ClickhouseDestroyTablesMixin):
         assert "first anomaly description" in email.html_body
         assert "second anomaly description" in email.html_body
 
+    def test_alerts_of_the_same_insight_share_the_insight_calculation(
+        self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        self.set_thresholds(lower=1)
+        other_alert = self.client.post(
+            f"/api/projects/{self.team.id}/alerts",
+            data={
+                "name": "other alert name",
+                "insight": self.insight["id"],
+                "subscribed_users": [self.user.id],
+                "calculation_interval": "daily",
+                "config": {"type": "TrendsAlertConfig", "series_index": 0},
+                "condition": {"type": "absolute_value"},
+                "threshold": {"configuration": {"type": "absolute", "bounds": {"upper": 5}}},
+            },
+        ).json()
+
+        with patch(
+            "posthog.tasks.alerts.trends.calculate_for_query_based_insight", wraps=calculate_for_query_based_insight
+        ) as mock_calculate:
+            check_alerts_for_insight([self.alert["id"], other_alert["id"]])
+
+        assert mock_calculate.call_count == 1
+        assert (
+            AlertCheck.objects.filter(alert_configuration=self.alert["id"]).latest("created_at").state
+            == AlertState.FIRING
+        )
+        assert (
+            AlertCheck.objects.filter(alert_configuration=other_alert["id"]).latest("created_at").state
+            == AlertState.NOT_FIRING
+        )
+        assert mock_send_notifications_for_breaches.call_count == 1
+
+    def test_alerts_of_the_same_insight_are_checked_when_one_fails(
+        self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        self.set_thresholds(lower=1)
+        other_alert_id = self.client.post(
+            f"/api/projects/{self.team.id}/alerts",
+            data={
+                "name": "other alert name",
+                "insight": self.insight["id"],
+                "subscribed_users": [self.user.id],
+                "calculation_interval": "daily",
+                "config": {"type": "TrendsAlertConfig", "series_index": 0},
+                "condition": {"type": "absolute_value"},
+                "threshold": {"configuration": {"type": "absolute", "bounds": {"lower": 1}}},
+            },
+        ).json()["id"]
+
+        with patch("posthog.tasks.alerts.checks.add_alert_check", side_effect=[Exception("Some error"), MagicMock()]):
+            check_alerts_for_insight([self.alert["id"], other_alert_id])
+
+        # The first alert failed, but the second was still checked
+        assert AlertConfiguration.objects.get(pk=self.alert["id"]).is_calculating is False
+        assert AlertConfiguration.objects.get(pk=other_alert_id).last_checked_at is not None
+
     def test_alert_not_recalculated_when_not_due(
         self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
     ) -> None:
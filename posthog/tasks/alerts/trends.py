@@ -1,5 +1,8 @@
+import json
 from typing import NotRequired, Optional, TypedDict, cast
 
+from prometheus_client import Counter
+
 from posthog.schema import (
     AlertCondition,
     AlertConditionType,
@@ -17,6 +20,12 @@ from posthog.caching.fetch_from_cache import InsightResult
 from posthog.models import AlertConfiguration, Insight
 from posthog.tasks.alerts.utils import NON_TIME_SERIES_DISPLAY_TYPES, AlertEvaluationResult
 
+ALERT_INSIGHT_RESULTS_COUNTER = Counter(
+    "posthog_alerts_insight_results_total",
+    "Insight results alerts were evaluated against, computed or reused from another alert of the same insight",
+    labelnames=["result"],
+)
+
 
 # TODO: move the TrendResult UI type to schema.ts and use that instead
 class TrendResult(TypedDict):
@@ -38,7 +47,57 @@ class TrendResult(TypedDict):
     filter: dict
 
 
-def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: TrendsQuery) -> AlertEvaluationResult:
+class InsightResultsForAlerts:
+    """
+    Computes the insight results alerts are evaluated against once per insight and effective query (i.e. date range
+    override and execution mode), so that alerts watching the same insight share one calculation.
+    Failed calculations are shared too, so an insight that can't be calculated isn't recalculated for every alert.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[tuple, InsightResult | Exception] = {}
+
+    def calculate(
+        self,
+        insight: Insight,
+        alert: AlertConfiguration,
+        execution_mode: ExecutionMode,
+        filters_override: Optional[dict],
+    ) -> InsightResult:
+        key = (insight.id, execution_mode, json.dumps(filters_override, sort_keys=True))
+        if key in self._results:
+            ALERT_INSIGHT_RESULTS_COUNTER.labels(result="reused").inc()
+        else:
+            ALERT_INSIGHT_RESULTS_COUNTER.labels(result="computed").inc()
+            try:
+                self._results[key] = _calculate_insight(insight, alert, execution_mode, filters_override)
+            except Exception as err:
+                self._results[key] = err
+
+        result = self._results[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _calculate_insight(
+    insight: Insight, alert: AlertConfiguration, execution_mode: ExecutionMode, filters_override: Optional[dict]
+) -> InsightResult:
+    return calculate_for_query_based_insight(
+        insight,
+        team=alert.team,
+        execution_mode=execution_mode,
+        user=None,
+        filters_override=filters_override,
+    )
+
+
+def check_trends_alert(
+    alert: AlertConfiguration,
+    insight: Insight,
+    query: TrendsQuery,
+    insight_results: Optional[InsightResultsForAlerts] = None,
+) -> AlertEvaluationResult:
     """
     Calculates insight value for the needed time periods and compares it with the threshold.
 
@@ -48,6 +107,8 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
 
     But in some cases (when check_current_interval = True) like value > X or value inc > X, we can check the value for the current interval and alert right away if threshold is breached.
     So then we check current interval value first and alert if threshold breached, otherwise fallback and process previous interval.
+
+    When `insight_results` is passed, the insight results are shared with the other alerts checked with it.
     """
 
     if "type" in alert.config and alert.config["type"] == "TrendsAlertConfig":
@@ -74,6 +135,11 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
     if query.interval == IntervalType.HOUR:
         execution_mode = ExecutionMode.CALCULATE_BLOCKING_ALWAYS
 
+    def calculate(filters_override: Optional[dict]) -> InsightResult:
+        if insight_results is not None:
+            return insight_results.calculate(insight, alert, execution_mode, filters_override)
+        return _calculate_insight(insight, alert, execution_mode, filters_override)
+
     match condition.type:
         case AlertConditionType.ABSOLUTE_VALUE:
             if threshold.type != InsightThresholdType.ABSOLUTE:
@@ -88,13 +154,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
                 # depending on the alert calculation interval
                 filters_override = _date_range_override_for_intervals(query, last_x_intervals=2)
 
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=execution_mode,
-                user=None,
-                filters_override=filters_override,
-            )
+            calculation_result = calculate(filters_override)
 
             if not calculation_result.result:
                 raise RuntimeError(f"No results found for insight with alert id = {alert.id}")
@@ -179,13 +239,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
             # so we need to compute the trend values for last 3 intervals
             # and then compare the previous interval with value for the interval before previous
             filters_overrides = _date_range_override_for_intervals(query, last_x_intervals=3)
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=execution_mode,
-                user=None,
-                filters_override=filters_overrides,
-            )
+            calculation_result = calculate(filters_overrides)
 
             results_to_evaluate: list[TrendResult] = []
 
@@ -286,13 +340,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
             # so we need to compute the trend values for last 3 intervals
             # and then compare the previous interval with value for the interval before previous
             filters_overrides = _date_range_override_for_intervals(query, last_x_intervals=3)
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=execution_mode,
-                user=None,
-                filters_override=filters_overrides,
-            )
+            calculation_result = calculate(filters_overrides)
 
             results_to_evaluate = []
 
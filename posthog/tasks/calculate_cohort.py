@@ -19,6 +19,7 @@ from posthog.exceptions_capture import capture_exception
 from posthog.models import Cohort
 from posthog.models.cohort import CohortOrEmpty
 from posthog.models.cohort.calculation_history import CohortCalculationHistory
+from posthog.models.cohort.dependencies import get_cohort_dependencies
 from posthog.models.cohort.util import (
     get_all_cohort_dependencies,
     get_all_cohort_dependents,
@@ -76,6 +77,11 @@ COHORT_CALCULATION_FAILURES_COUNTER = Counter(
     ["failure_type"],  # labels: "exception", "clickhouse_error", etc.
 )
 
+COHORT_CALCULATION_SKIPPED_COUNTER = Counter(
+    "cohort_calculation_skipped_total",
+    "Dependent cohort calculations skipped because none of their dependencies changed",
+)
+
 COHORT_CALCULATION_DURATION_SECONDS = Histogram(
     "cohort_calculation_duration_seconds",
     "Duration of cohort calculations in seconds",
@@ -241,6 +247,7 @@ def increment_version_and_enqueue_calculate_cohort(cohort: Cohort, *, initiating
             return
 
         # Create a chain of tasks to ensure sequential execution
+        dependent_cohort_ids = {dep.id for dep in dependent_cohorts}
         task_chain = []
         for cohort_id in sorted_cohort_ids:
             current_cohort = seen_cohorts_cache.get(cohort_id)
@@ -251,6 +258,8 @@ def increment_version_and_enqueue_calculate_cohort(cohort: Cohort, *, initiating
                         current_cohort.id,
                         current_cohort.pending_version,
                         initiating_user.id if initiating_user else None,
+                        # Dependents only need recalculating if what they depend on actually changed
+                        skip_if_dependencies_unchanged=cohort_id in dependent_cohort_ids,
                     )
                 )
 
@@ -281,14 +290,48 @@ def _enqueue_single_cohort_calculation(cohort: Cohort, initiating_user: Optional
     calculate_cohort_ch.delay(cohort.id, cohort.pending_version, initiating_user.id if initiating_user else None)
 
 
+def _dependencies_unchanged_since_last_calculation(cohort: Cohort) -> bool:
+    """
+    Whether none of the cohorts this cohort depends on changed membership since this cohort was last calculated.
+    A dependency recalculation that failed or didn't record a diff counts as a change.
+    """
+    if cohort.last_calculation is None:
+        return False
+
+    dependency_ids = get_cohort_dependencies(cohort)
+    if not dependency_ids:
+        return False
+
+    calculations = CohortCalculationHistory.objects.filter(
+        cohort_id__in=dependency_ids, started_at__gte=cohort.last_calculation
+    ).values_list("finished_at", "error", "added_count", "removed_count")
+    return all(
+        finished_at is not None and error is None and added_count == 0 and removed_count == 0
+        for finished_at, error, added_count, removed_count in calculations
+    )
+
+
 @shared_task(ignore_result=True, max_retries=2, queue=CeleryQueue.LONG_RUNNING.value)
-def calculate_cohort_ch(cohort_id: int, pending_version: int, initiating_user_id: Optional[int] = None) -> None:
+def calculate_cohort_ch(
+    cohort_id: int,
+    pending_version: int,
+    initiating_user_id: Optional[int] = None,
+    skip_if_dependencies_unchanged: bool = False,
+) -> None:
     with posthoganalytics.new_context():
         posthoganalytics.tag("feature", Feature.COHORT.value)
         posthoganalytics.tag("cohort_id", cohort_id)
 
         cohort: Cohort = Cohort.objects.get(pk=cohort_id)
 
+        if skip_if_dependencies_unchanged and _dependencies_unchanged_since_last_calculation(cohort):
+            # Its own schedule still recalculates it once it's due, `last_calculation` is left untouched for that
+            COHORT_CALCULATION_SKIPPED_COUNTER.inc()
+            logger.info("cohort_calculation_skipped_dependencies_unchanged", cohort_id=cohort_id)
+            cohort.is_calculating = False
+            cohort.save(update_fields=["is_calculating"])
+            return
+
         posthoganalytics.tag("team_id", cohort.team.id)
 
         staleness_hours = 0.0
@@ -17,7 +17,7 @@ from posthog.tasks.alerts.checks import (
 from posthog.tasks.email import send_hog_functions_daily_digest
 from posthog.tasks.integrations import refresh_integrations
 from posthog.tasks.remote_config import sync_all_remote_configs
-from posthog.tasks.surveys import sync_all_surveys_cache
+from posthog.tasks.surveys import rollup_survey_events_daily, sync_all_surveys_cache
 from posthog.tasks.tasks import (
     calculate_cohort,
     calculate_decide_usage,
@@ -44,6 +44,8 @@ from posthog.tasks.tasks import (
     redis_celery_queue_depth,
     redis_heartbeat,
     refresh_activity_log_fields_cache,
+    refresh_error_tracking_similarity_indexes,
+    refresh_property_value_sketches,
     replay_count_metrics,
     schedule_all_subscriptions,
     send_org_usage_reports,
@@ -393,3 +395,22 @@ def setup_periodic_tasks(sender: Celery, **kwargs: Any) -> None:
         sync_all_surveys_cache.s(),
         name="sync all surveys cache",
     )
+
+    # Late enough for the events of the previous day to be ingested
+    sender.add_periodic_task(
+        crontab(hour="1", minute=str(randrange(0, 40))),
+        rollup_survey_events_daily.s(),
+        name="rollup survey events daily",
+    )
+
+    sender.add_periodic_task(
+        crontab(minute=str(randrange(0, 60))),
+        refresh_property_value_sketches.s(),
+        name="refresh property value sketches",
+    )
+
+    sender.add_periodic_task(
+        crontab(minute="*/15"),
+        refresh_error_tracking_similarity_indexes.s(),
+        name="refresh error tracking similarity indexes",
+    )
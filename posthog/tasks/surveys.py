@@ -1,6 +1,7 @@
 import structlog
 from celery import shared_task
 
+from posthog.models.surveys.rollups import rollup_recent_survey_events
 from posthog.models.surveys.survey import surveys_hypercache
 from posthog.models.team import Team
 from posthog.tasks.utils import CeleryQueue
@@ -26,3 +27,14 @@ def sync_all_surveys_cache() -> None:
     # Only select the id from the team queryset
     for team_id in Team.objects.values_list("id", flat=True):
         update_team_surveys_cache.delay(team_id)
+
+
+@shared_task(ignore_result=True, queue=CeleryQueue.LONG_RUNNING.value)
+def rollup_survey_events_daily() -> None:
+    # Rolls up the survey events of the closed days, which the survey stats read instead of the events
+    rolled_up = rollup_recent_survey_events()
+    logger.info(
+        "Rolled up survey events",
+        first_day=rolled_up.first_day.isoformat(),
+        end_day=rolled_up.end_day.isoformat(),
+    )
@@ -746,6 +746,22 @@ def update_survey_adaptive_sampling() -> None:
     update_survey_adaptive_sampling()
 
 
+@shared_task(ignore_result=True, expires=60 * 30)
+def refresh_property_value_sketches() -> None:
+    from posthog.queries.property_value_sketches import get_picked_property_value_sketches
+
+    for team_id, names in get_picked_property_value_sketches().items():
+        refresh_team_property_value_sketches.delay(team_id, names)
+
+
+@shared_task(ignore_result=True, expires=60 * 30)
+def refresh_team_property_value_sketches(team_id: int, names: list[str]) -> None:
+    from posthog.queries.property_value_sketches import refresh_team_property_value_sketches
+
+    refreshed = refresh_team_property_value_sketches(team_id, names)
+    logger.info("Refreshed property value sketches", team_id=team_id, refreshed=refreshed)
+
+
 def recompute_materialized_columns_enabled() -> bool:
     from posthog.models.instance_setting import get_instance_setting
 
@@ -1208,6 +1224,7 @@ def refresh_activity_log_fields_cache(flush: bool = False, hours_back: int = 14)
     from django.db.models import Count
 
     from posthog.api.advanced_activity_logs.constants import BATCH_SIZE, SAMPLING_PERCENTAGE, SMALL_ORG_THRESHOLD
+    from posthog.api.advanced_activity_logs.field_catalog import delete_field_catalog, mark_field_catalog_complete
     from posthog.api.advanced_activity_logs.field_discovery import AdvancedActivityLogFieldDiscovery
     from posthog.api.advanced_activity_logs.fields_cache import delete_cached_fields
     from posthog.exceptions_capture import capture_exception
@@ -1215,9 +1232,12 @@ def refresh_activity_log_fields_cache(flush: bool = False, hours_back: int = 14)
     from posthog.models.activity_logging.activity_log import ActivityLog
 
     def _process_org_with_flush(discovery: AdvancedActivityLogFieldDiscovery, org_id: UUID) -> None:
-        """Rebuild cache from scratch with sampling."""
+        """Rebuild cache and field catalog from scratch with sampling."""
         deleted = delete_cached_fields(str(org_id))
         logger.info(f"Flushed cache for org {org_id}: {deleted}")
+        # The fields of the activity logs written from now on are recorded as they are written
+        deleted = delete_field_catalog(str(org_id))
+        logger.info(f"Flushed field catalog for org {org_id}: {deleted}")
 
         record_count = discovery._get_org_record_count()
         estimated_sampled_records = int(record_count * (SAMPLING_PERCENTAGE / 100))
@@ -1233,6 +1253,8 @@ def refresh_activity_log_fields_cache(flush: bool = False, hours_back: int = 14)
             records = discovery.get_sampled_records(limit=BATCH_SIZE, offset=offset)
             discovery.process_batch_for_large_org(records)
 
+        mark_field_catalog_complete(str(org_id))
+
     def _process_org_incremental(discovery: AdvancedActivityLogFieldDiscovery, org_id: UUID, hours_back: int) -> int:
         """Process recent records with 100% coverage."""
         recent_queryset = discovery.get_activity_logs_queryset(hours_back=hours_back)
@@ -1300,3 +1322,29 @@ def refresh_activity_log_fields_cache(flush: bool = False, hours_back: int = 14)
             f"[refresh_activity_log_fields_cache] completed flush and rebuild for "
             f"{processed_orgs}/{org_count} organizations"
         )
+
+
+@shared_task(ignore_result=True, max_retries=1, queue=CeleryQueue.LONG_RUNNING.value)
+def build_error_tracking_similarity_index(team_id: int, model_name: str, rendering: str) -> None:
+    """
+    Builds the ANN index used by the similar issues query if the team has none yet, or adds the embeddings inserted
+    since its last refresh to it.
+    """
+    from products.error_tracking.backend.similarity_index import refresh_team_similarity_index
+
+    indexed = refresh_team_similarity_index(team_id, model_name, rendering)
+    logger.info(
+        "build_error_tracking_similarity_index",
+        team_id=team_id,
+        model_name=model_name,
+        rendering=rendering,
+        indexed=indexed,
+    )
+
+
+@shared_task(ignore_result=True, expires=60 * 15)
+def refresh_error_tracking_similarity_indexes() -> None:
+    from products.error_tracking.backend.similarity_index import get_indexable_teams
+
+    for team_id, model_name, rendering in get_indexable_teams():
+        build_error_tracking_similarity_index.delay(team_id, model_name, rendering)
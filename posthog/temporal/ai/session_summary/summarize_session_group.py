@@ -79,10 +79,10 @@ from ee.models.session_summaries import SingleSessionSummary
 logger = structlog.get_logger(__name__)
 
 
-def _get_db_events_per_page(
+async def _get_db_events_per_page(
     session_ids: list[str], team: Team, min_timestamp_str: str, max_timestamp_str: str, page_size: int, offset: int
 ) -> CachedSessionBatchEventsQueryResponse:
-    """Fetch events for multiple sessions in a single query and return the response. Separate function to run in a single db_sync_to_async call."""
+    """Fetch events for multiple sessions in a single query and return the response, waiting for ClickHouse without holding a thread."""
     query = create_session_batch_events_query(
         session_ids=session_ids,
         after=min_timestamp_str,
@@ -90,8 +90,8 @@ def _get_db_events_per_page(
         max_total_events=page_size,
         offset=offset,
     )
-    runner = SessionBatchEventsQueryRunner(query=query, team=team)
-    response = runner.run()
+    runner = await database_sync_to_async(SessionBatchEventsQueryRunner)(query=query, team=team)
+    response = await runner.arun()
     if not isinstance(response, CachedSessionBatchEventsQueryResponse):
         raise ValueError(
             f"Failed to fetch events for sessions {logging_session_ids(session_ids)} in team {team.id} "
@@ -145,7 +145,7 @@ async def fetch_session_batch_events_activity(
     columns, offset, page_size = None, 0, DEFAULT_TOTAL_EVENTS_PER_QUERY
     # Paginate
     while True:
-        response = await database_sync_to_async(_get_db_events_per_page)(
+        response = await _get_db_events_per_page(
             session_ids=session_ids_to_fetch,
             team=team,
             min_timestamp_str=inputs.min_timestamp_str,
@@ -2,9 +2,11 @@ import re
 import ssl
 import enum
 import json
+import time
 import uuid
 import typing
 import asyncio
+import weakref
 import datetime as dt
 import contextlib
 import collections.abc
@@ -213,6 +215,175 @@ def add_log_comment_param(params: dict[str, typing.Any], query_tags: typing.Opti
     params[param_name] = query_tags.to_json()
 
 
+def _record_pool_metric(name: str, description: str, pool: "ClickHouseConnectionPool", value: int = 1) -> None:
+    """Count a connection pool event, if running in an activity where a metric meter is available."""
+    if not activity.in_activity():
+        return
+    activity.metric_meter().with_additional_attributes({"clickhouse_url": pool.url}).create_counter(
+        name, description
+    ).add(value)
+
+
+class ClickHouseConnectionPool:
+    """A pool of keep-alive HTTP connections to a ClickHouse cluster, shared by all clients in an event loop.
+
+    Clients borrow the pool's session instead of opening their own, so connections (and their TCP/TLS setup) are
+    reused across activities. At most `max_size` connections are open at once, requests beyond that wait for a
+    connection to be released. The pool pings ClickHouse at most every `health_check_interval` seconds when handing
+    out its session, and starts over with fresh connections if the ping fails.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        max_size: int,
+        keepalive_timeout: float,
+        health_check_interval: float,
+        timeout: None | aiohttp.ClientTimeout = None,
+        ssl: ssl.SSLContext | bool = True,
+    ):
+        self.url = url
+        self.max_size = max_size
+        self.keepalive_timeout = keepalive_timeout
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.ssl = ssl
+        self.session: None | aiohttp.ClientSession = None
+        self.last_health_check = 0.0
+        self.lock = asyncio.Lock()
+        self.logger = LOGGER.bind(url=url)
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_queued_start(session, context, params):
+            _record_pool_metric(
+                "clickhouse_pool_connection_waits", "Requests that waited for a pooled connection.", self
+            )
+
+        async def on_connection_create_end(session, context, params):
+            _record_pool_metric("clickhouse_pool_connections_created", "New connections opened by the pool.", self)
+
+        async def on_connection_reuseconn(session, context, params):
+            _record_pool_metric("clickhouse_pool_connections_reused", "Requests that reused a pooled connection.", self)
+
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            ssl=self.ssl, limit=self.max_size, limit_per_host=self.max_size, keepalive_timeout=self.keepalive_timeout
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=self.timeout, trace_configs=[self._trace_config()])
+
+    async def _is_healthy(self, session: aiohttp.ClientSession) -> bool:
+        try:
+            async with session.get(
+                urljoin(self.url, "ping"), raise_for_status=True, timeout=aiohttp.ClientTimeout(total=10)
+            ):
+                return True
+        except (aiohttp.ClientError, TimeoutError) as exc:
+            self.logger.warning("Pooled ClickHouse connection failed health check", exc_info=exc)
+            return False
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        async with self.lock:
+            if self.session is None or self.session.closed:
+                self.session = self._create_session()
+                self.last_health_check = time.monotonic()
+            elif time.monotonic() - self.last_health_check > self.health_check_interval:
+                self.last_health_check = time.monotonic()
+                if not await self._is_healthy(self.session):
+                    _record_pool_metric(
+                        "clickhouse_pool_health_check_failures", "Failed health checks of pooled connections.", self
+                    )
+                    # In-flight requests keep their connections until done, new ones get fresh connections
+                    stale_session, self.session = self.session, self._create_session()
+                    close_task = asyncio.create_task(_close_session_when_idle(stale_session))
+                    _background_tasks.add(close_task)
+                    close_task.add_done_callback(_background_tasks.discard)
+            return self.session
+
+    async def close(self) -> None:
+        async with self.lock:
+            if self.session is not None:
+                await self.session.close()
+            self.session = None
+
+
+# Keep references to fire-and-forget tasks, so they aren't garbage collected before they are done
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _close_session_when_idle(session: aiohttp.ClientSession, timeout: float = 300.0) -> None:
+    """Close a session that was replaced, once requests still using it are done."""
+    deadline = time.monotonic() + timeout
+    connector = session.connector
+    while connector is not None and connector._acquired and time.monotonic() < deadline:  # noqa: SLF001
+        await asyncio.sleep(1)
+    await session.close()
+
+
+# Pools are bound to the event loop their connections were opened in
+_connection_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, ClickHouseConnectionPool]]" = (
+    weakref.WeakKeyDictionary()
+)
+# The sessions of the pools reference their loop, so the pools are removed by these once the loop shuts down
+_connection_pools_shutdown_hooks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, collections.abc.AsyncGenerator[None, None]]" = weakref.WeakKeyDictionary()
+
+
+async def _close_connection_pools_at_shutdown(
+    pools: dict[str, ClickHouseConnectionPool],
+) -> collections.abc.AsyncGenerator[None, None]:
+    """Close the pools of an event loop when it shuts down.
+
+    Event loops finalize their async generators before closing, which `asyncio.run` and `async_to_sync` do, so
+    pools of short-lived loops don't leak their sessions and connectors.
+    """
+    try:
+        yield
+    finally:
+        loop = asyncio.get_running_loop()
+        if _connection_pools.get(loop) is pools:
+            del _connection_pools[loop]
+            _connection_pools_shutdown_hooks.pop(loop, None)
+        await asyncio.gather(*(pool.close() for pool in pools.values()))
+
+
+def get_connection_pool(url: str, timeout: None | aiohttp.ClientTimeout = None) -> ClickHouseConnectionPool:
+    """Return the connection pool for the ClickHouse cluster at `url`, shared by the current event loop."""
+    loop = asyncio.get_running_loop()
+    pools = _connection_pools.get(loop)
+    if pools is None:
+        pools = _connection_pools[loop] = {}
+        shutdown_hook = _connection_pools_shutdown_hooks[loop] = _close_connection_pools_at_shutdown(pools)
+        # Run the generator up to its yield, which registers it with the loop
+        start_task = asyncio.ensure_future(anext(shutdown_hook))
+        _background_tasks.add(start_task)
+        start_task.add_done_callback(_background_tasks.discard)
+    if url not in pools:
+        pools[url] = ClickHouseConnectionPool(
+            url,
+            max_size=settings.CLICKHOUSE_CONNECTION_POOL_MAX_SIZE,
+            keepalive_timeout=settings.CLICKHOUSE_CONNECTION_POOL_KEEPALIVE_SECONDS,
+            health_check_interval=settings.CLICKHOUSE_CONNECTION_POOL_HEALTH_CHECK_SECONDS,
+            timeout=timeout,
+            ssl=False,
+        )
+    return pools[url]
+
+
+async def close_connection_pools() -> None:
+    """Close the connection pools of the current event loop, e.g. when shutting down a worker."""
+    loop = asyncio.get_running_loop()
+    pools = _connection_pools.pop(loop, {})
+    _connection_pools_shutdown_hooks.pop(loop, None)
+    await asyncio.gather(*(pool.close() for pool in pools.values()))
+
+
 class ClickHouseClient:
     """An asynchronous client to access ClickHouse via HTTP.
 
@@ -222,6 +393,7 @@ class ClickHouseClient:
         headers: Headers sent to ClickHouse in an HTTP request. Includes authentication details.
         params: Parameters passed as query arguments in the HTTP request. Common ones include the
             ClickHouse database and the 'max_execution_time'.
+        pool: If set, the client uses the pool's session instead of opening its own connections.
     """
 
     def __init__(
@@ -232,6 +404,7 @@ class ClickHouseClient:
         database: str = "default",
         timeout: None | aiohttp.ClientTimeout = None,
         ssl: ssl.SSLContext | bool = True,
+        pool: ClickHouseConnectionPool | None = None,
         **kwargs,
     ):
         self.url = url
@@ -239,6 +412,7 @@ class ClickHouseClient:
         self.params = {}
         self.timeout = timeout
         self.ssl = ssl
+        self.pool = pool
         self.connector: None | aiohttp.TCPConnector = None
         self.session: None | aiohttp.ClientSession = None
         self.logger = LOGGER.bind(url=url, database=database, user=user)
@@ -675,12 +849,21 @@ class ClickHouseClient:
 
     async def __aenter__(self):
         """Enter method part of the AsyncContextManager protocol."""
+        if self.pool is not None:
+            self.session = await self.pool.get_session()
+            return self
+
         self.connector = aiohttp.TCPConnector(ssl=self.ssl)
         self.session = aiohttp.ClientSession(connector=self.connector, timeout=self.timeout)
         return self
 
     async def __aexit__(self, exc_type, exc_value, tb):
         """Exit method part of the AsyncContextManager protocol."""
+        if self.pool is not None:
+            # The session, and its connections, stay open for the next client
+            self.session = None
+            return False
+
         if self.session is not None:
             await self.session.close()
 
@@ -694,7 +877,7 @@ class ClickHouseClient:
 
 @contextlib.asynccontextmanager
 async def get_client(
-    *, team_id: typing.Optional[int] = None, clickhouse_url: str | None = None, **kwargs
+    *, team_id: typing.Optional[int] = None, clickhouse_url: str | None = None, pooled: bool | None = None, **kwargs
 ) -> collections.abc.AsyncIterator[ClickHouseClient]:
     """
     Returns a ClickHouse client based on the aiochclient library. This is an
@@ -705,8 +888,9 @@ async def get_client(
         async with get_client() as client:
             await client.apost_query("SELECT 1")
 
-    Note that this is not a connection pool, so you should not use this for
-    queries that are run frequently.
+    Unless `pooled` is False (or the CLICKHOUSE_CONNECTION_POOL_ENABLED setting is off), the client
+    uses connections from a pool shared by all clients in the event loop, see
+    `ClickHouseConnectionPool`.
 
     Note that we setup the SSL context here, allowing for custom CA certs to be
     used. I couldn't see a simply way to do this with `aiochclient` so we
@@ -740,6 +924,10 @@ async def get_client(
     else:
         url = clickhouse_url
 
+    if pooled is None:
+        pooled = settings.CLICKHOUSE_CONNECTION_POOL_ENABLED
+    pool = get_connection_pool(url, timeout=timeout) if pooled else None
+
     async with ClickHouseClient(
         url=url,
         user=settings.CLICKHOUSE_USER,
@@ -747,6 +935,7 @@ async def get_client(
         database=settings.CLICKHOUSE_DATABASE,
         timeout=timeout,
         ssl=False,
+        pool=pool,
         max_execution_time=settings.CLICKHOUSE_MAX_EXECUTION_TIME,
         max_memory_usage=settings.CLICKHOUSE_MAX_MEMORY_USAGE,
         max_block_size=max_block_size,
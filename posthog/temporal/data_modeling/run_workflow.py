@@ -429,6 +429,10 @@ async def materialize_model(
         query_columns = await database_sync_to_async(saved_query.get_columns)()
 
     hogql_query = saved_query.query["query"]
+    cursor_column = saved_query.incremental_cursor_column
+
+    delta_table: deltalake.DeltaTable | None = None
+    starting_version: int | None = None
 
     try:
         row_count = 0
@@ -438,29 +442,51 @@ async def materialize_model(
 
         await logger.adebug(f"Delta table URI = {table_uri}")
 
-        # Delete existing table first so that there are no schema conflicts
-        s3 = get_s3_client()
-        try:
-            await logger.adebug(f"Deleting existing delta table at {table_uri}")
-            s3.delete(table_uri, recursive=True)
-            await logger.adebug("Table deleted")
-        except FileNotFoundError:
-            await logger.adebug(f"Table at {table_uri} not found - skipping deletion")
+        high_water_mark = get_incremental_high_water_mark(saved_query)
+        is_incremental = high_water_mark is not None and deltalake.DeltaTable.is_deltatable(
+            table_uri=table_uri, storage_options=storage_options
+        )
 
-        try:
-            rows_expected = await get_query_row_count(hogql_query, team, logger)
-            await logger.ainfo(f"Expected rows: {rows_expected}")
-            # Set expected rows on the job
-            job.rows_expected = rows_expected
-            await database_sync_to_async(job.save)()
-        except Exception as e:
-            await logger.awarning(f"Failed to get expected row count: {str(e)}. Continuing without progress tracking.")
+        if is_incremental:
+            await logger.ainfo(f"Materializing rows with {cursor_column} > {high_water_mark}")
+            delta_table = deltalake.DeltaTable(table_uri=table_uri, storage_options=storage_options)
+            # A failed run is rolled back to here, as its rows would otherwise be appended again by the next run
+            starting_version = delta_table.version()
+            table_rows = hogql_table(
+                incremental_query(hogql_query, typing.cast(str, cursor_column), high_water_mark),
+                team,
+                logger,
+                column_types=[(column_name, column["clickhouse"]) for column_name, column in query_columns.items()],
+            )
+            # Progress is tracked as rows are written, counting the new rows upfront would run the query twice
             job.rows_expected = None
             await database_sync_to_async(job.save)()
+        else:
+            # Delete existing table first so that there are no schema conflicts
+            s3 = get_s3_client()
+            try:
+                await logger.adebug(f"Deleting existing delta table at {table_uri}")
+                s3.delete(table_uri, recursive=True)
+                await logger.adebug("Table deleted")
+            except FileNotFoundError:
+                await logger.adebug(f"Table at {table_uri} not found - skipping deletion")
 
-        delta_table: deltalake.DeltaTable | None = None
+            try:
+                rows_expected = await get_query_row_count(hogql_query, team, logger)
+                await logger.ainfo(f"Expected rows: {rows_expected}")
+                # Set expected rows on the job
+                job.rows_expected = rows_expected
+                await database_sync_to_async(job.save)()
+            except Exception as e:
+                await logger.awarning(
+                    f"Failed to get expected row count: {str(e)}. Continuing without progress tracking."
+                )
+                job.rows_expected = None
+                await database_sync_to_async(job.save)()
+
+            table_rows = hogql_table(hogql_query, team, logger)
 
-        async for index, res in asyncstdlib.enumerate(hogql_table(hogql_query, team, logger)):
+        async for index, res in asyncstdlib.enumerate(table_rows):
             batch, ch_types = res
             batch = _transform_unsupported_decimals(batch)
             batch = _transform_date_and_datetimes(batch, ch_types)
@@ -474,7 +500,7 @@ async def materialize_model(
 
             mode: typing.Literal["error", "append", "overwrite", "ignore"] = "append"
             schema_mode: typing.Literal["merge", "overwrite"] | None = "merge"
-            if index == 0:
+            if index == 0 and not is_incremental:
                 mode = "overwrite"
                 schema_mode = "overwrite"
 
@@ -491,6 +517,9 @@ async def materialize_model(
                 engine="rust",
             )
 
+            if cursor_column:
+                high_water_mark = batch_high_water_mark(batch, cursor_column, high_water_mark)
+
             row_count = row_count + batch.num_rows
             job.rows_materialized = row_count
             await database_sync_to_async(job.save)()
@@ -506,6 +535,10 @@ async def materialize_model(
 
         await logger.aerror(f"Error materializing model {model_label}: {error_message}")
 
+        if delta_table is not None and starting_version is not None and delta_table.version() != starting_version:
+            await logger.ainfo(f"Restoring delta table to version {starting_version}")
+            delta_table.restore(starting_version)
+
         if "Query exceeds memory limits" in error_message:
             error_message = f"Query exceeded memory limit. Try reducing its scope by changing the time range."
             saved_query.latest_error = error_message
@@ -568,6 +601,8 @@ async def materialize_model(
 
     data_modeling_job = await database_sync_to_async(DataModelingJob.objects.get)(id=job.id)
     if data_modeling_job.status == DataModelingJob.Status.CANCELLED:
+        if starting_version is not None:
+            delta_table.restore(starting_version)
         raise DataModelingCancelledException("Data modeling run was cancelled")
 
     await logger.adebug("Compacting delta table")
@@ -599,9 +634,20 @@ async def materialize_model(
 
     await database_sync_to_async(saved_query.refresh_from_db)()
     saved_query.table_id = dwh_table.id
+    if (
+        cursor_column
+        and cursor_column == saved_query.incremental_cursor_column
+        and hogql_query == saved_query.query["query"]
+    ):
+        # The next run picks up from here, unless the query was changed in the meantime
+        saved_query.incremental_cursor_value = (
+            serialize_cursor_value(high_water_mark) if high_water_mark is not None else None
+        )
     await database_sync_to_async(saved_query.save)()
 
-    await update_table_row_count(saved_query, row_count, logger)
+    # After an incremental run, the table also holds the rows of the previous runs
+    table_row_count = get_delta_table_row_count(delta_table) if is_incremental else row_count
+    await update_table_row_count(saved_query, table_row_count, logger)
 
     # Update the job record with the row count and completed status
     await database_sync_to_async(job.refresh_from_db)()
@@ -616,6 +662,58 @@ async def materialize_model(
     return (saved_query.normalized_name, delta_table, job.id)
 
 
+def serialize_cursor_value(value: typing.Any) -> dict[str, typing.Any]:
+    """Encodes a high-water mark of an incremental cursor column, so it can be stored as JSON."""
+    if isinstance(value, dt.datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, dt.date):
+        return {"type": "date", "value": value.isoformat()}
+    return {"type": "value", "value": value}
+
+
+def deserialize_cursor_value(data: dict[str, typing.Any]) -> typing.Any:
+    if data["type"] == "datetime":
+        return dt.datetime.fromisoformat(data["value"])
+    if data["type"] == "date":
+        return dt.date.fromisoformat(data["value"])
+    return data["value"]
+
+
+def get_incremental_high_water_mark(saved_query: DataWarehouseSavedQuery) -> typing.Any:
+    """The highest cursor value materialized so far, or None if the saved query needs to be materialized in full."""
+    if not saved_query.incremental_cursor_column or not saved_query.incremental_cursor_value:
+        return None
+    return deserialize_cursor_value(saved_query.incremental_cursor_value)
+
+
+def incremental_query(hogql_query: str, cursor_column: str, high_water_mark: typing.Any) -> ast.SelectQuery:
+    """The saved query, restricted to the rows past the high-water mark of its cursor column."""
+    return ast.SelectQuery(
+        select=[ast.Field(chain=["*"])],
+        select_from=ast.JoinExpr(table=parse_select(hogql_query)),
+        where=ast.CompareOperation(
+            op=ast.CompareOperationOp.Gt,
+            left=ast.Field(chain=[cursor_column]),
+            right=ast.Constant(value=high_water_mark),
+        ),
+    )
+
+
+def batch_high_water_mark(batch: pa.RecordBatch, cursor_column: str, high_water_mark: typing.Any) -> typing.Any:
+    batch_max = pc.max(batch.column(cursor_column)).as_py()
+    if batch_max is None:
+        return high_water_mark
+    if high_water_mark is None or batch_max > high_water_mark:
+        return batch_max
+    return high_water_mark
+
+
+def get_delta_table_row_count(delta_table: DeltaTable) -> int:
+    """The row count of the table, from the statistics of its files."""
+    add_actions = delta_table.get_add_actions(flatten=True)
+    return pc.sum(add_actions.column("num_records")).as_py() or 0
+
+
 async def mark_job_as_failed(job: DataModelingJob, error_message: str, logger: FilteringBoundLogger) -> None:
     """
     Mark DataModelingJob as failed
@@ -709,10 +807,54 @@ async def get_query_row_count(query: str, team: Team, logger: FilteringBoundLogg
 MB_50_IN_BYTES = 50 * 1000 * 1000
 
 
-async def hogql_table(query: str, team: Team, logger: FilteringBoundLogger):
-    """A HogQL table given by a HogQL query."""
+ARROW_TYPE_CONVERSION: dict[str, tuple[str, tuple[ast.Constant, ...]]] = {
+    "FIXED_SIZE_BINARY": ("toString", ()),
+    "JSON": ("toString", ()),
+    "UUID": ("toString", ()),
+    "ENUM": ("toString", ()),
+    "IPv4": ("toString", ()),
+    "IPv6": ("toString", ()),
+    "DateTime": ("toTimeZone", (ast.Constant(value="UTC"),)),
+}
+
+
+def _arrow_type_conversion(ch_type: str) -> tuple[str, tuple[ast.Constant, ...]] | None:
+    """The function to wrap a column of the ClickHouse type in, if ArrowStream doesn't support the type."""
+    for unsupported_type, call_tuple in ARROW_TYPE_CONVERSION.items():
+        if unsupported_type.lower() in ch_type.lower():
+            return call_tuple
+    return None
+
+
+async def _describe_query_columns(printed: str, context: HogQLContext) -> list[tuple[str, str]]:
+    """The names and ClickHouse types of the columns the printed query returns."""
+    table_describe_query = f"DESCRIBE TABLE ({printed}) FORMAT TabSeparatedRaw"
+
+    column_types: list[tuple[str, str]] = []
+    async with get_client() as client:
+        async with client.apost_query(
+            query=table_describe_query, query_parameters=context.values, query_id=str(uuid.uuid4())
+        ) as ch_response:
+            table_describe_response = await ch_response.content.read()
+            for line in table_describe_response.decode("utf-8").splitlines():
+                split_arr = line.strip().split("\t")
+                column_types.append((split_arr[0], split_arr[1]))
+    return column_types
+
+
+async def hogql_table(
+    query: str | ast.SelectQuery | ast.SelectSetQuery,
+    team: Team,
+    logger: FilteringBoundLogger,
+    column_types: list[tuple[str, str]] | None = None,
+):
+    """A HogQL table given by a HogQL query.
 
-    query_node = parse_select(query)
+    The ClickHouse types of the query's columns are looked up with a DESCRIBE query, unless they are passed in as
+    `column_types`.
+    """
+
+    query_node = parse_select(query) if isinstance(query, str) else query
     assert query_node is not None
 
     settings = HogQLGlobalSettings()
@@ -740,48 +882,14 @@ async def hogql_table(query: str, team: Team, logger: FilteringBoundLogger):
         stack=[],
     )
 
-    table_describe_query = f"DESCRIBE TABLE ({printed}) FORMAT TabSeparatedRaw"
-    arrow_type_conversion: dict[str, tuple[str, tuple[ast.Constant, ...]]] = {
-        "FIXED_SIZE_BINARY": ("toString", ()),
-        "JSON": ("toString", ()),
-        "UUID": ("toString", ()),
-        "ENUM": ("toString", ()),
-        "IPv4": ("toString", ()),
-        "IPv6": ("toString", ()),
-        "DateTime": ("toTimeZone", (ast.Constant(value="UTC"),)),
-    }
+    if column_types is None:
+        column_types = await _describe_query_columns(printed, context)
 
-    # Query for types first, check for any types ArrowStream doesn't support
-    # and rewrite the query wrapping those columns in a `toString(..)`
-    async with get_client() as client:
-        query_typings: list[tuple[str, str, tuple[str, tuple[ast.Constant, ...]] | None]] = []
-        has_type_to_convert = False
-
-        async with client.apost_query(
-            query=table_describe_query, query_parameters=context.values, query_id=str(uuid.uuid4())
-        ) as ch_response:
-            table_describe_response = await ch_response.content.read()
-            for line in table_describe_response.decode("utf-8").splitlines():
-                split_arr = line.strip().split("\t")
-                column_name = split_arr[0]
-                ch_type = split_arr[1]
-
-                # Does the clickhouse type exist in our mapping of types to convert?
-                if any(uat.lower() in ch_type.lower() for uat in arrow_type_conversion.keys()):
-                    # Find which type we need to convert
-                    call_tuples = [
-                        call_tuple
-                        for uat, call_tuple in arrow_type_conversion.items()
-                        if uat.lower() in ch_type.lower()
-                    ]
-
-                    # We can safely assume there is at least one element in this array due to the outer `if`
-                    call_tuple = call_tuples[0]
-
-                    has_type_to_convert = True
-                    query_typings.append((column_name, ch_type, call_tuple))
-                else:
-                    query_typings.append((column_name, ch_type, None))
+    # Check for any types ArrowStream doesn't support and rewrite the query wrapping those columns in a `toString(..)`
+    query_typings: list[tuple[str, str, tuple[str, tuple[ast.Constant, ...]] | None]] = [
+        (column_name, ch_type, _arrow_type_conversion(ch_type)) for column_name, ch_type in column_types
+    ]
+    has_type_to_convert = any(call_tuple is not None for _, _, call_tuple in query_typings)
     if has_type_to_convert:
         await logger.adebug("Query has fields that need converting")
 
@@ -0,0 +1,35 @@
+from temporalio import activity
+from temporalio.common import MetricCounter, MetricHistogram, MetricHistogramTimedelta
+
+
+def get_team_calculation_duration_metric() -> MetricHistogramTimedelta:
+    return activity.metric_meter().create_histogram_timedelta(
+        "realtime_cohort_team_calculation_duration",
+        "Time spent calculating the realtime cohort memberships of all the actions of a team",
+        unit="ms",
+    )
+
+
+def get_actions_calculated_metric() -> MetricCounter:
+    return activity.metric_meter().create_counter(
+        "realtime_cohort_actions_calculated", "Number of actions whose realtime cohort memberships were calculated"
+    )
+
+
+def get_membership_changes_metric(status: str) -> MetricCounter:
+    return (
+        activity.metric_meter()
+        .with_additional_attributes({"status": status})
+        .create_counter("realtime_cohort_membership_changes", "Number of realtime cohort membership changes produced")
+    )
+
+
+def get_action_membership_changes_metric(status: str) -> MetricHistogram:
+    return (
+        activity.metric_meter()
+        .with_additional_attributes({"status": status})
+        .create_histogram(
+            "realtime_cohort_action_membership_changes",
+            "Number of realtime cohort membership changes produced per action",
+        )
+    )
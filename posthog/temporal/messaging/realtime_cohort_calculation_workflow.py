@@ -2,6 +2,7 @@ import time
 import asyncio
 import datetime as dt
 import dataclasses
+from collections import Counter, defaultdict
 from typing import Any, Optional
 
 import temporalio.activity
@@ -9,7 +10,7 @@ import temporalio.workflow
 from structlog.contextvars import bind_contextvars
 
 from posthog.clickhouse.query_tagging import Feature, Product, tags_context
-from posthog.kafka_client.client import KafkaProducer
+from posthog.kafka_client.client import KafkaProducer, _KafkaProducer
 from posthog.kafka_client.topics import KAFKA_COHORT_MEMBERSHIP_CHANGED
 from posthog.models.action import Action
 from posthog.sync import database_sync_to_async
@@ -17,6 +18,12 @@ from posthog.temporal.common.base import PostHogWorkflow
 from posthog.temporal.common.clickhouse import get_client
 from posthog.temporal.common.heartbeat import Heartbeater
 from posthog.temporal.common.logger import get_logger
+from posthog.temporal.messaging.metrics import (
+    get_action_membership_changes_metric,
+    get_actions_calculated_metric,
+    get_membership_changes_metric,
+    get_team_calculation_duration_metric,
+)
 
 LOGGER = get_logger(__name__)
 
@@ -40,6 +47,164 @@ class RealtimeCohortCalculationWorkflowInputs:
         }
 
 
+# The persons who performed each action of the team at least N times over the last X days, compared with the current
+# members of the cohort of the action. The distinct ids are resolved to persons once for all the actions.
+TEAM_COHORT_MEMBERSHIP_CHANGES_QUERY = """
+   SELECT
+        COALESCE(bcm.team_id, cmc.team_id) as team_id,
+        COALESCE(bcm.cohort_id, cmc.cohort_id) as cohort_id,
+        COALESCE(bcm.person_id, cmc.person_id) as person_id,
+        now64() as last_updated,
+        CASE
+            WHEN
+                cmc.person_id IS NULL -- Does not exist in cohort_membership_changed
+                THEN 'entered' -- so, new member (or re-entered, as we filter members who left)
+            WHEN
+                bcm.person_id IS NULL -- There is no match in behavioral_cohorts_matches
+                THEN 'left' -- so, it left the cohort
+            ELSE
+                'unchanged' -- for all other cases, the membership did not change
+        END as status
+    FROM
+    (
+        SELECT
+            team_id,
+            toInt64(condition) as cohort_id,
+            person_id
+        FROM
+        (
+            SELECT team_id, condition, distinct_id
+            FROM prefiltered_events
+            WHERE
+                team_id = %(team_id)s
+                AND condition IN %(conditions)s
+                AND date >= now() - toIntervalDay(%(days)s)
+        ) AS pfe
+        INNER JOIN
+        (
+            SELECT
+                distinct_id,
+                argMax(person_id, version) as person_id
+            FROM person_distinct_id2
+            WHERE
+                team_id = %(team_id)s
+                AND distinct_id IN (
+                    SELECT distinct_id
+                    FROM prefiltered_events
+                    WHERE
+                        team_id = %(team_id)s
+                        AND condition IN %(conditions)s
+                        AND date >= now() - toIntervalDay(%(days)s)
+                )
+            GROUP BY distinct_id
+            HAVING argMax(is_deleted, version) = 0
+        ) AS pdi2 ON pdi2.distinct_id = pfe.distinct_id
+        GROUP BY
+            team_id,
+            condition,
+            person_id
+        HAVING count() >= %(min_matches)s
+    ) bcm
+    FULL OUTER JOIN
+    (
+        SELECT team_id, cohort_id, person_id, argMax(status, last_updated) as status
+        FROM cohort_membership
+        WHERE
+            team_id = %(team_id)s
+            AND cohort_id IN %(action_ids)s
+        GROUP BY team_id, cohort_id, person_id
+        HAVING status = 'entered'
+    ) cmc ON bcm.team_id = cmc.team_id AND bcm.cohort_id = cmc.cohort_id AND bcm.person_id = cmc.person_id
+    WHERE status != 'unchanged'
+    SETTINGS join_use_nulls = 1
+    FORMAT JSONEachRow
+"""
+
+# Number of membership changes buffered before they are produced to Kafka
+COHORT_MEMBERSHIP_CHANGES_BATCH_SIZE = 1000
+
+
+class CohortMembershipChangesProduceError(Exception):
+    """The membership changes could not be produced to Kafka, unlike a query error it's not specific to a team."""
+
+
+class CohortMembershipChangesProducer:
+    """Buffers the membership changes and produces them to Kafka in bulk, off the event loop."""
+
+    def __init__(self, kafka_producer: _KafkaProducer, batch_size: int = COHORT_MEMBERSHIP_CHANGES_BATCH_SIZE):
+        self.kafka_producer = kafka_producer
+        self.batch_size = batch_size
+        self.buffer: list[dict[str, Any]] = []
+
+    async def add(self, payload: dict[str, Any]) -> None:
+        self.buffer.append(payload)
+        if len(self.buffer) >= self.batch_size:
+            await self.produce()
+
+    async def produce(self) -> None:
+        if not self.buffer:
+            return
+        messages, self.buffer = self.buffer, []
+        try:
+            await asyncio.to_thread(
+                self.kafka_producer.produce_many,
+                topic=KAFKA_COHORT_MEMBERSHIP_CHANGED,
+                messages=messages,
+                key=lambda payload: payload["person_id"],
+            )
+        except Exception as e:
+            # Keep the changes, they may be of teams whose calculation completed
+            self.buffer = messages + self.buffer
+            raise CohortMembershipChangesProduceError(str(e)) from e
+
+    def discard(self, team_id: int) -> None:
+        """Drops the buffered changes of a team, the changes already produced can't be taken back."""
+        self.buffer = [payload for payload in self.buffer if payload["team_id"] != team_id]
+
+    async def flush(self) -> None:
+        await self.produce()
+        await asyncio.to_thread(self.kafka_producer.flush)
+
+
+async def calculate_team_cohort_memberships(
+    team_id: int,
+    action_ids: list[int],
+    inputs: RealtimeCohortCalculationWorkflowInputs,
+    producer: CohortMembershipChangesProducer,
+) -> dict[int, Counter[str]]:
+    """Calculates the cohort memberships of all the actions of a team with one query, returns the changes per action."""
+    changes: dict[int, Counter[str]] = {action_id: Counter() for action_id in action_ids}
+
+    with tags_context(
+        team_id=team_id,
+        feature=Feature.BEHAVIORAL_COHORTS,
+        product=Product.MESSAGING,
+        query_type="action_event_counts_per_person_per_team",
+    ):
+        async with get_client(team_id=team_id) as client:
+            async for row in client.stream_query_as_jsonl(
+                TEAM_COHORT_MEMBERSHIP_CHANGES_QUERY,
+                query_parameters={
+                    "team_id": team_id,
+                    "conditions": tuple(str(action_id) for action_id in action_ids),
+                    "action_ids": tuple(action_ids),
+                    "days": inputs.days,
+                    "min_matches": inputs.min_matches,
+                },
+            ):
+                payload = {
+                    "team_id": row["team_id"],
+                    "cohort_id": row["cohort_id"],
+                    "person_id": str(row["person_id"]),
+                    "last_updated": str(row["last_updated"]),
+                    "status": row["status"],
+                }
+                await producer.add(payload)
+                changes[int(row["cohort_id"])][row["status"]] += 1
+
+    return changes
+
+
 @temporalio.activity.defn
 async def process_realtime_cohort_calculation_activity(inputs: RealtimeCohortCalculationWorkflowInputs) -> None:
     """Process a batch of actions with bytecode."""
@@ -74,122 +239,65 @@ async def process_realtime_cohort_calculation_activity(inputs: RealtimeCohortCal
 
         actions: list[Action] = await get_actions()
 
+        # The actions of a team are calculated together
+        action_ids_by_team: dict[int, list[int]] = defaultdict(list)
+        for action in actions:
+            action_ids_by_team[action.team_id].append(action.id)
+
         actions_count = 0
 
         # Initialize Kafka producer once before the loop
-        kafka_producer = KafkaProducer()
-
-        # Process each action
-        for idx, action in enumerate(actions, 1):
-            # Update heartbeat progress every 100 actions to minimize overhead
-            if idx % 100 == 0 or idx == len(actions):
-                heartbeater.details = (f"Processing action {idx}/{len(actions)}",)
+        producer = CohortMembershipChangesProducer(KafkaProducer())
 
-            # Log progress periodically
-            if idx % 100 == 0 or idx == len(actions):
-                logger.info(f"Processed {idx}/{len(actions)} actions so far")
-
-            # Query ClickHouse for persons who performed event X at least N times over the last X days
-            query = """
-               SELECT
-                    COALESCE(bcm.team_id, cmc.team_id) as team_id,
-                    %(action_id)s as cohort_id,
-                    COALESCE(bcm.person_id, cmc.person_id) as person_id,
-                    now64() as last_updated,
-                    CASE
-                        WHEN
-                            cmc.person_id IS NULL -- Does not exist in cohort_membership_changed
-                            THEN 'entered' -- so, new member (or re-entered, as we filter members who left)
-                        WHEN
-                            bcm.person_id IS NULL -- There is no match in behavioral_cohorts_matches
-                            THEN 'left' -- so, it left the cohort
-                        ELSE
-                            'unchanged' -- for all other cases, the membership did not change
-                    END as status
-                FROM
-                (
-                    SELECT
-                        team_id,
-                        person_id
-                    FROM
-                    (
-                        SELECT team_id, distinct_id
-                        FROM prefiltered_events
-                        WHERE
-                            team_id = %(team_id)s
-                            AND condition = toString(%(action_id)s)
-                            AND date >= now() - toIntervalDay(%(days)s)
-                    ) AS pfe
-                    INNER JOIN
-                    (
-                        SELECT
-                            distinct_id,
-                            argMax(person_id, version) as person_id
-                        FROM person_distinct_id2
-                        WHERE team_id = %(team_id)s
-                        GROUP BY distinct_id
-                        HAVING argMax(is_deleted, version) = 0
-                    ) AS pdi2 ON pdi2.distinct_id = pfe.distinct_id
-                    GROUP BY
-                        team_id,
-                        person_id
-                    HAVING count() >= %(min_matches)s
-                ) bcm
-                FULL OUTER JOIN
-                (
-                    SELECT team_id, person_id, argMax(status, last_updated) as status
-                    FROM cohort_membership
-                    WHERE
-                        team_id = %(team_id)s
-                        AND cohort_id = %(action_id)s
-                    GROUP BY team_id, person_id
-                    HAVING status = 'entered'
-                ) cmc ON bcm.team_id = cmc.team_id AND bcm.person_id = cmc.person_id
-                WHERE status != 'unchanged'
-                SETTINGS join_use_nulls = 1
-                FORMAT JSONEachRow
-            """
+        # Process the actions of each team
+        for idx, (team_id, action_ids) in enumerate(action_ids_by_team.items(), 1):
+            heartbeater.details = (f"Processing team {idx}/{len(action_ids_by_team)}",)
 
+            team_start_time = time.time()
             try:
-                with tags_context(
-                    team_id=action.team_id,
-                    feature=Feature.BEHAVIORAL_COHORTS,
-                    product=Product.MESSAGING,
-                    query_type="action_event_counts_per_person_per_day",
-                ):
-                    async with get_client(team_id=action.team_id) as client:
-                        async for row in client.stream_query_as_jsonl(
-                            query,
-                            query_parameters={
-                                "team_id": action.team_id,
-                                "action_id": action.id,
-                                "days": inputs.days,
-                                "min_matches": inputs.min_matches,
-                            },
-                        ):
-                            payload = {
-                                "team_id": row["team_id"],
-                                "cohort_id": row["cohort_id"],
-                                "person_id": str(row["person_id"]),
-                                "last_updated": str(row["last_updated"]),
-                                "status": row["status"],
-                            }
-                            await asyncio.to_thread(
-                                kafka_producer.produce,
-                                topic=KAFKA_COHORT_MEMBERSHIP_CHANGED,
-                                key=payload["person_id"],
-                                data=payload,
-                            )
-
+                changes = await calculate_team_cohort_memberships(team_id, action_ids, inputs, producer)
+            except CohortMembershipChangesProduceError:
+                # Fail the activity to retry it, rather than skipping the teams whose changes could not be produced
+                raise
             except Exception as e:
+                # Don't produce the partial changes of a failed query, they would be taken as the full membership
+                producer.discard(team_id)
                 logger.exception(
-                    f"Error querying events for action {action.id}",
-                    action_id=action.id,
+                    f"Error querying events for the actions of team {team_id}",
+                    team_id=team_id,
+                    action_ids=action_ids,
                     error=str(e),
                 )
                 continue
+            team_duration_seconds = time.time() - team_start_time
+
+            get_team_calculation_duration_metric().record(dt.timedelta(seconds=team_duration_seconds))
+            get_actions_calculated_metric().add(len(action_ids))
+            team_changes: Counter[str] = sum(changes.values(), Counter())
+            for status, count in team_changes.items():
+                get_membership_changes_metric(status).add(count)
+            for status in ("entered", "left"):
+                action_changes_metric = get_action_membership_changes_metric(status)
+                for action_changes in changes.values():
+                    action_changes_metric.record(action_changes[status])
+
+            logger.info(
+                f"Processed {len(action_ids)} actions of team {team_id} in {team_duration_seconds:.1f} seconds",
+                team_id=team_id,
+                actions_processed=len(action_ids),
+                duration_seconds=team_duration_seconds,
+                changes=dict(team_changes),
+                changes_per_second=sum(team_changes.values()) / team_duration_seconds if team_duration_seconds else 0,
+                changes_per_action={action_id: dict(action_changes) for action_id, action_changes in changes.items()},
+            )
+
+            actions_count += len(action_ids)
+
+            # Log progress periodically
+            if idx % 100 == 0 or idx == len(action_ids_by_team):
+                logger.info(f"Processed {actions_count}/{len(actions)} actions so far")
 
-            actions_count += 1
+        await producer.flush()
 
         end_time = time.time()
         duration_seconds = end_time - start_time
@@ -200,6 +308,7 @@ async def process_realtime_cohort_calculation_activity(inputs: RealtimeCohortCal
         logger.info(
             f"Completed processing: processed {actions_count} actions in {duration_minutes:.1f} minutes ({duration_seconds:.1f} seconds)",
             actions_processed=actions_count,
+            teams_processed=len(action_ids_by_team),
             duration_seconds=duration_seconds,
             duration_minutes=duration_minutes,
             offset=inputs.offset,
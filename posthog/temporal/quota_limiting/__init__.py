@@ -1,9 +1,16 @@
-from posthog.temporal.quota_limiting.run_quota_limiting import RunQuotaLimitingWorkflow, run_quota_limiting_all_orgs
+from posthog.temporal.quota_limiting.run_quota_limiting import (
+    RunIncrementalQuotaLimitingWorkflow,
+    RunQuotaLimitingWorkflow,
+    run_quota_limiting_all_orgs,
+    run_quota_limiting_changed_orgs,
+)
 
 WORKFLOWS = [
     RunQuotaLimitingWorkflow,
+    RunIncrementalQuotaLimitingWorkflow,
 ]
 
 ACTIVITIES = [
     run_quota_limiting_all_orgs,
+    run_quota_limiting_changed_orgs,
 ]
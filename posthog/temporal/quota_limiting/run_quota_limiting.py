@@ -46,6 +46,32 @@ async def run_quota_limiting_all_orgs(
             raise Exception(f"Quota limiting failed: {type(e).__name__}: {str(e)[:200]}...")
 
 
+@dataclasses.dataclass
+class RunIncrementalQuotaLimitingInputs:
+    pass
+
+
+@activity.defn(name="run-quota-limiting-changed-orgs")
+async def run_quota_limiting_changed_orgs(
+    _inputs: RunIncrementalQuotaLimitingInputs,
+) -> None:
+    async with Heartbeater():
+        try:
+            from ee.billing.quota_limiting import update_changed_orgs_billing_quotas
+
+            @database_sync_to_async(thread_sensitive=True)
+            def async_update_changed_orgs_billing_quotas():
+                update_changed_orgs_billing_quotas()
+
+            await async_update_changed_orgs_billing_quotas()
+        except ImportError:
+            pass
+        except Exception as e:
+            capture_exception(e)
+            # Raise exception without large context to avoid "Failure exceeds size limit"
+            raise Exception(f"Incremental quota limiting failed: {type(e).__name__}: {str(e)[:200]}...")
+
+
 @workflow.defn(name="run-quota-limiting")
 class RunQuotaLimitingWorkflow(PostHogWorkflow):
     @staticmethod
@@ -71,3 +97,28 @@ class RunQuotaLimitingWorkflow(PostHogWorkflow):
         except Exception as e:
             capture_exception(e)
             raise
+
+
+@workflow.defn(name="run-incremental-quota-limiting")
+class RunIncrementalQuotaLimitingWorkflow(PostHogWorkflow):
+    @staticmethod
+    def parse_inputs(inputs: list[str]) -> RunIncrementalQuotaLimitingInputs:
+        """Parse inputs from the management command CLI."""
+        loaded = json.loads(inputs[0])
+        return RunIncrementalQuotaLimitingInputs(**loaded)
+
+    @workflow.run
+    async def run(self, inputs: RunIncrementalQuotaLimitingInputs) -> None:
+        try:
+            await workflow.execute_activity(
+                run_quota_limiting_changed_orgs,
+                inputs,
+                start_to_close_timeout=timedelta(minutes=10),
+                # The next run picks up the usage from where this one failed
+                retry_policy=common.RetryPolicy(maximum_attempts=1),
+                heartbeat_timeout=timedelta(minutes=2),
+            )
+
+        except Exception as e:
+            capture_exception(e)
+            raise
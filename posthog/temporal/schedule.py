@@ -25,7 +25,7 @@ from posthog.temporal.common.client import async_connect
 from posthog.temporal.common.schedule import a_create_schedule, a_schedule_exists, a_update_schedule
 from posthog.temporal.enforce_max_replay_retention.types import EnforceMaxReplayRetentionInput
 from posthog.temporal.product_analytics.upgrade_queries_workflow import UpgradeQueriesWorkflowInputs
-from posthog.temporal.quota_limiting.run_quota_limiting import RunQuotaLimitingInputs
+from posthog.temporal.quota_limiting.run_quota_limiting import RunIncrementalQuotaLimitingInputs, RunQuotaLimitingInputs
 from posthog.temporal.salesforce_enrichment.workflow import SalesforceEnrichmentInputs
 from posthog.temporal.subscriptions.subscription_scheduling_workflow import ScheduleAllSubscriptionsWorkflowInputs
 from posthog.temporal.weekly_digest.types import WeeklyDigestInput
@@ -74,6 +74,34 @@ async def create_run_quota_limiting_schedule(client: Client):
         )
 
 
+async def create_run_incremental_quota_limiting_schedule(client: Client):
+    """Create or update the schedule for the RunIncrementalQuotaLimitingWorkflow.
+
+    This schedule runs every 5 minutes, in between the runs of the RunQuotaLimitingWorkflow.
+    """
+    run_incremental_quota_limiting_schedule = Schedule(
+        action=ScheduleActionStartWorkflow(
+            "run-incremental-quota-limiting",
+            asdict(RunIncrementalQuotaLimitingInputs()),
+            id="run-incremental-quota-limiting-schedule",
+            task_queue=settings.BILLING_TASK_QUEUE,
+        ),
+        spec=ScheduleSpec(cron_expressions=["2-59/5 * * * *"]),  # Run at minutes 2, 7, 12, ..., 57 of every hour
+    )
+
+    if await a_schedule_exists(client, "run-incremental-quota-limiting-schedule"):
+        await a_update_schedule(
+            client, "run-incremental-quota-limiting-schedule", run_incremental_quota_limiting_schedule
+        )
+    else:
+        await a_create_schedule(
+            client,
+            "run-incremental-quota-limiting-schedule",
+            run_incremental_quota_limiting_schedule,
+            trigger_immediately=False,
+        )
+
+
 async def create_schedule_all_subscriptions_schedule(client: Client):
     """Create or update the schedule for the ScheduleAllSubscriptionsWorkflow.
 
@@ -228,6 +256,7 @@ async def create_weekly_digest_schedule(client: Client):
 schedules = [
     create_sync_vectors_schedule,
     create_run_quota_limiting_schedule,
+    create_run_incremental_quota_limiting_schedule,
     create_upgrade_queries_schedule,
     create_enforce_max_replay_retention_schedule,
     create_weekly_digest_schedule,
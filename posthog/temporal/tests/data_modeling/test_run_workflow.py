@@ -1,6 +1,7 @@
 import os
 import re
 import uuid
+import typing
 import asyncio
 import datetime as dt
 import functools
@@ -20,6 +21,7 @@ import temporalio.common
 import temporalio.worker
 from asgiref.sync import sync_to_async
 
+from posthog.hogql import ast
 from posthog.hogql.database.database import Database
 from posthog.hogql.query import execute_hogql_query
 
@@ -1302,6 +1304,83 @@ async def test_materialize_model_progress_tracking(ateam, bucket_name, minio_cli
         assert job.rows_expected == 6
 
 
+async def test_materialize_model_incremental(ateam, bucket_name, minio_client):
+    """Test that a saved query with a cursor column only appends the rows past the previous run."""
+    query = "SELECT id FROM events"
+    saved_query = await DataWarehouseSavedQuery.objects.acreate(
+        team=ateam,
+        name="incremental_test_model",
+        query={"query": query, "kind": "HogQLQuery"},
+        columns={"id": {"hogql": "IntegerDatabaseField", "clickhouse": "Int64", "valid": True}},
+        incremental_cursor_column="id",
+    )
+
+    runs: list[tuple[typing.Any, dict]] = []
+
+    def mock_hogql_table(hogql_query, *args, **kwargs):
+        runs.append((hogql_query, kwargs))
+        ids = [[1, 2, 3], [4, 5]] if len(runs) == 1 else [[7, 6]]
+
+        async def async_generator():
+            for batch_ids in ids:
+                yield (
+                    pa.RecordBatch.from_arrays([pa.array(batch_ids, type=pa.int64())], names=["id"]),
+                    [("id", "Int64")],
+                )
+
+        return async_generator()
+
+    with (
+        override_settings(
+            BUCKET_URL=f"s3://{bucket_name}",
+            AIRBYTE_BUCKET_KEY=settings.OBJECT_STORAGE_ACCESS_KEY_ID,
+            AIRBYTE_BUCKET_SECRET=settings.OBJECT_STORAGE_SECRET_ACCESS_KEY,
+            AIRBYTE_BUCKET_REGION="us-east-1",
+            AIRBYTE_BUCKET_DOMAIN="objectstorage:19000",
+        ),
+        unittest.mock.patch("posthog.temporal.data_modeling.run_workflow.hogql_table", mock_hogql_table),
+        unittest.mock.patch(
+            "posthog.temporal.data_modeling.run_workflow.get_query_row_count", return_value=5
+        ) as mock_row_count,
+    ):
+        for _ in range(2):
+            job = await database_sync_to_async(DataModelingJob.objects.create)(
+                team=ateam,
+                status=DataModelingJob.Status.RUNNING,
+                workflow_id="test_workflow",
+            )
+            _, delta_table, _ = await materialize_model(
+                saved_query.id.hex,
+                ateam,
+                saved_query,
+                job,
+                unittest.mock.AsyncMock(),
+                unittest.mock.AsyncMock(),
+            )
+
+    assert runs[0] == (query, {})
+
+    incremental_query, incremental_kwargs = runs[1]
+    assert isinstance(incremental_query, ast.SelectQuery)
+    assert incremental_query.where == ast.CompareOperation(
+        op=ast.CompareOperationOp.Gt, left=ast.Field(chain=["id"]), right=ast.Constant(value=5)
+    )
+    assert incremental_kwargs == {"column_types": [("id", "Int64")]}
+    mock_row_count.assert_called_once()
+
+    assert sorted(delta_table.to_pyarrow_table().column("id").to_pylist()) == [1, 2, 3, 4, 5, 6, 7]
+
+    await database_sync_to_async(saved_query.refresh_from_db)()
+    assert saved_query.incremental_cursor_value == {"type": "value", "value": 7}
+
+    await database_sync_to_async(job.refresh_from_db)()
+    assert job.status == DataModelingJob.Status.COMPLETED
+    assert job.rows_materialized == 2
+
+    table = await DataWarehouseTable.objects.aget(id=saved_query.table_id)
+    assert table.row_count == 7
+
+
 async def test_materialize_model_with_non_utc_timestamp(ateam, bucket_name, minio_client, truncate_events_table):
     await sync_to_async(bulk_create_events)(
         [{"event": "user signed up", "distinct_id": "1", "team": ateam, "timestamp": "2022-01-01T12:00:00"}]
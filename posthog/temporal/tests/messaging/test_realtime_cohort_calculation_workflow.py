@@ -0,0 +1,218 @@
+import uuid
+import datetime as dt
+from collections import Counter
+
+import pytest
+from unittest.mock import MagicMock
+
+import pytest_asyncio
+
+from posthog.models.precalculated_events.sql import PRECALCULATED_EVENTS_DISTRIBUTED_TABLE_SQL
+from posthog.temporal.messaging.realtime_cohort_calculation_workflow import (
+    CohortMembershipChangesProduceError,
+    CohortMembershipChangesProducer,
+    RealtimeCohortCalculationWorkflowInputs,
+    calculate_team_cohort_memberships,
+)
+from posthog.temporal.tests.utils.events import execute_query, truncate_table
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.django_db]
+
+# The query calculating the memberships of a single action cohort, which the team query replaced
+ACTION_COHORT_MEMBERSHIP_CHANGES_QUERY = """
+   SELECT
+        COALESCE(bcm.team_id, cmc.team_id) as team_id,
+        %(action_id)s as cohort_id,
+        COALESCE(bcm.person_id, cmc.person_id) as person_id,
+        now64() as last_updated,
+        CASE
+            WHEN cmc.person_id IS NULL THEN 'entered'
+            WHEN bcm.person_id IS NULL THEN 'left'
+            ELSE 'unchanged'
+        END as status
+    FROM
+    (
+        SELECT
+            team_id,
+            person_id
+        FROM
+        (
+            SELECT team_id, distinct_id
+            FROM prefiltered_events
+            WHERE
+                team_id = %(team_id)s
+                AND condition = toString(%(action_id)s)
+                AND date >= now() - toIntervalDay(%(days)s)
+        ) AS pfe
+        INNER JOIN
+        (
+            SELECT
+                distinct_id,
+                argMax(person_id, version) as person_id
+            FROM person_distinct_id2
+            WHERE team_id = %(team_id)s
+            GROUP BY distinct_id
+            HAVING argMax(is_deleted, version) = 0
+        ) AS pdi2 ON pdi2.distinct_id = pfe.distinct_id
+        GROUP BY
+            team_id,
+            person_id
+        HAVING count() >= %(min_matches)s
+    ) bcm
+    FULL OUTER JOIN
+    (
+        SELECT team_id, person_id, argMax(status, last_updated) as status
+        FROM cohort_membership
+        WHERE
+            team_id = %(team_id)s
+            AND cohort_id = %(action_id)s
+        GROUP BY team_id, person_id
+        HAVING status = 'entered'
+    ) cmc ON bcm.team_id = cmc.team_id AND bcm.person_id = cmc.person_id
+    WHERE status != 'unchanged'
+    SETTINGS join_use_nulls = 1
+    FORMAT JSONEachRow
+"""
+
+
+@pytest_asyncio.fixture
+async def prefiltered_events(clickhouse_client):
+    """Provide the prefiltered_events table read by the calculation, backed by the precalculated events."""
+    await execute_query(clickhouse_client, PRECALCULATED_EVENTS_DISTRIBUTED_TABLE_SQL("prefiltered_events"))
+    yield
+    await truncate_table(clickhouse_client, "sharded_precalculated_events")
+    await truncate_table(clickhouse_client, "cohort_membership")
+    await execute_query(clickhouse_client, "DROP TABLE IF EXISTS prefiltered_events")
+
+
+async def insert_action_matches(clickhouse_client, team_id: int, matches: list[tuple[int, str, int, int]]):
+    """Insert the matches of each (action_id, distinct_id, days_ago, count)."""
+    today = dt.date.today()
+    await execute_query(
+        clickhouse_client,
+        """
+        INSERT INTO sharded_precalculated_events (
+            team_id, date, distinct_id, person_id, condition, uuid, source, _timestamp, _partition, _offset
+        )
+        VALUES
+        """,
+        *[
+            (
+                team_id,
+                (today - dt.timedelta(days=days_ago)).isoformat(),
+                distinct_id,
+                uuid.uuid4(),
+                str(action_id),
+                uuid.uuid4(),
+                "test",
+                dt.datetime.now(tz=dt.UTC),
+                0,
+                0,
+            )
+            for action_id, distinct_id, days_ago, count in matches
+            for _ in range(count)
+        ],
+    )
+
+
+async def test_team_memberships_match_action_memberships(ateam, clickhouse_client, prefiltered_events):
+    """The memberships calculated for all the actions of a team at once are those calculated per action."""
+    inputs = RealtimeCohortCalculationWorkflowInputs(days=30, min_matches=3)
+    action_ids = [101, 102, 103]
+    persons = {name: uuid.uuid4() for name in ("alice", "bob", "carol", "dave")}
+
+    await execute_query(
+        clickhouse_client,
+        "INSERT INTO person_distinct_id2 (team_id, distinct_id, person_id, is_deleted, version) VALUES",
+        (ateam.pk, "alice", persons["alice"], 0, 0),
+        # Both distinct ids of bob count towards his matches
+        (ateam.pk, "bob-1", persons["bob"], 0, 0),
+        (ateam.pk, "bob-2", persons["bob"], 0, 0),
+        (ateam.pk, "carol", persons["carol"], 0, 0),
+        # The distinct id of dave was deleted
+        (ateam.pk, "dave", persons["dave"], 0, 0),
+        (ateam.pk, "dave", persons["dave"], 1, 1),
+    )
+    await insert_action_matches(
+        clickhouse_client,
+        ateam.pk,
+        [
+            (101, "alice", 1, 3),
+            (101, "bob-1", 1, 2),
+            (101, "bob-2", 2, 1),
+            (101, "carol", 1, 2),
+            (102, "alice", 1, 1),
+            (102, "carol", 3, 4),
+            (102, "carol", 40, 4),
+            (102, "dave", 1, 5),
+            (103, "bob-1", 45, 5),
+        ],
+    )
+    await execute_query(
+        clickhouse_client,
+        "INSERT INTO cohort_membership (team_id, cohort_id, person_id, status) VALUES",
+        # Still a member
+        (ateam.pk, 101, persons["alice"], "entered"),
+        # No longer a member
+        (ateam.pk, 101, persons["carol"], "entered"),
+        (ateam.pk, 103, persons["bob"], "entered"),
+        # Already left
+        (ateam.pk, 102, persons["alice"], "left"),
+    )
+
+    action_changes: set[tuple[int, str, str]] = set()
+    for action_id in action_ids:
+        async for row in clickhouse_client.stream_query_as_jsonl(
+            ACTION_COHORT_MEMBERSHIP_CHANGES_QUERY,
+            query_parameters={
+                "team_id": ateam.pk,
+                "action_id": action_id,
+                "days": inputs.days,
+                "min_matches": inputs.min_matches,
+            },
+        ):
+            action_changes.add((int(row["cohort_id"]), str(row["person_id"]), row["status"]))
+
+    producer = CohortMembershipChangesProducer(MagicMock(), batch_size=2)
+    changes = await calculate_team_cohort_memberships(ateam.pk, action_ids, inputs, producer)
+    produced = [
+        payload for call in producer.kafka_producer.produce_many.call_args_list for payload in call.kwargs["messages"]
+    ] + producer.buffer
+    team_changes = {(int(payload["cohort_id"]), payload["person_id"], payload["status"]) for payload in produced}
+
+    assert team_changes == action_changes
+    assert team_changes == {
+        (101, str(persons["bob"]), "entered"),
+        (101, str(persons["carol"]), "left"),
+        (102, str(persons["carol"]), "entered"),
+        (103, str(persons["bob"]), "left"),
+    }
+    assert len(produced) == len(team_changes)
+    assert changes == {
+        101: Counter({"entered": 1, "left": 1}),
+        102: Counter({"entered": 1}),
+        103: Counter({"left": 1}),
+    }
+
+
+async def test_discard_drops_the_buffered_changes_of_a_team():
+    producer = CohortMembershipChangesProducer(MagicMock(), batch_size=10)
+    for team_id in (1, 2, 1):
+        await producer.add({"team_id": team_id, "cohort_id": 1, "person_id": str(uuid.uuid4()), "status": "entered"})
+
+    producer.discard(1)
+
+    assert [payload["team_id"] for payload in producer.buffer] == [2]
+    producer.kafka_producer.produce_many.assert_not_called()
+
+
+async def test_produce_errors_keep_the_buffered_changes():
+    kafka_producer = MagicMock()
+    kafka_producer.produce_many.side_effect = Exception("Kafka is down")
+    producer = CohortMembershipChangesProducer(kafka_producer, batch_size=2)
+    await producer.add({"team_id": 1, "cohort_id": 1, "person_id": str(uuid.uuid4()), "status": "entered"})
+
+    with pytest.raises(CohortMembershipChangesProduceError):
+        await producer.add({"team_id": 2, "cohort_id": 2, "person_id": str(uuid.uuid4()), "status": "left"})
+
+    assert [payload["team_id"] for payload in producer.buffer] == [1, 2]
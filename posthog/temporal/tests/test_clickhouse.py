@@ -1,4 +1,5 @@
 import uuid
+import asyncio
 import datetime as dt
 
 import pytest
@@ -8,7 +9,10 @@ from posthog.clickhouse.query_tagging import QueryTags
 from posthog.temporal.common.clickhouse import (
     ClickHouseMemoryLimitExceededError,
     add_log_comment_param,
+    close_connection_pools,
     encode_clickhouse_data,
+    get_client,
+    get_connection_pool,
 )
 
 
@@ -76,3 +80,52 @@ def test_clickhouse_memory_limit_exceeded_error(clickhouse_client):
         with pytest.raises(ClickHouseMemoryLimitExceededError):
             with clickhouse_client.post_query("SELECT 1", query_parameters={}, query_id=None):
                 pass
+
+
+async def test_pooled_clients_share_session():
+    async with get_client(pooled=True) as first_client:
+        first_session = first_client.session
+    async with get_client(pooled=True) as second_client:
+        assert second_client.session is first_session
+
+    assert first_session is not None
+    assert not first_session.closed
+
+    async with get_client(pooled=False) as unpooled_client:
+        assert unpooled_client.session is not first_session
+
+    await close_connection_pools()
+    assert first_session.closed
+
+
+async def test_pool_replaces_session_after_failed_health_check():
+    async with get_client(pooled=True) as client:
+        pool = client.pool
+        assert pool is not None
+        session = client.session
+
+    pool.health_check_interval = 0
+    with patch.object(pool, "_is_healthy", return_value=False):
+        async with get_client(pooled=True) as client:
+            assert client.pool is pool
+            assert client.session is not session
+
+    await close_connection_pools()
+
+
+async def test_pools_are_per_url():
+    assert get_connection_pool("http://localhost:8123") is get_connection_pool("http://localhost:8123")
+    assert get_connection_pool("http://localhost:8123") is not get_connection_pool("http://localhost:8124")
+
+    await close_connection_pools()
+
+
+def test_pools_are_closed_when_the_event_loop_shuts_down():
+    async def open_pool_session():
+        pool = get_connection_pool("http://localhost:8123")
+        return pool, await pool.get_session()
+
+    pool, session = asyncio.run(open_pool_session())
+
+    assert session.closed
+    assert pool.session is None
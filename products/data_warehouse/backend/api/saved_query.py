@@ -61,6 +61,10 @@ from products.data_warehouse.backend.models.external_data_schema import (
 logger = structlog.get_logger(__name__)
 
 
+# Types of the columns an incremental materialization can use as its cursor
+INCREMENTAL_CURSOR_COLUMN_TYPES = ("Int", "UInt", "Float", "Decimal", "Date", "DateTime")
+
+
 class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
     created_by = UserBasicSerializer(read_only=True)
     columns = serializers.SerializerMethodField(read_only=True)
@@ -90,6 +94,7 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
             "latest_history_id",
             "soft_update",
             "is_materialized",
+            "incremental_cursor_column",
         ]
         read_only_fields = [
             "id",
@@ -188,6 +193,8 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
             except Exception:
                 raise serializers.ValidationError("Failed to retrieve types for view")
 
+            self._validate_incremental_cursor_column(view)
+
         with transaction.atomic():
             view.save()
             try:
@@ -271,6 +278,13 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
                 locked_instance.sync_frequency_interval = sync_frequency_interval
                 validated_data["is_materialized"] = True
 
+            if "query" in validated_data or (
+                "incremental_cursor_column" in validated_data
+                and validated_data["incremental_cursor_column"] != locked_instance.incremental_cursor_column
+            ):
+                # The rows materialized so far no longer match, the next run materializes the query in full
+                validated_data["incremental_cursor_value"] = None
+
             view: DataWarehouseSavedQuery = super().update(locked_instance, validated_data)
 
             # Only update columns and status if the query has changed
@@ -300,6 +314,9 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
                 view.status = DataWarehouseSavedQuery.Status.MODIFIED
                 view.save()
 
+            if "query" in validated_data or "incremental_cursor_column" in validated_data:
+                self._validate_incremental_cursor_column(view)
+
             try:
                 view.setup_model_paths()
             except Exception:
@@ -341,6 +358,22 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
 
         return view
 
+    def _validate_incremental_cursor_column(self, view: DataWarehouseSavedQuery) -> None:
+        if not view.incremental_cursor_column:
+            return
+
+        column = (view.columns or {}).get(view.incremental_cursor_column)
+        if column is None:
+            raise serializers.ValidationError(
+                f"Incremental cursor column '{view.incremental_cursor_column}' is not returned by the query"
+            )
+
+        clickhouse_type = clean_type(str(column.get("clickhouse", "")))
+        if not clickhouse_type.startswith(INCREMENTAL_CURSOR_COLUMN_TYPES):
+            raise serializers.ValidationError(
+                f"Incremental cursor column '{view.incremental_cursor_column}' must be a number, date or datetime column"
+            )
+
     def validate_query(self, query):
         team_id = self.context["team_id"]
 
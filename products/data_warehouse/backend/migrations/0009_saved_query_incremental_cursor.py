@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data_warehouse", "0008_backfill_saved_query_origin"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="incremental_cursor_column",
+            field=models.CharField(
+                blank=True,
+                default=None,
+                help_text="Monotonically increasing column used to materialize this SavedQuery incrementally.",
+                max_length=128,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="incremental_cursor_value",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Highest value of the incremental cursor column materialized so far.",
+                null=True,
+            ),
+        ),
+    ]
@@ -108,6 +108,21 @@ class DataWarehouseSavedQuery(CreatedMetaFields, UUIDTModel, DeletedMetaFields):
         choices=Origin.choices, help_text="Where this SavedQuery is created.", default=None, null=True, blank=True
     )
 
+    # If set, materializations only append the rows past the highest value of this column materialized so far
+    incremental_cursor_column = models.CharField(
+        max_length=128,
+        default=None,
+        null=True,
+        blank=True,
+        help_text="Monotonically increasing column used to materialize this SavedQuery incrementally.",
+    )
+    incremental_cursor_value = models.JSONField(
+        default=None,
+        null=True,
+        blank=True,
+        help_text="Highest value of the incremental cursor column materialized so far.",
+    )
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -27,6 +27,12 @@ from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
 from posthog.hogql_queries.query_runner import AnalyticsQueryRunner
 
 from products.error_tracking.backend.models import ErrorTrackingIssueFingerprintV2
+from products.error_tracking.backend.similarity_index import (
+    RERANK_MULTIPLIER,
+    SIMILARITY_INDEX_LOOKUP_COUNTER,
+    SIMILARITY_INDEX_SEARCH_LATENCY,
+    get_team_similarity_index,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -88,8 +94,9 @@ class ErrorTrackingSimilarIssuesQueryRunner(AnalyticsQueryRunner[ErrorTrackingQu
     cached_response: CachedErrorTrackingSimilarIssuesQueryResponse
     paginator: HogQLHasMorePaginator
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, use_similarity_index: bool = True, **kwargs):
         super().__init__(*args, **kwargs)
+        self.use_similarity_index = use_similarity_index
         self.paginator = HogQLHasMorePaginator.from_limit_context(
             limit_context=LimitContext.QUERY,
             limit=self.query.limit if self.query.limit else None,
@@ -245,10 +252,22 @@ class ErrorTrackingSimilarIssuesQueryRunner(AnalyticsQueryRunner[ErrorTrackingQu
             cast(datetime, fingerprint["first_seen"]) + time_window for fingerprint in matched_fingerprints
         )
         target_fingerprints = [fingerprint["fingerprint"] for fingerprint in matched_fingerprints]
+
+        candidates = self.get_candidate_fingerprints(target_fingerprints)
+        candidate_filter: ast.Expr = (
+            ast.Constant(value=True)
+            if candidates is None
+            else ast.CompareOperation(
+                left=ast.Field(chain=["document_id"]),
+                right=ast.Constant(value=candidates),
+                op=ast.CompareOperationOp.In,
+            )
+        )
         return parse_select(
             self.query_template,
             placeholders={
                 "fingerprints": ast.Constant(value=target_fingerprints),
+                "candidate_filter": candidate_filter,
                 "model_name": ast.Constant(value=self.model_name),
                 "rendering": ast.Constant(value=self.rendering),
                 "max_distance": ast.Constant(value=self.max_distance),
@@ -258,6 +277,42 @@ class ErrorTrackingSimilarIssuesQueryRunner(AnalyticsQueryRunner[ErrorTrackingQu
             },
         )
 
+    def get_candidate_fingerprints(self, target_fingerprints: list[str]) -> Optional[list[str]]:
+        """
+        Uses the team's ANN index to narrow down the fingerprints compared against the target issue.
+        The candidates are re-ranked exactly by the query, so only recall (not the distances) is affected.
+        Returns None when the index can't be used and every fingerprint has to be compared.
+        """
+        if not self.use_similarity_index:
+            return None
+
+        with self.timings.measure("error_tracking_similarity_index"):
+            team_index = get_team_similarity_index(self.team.id, self.model_name, self.rendering)
+            if team_index is None:
+                SIMILARITY_INDEX_LOOKUP_COUNTER.labels(result="no_index").inc()
+                return None
+
+            target_vectors = team_index.index.get_vectors(target_fingerprints)
+            if len(target_vectors) == 0:
+                # The target fingerprints haven't been embedded (or indexed) yet
+                SIMILARITY_INDEX_LOOKUP_COUNTER.labels(result="target_not_indexed").inc()
+                return None
+
+            try:
+                with SIMILARITY_INDEX_SEARCH_LATENCY.time():
+                    candidates = team_index.index.search(
+                        target_vectors,
+                        k=(self.paginator.limit + 1 + self.paginator.offset) * RERANK_MULTIPLIER,
+                        exclude=set(target_fingerprints),
+                    )
+            except Exception as e:
+                logger.warning("error_tracking_similarity_index_search_failed", team_id=self.team.id, error=str(e))
+                SIMILARITY_INDEX_LOOKUP_COUNTER.labels(result="error").inc()
+                return None
+
+        SIMILARITY_INDEX_LOOKUP_COUNTER.labels(result="index").inc()
+        return list(candidates.keys())
+
     @property
     def query_template(self):
         return """
@@ -287,6 +342,7 @@ class ErrorTrackingSimilarIssuesQueryRunner(AnalyticsQueryRunner[ErrorTrackingQu
                 AND model_name = {model_name}
                 AND document_id NOT IN {fingerprints}
                 AND product = 'error_tracking'
+                AND {candidate_filter}
             ) as b
             ORDER BY distance ASC
         ) as subquery
@@ -0,0 +1,501 @@
+"""
+Approximate nearest neighbour (ANN) index over error tracking fingerprint embeddings.
+
+The similar issues query compares the target issue's fingerprints against every fingerprint embedding of the
+team, which gets slow once a team has hundreds of thousands of fingerprints. This module keeps a per-team
+inverted file (IVF) index of int8-quantized, truncated embeddings that is used to pick a small candidate set.
+The candidates are then re-ranked exactly in ClickHouse against the full float64 embeddings, so the distances
+returned to the user are identical to the brute-force path.
+
+The index is persisted to object storage and kept up to date incrementally by a periodic task: every refresh only
+pulls the embeddings inserted after the index watermark. The coarse centroids are retrained once the index has grown
+enough that the original clustering no longer describes the data well. The request path only ever reads the
+persisted index, and compares every fingerprint when there is none or it can't be read.
+"""
+
+import io
+import time
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Optional
+
+from django.conf import settings
+
+import numpy as np
+import structlog
+from prometheus_client import Counter, Histogram
+
+from posthog.clickhouse.client.execute import sync_execute
+from posthog.storage import object_storage
+
+from products.error_tracking.backend.embedding import DOCUMENT_EMBEDDINGS
+
+logger = structlog.get_logger(__name__)
+
+# OpenAI text-embedding-3 models are trained so that a prefix of the vector is itself a usable embedding,
+# so candidate generation works on the first INDEX_DIMENSIONS components only.
+INDEX_DIMENSIONS = 256
+# Below this many fingerprints the brute-force query is fast enough and not worth indexing
+MIN_INDEXED_VECTORS = 2_000
+DEFAULT_NPROBE = 8
+# How many candidates per requested result are re-ranked exactly
+RERANK_MULTIPLIER = 4
+# Retrain the centroids once the index has grown by this factor since it was trained
+RETRAIN_GROWTH_FACTOR = 2.0
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_SIZE = 50_000
+# How often the in-process copy of an index is checked against the persisted one
+REFRESH_INTERVAL_SECONDS = 60
+FETCH_BATCH_SIZE = 10_000
+
+SIMILARITY_INDEX_SEARCH_LATENCY = Histogram(
+    "error_tracking_similarity_index_search_seconds",
+    "Time spent searching the error tracking similarity index for candidates",
+)
+SIMILARITY_INDEX_REFRESH_COUNTER = Counter(
+    "error_tracking_similarity_index_refresh_total",
+    "Refreshes of the error tracking similarity index",
+    labelnames=["kind"],
+)
+SIMILARITY_INDEX_LOOKUP_COUNTER = Counter(
+    "error_tracking_similarity_index_lookup_total",
+    "Similar issues lookups, by whether the ANN index could be used",
+    labelnames=["result"],
+)
+
+
+def normalize(vectors: np.ndarray, dimensions: int = INDEX_DIMENSIONS) -> np.ndarray:
+    """Truncate vectors to `dimensions` and L2 normalize them, so that cosine distance is 1 - dot product."""
+    truncated = np.asarray(vectors, dtype=np.float32)[:, :dimensions]
+    norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return truncated / norms
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-vector int8 quantization. Returns the codes and the scale to multiply them back with."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def _kmeans(vectors: np.ndarray, nlist: int, iterations: int, seed: int) -> np.ndarray:
+    """Spherical k-means over unit vectors, returns unit-norm centroids."""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > KMEANS_SAMPLE_SIZE:
+        vectors = vectors[rng.choice(len(vectors), KMEANS_SAMPLE_SIZE, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for i in range(nlist):
+            members = vectors[assignments == i]
+            if len(members) > 0:
+                centroids[i] = members.sum(axis=0)
+        centroids = normalize(centroids, centroids.shape[1])
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted file index with int8-quantized vectors.
+
+    Vectors are assigned to their closest centroid. A search only scores the vectors in the `nprobe` lists whose
+    centroids are closest to the query, which makes the cost roughly `nprobe / nlist` of a full scan.
+    Distances returned by `search` are approximate and must be re-ranked against the original embeddings.
+    """
+
+    def __init__(self, centroids: np.ndarray, trained_size: int, dimensions: int = INDEX_DIMENSIONS):
+        self.dimensions = dimensions
+        self.centroids = centroids.astype(np.float32)
+        self.trained_size = trained_size
+        self.document_ids: list[str] = []
+        self.timestamps = np.empty(0, dtype="datetime64[ms]")
+        self.codes = np.empty((0, dimensions), dtype=np.int8)
+        self.scales = np.empty(0, dtype=np.float32)
+        self.assignments = np.empty(0, dtype=np.int32)
+        self._positions: dict[str, int] = {}
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        dimensions: int = INDEX_DIMENSIONS,
+        nlist: Optional[int] = None,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        unit_vectors = normalize(vectors, dimensions)
+        if nlist is None:
+            nlist = max(1, int(np.sqrt(len(unit_vectors))))
+        nlist = min(nlist, len(unit_vectors))
+        centroids = _kmeans(unit_vectors, nlist, KMEANS_ITERATIONS, seed)
+        return cls(centroids=centroids, trained_size=len(unit_vectors), dimensions=dimensions)
+
+    def __len__(self) -> int:
+        return len(self.document_ids)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def needs_retrain(self) -> bool:
+        return len(self) > self.trained_size * RETRAIN_GROWTH_FACTOR
+
+    def add(self, document_ids: list[str], timestamps: list[datetime], vectors: np.ndarray) -> None:
+        """Add or replace vectors. A document that is already indexed is overwritten in place."""
+        if len(document_ids) == 0:
+            return
+        unit_vectors = normalize(vectors, self.dimensions)
+        codes, scales = quantize_int8(unit_vectors)
+        assignments = np.argmax(unit_vectors @ self.centroids.T, axis=1).astype(np.int32)
+        stamps = np.array([np.datetime64(ts.replace(tzinfo=None), "ms") for ts in timestamps], dtype="datetime64[ms]")
+
+        # Only the last occurrence of a document within the batch is kept
+        last_rows = {document_id: row for row, document_id in enumerate(document_ids)}
+        new_rows: list[int] = []
+        for document_id, row in last_rows.items():
+            position = self._positions.get(document_id)
+            if position is None:
+                self._positions[document_id] = len(self.document_ids)
+                self.document_ids.append(document_id)
+                new_rows.append(row)
+            else:
+                self.codes[position] = codes[row]
+                self.scales[position] = scales[row]
+                self.assignments[position] = assignments[row]
+                self.timestamps[position] = stamps[row]
+
+        if new_rows:
+            self.codes = np.concatenate([self.codes, codes[new_rows]])
+            self.scales = np.concatenate([self.scales, scales[new_rows]])
+            self.assignments = np.concatenate([self.assignments, assignments[new_rows]])
+            self.timestamps = np.concatenate([self.timestamps, stamps[new_rows]])
+
+    def get_vectors(self, document_ids: list[str]) -> np.ndarray:
+        """Returns the (dequantized) indexed vectors of the given documents, skipping unknown ones."""
+        positions = [self._positions[document_id] for document_id in document_ids if document_id in self._positions]
+        return dequantize_int8(self.codes[positions], self.scales[positions])
+
+    def retrain(self, seed: int = 0) -> "IVFIndex":
+        """Returns a new index with centroids trained on the current contents."""
+        vectors = dequantize_int8(self.codes, self.scales)
+        index = IVFIndex.train(vectors, dimensions=self.dimensions, seed=seed)
+        index.add(self.document_ids, [ts.astype(datetime) for ts in self.timestamps], vectors)
+        return index
+
+    def search(
+        self,
+        query_vectors: np.ndarray,
+        k: int,
+        nprobe: int = DEFAULT_NPROBE,
+        exclude: Optional[set[str]] = None,
+    ) -> dict[str, float]:
+        """
+        Returns up to `k` candidates per query vector, as a mapping of document id to the smallest approximate
+        cosine distance to any of the query vectors.
+        """
+        exclude = exclude or set()
+        queries = normalize(query_vectors, self.dimensions)
+        nprobe = min(nprobe, self.nlist)
+        candidates: dict[str, float] = {}
+        if len(self) == 0 or len(queries) == 0:
+            return candidates
+
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+        for query, probe in zip(queries, probes):
+            positions = np.flatnonzero(np.isin(self.assignments, probe))
+            if len(positions) == 0:
+                continue
+            similarities = (self.codes[positions].astype(np.float32) @ query) * self.scales[positions]
+            # Over-fetch to leave room for excluded documents
+            top = min(k + len(exclude), len(positions))
+            best = np.argpartition(-similarities, top - 1)[:top]
+            for i in best[np.argsort(-similarities[best])]:
+                document_id = self.document_ids[positions[i]]
+                if document_id in exclude:
+                    continue
+                distance = float(1.0 - similarities[i])
+                if distance < candidates.get(document_id, np.inf):
+                    candidates[document_id] = distance
+        return candidates
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            centroids=self.centroids,
+            trained_size=np.array([self.trained_size]),
+            document_ids=np.array(self.document_ids, dtype=np.str_),
+            timestamps=self.timestamps,
+            codes=self.codes,
+            scales=self.scales,
+            assignments=self.assignments,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IVFIndex":
+        arrays = np.load(io.BytesIO(data), allow_pickle=False)
+        index = cls(
+            centroids=arrays["centroids"],
+            trained_size=int(arrays["trained_size"][0]),
+            dimensions=arrays["centroids"].shape[1],
+        )
+        index.document_ids = [str(document_id) for document_id in arrays["document_ids"]]
+        index.timestamps = arrays["timestamps"]
+        index.codes = arrays["codes"]
+        index.scales = arrays["scales"]
+        index.assignments = arrays["assignments"]
+        index._positions = {document_id: i for i, document_id in enumerate(index.document_ids)}
+        return index
+
+
+@dataclass
+class TeamSimilarityIndex:
+    team_id: int
+    model_name: str
+    rendering: str
+    index: IVFIndex
+    # Largest `inserted_at` of any embedding in the index
+    watermark: datetime
+    refreshed_at: float = 0.0
+
+    @property
+    def storage_key(self) -> str:
+        return _storage_key(self.team_id, self.model_name, self.rendering)
+
+    def persist(self) -> None:
+        object_storage.write(
+            self.storage_key,
+            self.index.to_bytes(),
+            extras={"Metadata": {"watermark": self.watermark.isoformat()}},
+        )
+
+    def refresh(self) -> int:
+        """
+        Pulls embeddings inserted since the watermark into the index, retrains it if it has grown enough, and persists
+        it. Returns the number of new embeddings. Too slow for the request path, see `refresh_team_similarity_index`.
+        """
+        added = 0
+        for document_ids, timestamps, vectors, watermark in _fetch_embeddings(
+            self.team_id, self.model_name, self.rendering, inserted_after=self.watermark
+        ):
+            self.index.add(document_ids, timestamps, vectors)
+            self.watermark = max(self.watermark, watermark)
+            added += len(document_ids)
+
+        retrained = self.index.needs_retrain
+        if retrained:
+            SIMILARITY_INDEX_REFRESH_COUNTER.labels(kind="retrain").inc()
+            self.index = self.index.retrain()
+
+        self.refreshed_at = time.monotonic()
+        if added > 0:
+            SIMILARITY_INDEX_REFRESH_COUNTER.labels(kind="incremental").inc()
+        if added > 0 or retrained:
+            self.persist()
+        return added
+
+
+def _storage_key(team_id: int, model_name: str, rendering: str) -> str:
+    return (
+        f"{settings.OBJECT_STORAGE_ERROR_TRACKING_SIMILARITY_INDEX_FOLDER}/team-{team_id}/{model_name}/{rendering}.npz"
+    )
+
+
+FETCH_EMBEDDINGS_SQL = """
+SELECT document_id, timestamp, arraySlice(embedding, 1, %(dimensions)s) AS embedding, inserted_at
+FROM {table}
+WHERE team_id = %(team_id)s
+    AND product = 'error_tracking'
+    AND document_type = 'fingerprint'
+    AND model_name = %(model_name)s
+    AND rendering = %(rendering)s
+    AND inserted_at > %(inserted_after)s
+ORDER BY inserted_at ASC
+LIMIT %(limit)s
+"""
+
+
+def _fetch_embeddings(team_id: int, model_name: str, rendering: str, inserted_after: datetime):
+    """Yields batches of (document ids, timestamps, truncated vectors, max inserted_at) in insertion order."""
+    while True:
+        rows = sync_execute(
+            FETCH_EMBEDDINGS_SQL.format(table=DOCUMENT_EMBEDDINGS),
+            {
+                "team_id": team_id,
+                "model_name": model_name,
+                "rendering": rendering,
+                "inserted_after": inserted_after,
+                "dimensions": INDEX_DIMENSIONS,
+                "limit": FETCH_BATCH_SIZE,
+            },
+            team_id=team_id,
+        )
+        if not rows:
+            return
+        inserted_after = rows[-1][3]
+        yield (
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            np.array([row[2] for row in rows], dtype=np.float32),
+            inserted_after,
+        )
+        if len(rows) < FETCH_BATCH_SIZE:
+            return
+
+
+def build_team_similarity_index(team_id: int, model_name: str, rendering: str) -> Optional[TeamSimilarityIndex]:
+    """Builds the index for a team from scratch and persists it. Returns None if the team has too few embeddings."""
+    document_ids: list[str] = []
+    timestamps: list[datetime] = []
+    batches: list[np.ndarray] = []
+    watermark = datetime(1970, 1, 1, tzinfo=UTC)
+    for batch_ids, batch_timestamps, batch_vectors, batch_watermark in _fetch_embeddings(
+        team_id, model_name, rendering, inserted_after=watermark
+    ):
+        document_ids.extend(batch_ids)
+        timestamps.extend(batch_timestamps)
+        batches.append(batch_vectors)
+        watermark = batch_watermark
+
+    if len(document_ids) < MIN_INDEXED_VECTORS:
+        return None
+
+    vectors = np.concatenate(batches)
+    index = IVFIndex.train(vectors)
+    index.add(document_ids, timestamps, vectors)
+    team_index = TeamSimilarityIndex(
+        team_id=team_id,
+        model_name=model_name,
+        rendering=rendering,
+        index=index,
+        watermark=watermark,
+        refreshed_at=time.monotonic(),
+    )
+    SIMILARITY_INDEX_REFRESH_COUNTER.labels(kind="full").inc()
+    team_index.persist()
+    return team_index
+
+
+def _load_team_similarity_index(team_id: int, model_name: str, rendering: str) -> Optional[TeamSimilarityIndex]:
+    key = _storage_key(team_id, model_name, rendering)
+    watermark = _persisted_watermark(key)
+    if watermark is None:
+        return None
+    data = object_storage.read_bytes(key)
+    if data is None:
+        return None
+    return TeamSimilarityIndex(
+        team_id=team_id,
+        model_name=model_name,
+        rendering=rendering,
+        index=IVFIndex.from_bytes(data),
+        watermark=watermark,
+        refreshed_at=time.monotonic(),
+    )
+
+
+def _persisted_watermark(key: str) -> Optional[datetime]:
+    head = object_storage.head_object(key)
+    watermark = (head or {}).get("Metadata", {}).get("watermark")
+    return datetime.fromisoformat(watermark) if watermark is not None else None
+
+
+def refresh_team_similarity_index(team_id: int, model_name: str, rendering: str) -> int:
+    """
+    Builds the index of the team if it has none yet, or pulls the embeddings inserted since into it.
+    Returns the number of indexed embeddings.
+    """
+    try:
+        team_index = _load_team_similarity_index(team_id, model_name, rendering)
+    except Exception as e:
+        # e.g. an index persisted in a previous format, it's built again from scratch
+        logger.warning("error_tracking_similarity_index_load_failed", team_id=team_id, error=str(e))
+        team_index = None
+
+    if team_index is None:
+        team_index = build_team_similarity_index(team_id, model_name, rendering)
+        return len(team_index.index) if team_index else 0
+
+    team_index.refresh()
+    return len(team_index.index)
+
+
+INDEXABLE_TEAMS_SQL = """
+SELECT team_id, model_name, rendering
+FROM {table}
+WHERE product = 'error_tracking'
+    AND document_type = 'fingerprint'
+GROUP BY team_id, model_name, rendering
+HAVING count() >= %(min_indexed_vectors)s
+"""
+
+
+def get_indexable_teams() -> list[tuple[int, str, str]]:
+    """The (team id, model name, rendering) of the fingerprint embeddings numerous enough to be indexed."""
+    rows = sync_execute(
+        INDEXABLE_TEAMS_SQL.format(table=DOCUMENT_EMBEDDINGS), {"min_indexed_vectors": MIN_INDEXED_VECTORS}
+    )
+    return [(int(team_id), model_name, rendering) for team_id, model_name, rendering in rows]
+
+
+_loaded_indexes: dict[tuple[int, str, str], TeamSimilarityIndex] = {}
+# Guards the dictionaries only, the indexes of different teams are loaded independently
+_loaded_indexes_lock = threading.Lock()
+_loading_locks: dict[tuple[int, str, str], threading.Lock] = {}
+
+
+def _reload_team_similarity_index(
+    key: tuple[int, str, str], team_index: Optional[TeamSimilarityIndex]
+) -> Optional[TeamSimilarityIndex]:
+    team_id, model_name, rendering = key
+    if team_index is not None and _persisted_watermark(team_index.storage_key) == team_index.watermark:
+        team_index.refreshed_at = time.monotonic()
+        return team_index
+
+    team_index = _load_team_similarity_index(team_id, model_name, rendering)
+    with _loaded_indexes_lock:
+        if team_index is None:
+            _loaded_indexes.pop(key, None)
+        else:
+            _loaded_indexes[key] = team_index
+    return team_index
+
+
+def get_team_similarity_index(team_id: int, model_name: str, rendering: str) -> Optional[TeamSimilarityIndex]:
+    """
+    Returns the index of the team as last persisted, or None if there is none or it can't be read, in which case every
+    fingerprint is compared. The index is never refreshed here, that's left to `refresh_team_similarity_index`, the
+    in-process copy is only reloaded once a newer one has been persisted.
+    """
+    key = (team_id, model_name, rendering)
+    try:
+        with _loaded_indexes_lock:
+            team_index = _loaded_indexes.get(key)
+            loading_lock = _loading_locks.setdefault(key, threading.Lock())
+
+        if team_index is not None and time.monotonic() - team_index.refreshed_at <= REFRESH_INTERVAL_SECONDS:
+            return team_index
+
+        # Only one request loads the index of a team, the others keep using the copy they have meanwhile
+        if not loading_lock.acquire(blocking=team_index is None):
+            return team_index
+        try:
+            with _loaded_indexes_lock:
+                loaded_index = _loaded_indexes.get(key)
+            if loaded_index is not None and loaded_index is not team_index:
+                # Loaded by another request while this one was waiting
+                return loaded_index
+            return _reload_team_similarity_index(key, team_index)
+        finally:
+            loading_lock.release()
+    except Exception as e:
+        logger.warning("error_tracking_similarity_index_load_failed", team_id=team_id, error=str(e))
+        return None
@@ -0,0 +1,132 @@
+from datetime import UTC, datetime
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from products.error_tracking.backend import similarity_index
+from products.error_tracking.backend.similarity_index import IVFIndex, dequantize_int8, normalize, quantize_int8
+
+DIMENSIONS = 32
+
+
+def _random_vectors(rng: np.random.Generator, count: int) -> np.ndarray:
+    # Clustered data, like real embeddings, rather than uniform noise
+    centers = rng.normal(size=(20, DIMENSIONS))
+    return centers[rng.integers(0, len(centers), count)] + rng.normal(scale=0.3, size=(count, DIMENSIONS))
+
+
+class TestSimilarityIndex(TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+        self.vectors = _random_vectors(self.rng, 2000)
+        self.document_ids = [f"fp-{i}" for i in range(len(self.vectors))]
+        self.timestamps = [datetime(2025, 1, 1, tzinfo=UTC)] * len(self.vectors)
+        self.index = IVFIndex.train(self.vectors, dimensions=DIMENSIONS, nlist=32)
+        self.index.add(self.document_ids, self.timestamps, self.vectors)
+
+    def test_quantization_round_trip_is_close(self):
+        unit_vectors = normalize(self.vectors, DIMENSIONS)
+        codes, scales = quantize_int8(unit_vectors)
+
+        assert codes.dtype == np.int8
+        assert np.abs(dequantize_int8(codes, scales) - unit_vectors).max() < 0.01
+
+    def test_recall_against_brute_force(self):
+        unit_vectors = normalize(self.vectors, DIMENSIONS)
+        k = 10
+        hits = 0
+        queries = self.rng.choice(len(self.vectors), 50, replace=False)
+        for query in queries:
+            exact = np.argsort(1 - unit_vectors @ unit_vectors[query])[1 : k + 1]
+            expected = {self.document_ids[i] for i in exact}
+
+            candidates = self.index.search(self.vectors[[query]], k=k * 4, nprobe=8, exclude={self.document_ids[query]})
+
+            hits += len(expected & set(candidates))
+
+        assert hits / (k * len(queries)) > 0.9
+
+    def test_search_excludes_documents(self):
+        candidates = self.index.search(self.vectors[[0]], k=5, exclude={"fp-0"})
+
+        assert "fp-0" not in candidates
+        assert len(candidates) == 5
+
+    def test_add_replaces_existing_documents(self):
+        self.index.add(["fp-0", "fp-new"], self.timestamps[:2], self.vectors[[1, 2]])
+
+        assert len(self.index) == len(self.vectors) + 1
+        assert np.allclose(self.index.get_vectors(["fp-0"]), self.index.get_vectors(["fp-1"]))
+
+    def test_needs_retrain_after_growth(self):
+        assert not self.index.needs_retrain
+
+        more = _random_vectors(self.rng, 2500)
+        self.index.add([f"more-{i}" for i in range(len(more))], [self.timestamps[0]] * len(more), more)
+
+        assert self.index.needs_retrain
+        retrained = self.index.retrain()
+        assert len(retrained) == len(self.index)
+        assert not retrained.needs_retrain
+
+    def test_serialization_round_trip(self):
+        restored = IVFIndex.from_bytes(self.index.to_bytes())
+
+        assert restored.document_ids == self.index.document_ids
+        assert np.array_equal(restored.codes, self.index.codes)
+        assert restored.search(self.vectors[[3]], k=5) == self.index.search(self.vectors[[3]], k=5)
+
+
+class TestGetTeamSimilarityIndex(TestCase):
+    def setUp(self):
+        similarity_index._loaded_indexes.clear()
+        rng = np.random.default_rng(0)
+        vectors = _random_vectors(rng, 100)
+        self.index = IVFIndex.train(vectors, dimensions=DIMENSIONS, nlist=4)
+        self.index.add([f"fp-{i}" for i in range(len(vectors))], [datetime(2025, 1, 1, tzinfo=UTC)] * 100, vectors)
+        self.watermark = datetime(2025, 1, 1, tzinfo=UTC)
+
+    def _head(self, key):
+        return {"Metadata": {"watermark": self.watermark.isoformat()}}
+
+    def test_loads_the_persisted_index_without_refreshing_it(self):
+        with (
+            patch.object(similarity_index.object_storage, "head_object", side_effect=self._head),
+            patch.object(similarity_index.object_storage, "read_bytes", return_value=self.index.to_bytes()),
+            patch.object(similarity_index, "_fetch_embeddings") as fetch_embeddings,
+        ):
+            team_index = similarity_index.get_team_similarity_index(1, "model", "rendering")
+
+            assert team_index is not None
+            assert team_index.index.document_ids == self.index.document_ids
+            fetch_embeddings.assert_not_called()
+
+    def test_falls_back_to_brute_force_when_the_index_cant_be_read(self):
+        with patch.object(similarity_index.object_storage, "head_object", side_effect=Exception("S3 is down")):
+            assert similarity_index.get_team_similarity_index(1, "model", "rendering") is None
+
+    def test_reloads_the_index_once_a_newer_one_is_persisted(self):
+        with (
+            patch.object(similarity_index.object_storage, "head_object", side_effect=self._head),
+            patch.object(similarity_index.object_storage, "read_bytes", return_value=self.index.to_bytes()) as read,
+        ):
+            team_index = similarity_index.get_team_similarity_index(1, "model", "rendering")
+            assert team_index is not None
+
+            # Not stale yet
+            assert similarity_index.get_team_similarity_index(1, "model", "rendering") is team_index
+            assert read.call_count == 1
+
+            # Stale, but nothing newer was persisted
+            team_index.refreshed_at -= similarity_index.REFRESH_INTERVAL_SECONDS + 1
+            assert similarity_index.get_team_similarity_index(1, "model", "rendering") is team_index
+            assert read.call_count == 1
+
+            team_index.refreshed_at -= similarity_index.REFRESH_INTERVAL_SECONDS + 1
+            self.watermark = datetime(2025, 1, 2, tzinfo=UTC)
+            reloaded = similarity_index.get_team_similarity_index(1, "model", "rendering")
+            assert reloaded is not team_index
+            assert reloaded is not None and reloaded.watermark == self.watermark
+            assert read.call_count == 2